@@ -4,19 +4,18 @@ Minimal interceptor - just captures and forwards everything to FastAPI
 ALL logic happens in the FastAPI service
 Control via cookies only (mitm-* cookies)
 """
+import os
 import json
+import time
+import struct
 import asyncio
+import aiohttp
 from urllib.parse   import urlparse
 from pathlib        import Path
 from datetime       import datetime
 from typing         import Dict, Tuple, Optional
 from mitmproxy      import http
 
-# For HTTP calls
-import urllib.request
-import urllib.error
-from concurrent.futures import ThreadPoolExecutor
-
 # Configuration
 FASTAPI_BASE_URL = "https://mitmproxy-api.dev.mgraph.ai"            # use when deploying to AWS EC2
 # on local docker use this (note: at the moment this is done manually during development)
@@ -24,40 +23,203 @@ FASTAPI_BASE_URL = "https://mitmproxy-api.dev.mgraph.ai"            # use when d
 
 REQUEST_ENDPOINT     = "/proxy/process-request"
 RESPONSE_ENDPOINT    = "/proxy/process-response"
-TIMEOUT              = 90       # was 5.0 (trying 90 seconds to see if it allows the creation of the ratings
-VERSION__INTERCEPTOR = "v0.2.1"  # cookies only, no path params
+RESPONSE_FRAME_ENDPOINT = "/proxy/process-response-frame"
+RULES_ENDPOINT       = "/proxy/get-interceptor-rules"
+RESPONSE_TRANSPORT   = "frame"  # "frame" sends the body as raw bytes (length-prefixed frame), "json" embeds it in the json payload
+TIMEOUT              = 90       # default timeout (was 5.0, 90 seconds allows the creation of the ratings)
+VERSION__INTERCEPTOR = "v0.8.0"  # cookies only, no path params, binary body frames, async keep-alive client, local bypass, response latency budget, header-only responses, compressed bodies
+RESPONSE_BUDGET_MS   = int(os.environ.get("FASTAPI_RESPONSE_BUDGET_MS", "8000"))      # latency budget for the response phase (FastAPI skips steps to stay within it, 0 disables), TIMEOUT stays the hard limit
+
+# Async HTTP client (one keep-alive connection pool to FastAPI, shared by all flows)
+MAX_CONCURRENT_CALLS = int(os.environ.get("FASTAPI_MAX_CONCURRENT_CALLS", "100"))     # max calls to FastAPI in flight (the rest wait in the queue)
+KEEPALIVE_TIMEOUT    = 60                                                             # seconds an idle connection is kept open
+ENDPOINT_TIMEOUTS    = { REQUEST_ENDPOINT       : float(os.environ.get("FASTAPI_TIMEOUT__REQUEST" , "30")),   # request phase is cheap (cookies, admin pages, cache lookups)
+                         RESPONSE_ENDPOINT      : float(os.environ.get("FASTAPI_TIMEOUT__RESPONSE", TIMEOUT)),# response phase can run LLM backed transformations
+                         RESPONSE_FRAME_ENDPOINT: float(os.environ.get("FASTAPI_TIMEOUT__RESPONSE", TIMEOUT)),
+                         RULES_ENDPOINT         : 5.0                                                       }
+
+# Binary frame: [4 byte big-endian metadata size][metadata json][raw body bytes]
+# (must match mgraph_ai_service_mitmproxy/service/proxy/Proxy__Body__Frame.py, this file is deployed on its own)
+CONTENT_TYPE__PROXY_FRAME = "application/x-mgraph-proxy-frame"
+FRAME__METADATA_SIZE      = struct.Struct('>I')
 
 # Stats tracking
 request_count = 0
 response_count = 0
 errors_count = 0
+bypassed_count = 0                                                         # flows handled locally (no call to FastAPI)
+headers_only_count = 0                                                     # responses sent to FastAPI without their body (no cookie could change it)
+
+# Interceptor rules (published by FastAPI, used to skip flows that don't need it, i.e. no mitm-* cookies)
+FLOW_METADATA__BYPASS  = "mitm-bypass"
+RULES__RETRY_SECONDS   = 10                                                # how long to wait before retrying when the rules can't be fetched
+interceptor_rules      : Optional[Dict] = None
+rules_expire_at        = 0.0
+rules_refreshing       = False
+
+# HTTP client stats (exposed to FastAPI via the 'stats' field of each call)
+client_stats = { "calls"            : 0,     # calls made to FastAPI
+                 "in_flight"        : 0,     # calls currently being executed
+                 "queue_depth"      : 0,     # calls currently waiting for a free slot
+                 "queue_depth_peak" : 0,     # max queue_depth seen
+                 "saturated"        : 0,     # calls that had to wait because MAX_CONCURRENT_CALLS were in flight
+                 "timeouts"         : 0,
+                 "failures"         : 0,
+                 "queue_wait_ms_max": 0.0 }
+
+http_session    : Optional[aiohttp.ClientSession] = None                  # created lazily (needs the running event loop)
+calls_semaphore : Optional[asyncio.Semaphore]     = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Keep-alive session to FastAPI (created on first use, inside mitmproxy's event loop)"""
+    global http_session, calls_semaphore
+    if http_session is None or http_session.closed:
+        connector       = aiohttp.TCPConnector(limit=MAX_CONCURRENT_CALLS, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        http_session    = aiohttp.ClientSession(connector=connector)
+        calls_semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+    return http_session
+
+
+async def get_from_fastapi(endpoint: str) -> Optional[dict]:
+    """GET json from FastAPI using the shared keep-alive session (not counted against MAX_CONCURRENT_CALLS)"""
+    session = get_http_session()
+    timeout = aiohttp.ClientTimeout(total=ENDPOINT_TIMEOUTS.get(endpoint, TIMEOUT))
+    try:
+        async with session.get(f"{FASTAPI_BASE_URL}{endpoint}", timeout=timeout) as response:
+            if response.status == 200:
+                return await response.json()
+    except Exception:
+        pass
+    return None
 
-# Thread pool for non-blocking HTTP calls
-executor = ThreadPoolExecutor(max_workers=10)
 
+async def refresh_interceptor_rules() -> None:
+    """Re-fetch the rules when they expire (only one refresh at a time, the other flows keep using the current rules)"""
+    global interceptor_rules, rules_expire_at, rules_refreshing
+    if rules_refreshing or time.monotonic() < rules_expire_at:
+        return
+    rules_refreshing = True
+    try:
+        rules = await get_from_fastapi(RULES_ENDPOINT)
+        if rules:
+            interceptor_rules = rules
+            rules_expire_at   = time.monotonic() + rules.get("refresh_seconds", 60)
+        else:
+            rules_expire_at   = time.monotonic() + RULES__RETRY_SECONDS     # keep the previous rules (or none, i.e. no bypass)
+    finally:
+        rules_refreshing = False
+
+
+def can_bypass(flow: http.HTTPFlow) -> bool:
+    """True when the rules say FastAPI would only add informational headers to this flow"""
+    rules = interceptor_rules
+    if not rules or not rules.get("bypass_enabled"):
+        return False
+    path = flow.request.path
+    if any(path.startswith(prefix) for prefix in rules.get("admin_path_prefixes", [])):
+        return False
+    if any(marker in path for marker in rules.get("blocked_path_markers", [])):
+        return False
+    cookie_names    = rules.get("cookie_names"   , [])
+    cookie_prefixes = tuple(rules.get("cookie_prefixes", []))
+    for cookie_name in flow.request.cookies.keys():
+        if cookie_name in cookie_names or (cookie_prefixes and cookie_name.startswith(cookie_prefixes)):
+            return False
+    return True
+
+
+def needs_body(flow: http.HTTPFlow) -> bool:
+    """False when the rules say no cookie of this request can change the response body (so only the headers are sent)"""
+    rules = interceptor_rules
+    if not rules or not rules.get("headers_only_enabled"):
+        return True
+    off_values = rules.get("body_cookie_off_values", [])
+    for cookie_name in rules.get("body_cookie_names", []):
+        value = flow.request.cookies.get(cookie_name)
+        if value is not None and value.strip().lower() not in off_values:          # must match Proxy__Cookie__Service.body_cookie_is_on
+            return True
+    return False
 
-def call_fastapi_sync(endpoint: str, data: dict) -> dict:
-    """Synchronous FastAPI call for use in thread pool"""
-    url = f"{FASTAPI_BASE_URL}{endpoint}"
 
-    try:
-        json_data = json.dumps(data).encode('utf-8')
-        req = urllib.request.Request(url, data=json_data, headers={'content-type': 'application/json'})
+def apply_bypass_request_rules(flow: http.HTTPFlow) -> None:
+    """Do locally what FastAPI would have done to a bypassed request (remove sensitive headers)"""
+    markers = interceptor_rules.get("sensitive_header_markers", [])
+    for header in list(flow.request.headers.keys()):
+        if any(marker in header for marker in markers):
+            del flow.request.headers[header]
+
+
+def get_client_stats() -> Dict:
+    """Snapshot of the HTTP client counters"""
+    return dict(client_stats, max_concurrent_calls=MAX_CONCURRENT_CALLS)
+
 
-        with urllib.request.urlopen(req, timeout=TIMEOUT) as response:
+async def post_to_fastapi(endpoint: str, data: bytes, content_type: str) -> Optional[bytes]:
+    """POST to FastAPI using the shared keep-alive session (bounded by MAX_CONCURRENT_CALLS), returns the body on 200"""
+    session = get_http_session()
+    url     = f"{FASTAPI_BASE_URL}{endpoint}"
+    timeout = aiohttp.ClientTimeout(total=ENDPOINT_TIMEOUTS.get(endpoint, TIMEOUT))
+    client_stats["calls"] += 1
+
+    if calls_semaphore.locked():                                        # all slots are taken, so this call is going to queue
+        client_stats["saturated"] += 1
+    client_stats["queue_depth"]      += 1
+    client_stats["queue_depth_peak"]  = max(client_stats["queue_depth_peak"], client_stats["queue_depth"])
+    queued_at = time.monotonic()
+    try:
+        await calls_semaphore.acquire()
+    finally:
+        client_stats["queue_depth"] -= 1
+    client_stats["queue_wait_ms_max"] = max(client_stats["queue_wait_ms_max"], (time.monotonic() - queued_at) * 1000)
+    client_stats["in_flight"]        += 1
+    try:
+        async with session.post(url, data=data, headers={'content-type': content_type}, timeout=timeout) as response:
             if response.status == 200:
-                response_data = response.read()
-                return json.loads(response_data)
-    except Exception as e:
+                return await response.read()
+            client_stats["failures"] += 1
+    except asyncio.TimeoutError:
+        client_stats["timeouts"] += 1
+    except Exception:
+        client_stats["failures"] += 1
+    finally:
+        client_stats["in_flight"] -= 1
+        calls_semaphore.release()
+    return None
+
+
+def encode_frame(metadata: dict, body: bytes) -> bytes:
+    """Build a frame: only the metadata is json encoded, the body is appended as is"""
+    metadata_bytes = json.dumps(metadata).encode('utf-8')
+    return FRAME__METADATA_SIZE.pack(len(metadata_bytes)) + metadata_bytes + (body or b'')
+
+
+def decode_frame(frame: bytes) -> Tuple[dict, bytes]:
+    """Split a frame into (metadata, body)"""
+    metadata_size = FRAME__METADATA_SIZE.unpack_from(frame)[0]
+    metadata_end  = FRAME__METADATA_SIZE.size + metadata_size
+    return json.loads(frame[FRAME__METADATA_SIZE.size:metadata_end]), frame[metadata_end:]
+
+
+async def call_fastapi_frame_async(endpoint: str, metadata: dict, body: bytes) -> dict:
+    """FastAPI call using the binary frame transport (returns modifications with modified_body as bytes)"""
+    try:
+        response_frame = await post_to_fastapi(endpoint, encode_frame(metadata, body), CONTENT_TYPE__PROXY_FRAME)
+        if response_frame:
+            modifications, modified_body = decode_frame(response_frame)
+            if modified_body:
+                modifications["modified_body"] = modified_body
+            return modifications
+    except Exception:
         return None
 
 
 async def call_fastapi_async(endpoint: str, data: dict) -> dict:
-    """Async wrapper that runs sync call in thread pool"""
-    loop = asyncio.get_event_loop()
+    """FastAPI call using json (request phase and the legacy response transport)"""
     try:
-        result = await loop.run_in_executor(executor, call_fastapi_sync, endpoint, data)
-        return result
+        response_data = await post_to_fastapi(endpoint, json.dumps(data).encode('utf-8'), 'application/json')
+        if response_data:
+            return json.loads(response_data)
     except Exception:
         return None
 
@@ -76,6 +238,8 @@ def prepare_request_data(flow: http.HTTPFlow) -> Dict:
              "headers"      : dict(flow.request.headers),                 # Includes Cookie header
              "stats"        : { "request_count": request_count              ,
                                 "errors_count": errors_count                ,
+                                "bypassed_count": bypassed_count            ,
+                                "http_client" : get_client_stats()          ,
                                 "timestamp": datetime.utcnow().isoformat()  },
              "version"      : VERSION__INTERCEPTOR    }
 
@@ -110,13 +274,20 @@ def apply_request_modifications(flow: http.HTTPFlow, modifications: Dict) -> boo
 
 async def request(flow: http.HTTPFlow) -> None:
     """Request handler - capture and forward to FastAPI"""
-    global request_count, errors_count
+    global request_count, errors_count, bypassed_count
     request_count += 1
 
     if not should_process_request(flow):                # Check if we should process this request
         #print(f"[REQUEST #{request_count}] ⏩ Skipping static asset: {flow.request.path}")
         return
 
+    await refresh_interceptor_rules()
+    if can_bypass(flow):                                # No mitm-* cookies (and not admin/blocked): nothing for FastAPI to do
+        apply_bypass_request_rules(flow)
+        flow.metadata[FLOW_METADATA__BYPASS] = True
+        bypassed_count += 1
+        return
+
     print(f"[REQUEST #{request_count}] {flow.request.method} {flow.request.pretty_host}{flow.request.path}")
 
     # Add tracking header
@@ -169,12 +340,13 @@ def extract_body_content(flow: http.HTTPFlow) -> Tuple[Optional[str], Optional[i
         return None, 0, str(e)
 
 
-def prepare_response_data(flow: http.HTTPFlow) -> Dict:
+def prepare_response_data(flow: http.HTTPFlow, include_body: bool = True) -> Dict:
     """
     Prepare response data for FastAPI
     Just capture everything - no parsing
 
     NOTE: request['headers'] includes Cookie header from original request
+    NOTE: with include_body=False the body is left out (the frame transport sends it as raw bytes)
     """
     content_type = flow.response.headers.get("content-type", "").lower()
 
@@ -194,13 +366,17 @@ def prepare_response_data(flow: http.HTTPFlow) -> Dict:
             "response_count": response_count,
             "request_count": request_count,
             "errors_count": errors_count,
+            "bypassed_count": bypassed_count,
+            "headers_only_count": headers_only_count,
+            "http_client": get_client_stats(),
             "timestamp": datetime.utcnow().isoformat()
         },
-        "version": VERSION__INTERCEPTOR
+        "version"  : VERSION__INTERCEPTOR,
+        "budget_ms": RESPONSE_BUDGET_MS
     }
 
     # Include body if text content
-    if check_text_content(content_type):
+    if include_body and check_text_content(content_type):
         content, size, error = extract_body_content(flow)
         if content:
             response_data["response"]["body"] = content
@@ -212,6 +388,18 @@ def prepare_response_data(flow: http.HTTPFlow) -> Dict:
     return response_data
 
 
+def set_response_body(flow: http.HTTPFlow, modifications: Dict) -> None:
+    """Write the modified body (FastAPI already compressed it when modified_body_encoding is set, so the bytes are written as they are)"""
+    content = modifications["modified_body"]
+    content = content if isinstance(content, bytes) else str(content).encode('utf-8')
+    if modifications.get("modified_body_encoding"):
+        flow.response.headers["content-encoding"] = modifications["modified_body_encoding"]
+        flow.response.raw_content = content                                  # .content would encode it again
+    else:
+        flow.response.content = content                                      # (re-encoded with the upstream content-encoding, if any)
+    flow.response.headers["content-length"] = str(len(flow.response.raw_content))
+
+
 def apply_response_modifications(flow: http.HTTPFlow, modifications: Dict) -> None:
     """Apply modifications from FastAPI to response"""
     if not modifications:
@@ -226,8 +414,7 @@ def apply_response_modifications(flow: http.HTTPFlow, modifications: Dict) -> No
             flow.response.headers["content-type"] = modifications["override_content_type"]
 
         if modifications.get("modified_body"):
-            flow.response.content = str(modifications["modified_body"]).encode('utf-8')
-            flow.response.headers["content-length"] = str(len(flow.response.content))
+            set_response_body(flow, modifications)
 
     # Apply header modifications
     if "headers_to_add" in modifications:
@@ -242,14 +429,8 @@ def apply_response_modifications(flow: http.HTTPFlow, modifications: Dict) -> No
     # Apply body modifications
     if "modified_body" in modifications and modifications["modified_body"]:
         try:
-            content = modifications["modified_body"]
-            if isinstance(content, bytes):
-                flow.response.content = content
-            else:
-                flow.response.content = str(content).encode('utf-8')
-
-            flow.response.headers["content-length"] = str(len(flow.response.content))
-            print(f"  ✓ Body modified: {len(flow.response.content)} bytes")
+            set_response_body(flow, modifications)
+            print(f"  ✓ Body modified: {len(flow.response.raw_content)} bytes ({modifications.get('modified_body_encoding') or 'not compressed'})")
         except Exception as e:
             print(f"  ⚠ Error modifying body: {e}")
 
@@ -259,21 +440,42 @@ def apply_response_modifications(flow: http.HTTPFlow, modifications: Dict) -> No
 
 
 async def response(flow: http.HTTPFlow) -> None:            # Response handler - capture and forward to FastAPI
-    global response_count
+    global response_count, bypassed_count, headers_only_count
     response_count += 1
 
     if not should_process_response(flow):
         #print(f"[RESPONSE #{response_count}] ⏩ Skipping - not processable content")
         return
 
+    if flow.metadata.get(FLOW_METADATA__BYPASS) or can_bypass(flow):       # decided locally (see interceptor rules)
+        if not flow.metadata.get(FLOW_METADATA__BYPASS):
+            bypassed_count += 1
+        flow.response.headers["x-proxy-status"] = "local-bypass"
+        return
+
     print(f"[RESPONSE #{response_count}] {flow.response.status_code} from {flow.request.pretty_host}")
 
     # Add tracking header
     flow.response.headers["x-proxy-response-count"] = str(response_count)
 
-    # Prepare and send to FastAPI
-    response_data = prepare_response_data(flow)
-    modifications = await call_fastapi_async(RESPONSE_ENDPOINT, response_data)
+    # Prepare and send to FastAPI (the body is only read, decoded and sent when a cookie can change it)
+    include_body = needs_body(flow)
+    if not include_body:
+        headers_only_count += 1
+    if RESPONSE_TRANSPORT == "frame":
+        response_data = prepare_response_data(flow, include_body=False)
+        body          = flow.response.content if include_body and check_text_content(response_data["response"]["content_type"]) else b''
+        if body:
+            print(f"  → Sending {len(body)} bytes")
+        if not include_body:
+            response_data["body_omitted"] = True
+            print(f"  → Sending headers only")
+        modifications = await call_fastapi_frame_async(RESPONSE_FRAME_ENDPOINT, response_data, body)
+    else:
+        response_data = prepare_response_data(flow, include_body=include_body)
+        if not include_body:
+            response_data["body_omitted"] = True
+        modifications = await call_fastapi_async(RESPONSE_ENDPOINT, response_data)
 
     if modifications:
         apply_response_modifications(flow, modifications)
@@ -327,14 +529,18 @@ def should_process_response(flow: http.HTTPFlow) -> bool:
 
     return any(t in content_type for t in processable_types)
 
-def done():
+async def done():
     """Cleanup"""
-    executor.shutdown(wait=False)
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
 
 
 print("=" * 60)
 print("FastAPI Interceptor Loaded!")
 print(f"Version: {VERSION__INTERCEPTOR}")
+print(f"Response budget: {RESPONSE_BUDGET_MS}ms")
 print(f"FastAPI: {FASTAPI_BASE_URL}")
+print(f"Response transport: {RESPONSE_TRANSPORT}")
+print(f"Max concurrent calls: {MAX_CONCURRENT_CALLS}")
 print("Control via cookies: mitm-show, mitm-inject, mitm-debug, etc.")
 print("=" * 60)
\ No newline at end of file
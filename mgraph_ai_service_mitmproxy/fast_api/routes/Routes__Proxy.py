@@ -1,20 +1,45 @@
+from fastapi                                                                         import Request, Response
 from osbot_fast_api.api.routes.Fast_API__Routes                                      import Fast_API__Routes
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data           import Schema__Proxy__Request_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Interceptor__Rules     import Schema__Proxy__Interceptor__Rules
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Request  import Schema__HTML__Transformation__Batch__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Response import Schema__HTML__Transformation__Batch__Response
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Request import Schema__Cache__Prewarm__Request
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Job   import Schema__Cache__Prewarm__Job
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Service                        import Proxy__Service
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Body__Frame                    import Proxy__Body__Frame
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                        import CONTENT_TYPE__PROXY_FRAME
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                    import http_session_pool, http_session_pool__paid
+from mgraph_ai_service_mitmproxy.service.http.Http__Async__Client__Pool              import http_async_client_pool
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers                import circuit_breakers
 from typing                                                                          import Dict
 
 TAG__ROUTES_PROXY                  = 'proxy'
 ROUTES_PATHS__PROXY                = [ f'/{TAG__ROUTES_PROXY}/process-request'  ,
                                        f'/{TAG__ROUTES_PROXY}/process-response' ,
                                        f'/{TAG__ROUTES_PROXY}/get-proxy-stats'  ,
-                                       f'/{TAG__ROUTES_PROXY}/reset-proxy-stats']
+                                       f'/{TAG__ROUTES_PROXY}/reset-proxy-stats',
+                                       f'/{TAG__ROUTES_PROXY}/get-http-pool-stats',
+                                       f'/{TAG__ROUTES_PROXY}/process-response-async',
+                                       f'/{TAG__ROUTES_PROXY}/process-response-frame',
+                                       f'/{TAG__ROUTES_PROXY}/get-interceptor-rules',
+                                       f'/{TAG__ROUTES_PROXY}/transform-html-batch',
+                                       f'/{TAG__ROUTES_PROXY}/prewarm-start'       ,
+                                       f'/{TAG__ROUTES_PROXY}/prewarm-status'      ,
+                                       f'/{TAG__ROUTES_PROXY}/prewarm-jobs'        ,
+                                       f'/{TAG__ROUTES_PROXY}/get-circuit-breakers',
+                                       f'/{TAG__ROUTES_PROXY}/reset-circuit-breakers',
+                                       f'/{TAG__ROUTES_PROXY}/get-original-html-stats',
+                                       f'/{TAG__ROUTES_PROXY}/get-response-compression-stats',
+                                       f'/{TAG__ROUTES_PROXY}/get-etag-stats'      ]
 
 class Routes__Proxy(Fast_API__Routes):                               # FastAPI routes for proxy control
     tag : str = TAG__ROUTES_PROXY
 
     proxy_service : Proxy__Service = None                                   # Main proxy service
+    body_frame    : Proxy__Body__Frame                               # Binary transport used by /process-response-frame
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -28,14 +53,84 @@ class Routes__Proxy(Fast_API__Routes):                               # FastAPI r
                         ) -> Schema__Proxy__Modifications:           # Modifications to apply
         return self.proxy_service.process_response(response_data)
 
+    async def process_response_async(self, request : Request         # Same contract as process_response, but runs on the event loop
+                                     ) -> Dict:                      # (registered directly since the Type_Safe route wrappers are sync)
+        response_data = Schema__Proxy__Response_Data.from_json(await request.json())
+        modifications = await self.proxy_service.process_response_async(response_data)
+        return modifications.json()
+
+    async def process_response_frame(self, request : Request         # Same contract as process_response, but the bodies travel as raw bytes
+                                     ) -> Response:                  # (length-prefixed frame, see Proxy__Body__Frame)
+        response_data                      = self.body_frame.decode__response_data(await request.body())
+        modifications, body, body_encoding = await self.proxy_service.process_response_frame(response_data)        # async pipeline (body is gzip/br encoded when the client accepts it)
+        return Response(content    = self.body_frame.encode__modifications(modifications, body, body_encoding),
+                        media_type = CONTENT_TYPE__PROXY_FRAME                                                 )
+
     def get_proxy_stats(self) -> Dict:                               # Get current proxy statistics
         return self.proxy_service.get_stats()
 
     def reset_proxy_stats(self) -> Dict:                             # Reset proxy statistics
         return self.proxy_service.reset_stats()
 
+    def transform_html_batch(self, request : Schema__HTML__Transformation__Batch__Request   # Transform N (url, html, mode) items in one call
+                             ) -> Schema__HTML__Transformation__Batch__Response:
+        return self.proxy_service.transform_html_batch(request)
+
+    def prewarm_start(self, request : Schema__Cache__Prewarm__Request    # Start a background job that fetches and transforms a list of urls (or a sitemap)
+                      ) -> Dict:
+        return self.prewarm_job_status(self.proxy_service.prewarm_start(request))
+
+    def prewarm_status(self, job_id : str) -> Dict:                  # Progress of a pre-warm job
+        job = self.proxy_service.prewarm_job(job_id)
+        if job is None:
+            return dict(error=f'pre-warm job not found: {job_id}')
+        return self.prewarm_job_status(job)
+
+    def prewarm_jobs(self) -> Dict:                                  # Recent pre-warm jobs (newest first)
+        return dict(jobs=[self.prewarm_job_status(job) for job in self.proxy_service.prewarm_jobs()])
+
+    def prewarm_job_status(self, job : Schema__Cache__Prewarm__Job) -> Dict:   # todo: refactor to Type_Safe class
+        return dict(**job.json(), progress=job.progress())
+
+    def get_interceptor_rules(self) -> Schema__Proxy__Interceptor__Rules:  # Rules the interceptor caches to skip flows that don't need this service
+        return self.proxy_service.get_interceptor_rules()
+
+    def get_http_pool_stats(self) -> Dict:                           # Get keep-alive connection pool stats for backend clients
+        return dict(session_pool      = http_session_pool      .stats(),
+                    paid_session_pool = http_session_pool__paid.stats(),
+                    async_client_pool = http_async_client_pool .stats())
+
+    def get_circuit_breakers(self) -> Dict:                          # State of each backend's circuit breaker (open = failing fast to passthrough)
+        return circuit_breakers.stats()
+
+    def reset_circuit_breakers(self) -> Dict:                        # Close every breaker (e.g. after a backend was fixed)
+        circuit_breakers.reset()
+        return circuit_breakers.stats()
+
+    def get_original_html_stats(self) -> Dict:                       # Original html uploads started, and uploads (and bytes) avoided because the page didn't change
+        return self.proxy_service.get_original_html_stats()
+
+    def get_response_compression_stats(self) -> Dict:                # Modified bodies sent gzip/br encoded, and how many needed no compression (precompressed variant)
+        return self.proxy_service.get_response_compression_stats()
+
+    def get_etag_stats(self) -> Dict:                                # Transformed pages sent with an etag, and repeat views answered with 304
+        return self.proxy_service.get_etag_stats()
+
     def setup_routes(self):                                          # Configure FastAPI routes
         self.add_route_post(self.process_request   )
         self.add_route_post(self.process_response  )
         self.add_route_get (self.get_proxy_stats   )
-        self.add_route_post(self.reset_proxy_stats )
\ No newline at end of file
+        self.add_route_post(self.reset_proxy_stats )
+        self.add_route_get (self.get_http_pool_stats)
+        self.add_route_get (self.get_interceptor_rules)
+        self.add_route_post(self.transform_html_batch)
+        self.add_route_post(self.prewarm_start       )
+        self.add_route_get (self.prewarm_status      )
+        self.add_route_get (self.prewarm_jobs        )
+        self.add_route_get (self.get_circuit_breakers  )
+        self.add_route_post(self.reset_circuit_breakers)
+        self.add_route_get (self.get_original_html_stats)
+        self.add_route_get (self.get_response_compression_stats)
+        self.add_route_get (self.get_etag_stats        )
+        self.router.add_api_route('/process-response-async', self.process_response_async, methods=['POST'])
+        self.router.add_api_route('/process-response-frame', self.process_response_frame, methods=['POST'])
\ No newline at end of file
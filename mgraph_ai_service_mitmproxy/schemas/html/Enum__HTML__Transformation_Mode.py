@@ -3,6 +3,8 @@ from typing import List, Dict
 
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.enums.Enum__Text__Transformation__Mode import Enum__Text__Transformation__Mode
 
+CACHE_TTL__DEFAULT               = 24 * 60 * 60                                     # seconds a cached transformation is trusted for (the services behind it may have changed their output since)
+CACHE_TTL__LOCAL_TRANSFORMATION  =  0                                               # never stale: entries are keyed on the html, and a local transformation depends on nothing else
 
 # todo: move the logic/code below into a helper class
 # todo: renamed HTML to Html
@@ -67,6 +69,11 @@ class Enum__HTML__Transformation_Mode(str, Enum):
         """Check if this transformation should be cached"""
         return self.is_active()                                                     # All active modes are cacheable
 
+    def cache_ttl_seconds(self) -> int:                                             # How long a cached transformation is fresh for (before it is revalidated)
+        if self.is_local_transformation():
+            return CACHE_TTL__LOCAL_TRANSFORMATION
+        return CACHE_TTL__DEFAULT
+
     def to_endpoint_path(self) -> str:                                              # Convert mode to HTML Service endpoint path"""
         mapping = {
             Enum__HTML__Transformation_Mode.DICT          : "/html/to/tree/view"       , # BUG this should be to html/to/dict and we should add new TREE_VIEW mode which would be the one that points to /html/to/tree/view
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Enum__HTML__Transformation__Defer(str, Enum):                     # Which cache misses are served as the original html (with the transformation run in the background)
+    NEVER     = "never"                                                  # every cache miss waits for its transformation
+    REMOTE    = "remote"                                                 # modes whose step 2 calls the Semantic Text Service (eg: the xxx-negative-* sentiment modes) don't block the first request
+    ALWAYS    = "always"                                                 # no cache miss waits (first-hit latency is the same as the unproxied site)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Enum__HTML__Transformation__Pipeline(str, Enum):                  # Where the html <-> dict/hashes steps of a transformation run
+    REMOTE            = "remote"                                         # html service for step 1 and step 3 (3 round trips per page)
+    LOCAL_RECONSTRUCT = "local-reconstruct"                              # html service for step 1, step 3 done in-process (html_dict never sent back)
+    LOCAL             = "local"                                          # step 1 and step 3 done in-process (local modes also skip the semantic text service)
@@ -0,0 +1,10 @@
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Html           import Safe_Str__Html
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Url            import Safe_Str__Url
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+
+
+class Schema__HTML__Transformation__Batch__Item(Type_Safe):                         # One page of a batch transformation
+    target_url  : Safe_Str__Url                                                     # Original URL (for the cache key)
+    source_html : Safe_Str__Html                                                    # Source HTML content
+    mode        : Enum__HTML__Transformation_Mode = Enum__HTML__Transformation_Mode.XXX
@@ -0,0 +1,7 @@
+from typing                                                                             import List
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Item import Schema__HTML__Transformation__Batch__Item
+
+
+class Schema__HTML__Transformation__Batch__Request(Type_Safe):                      # Transform many pages in one call (e.g. to pre-warm the cache for a site)
+    items : List[Schema__HTML__Transformation__Batch__Item]
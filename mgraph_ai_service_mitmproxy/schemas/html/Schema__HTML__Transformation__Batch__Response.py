@@ -0,0 +1,15 @@
+from typing                                                                             import List
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                                   import Safe_Float
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                    import Safe_UInt
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result      import Schema__HTML__Transformation__Result
+
+
+class Schema__HTML__Transformation__Batch__Response(Type_Safe):                     # Results of a batch transformation (same order as the request items)
+    results           : List[Schema__HTML__Transformation__Result]
+    total_items       : Safe_UInt                                                   # Items in the request
+    cache_hits        : Safe_UInt                                                   # Items served from the cache
+    transformed_pages : Safe_UInt                                                   # Distinct pages (html + mode) that went through the pipeline
+    text_nodes_total  : Safe_UInt                                                   # Text nodes across all transformed pages
+    text_nodes_unique : Safe_UInt                                                   # Text nodes after de-duplicating across pages (what step 2 had to handle)
+    duration_ms       : Safe_Float                                                  # Time taken for the whole batch (ms)
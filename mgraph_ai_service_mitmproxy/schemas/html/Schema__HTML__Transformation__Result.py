@@ -13,12 +13,17 @@ class Schema__HTML__Transformation__Result(Type_Safe):                # Result o
     content_type           : Safe_Str__Http__Content_Type             # Content type of result
     cache_hit              : bool                                     # Whether result came from cache
     transformation_time_ms : Safe_Float                               # Time taken for transformation (ms)
+    transformation_pending : bool                                     # Original html served while the transformation runs in the background
+    success                : bool                                     # Transformed by the pipeline, or served from the transformation cache (False for passthrough, error and pending results)
 
     def was_cached(self) -> bool:                                                   # Check if result was from cache
         return self.cache_hit
 
     def to_headers(self) -> dict:                                                   # Convert transformation metadata to HTTP headers
-        return { "x-proxy-transformation"  : self.transformation_mode.value      ,
-                  "x-proxy-cache"          : "hit" if self.cache_hit else "miss" ,
-                  "x-html-service-time"    : f"{self.transformation_time_ms}ms"  ,
-                  "content-type"           : str(self.content_type)              }
\ No newline at end of file
+        headers = { "x-proxy-transformation"  : self.transformation_mode.value      ,
+                     "x-proxy-cache"          : "hit" if self.cache_hit else "miss" ,
+                     "x-html-service-time"    : f"{self.transformation_time_ms}ms"  ,
+                     "content-type"           : str(self.content_type)              }
+        if self.transformation_pending:
+            headers["x-proxy-transformation-pending"] = "true"
+        return headers
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing                                                                          import Dict, Optional
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode        import Enum__HTML__Transformation_Mode
+
+
+class Schema__Proxy__Cookie__Context(Type_Safe):                     # Cookie header parsed once, shared by every consumer of the same request (treat as read-only)
+    cookie_header  : str                                             # Raw Cookie header value
+    cookies        : Dict[str, str]                                  # All cookies (sanitised names and values)
+    proxy_cookies  : Dict[str, str]                                  # Only the mitm-* cookies
+    show_command   : Optional[str]  = None                           # mitm-show
+    inject_command : Optional[str]  = None                           # mitm-inject
+    replace_command: Optional[str]  = None                           # mitm-replace
+    model_override : Optional[str]  = None                           # mitm-model
+    rating         : Optional[float]= None                           # mitm-rating (None if missing or invalid)
+    debug_enabled  : bool           = False                          # mitm-debug
+    cache_enabled  : bool           = False                          # mitm-cache
+    is_wcf_command : bool           = False                          # mitm-show holds a WCF command
+    mitm_mode      : Enum__HTML__Transformation_Mode = Enum__HTML__Transformation_Mode.OFF   # mitm-mode
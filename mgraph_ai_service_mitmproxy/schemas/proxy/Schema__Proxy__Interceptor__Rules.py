@@ -0,0 +1,16 @@
+from typing                                                                          import List
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+
+
+class Schema__Proxy__Interceptor__Rules(Type_Safe):                  # Rules the interceptor uses to decide locally if a flow needs this service
+    bypass_enabled           : bool      = True                      # False: send every flow to this service (old behaviour)
+    refresh_seconds          : int       = 60                        # how long the interceptor can keep using these rules
+    cookie_prefixes          : List[str]                             # any cookie starting with these needs the service
+    cookie_names             : List[str]                             # any cookie with these exact names needs the service
+    admin_path_prefixes      : List[str]                             # paths served by the service (admin UI)
+    blocked_path_markers     : List[str]                             # paths containing these are blocked by the service
+    sensitive_header_markers : List[str]                             # request headers the interceptor must remove itself when bypassing
+    headers_only_enabled     : bool      = True                      # False: always send the response body (old behaviour)
+    body_cookie_names        : List[str]                             # the only cookies that can change the response body (when none is on, the body is not sent)
+    body_cookie_off_values   : List[str]                             # values of those cookies that don't change anything (e.g. mitm-mode=off)
+    rules_hash               : str       = ''                        # changes when any rule changes
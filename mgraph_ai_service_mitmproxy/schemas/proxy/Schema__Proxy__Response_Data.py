@@ -1,4 +1,5 @@
 from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                 import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.common.safe_str.Safe_Str__Version      import Safe_Str__Version
 from typing                                                                          import Dict, Any
 
@@ -6,4 +7,16 @@ class Schema__Proxy__Response_Data(Type_Safe):                       # Incoming
     request       : Dict[str, Any]                                   # Original request info (includes headers with Cookie)
     response      : Dict[str, Any]                                   # Response details
     stats         : Dict[str, Any]                                   # Response statistics
-    version       : Safe_Str__Version                                # Interceptor version
\ No newline at end of file
+    version       : Safe_Str__Version                                # Interceptor version
+    budget_ms     : Safe_UInt                                        # Latency budget for this response in ms (set by the interceptor, 0 means no budget)
+    body_omitted  : bool                                             # True when the interceptor only sent the headers (no cookie can change the body)
+
+    @classmethod
+    def from_frame(cls, metadata : dict ,                            # Build from a binary frame (see Proxy__Body__Frame)
+                        body     : bytes                             # raw response body, sent outside the json metadata
+                   ) -> 'Schema__Proxy__Response_Data':
+        response_data = cls.from_json(metadata)
+        if body:
+            response_data.response['body'     ] = body.decode('utf-8', errors='ignore')   # same decoding the interceptor used to do before json encoding
+            response_data.response['body_size'] = len(response_data.response['body'])
+        return response_data
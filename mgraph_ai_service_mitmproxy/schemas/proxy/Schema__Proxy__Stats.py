@@ -8,4 +8,7 @@ class Schema__Proxy__Stats(Type_Safe):                               # Proxy sta
     #hosts_seen            : Set[Safe_Str__Id]                        # Unique hosts encountered
     #paths_seen            : Set[str]                                 # Unique paths encountered
     total_bytes_processed : Safe_UInt                                # Total bytes of content processed
-    content_modifications : Safe_UInt                                # Number of content modifications
\ No newline at end of file
+    content_modifications : Safe_UInt                                # Number of content modifications
+    budget_exceeded       : Safe_UInt                                # Responses that ran out of latency budget (see x-proxy-budget-exceeded)
+    headers_only          : Safe_UInt                                # Responses processed without their body (no cookie could change it)
+    not_modified          : Safe_UInt                                # Requests answered with 304 (the client's etag matched a cached transformation)
@@ -1,4 +1,6 @@
 # Environment variable names for Semantic Text Service configuration
 ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL  = "AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL"
 ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_NAME  = "AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_NAME"
-ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE = "AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE"
\ No newline at end of file
+ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE = "AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE"
+
+DEFAULT__SEMANTIC_TEXT_SERVICE__TIMEOUT = 60.0                                  # Default timeout in seconds (transformations can trigger LLM calls)
@@ -9,6 +9,7 @@ from datetime
 from typing                                                                                               import Dict, Optional
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service                                     import Proxy__Cookie__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Stats__Service                                      import Proxy__Stats__Service
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                                             import PROXY__ADMIN_PATH_PREFIX
 
 
 class Proxy__Admin__Service(Type_Safe):                                                                    # Admin UI static file server + JSON API
@@ -23,7 +24,7 @@ class Proxy__Admin__Service(Type_Safe):
         return self
 
     def is_admin_path(self, path: Safe_Str__File__Path) -> bool:                                          # Check if path is admin endpoint
-        return str(path).startswith('/mitm-proxy')
+        return str(path).startswith(PROXY__ADMIN_PATH_PREFIX)
 
     def handle_admin_request(self, request_data) -> Optional[Dict]:                                       # Main entry point: route admin requests
         path = request_data.path
@@ -0,0 +1,114 @@
+import time
+import gzip
+import base64
+import threading
+from typing                                                                         import Any, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Compression     import Enum__Cache__Compression
+
+try:
+    import zstandard                                                                # optional (Enum__Cache__Compression.ZSTD falls back to gzip without it)
+except ImportError:
+    zstandard = None
+
+COMPRESSION__MARKER_PREFIX       = '~compressed:'                                   # stored value: ~compressed:{format}~{base64 of the compressed utf-8 bytes}
+COMPRESSION__MARKER_SUFFIX       = '~'
+DEFAULT__COMPRESSION__MIN_SIZE   = 1024                                             # smaller strings (meta, pointers, short text) are stored as is
+DEFAULT__COMPRESSION__GZIP_LEVEL = 6
+DEFAULT__COMPRESSION__ZSTD_LEVEL = 3
+
+
+class Proxy__Cache__Compression(Type_Safe):                                         # Transparent compression of the strings stored in the cache service (reads detect the format from the marker)
+    format             : Enum__Cache__Compression = Enum__Cache__Compression.GZIP
+    min_size           : Safe_UInt                = Safe_UInt(DEFAULT__COMPRESSION__MIN_SIZE)
+    compressed         : Safe_UInt                                                  # strings stored compressed
+    decompressed       : Safe_UInt                                                  # compressed strings read back
+    bytes_in           : Safe_UInt                                                  # utf-8 bytes of the strings that were compressed
+    bytes_out          : Safe_UInt                                                  # bytes sent instead (marker + base64)
+    compress_time_ms   : float                                                      # cpu time spent compressing
+    decompress_time_ms : float                                                      # cpu time spent decompressing
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # counters are updated from the request and background threads
+
+    def active_format(self, compression_format : Optional[Enum__Cache__Compression] = None     # format used for new writes (the namespace's format, or this instance's default)
+                       ) -> Enum__Cache__Compression:
+        compression_format = compression_format or self.format
+        if compression_format == Enum__Cache__Compression.ZSTD and zstandard is None:
+            return Enum__Cache__Compression.GZIP
+        return compression_format
+
+    def compress(self, text               : str                                      ,      # Value to store (text itself when compression is off, the text is small, or it doesn't get smaller)
+                       compression_format : Optional[Enum__Cache__Compression] = None,      # set by the caller from the namespace's config (None uses self.format)
+                       min_size           : Optional[int]                      = None       # (None uses self.min_size)
+                  ) -> str:
+        compression_format = self.active_format(compression_format)
+        min_size           = self.min_size if min_size is None else min_size
+        if compression_format == Enum__Cache__Compression.NONE or not isinstance(text, str) or len(text) < min_size:
+            return text
+        start_time = time.process_time()
+        data       = text.encode('utf-8')
+        encoded    = f"{COMPRESSION__MARKER_PREFIX}{compression_format.value}{COMPRESSION__MARKER_SUFFIX}" + base64.b64encode(self.compress_bytes(data, compression_format)).decode('ascii')
+        duration   = (time.process_time() - start_time) * 1000
+        if len(encoded) >= len(data):
+            return text
+        with self.lock:
+            self.compressed       += 1
+            self.bytes_in         += len(data)
+            self.bytes_out        += len(encoded)
+            self.compress_time_ms += duration
+        return encoded
+
+    def decompress(self, stored : Any) -> Any:                                      # Original text of a stored value (values without the marker are returned as is)
+        if not self.is_compressed(stored):
+            return stored
+        start_time               = time.process_time()
+        header, payload          = stored[len(COMPRESSION__MARKER_PREFIX):].split(COMPRESSION__MARKER_SUFFIX, 1)
+        compression_format       = Enum__Cache__Compression(header)
+        text                     = self.decompress_bytes(base64.b64decode(payload), compression_format).decode('utf-8')
+        with self.lock:
+            self.decompressed       += 1
+            self.decompress_time_ms += (time.process_time() - start_time) * 1000
+        return text
+
+    def is_compressed(self, stored : Any) -> bool:
+        return isinstance(stored, str) and stored.startswith(COMPRESSION__MARKER_PREFIX)
+
+    def gzip_payload(self, stored : Any) -> Optional[bytes]:                        # The gzip bytes of a value stored as gzip (a valid 'content-encoding: gzip' body, so it can be sent without recompressing)
+        prefix = f"{COMPRESSION__MARKER_PREFIX}{Enum__Cache__Compression.GZIP.value}{COMPRESSION__MARKER_SUFFIX}"
+        if isinstance(stored, str) and stored.startswith(prefix):
+            return base64.b64decode(stored[len(prefix):])
+        return None
+
+    def compress_bytes(self, data               : bytes                    ,
+                             compression_format : Enum__Cache__Compression
+                        ) -> bytes:
+        if compression_format == Enum__Cache__Compression.ZSTD:
+            return zstandard.ZstdCompressor(level=DEFAULT__COMPRESSION__ZSTD_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=DEFAULT__COMPRESSION__GZIP_LEVEL, mtime=0)
+
+    def decompress_bytes(self, data               : bytes                    ,
+                               compression_format : Enum__Cache__Compression
+                          ) -> bytes:
+        if compression_format == Enum__Cache__Compression.ZSTD:
+            if zstandard is None:
+                raise ValueError("cached value is zstd compressed, but the zstandard package is not installed")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def ratio(self) -> float:                                                       # bytes before / bytes after (for the strings that were compressed)
+        if not self.bytes_out:
+            return 0.0
+        return round(int(self.bytes_in) / int(self.bytes_out), 2)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "format"             : self.active_format().value         ,
+                 "compressed"         : int(self.compressed  )             ,
+                 "decompressed"       : int(self.decompressed)             ,
+                 "bytes_in"           : int(self.bytes_in    )             ,
+                 "bytes_out"          : int(self.bytes_out   )             ,
+                 "ratio"              : self.ratio()                       ,
+                 "compress_time_ms"   : round(self.compress_time_ms  , 3)  ,
+                 "decompress_time_ms" : round(self.decompress_time_ms, 3)  }
@@ -0,0 +1,52 @@
+import threading
+from collections                                                                        import OrderedDict
+from typing                                                                             import Hashable
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                    import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta import Schema__Cache__Transformation__Meta
+
+DEFAULT__CACHE_FRESHNESS__MAX_ENTRIES = 10000                                       # max (entry, mode) -> meta records kept in memory
+
+
+class Proxy__Cache__Freshness(Type_Safe):                                           # Bounded in-memory map of (entry, mode) -> Schema__Cache__Transformation__Meta, so checking if a cache hit is stale costs no cache service read
+    max_entries : Safe_UInt = Safe_UInt(DEFAULT__CACHE_FRESHNESS__MAX_ENTRIES)
+    entries     : OrderedDict                                                       # key -> meta, oldest first
+    evictions   : Safe_UInt                                                         # records dropped because max_entries was reached
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # guards entries and evictions: hits are checked from route threads and the event loop, stores also come from background refreshes
+
+    def put(self, key  : Hashable                            ,                      # Record when the transformation under key was cached
+                  meta : Schema__Cache__Transformation__Meta
+             ) -> None:
+        with self.lock:
+            self.entries[key] = meta
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key         : Hashable ,                                          # Meta of the transformation under key (entries cached by another proxy, or before a restart, count as cached when first seen)
+                  ttl_seconds : int
+             ) -> Schema__Cache__Transformation__Meta:
+        with self.lock:
+            meta = self.entries.get(key)
+            if meta is not None:
+                self.entries.move_to_end(key)
+                return meta
+        meta = Schema__Cache__Transformation__Meta(ttl_seconds=ttl_seconds)
+        self.put(key, meta)
+        return meta
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "size"        : self.size()           ,
+                 "max_entries" : int(self.max_entries) ,
+                 "evictions"   : int(self.evictions)   }
@@ -0,0 +1,85 @@
+import copy
+import time
+import threading
+from collections                                                                    import OrderedDict
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs    import Schema__Cache__Page__Refs
+
+DEFAULT__PAGE_REFS_LRU__MAX_ENTRIES = 1024                                          # max number of cache_key -> page_refs mappings kept in memory
+DEFAULT__PAGE_REFS_LRU__TTL_SECONDS = 300                                           # how long (in seconds) a mapping is trusted before going back to the cache service
+
+
+class Proxy__Cache__Page_Refs__LRU(Type_Safe):                                      # Bounded, TTL-aware in-memory map of cache_key -> Schema__Cache__Page__Refs
+                                                                                    # (get and put copy the page_refs, so callers never share the stored instance)
+    max_entries : Safe_UInt   = Safe_UInt(DEFAULT__PAGE_REFS_LRU__MAX_ENTRIES)      # 0 disables the LRU
+    ttl_seconds : float       = float(DEFAULT__PAGE_REFS_LRU__TTL_SECONDS)          # 0 means entries never expire
+    entries     : OrderedDict                                                       # cache_key -> (stored_at, page_refs), oldest first
+    hits        : Safe_UInt                                                         # lookups served from memory
+    misses      : Safe_UInt                                                         # lookups that had to go to the cache service
+    evictions   : Safe_UInt                                                         # entries dropped because max_entries was reached
+    expirations : Safe_UInt                                                         # entries dropped because ttl_seconds had passed
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # guards entries and the counters (get moves entries, so even lookups write)
+
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, cache_key : str                                                   # Return cached page_refs (or None on miss/expiry)
+             ) -> Optional[Schema__Cache__Page__Refs]:
+        if not self.enabled():
+            return None
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, page_refs = entry
+            if self.is_expired(stored_at):
+                del self.entries[cache_key]
+                self.expirations += 1
+                self.misses      += 1
+                return None
+            self.entries.move_to_end(cache_key)                                     # mark as most recently used
+            self.hits += 1
+            return copy.copy(page_refs)                                             # fields are immutable primitives, so a shallow copy is enough
+
+    def put(self, cache_key : str                        ,                          # Store page_refs for cache_key (evicting the least recently used entry if full)
+                  page_refs : Schema__Cache__Page__Refs
+             ) -> None:
+        if not self.enabled():
+            return
+        with self.lock:
+            self.entries[cache_key] = (time.monotonic(), copy.copy(page_refs))
+            self.entries.move_to_end(cache_key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def remove(self, cache_key : str) -> bool:                                      # Drop a single entry (returns True if it existed)
+        with self.lock:
+            return self.entries.pop(cache_key, None) is not None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def is_expired(self, stored_at : float) -> bool:
+        if self.ttl_seconds <= 0:
+            return False
+        return (time.monotonic() - stored_at) > self.ttl_seconds
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "size"        : self.size()             ,
+                 "max_entries" : int(self.max_entries)   ,
+                 "ttl_seconds" : self.ttl_seconds        ,
+                 "hits"        : int(self.hits)          ,
+                 "misses"      : int(self.misses)        ,
+                 "evictions"   : int(self.evictions)     ,
+                 "expirations" : int(self.expirations)   }
@@ -0,0 +1,20 @@
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                               import Safe_Float
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                   import http_session_pool
+
+DEFAULT__PREWARM_FETCHER__TIMEOUT    = 30.0                                         # seconds
+DEFAULT__PREWARM_FETCHER__USER_AGENT = 'mgraph-ai-mitmproxy-prewarm/1.0'
+
+
+class Proxy__Cache__Prewarm__Fetcher(Type_Safe):                                    # Fetches the pages (and sitemaps) of a pre-warm job (subclass it to fetch from somewhere else, e.g. offline in tests)
+    timeout    : Safe_Float = Safe_Float(DEFAULT__PREWARM_FETCHER__TIMEOUT)
+    user_agent : str        = DEFAULT__PREWARM_FETCHER__USER_AGENT
+
+    def fetch(self, url : str                                                       # Body of url (None when the response is not a 200)
+               ) -> Optional[str]:
+        response = http_session_pool.get(url, headers = {'user-agent': self.user_agent},
+                                              timeout = float(self.timeout)            )
+        if response.status_code != 200:
+            return None
+        return response.text
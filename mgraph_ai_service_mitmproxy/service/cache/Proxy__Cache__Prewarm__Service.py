@@ -0,0 +1,127 @@
+import time
+import threading
+from concurrent.futures                                                                 import ThreadPoolExecutor
+from typing                                                                             import List, Optional
+from xml.etree                                                                          import ElementTree
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                                   import Safe_Float
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                    import Safe_UInt
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode           import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result      import Schema__HTML__Transformation__Result
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Prewarm__Fetcher           import Proxy__Cache__Prewarm__Fetcher
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Prewarm__State      import Enum__Cache__Prewarm__State
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Job      import Schema__Cache__Prewarm__Job
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Request  import Schema__Cache__Prewarm__Request
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service             import HTML__Transformation__Service
+
+DEFAULT__PREWARM__MAX_JOBS_KEPT     = 20                                            # finished jobs kept for the status endpoint
+DEFAULT__PREWARM__SITEMAP_MAX_DEPTH = 2                                             # sitemap index -> sitemap -> urls
+
+
+class Proxy__Cache__Prewarm__Service(Type_Safe):                                    # Background jobs that fetch pages and transform them, so the first visitor gets a cache hit
+    html_transformation_service : HTML__Transformation__Service = None              # Shared with the proxy's pipeline (same caches and single-flight)
+    fetcher                     : Proxy__Cache__Prewarm__Fetcher                    # Pluggable page fetcher
+    max_jobs_kept               : Safe_UInt = Safe_UInt(DEFAULT__PREWARM__MAX_JOBS_KEPT)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # job counters are updated from the worker threads
+        self.jobs = {}                                                              # job_id -> Schema__Cache__Prewarm__Job (oldest first)
+
+    def setup(self) -> 'Proxy__Cache__Prewarm__Service':
+        self.html_transformation_service = HTML__Transformation__Service().setup()
+        return self
+
+    def start(self, request : Schema__Cache__Prewarm__Request                       # Start a job in a background thread (returns straight away)
+               ) -> Schema__Cache__Prewarm__Job:
+        job    = self.new_job(request)
+        thread = threading.Thread(target=self.run, args=(job, request), daemon=True)
+        thread.start()
+        return job
+
+    def new_job(self, request : Schema__Cache__Prewarm__Request) -> Schema__Cache__Prewarm__Job:
+        job = Schema__Cache__Prewarm__Job(modes=list(request.modes) or [Enum__HTML__Transformation_Mode.XXX])
+        with self.lock:
+            self.jobs[str(job.job_id)] = job
+            while len(self.jobs) > self.max_jobs_kept:
+                self.jobs.pop(next(iter(self.jobs)))
+        return job
+
+    def run(self, job     : Schema__Cache__Prewarm__Job    ,                        # Process every url of the job (max_concurrency at a time)
+                  request : Schema__Cache__Prewarm__Request
+             ) -> Schema__Cache__Prewarm__Job:
+        start_time = time.time()
+        job.state  = Enum__Cache__Prewarm__State.RUNNING
+        try:
+            urls           = self.urls(request)
+            job.total_urls = len(urls)
+            max_workers    = max(1, min(int(request.max_concurrency), len(urls) or 1))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(lambda url: self.prewarm_url(job, url), urls))
+            job.state = Enum__Cache__Prewarm__State.COMPLETED
+        except Exception as error:
+            job.state      = Enum__Cache__Prewarm__State.FAILED
+            job.last_error = str(error)
+        job.duration_ms = Safe_Float((time.time() - start_time) * 1000)
+        return job
+
+    def prewarm_url(self, job : Schema__Cache__Prewarm__Job ,                       # Fetch one page and transform it in every mode of the job
+                          url : str
+                     ) -> None:
+        try:
+            html = self.fetcher.fetch(url)
+            if not html:
+                raise Exception(f"no content for {url}")
+            for mode in job.modes:
+                if not mode.is_active():                                            # nothing to cache
+                    continue
+                result = self.html_transformation_service._transform_html__single_flight(html, url, mode)   # not transform_html: a deferring service would only start the transformation and return
+                self.record_result(job, result)
+        except Exception as error:
+            with self.lock:
+                job.errors    += 1
+                job.last_error = str(error)
+        with self.lock:
+            job.pages_done += 1
+
+    def record_result(self, job    : Schema__Cache__Prewarm__Job          ,         # Count a (page, mode) result by what it left in the cache
+                            result : Schema__HTML__Transformation__Result
+                       ) -> None:
+        with self.lock:
+            if result.cache_hit:
+                job.cache_hits      += 1
+            elif result.transformation_pending:
+                job.pending         += 1
+            elif result.success:
+                job.transformations += 1
+            else:
+                job.not_transformed += 1
+
+    def urls(self, request : Schema__Cache__Prewarm__Request                        # Explicit urls + sitemap urls (de-duplicated and capped at max_urls)
+              ) -> List[str]:
+        urls = [str(url) for url in request.urls]
+        if request.sitemap_url:
+            urls.extend(self.sitemap_urls(str(request.sitemap_url)))
+        return list(dict.fromkeys(urls))[:int(request.max_urls)]
+
+    def sitemap_urls(self, sitemap_url : str ,                                      # <loc> urls of a sitemap (following sitemap indexes)
+                           depth       : int = 0
+                      ) -> List[str]:
+        content = self.fetcher.fetch(sitemap_url)
+        if not content:
+            raise Exception(f"could not fetch sitemap {sitemap_url}")
+        root = ElementTree.fromstring(content.encode() if isinstance(content, str) else content)
+        locs = [element.text.strip() for element in root.iter() if element.tag.endswith('loc') and element.text]
+        if not root.tag.endswith('sitemapindex'):
+            return locs
+        urls = []
+        if depth < DEFAULT__PREWARM__SITEMAP_MAX_DEPTH:
+            for child_sitemap_url in locs:
+                urls.extend(self.sitemap_urls(child_sitemap_url, depth + 1))
+        return urls
+
+    def job(self, job_id : str) -> Optional[Schema__Cache__Prewarm__Job]:
+        return self.jobs.get(str(job_id))
+
+    def jobs_status(self) -> List[Schema__Cache__Prewarm__Job]:                     # newest first
+        return list(reversed(list(self.jobs.values())))
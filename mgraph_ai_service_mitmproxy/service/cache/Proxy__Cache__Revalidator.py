@@ -0,0 +1,60 @@
+import threading
+from typing                                                                         import Any, Callable, Hashable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+
+class Proxy__Cache__Revalidator(Type_Safe):                                         # Runs background refreshes of stale cache entries (at most one per key at a time)
+    started   : Safe_UInt                                                           # refreshes started
+    completed : Safe_UInt                                                           # refreshes that finished without error
+    failed    : Safe_UInt                                                           # refreshes that raised
+    skipped   : Safe_UInt                                                           # requests for a key that was already being refreshed
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock        = threading.Lock()                                         # makes submit's check-then-add on in_progress atomic, and guards threads and the counters:
+                                                                                    # submit is called from route threads, run's bookkeeping from each background thread
+        self.in_progress = set()                                                    # keys being refreshed
+        self.threads     = set()                                                    # running refresh threads (see wait)
+
+    def submit(self, key    : Hashable       ,                                      # Refresh key in a daemon thread (returns False if it was already being refreshed)
+                     target : Callable[[], Any]
+                ) -> bool:
+        with self.lock:
+            if key in self.in_progress:
+                self.skipped += 1
+                return False
+            self.in_progress.add(key)
+            self.started += 1
+        thread = threading.Thread(target=self.run, args=(key, target), daemon=True)
+        with self.lock:
+            self.threads.add(thread)
+        thread.start()
+        return True
+
+    def run(self, key    : Hashable       ,
+                  target : Callable[[], Any]
+             ) -> None:
+        try:
+            target()
+            with self.lock:
+                self.completed += 1
+        except Exception as error:
+            print(f"    ⚠️  Revalidation error for {key}: {error}")
+            with self.lock:
+                self.failed += 1
+        finally:
+            with self.lock:
+                self.in_progress.discard(key)
+                self.threads.discard(threading.current_thread())
+
+    def wait(self, timeout : float = None) -> None:                                 # Wait for the running refreshes (used by tests and on shutdown)
+        for thread in list(self.threads):
+            thread.join(timeout)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "started"     : int(self.started  ) ,
+                 "completed"   : int(self.completed) ,
+                 "failed"      : int(self.failed   ) ,
+                 "skipped"     : int(self.skipped  ) ,
+                 "in_progress" : len(self.in_progress) }
@@ -0,0 +1,48 @@
+import asyncio
+from typing                                                                         import Any, Awaitable, Callable, Hashable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+
+class Proxy__Cache__Revalidator__Async(Type_Safe):                                  # Async version of Proxy__Cache__Revalidator (refreshes run as event loop tasks)
+    started   : Safe_UInt
+    completed : Safe_UInt
+    failed    : Safe_UInt
+    skipped   : Safe_UInt
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tasks = {}                                                             # key -> asyncio.Task (all access happens on the event loop, so no lock is needed)
+
+    def submit(self, key    : Hashable                     ,                        # Refresh key in a background task (returns False if it was already being refreshed)
+                     target : Callable[[], Awaitable[Any]]
+                ) -> bool:
+        if key in self.tasks:
+            self.skipped += 1
+            return False
+        self.started   += 1
+        self.tasks[key] = asyncio.get_running_loop().create_task(self.run(key, target))    # the reference kept in self.tasks stops the task being garbage collected
+        return True
+
+    async def run(self, key    : Hashable                     ,
+                        target : Callable[[], Awaitable[Any]]
+                   ) -> None:
+        try:
+            await target()
+            self.completed += 1
+        except Exception as error:
+            print(f"    ⚠️  Revalidation error for {key}: {error}")
+            self.failed += 1
+        finally:
+            self.tasks.pop(key, None)
+
+    async def wait(self) -> None:                                                   # Wait for the running refreshes (used by tests and on shutdown)
+        if self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "started"     : int(self.started  ) ,
+                 "completed"   : int(self.completed) ,
+                 "failed"      : int(self.failed   ) ,
+                 "skipped"     : int(self.skipped  ) ,
+                 "in_progress" : len(self.tasks)     }
@@ -13,24 +13,36 @@ from osbot_utils.type_safe.type_safe_core.decorators.type_safe
 from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client               import Service__Fast_API__Client
 from mgraph_ai_service_cache_client.schemas.cache.enums.Enum__Cache__Store__Strategy        import Enum__Cache__Store__Strategy
 from osbot_utils.utils.Env                                                                  import get_env
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Page_Refs__LRU                import Proxy__Cache__Page_Refs__LRU
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Compression                   import Proxy__Cache__Compression
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Freshness                     import Proxy__Cache__Freshness
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Compression            import Enum__Cache__Compression
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Transformation_Type     import Enum__Cache__Transformation_Type
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config                import Schema__Cache__Config
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Entry           import Schema__Cache__Page__Entry
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Content__Entry        import Schema__Cache__Content__Entry
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs            import Schema__Cache__Page__Refs
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Stats                 import Schema__Cache__Stats
 from mgraph_ai_service_mitmproxy.service.cache.schemas.safe_str.Safe_Str__Proxy__Cache_Key  import Safe_Str__Proxy__Cache_Key
-from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                               import ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_NAME, ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__BASE_URL
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                               import ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_NAME, ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__BASE_URL, ENV_VAR__CACHE_SERVICE__COMPRESSION
 
-DEFAULT__TEXT__CACHE_NOT_FOUND = ''                             # this used to be 'Not found' # todo see if we still need this DEFAULT__TEXT__CACHE_NOT_FOUND variable
-PAGE_ENTRY__JSON_FIELD_PATH    = 'cache_key'
+DEFAULT__TEXT__CACHE_NOT_FOUND  = ''                            # this used to be 'Not found' # todo see if we still need this DEFAULT__TEXT__CACHE_NOT_FOUND variable
+PAGE_ENTRY__JSON_FIELD_PATH     = 'cache_key'
+CONTENT_ENTRY__CACHE_KEY_PREFIX = 'contents'                    # content-addressed entries live at contents/{content_hash}
 
 class Proxy__Cache__Service(Type_Safe):                         # Cache service for WCF transformations
     cache_client      : Service__Fast_API__Client   = None      # Cache service client (Service__Fast_API__Client)
     cache_config      : Schema__Cache__Config       = None      # Configuration
     stats             : Schema__Cache__Stats                    # Cache statistics
+    page_refs_cache   : Proxy__Cache__Page_Refs__LRU            # In-memory cache_key -> page_refs map (saves cache service round trips)
+    compression       : Proxy__Cache__Compression               # Compression of the html (and transformations) sent to the cache service
+    freshness         : Proxy__Cache__Freshness                 # In-memory cached_at/ttl of the cached transformations (so a cache hit is one read)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        if self.cache_config:
+            self.setup__page_refs_cache()
+            self.setup__compression()
 
 
     def setup(self):
@@ -57,9 +69,70 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
 
         self.cache_config    = Schema__Cache__Config            (**auth__kwargs, enabled=cache_enabled)
         self.cache_client    = Service__Fast_API__Client        (config=cache_client__config)
+        compression          = self.compression_format__from_env()
+        if compression:
+            self.cache_config.compression = compression
+        self.setup__page_refs_cache()
+        self.setup__compression()
 
         return self
 
+    def setup__page_refs_cache(self):
+        self.page_refs_cache = Proxy__Cache__Page_Refs__LRU(max_entries = self.cache_config.page_refs_cache_size        ,
+                                                            ttl_seconds = float(self.cache_config.page_refs_cache_ttl))
+        return self
+
+
+    def setup__compression(self):
+        self.compression = Proxy__Cache__Compression(format   = self.cache_config.compression         ,
+                                                     min_size = self.cache_config.compression_min_size)
+        return self
+
+    def compression_format__from_env(self) -> Optional[Enum__Cache__Compression]:     # CACHE_SERVICE__COMPRESSION__{NAMESPACE} (e.g. __WCF_RESULTS), then CACHE_SERVICE__COMPRESSION for all namespaces
+        namespace__env_var = f"{ENV_VAR__CACHE_SERVICE__COMPRESSION}__{str(self.cache_config.namespace).upper().replace('-', '_')}"
+        compression        = get_env(namespace__env_var) or get_env(ENV_VAR__CACHE_SERVICE__COMPRESSION)
+        if compression:
+            return Enum__Cache__Compression(compression)
+        return None
+
+    def store_string(self, cache_id     : str ,                                                # Store a child data string (compressed, see Proxy__Cache__Compression)
+                           data_key     : str ,
+                           data_file_id : str ,
+                           body         : str
+                      ) -> None:
+        self.cache_client.data_store().data__store_string__with__id_and_key(body         = self.compress(body)          ,
+                                                                            cache_id     = cache_id                     ,
+                                                                            data_key     = data_key                     ,
+                                                                            data_file_id = data_file_id                 ,
+                                                                            namespace    = self.cache_config.namespace  )
+
+    def compress(self, body : str) -> str:                                                  # Compressed with the format and min size of this namespace's config
+        return self.compression.compress(body                                                        ,
+                                         compression_format = self.cache_config.compression               ,
+                                         min_size           = int(self.cache_config.compression_min_size) )
+
+    def retrieve_string(self, cache_id     : str ,                                             # Retrieve a child data string (decompressed when it was stored compressed)
+                              data_key     : str ,
+                              data_file_id : str
+                         ):
+        return self.compression.decompress(self.retrieve_stored(cache_id, data_key, data_file_id))
+
+    # todo: refactor tuple with Type_Safe class
+    def retrieve_string__with_gzip(self, cache_id     : str ,                                  # Retrieve a child data string, and its gzip bytes when it was stored as gzip
+                                         data_key     : str ,                                  # (so responses can be sent gzip encoded without compressing them again)
+                                         data_file_id : str
+                                    ) -> tuple:                                                # (text, gzip bytes or None)
+        stored = self.retrieve_stored(cache_id, data_key, data_file_id)
+        return self.compression.decompress(stored), self.compression.gzip_payload(stored)
+
+    def retrieve_stored(self, cache_id     : str ,                                             # Child data string as stored (compressed values keep their marker)
+                              data_key     : str ,
+                              data_file_id : str
+                         ):
+        return self.cache_client.data().retrieve().data__string__with__id_and_key(cache_id     = cache_id                   ,
+                                                                                  data_key     = data_key                   ,
+                                                                                  data_file_id = data_file_id               ,
+                                                                                  namespace    = self.cache_config.namespace)
 
     def url_to_cache_key(self, target_url : str                                         # Convert URL to hierarchical cache_key
                           ) -> Safe_Str__Proxy__Cache_Key:                              # Hierarchical cache_key
@@ -100,10 +173,56 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
     def get_or_create_page_entry(self, target_url : Safe_Str__Url                           # Get existing page cache_id or create new page entry
                                   ) -> Schema__Cache__Page__Refs:                           # cache_id for the page
 
+        cache_key   = self.url_to_cache_key(target_url)
+        cached_refs = self.page_refs_cache.get(cache_key)                                          # in-memory hit means no round trip to the cache service
+        if cached_refs:
+            return cached_refs
+
+        parsed     = urlparse(target_url)
+        page_entry = Schema__Cache__Page__Entry(url           = target_url,
+                                                cache_key     = cache_key,
+                                                domain        = parsed.netloc,
+                                                path          = parsed.path,
+                                                access_count  = 1)
+        page_refs, created = self.get_or_create_entry(cache_key, page_entry.json())
+
+        if created and self.cache_config.track_stats:                           # Update stats (only if this is a new page)
+            self.stats.total_pages_cached += 1
+
+        return page_refs
+
+    def content_hash(self, source_html : str                                                # Hash of the source html (the content-addressed key)
+                      ) -> Safe_Str__Cache_Hash:
+        return Cache__Hash__Generator().from_string(source_html)
+
+    def content_to_cache_key(self, content_hash : str                                       # cache_key of a content entry
+                              ) -> Safe_Str__Proxy__Cache_Key:
+        return Safe_Str__Proxy__Cache_Key(f"{CONTENT_ENTRY__CACHE_KEY_PREFIX}/{content_hash}")
+
+    def get_or_create_content_entry(self, content_hash : str                                # Get (or create) the entry that holds the transformations of one html content
+                                     ) -> Schema__Cache__Page__Refs:
+        cache_key   = self.content_to_cache_key(content_hash)
+        cached_refs = self.page_refs_cache.get(cache_key)
+        if cached_refs:
+            return cached_refs
+
+        content_entry      = Schema__Cache__Content__Entry(cache_key    = cache_key   ,
+                                                           content_hash = content_hash)
+        content_refs, created = self.get_or_create_entry(cache_key, content_entry.json())
+
+        if created and self.cache_config.track_stats:
+            self.stats.total_contents_cached += 1
+
+        return content_refs
+
+    # todo: refactor tuple with Type_Safe class
+    def get_or_create_entry(self, cache_key  : str ,                                        # Get (or create) the cache entry for cache_key
+                                  entry_body : dict                                         # json stored when the entry doesn't exist yet
+                             ) -> tuple:                                                    # (page_refs, created)
         json_field_path = PAGE_ENTRY__JSON_FIELD_PATH
-        cache_key       = self.url_to_cache_key(target_url)
         page_refs       = Schema__Cache__Page__Refs(cache_key       = cache_key      ,
                                                     json_field_path = json_field_path)
+
         cache_hash = Cache__Hash__Generator().from_string(cache_key)                                    # todo review the dependency of importing a class from mgraph_ai_service_cache (and if we shouldn't move this Cache__Hash__Generator to the mgraph_ai_service_cache_client project)
 
         page_entry = self.get_page_entry__via__cache_hash(cache_hash = cache_hash)
@@ -111,20 +230,14 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
         if page_entry:          # means the cache_hash was found
             page_refs.cache_id   = page_entry.get('cache_id')
             page_refs.cache_hash = cache_hash
-            return page_refs
-
+            self.page_refs_cache.put(cache_key, page_refs)
+            return page_refs, False
 
-        parsed       = urlparse(target_url)
-        page_entry   = Schema__Cache__Page__Entry(url           = target_url,
-                                                  cache_key     = cache_key,
-                                                  domain        = parsed.netloc,
-                                                  path          = parsed.path,
-                                                  access_count  = 1)
         store_kwargs = dict(namespace       = self.cache_config.namespace            ,
                             strategy         = Enum__Cache__Store__Strategy.KEY_BASED,
                             cache_key        = cache_key                             ,
                             file_id          = "page-entry"                          ,  # Fixed file_id for page entries
-                            body             = page_entry.json()                     ,
+                            body             = entry_body                            ,
                             json_field_path  = json_field_path                       )
 
         result               = self.cache_client.store().store__json__cache_key(**store_kwargs)
@@ -132,11 +245,8 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
             raise Exception(f"Error in get_or_create_page_entry:  {result.get('message')}")     # todo: find a better way and location to catch these errors (which usually happen when the API key is not set)
         page_refs.cache_id   = result.get("cache_id")
         page_refs.cache_hash = result.get("cache_hash")
-
-        if self.cache_config.track_stats:                                       # Update stats (only if this is a new page)
-            self.stats.total_pages_cached += 1
-
-        return page_refs
+        self.page_refs_cache.put(cache_key, page_refs)
+        return page_refs, True
 
 
     def page_exists(self, target_url : str                      # Check if page exists in cache
@@ -160,10 +270,9 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
         data_key = self._wcf_command_to_data_key(wcf_command)               # Get transformation data
 
 
-        transformation = self.cache_client.data().retrieve().data__string__with__id_and_key(cache_id     = cache_id,
-                                                                                            namespace    = self.cache_config.namespace,
-                                                                                            data_key     = data_key,
-                                                                                            data_file_id = self.cache_config.data_file_id)
+        transformation = self.retrieve_string(cache_id     = cache_id                     ,
+                                              data_key     = data_key                     ,
+                                              data_file_id = self.cache_config.data_file_id)
         if transformation == DEFAULT__TEXT__CACHE_NOT_FOUND:                    # check if we got a Not found (aka 404) error
             return None
 
@@ -185,11 +294,10 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
         data_key  = self._wcf_command_to_data_key(wcf_command)       # Convert WCF command to data_key
 
         # Store transformation content as child data
-        self.cache_client.data_store().data__store_string__with__id_and_key(cache_id     = cache_id                     ,
-                                                                            namespace    = self.cache_config.namespace  ,
-                                                                            data_key     = data_key                      ,
-                                                                            data_file_id = self.cache_config.data_file_id,
-                                                                            body         = content                       )
+        self.store_string(cache_id     = cache_id                     ,
+                          data_key     = data_key                     ,
+                          data_file_id = self.cache_config.data_file_id,
+                          body         = content                      )
 
         if self.cache_config.cache_metadata:                                # Store metadata (optional, if enabled)
             metadata_key = f"{data_key}/metadata"
@@ -230,10 +338,13 @@ class Proxy__Cache__Service(Type_Safe):                         # Cache service
                  "cache_misses"                 : self.stats.cache_misses,
                  "wcf_calls_saved"              : self.stats.wcf_calls_saved,
                  "total_pages_cached"           : self.stats.total_pages_cached,
+                 "total_contents_cached"        : self.stats.total_contents_cached,
                  "avg_cache_hit_time_ms"        : self.stats.avg_cache_hit_time_ms,
                  "avg_cache_miss_time_ms"       : self.stats.avg_cache_miss_time_ms,
                  "avg_wcf_call_time_ms"         : self.stats.avg_wcf_call_time_ms,
-                 "estimated_time_saved_seconds" : self.stats.estimated_time_saved_seconds() }
+                 "estimated_time_saved_seconds" : self.stats.estimated_time_saved_seconds(),
+                 "page_refs_cache"              : self.page_refs_cache.stats()            ,
+                 "compression"                  : self.compression.stats()                }
 
     def _wcf_command_to_data_key(self, wcf_command : str        # Convert WCF command to data_key path
                                    ) -> str:                    # data_key path
@@ -0,0 +1,79 @@
+import asyncio
+from typing                                                                                 import Optional
+from osbot_utils.type_safe.Type_Safe                                                        import Type_Safe
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Url                    import Safe_Str__Url
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                        import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs            import Schema__Cache__Page__Refs
+
+
+class Proxy__Cache__Service__Async(Type_Safe):                                              # Async facade over Proxy__Cache__Service
+    cache_service : Proxy__Cache__Service = None                                            # the cache client is sync, so its calls are moved off the event loop
+
+    def setup(self) -> 'Proxy__Cache__Service__Async':
+        self.cache_service = Proxy__Cache__Service().setup()
+        return self
+
+    def enabled(self) -> bool:
+        return bool(self.cache_service and self.cache_service.cache_config.enabled)
+
+    def namespace(self):
+        return self.cache_service.cache_config.namespace
+
+    async def get_or_create_page_entry(self, target_url : Safe_Str__Url                    # Get (or create) page refs without blocking the event loop
+                                        ) -> Schema__Cache__Page__Refs:
+        cache_key   = self.cache_service.url_to_cache_key(target_url)
+        cached_refs = self.cache_service.page_refs_cache.get(cache_key)                     # in-memory hit doesn't need a worker thread
+        if cached_refs:
+            return cached_refs
+        return await asyncio.to_thread(self.cache_service.get_or_create_page_entry, target_url)
+
+    def content_hash(self, source_html : str) -> Optional[str]:                             # cpu only (no round trip), so it stays on the event loop
+        if self.cache_service:
+            return self.cache_service.content_hash(source_html)
+        return None
+
+    async def get_or_create_content_entry(self, content_hash : str                          # Get (or create) the content-addressed entry without blocking the event loop
+                                           ) -> Schema__Cache__Page__Refs:
+        cache_key   = self.cache_service.content_to_cache_key(content_hash)
+        cached_refs = self.cache_service.page_refs_cache.get(cache_key)
+        if cached_refs:
+            return cached_refs
+        return await asyncio.to_thread(self.cache_service.get_or_create_content_entry, content_hash)
+
+    async def retrieve_string(self, cache_id     : str ,                                    # Retrieve a child data string (returns '' when not found, decompressed when it was stored compressed)
+                                    data_key     : str ,
+                                    data_file_id : str
+                               ) -> str:
+        return await asyncio.to_thread(self.cache_service.retrieve_string,                  # decompression is cpu work, so it also stays off the event loop
+                                       cache_id     = cache_id        ,
+                                       data_key     = data_key        ,
+                                       data_file_id = data_file_id    )
+
+    async def retrieve_string__with_gzip(self, cache_id     : str ,                         # Retrieve a child data string, and its gzip bytes when it was stored as gzip
+                                               data_key     : str ,
+                                               data_file_id : str
+                                          ) -> tuple:                                       # (text, gzip bytes or None)
+        return await asyncio.to_thread(self.cache_service.retrieve_string__with_gzip,
+                                       cache_id     = cache_id        ,
+                                       data_key     = data_key        ,
+                                       data_file_id = data_file_id    )
+
+    async def store_string(self, cache_id     : str ,                                       # Store a child data string (compressed, see Proxy__Cache__Compression)
+                                 data_key     : str ,
+                                 data_file_id : str ,
+                                 body         : str
+                            ) -> None:
+        await asyncio.to_thread(self.cache_service.store_string,
+                                body         = body            ,
+                                cache_id     = cache_id        ,
+                                data_key     = data_key        ,
+                                data_file_id = data_file_id    )
+
+    def increment_cache_hit(self):
+        self.cache_service.increment_cache_hit()
+
+    def increment_cache_miss(self):
+        self.cache_service.increment_cache_miss()
+
+    def get_cache_stats(self) -> dict:
+        return self.cache_service.get_cache_stats()
@@ -0,0 +1,70 @@
+import time
+import threading
+from typing                                                                         import Hashable, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+DEFAULT__NEGATIVE_CACHE__BASE_BACKOFF = 5                                           # seconds a key is skipped after its first failure
+DEFAULT__NEGATIVE_CACHE__MAX_BACKOFF  = 300                                         # backoff doubles on each consecutive failure, up to this
+DEFAULT__NEGATIVE_CACHE__MAX_ENTRIES  = 10000                                       # failing keys remembered (oldest dropped first)
+
+
+class Proxy__Negative__Cache__Entry:                                                # Failure state of one key
+    def __init__(self):
+        self.failures   = 0
+        self.retry_at   = 0.0                                                       # time.monotonic() after which the key is tried again
+        self.last_error = ''
+
+
+class Proxy__Negative__Cache(Type_Safe):                                            # Remembers recent failures (per key) so they are not retried, with their full timeouts, on every request
+    base_backoff_seconds : Safe_UInt = Safe_UInt(DEFAULT__NEGATIVE_CACHE__BASE_BACKOFF)     # 0 disables the negative cache
+    max_backoff_seconds  : Safe_UInt = Safe_UInt(DEFAULT__NEGATIVE_CACHE__MAX_BACKOFF )
+    max_entries          : Safe_UInt = Safe_UInt(DEFAULT__NEGATIVE_CACHE__MAX_ENTRIES )
+    short_circuits       : Safe_UInt                                                # requests answered from the negative cache
+    failures             : Safe_UInt                                                # failures recorded
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock    = threading.Lock()                                             # makes record_failure's read-modify-write of an entry atomic, and guards the eviction order and the counters
+                                                                                    # (shared by the sync and async transformation services, so used from route threads and the event loop)
+        self.entries = {}                                                           # key -> Proxy__Negative__Cache__Entry (oldest first)
+
+    def enabled(self) -> bool:
+        return self.base_backoff_seconds > 0
+
+    def is_blocked(self, key : Hashable) -> bool:                                   # True while key is backing off (the caller should skip the work)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.monotonic() >= entry.retry_at:
+                return False
+            self.short_circuits += 1
+            return True
+
+    def record_failure(self, key   : Hashable ,                                     # Back off key for base * 2^(failures-1) seconds (capped at max_backoff_seconds)
+                             error : str = ''
+                        ) -> float:                                                 # seconds until the key is tried again
+        if not self.enabled():
+            return 0.0
+        with self.lock:
+            entry = self.entries.pop(key, None) or Proxy__Negative__Cache__Entry()
+            entry.failures  += 1
+            entry.last_error = str(error)
+            backoff          = min(int(self.base_backoff_seconds) * 2 ** (entry.failures - 1), int(self.max_backoff_seconds))
+            entry.retry_at   = time.monotonic() + backoff
+            self.entries[key] = entry                                               # re-inserted, so the dict stays ordered by last failure
+            self.failures    += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+            return float(backoff)
+
+    def record_success(self, key : Hashable) -> None:                               # A success clears the key's backoff
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def entry(self, key : Hashable) -> Optional[Proxy__Negative__Cache__Entry]:
+        return self.entries.get(key)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "failing_keys"   : len(self.entries)        ,
+                 "failures"       : int(self.failures      ) ,
+                 "short_circuits" : int(self.short_circuits) }
@@ -0,0 +1,57 @@
+import threading
+from collections                                                                    import OrderedDict
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+DEFAULT__ORIGINAL_HTML_DEDUP__MAX_ENTRIES = 10000                                   # urls whose last stored original html hash is remembered
+
+
+class Proxy__Original_Html__Dedup(Type_Safe):                                       # Remembers the hash of the original html last stored per url, so unchanged pages are not uploaded again
+    max_entries   : Safe_UInt = Safe_UInt(DEFAULT__ORIGINAL_HTML_DEDUP__MAX_ENTRIES)    # 0 disables the dedup (every page is uploaded)
+    stored        : Safe_UInt                                                       # uploads started
+    skipped       : Safe_UInt                                                       # uploads avoided (same html as the last one stored for the url)
+    bytes_stored  : Safe_UInt                                                       # bytes of original html uploaded
+    bytes_avoided : Safe_UInt                                                       # bytes of original html not uploaded again
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock   = threading.Lock()                                              # makes should_store's compare-and-record atomic (so two responses with the same html start one upload) and guards the counters;
+                                                                                    # forget is called from the upload threads
+        self.hashes = OrderedDict()                                                 # cache_key -> content_hash of the html stored (least recently used first)
+
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def should_store(self, cache_key    : str ,                                     # True (and recorded as stored) when cache_key's html changed since it was last stored
+                           content_hash : str ,
+                           size         : int
+                      ) -> bool:
+        with self.lock:
+            if self.enabled() and self.hashes.get(cache_key) == content_hash:
+                self.hashes.move_to_end(cache_key)
+                self.skipped       += 1
+                self.bytes_avoided += size
+                return False
+            self.stored       += 1
+            self.bytes_stored += size
+            if self.enabled():
+                self.hashes[cache_key] = content_hash
+                self.hashes.move_to_end(cache_key)
+                while len(self.hashes) > self.max_entries:
+                    self.hashes.popitem(last=False)
+            return True
+
+    def forget(self, cache_key : str) -> None:                                      # The upload didn't happen (so the next response for the url stores it)
+        with self.lock:
+            self.hashes.pop(cache_key, None)
+
+    def content_hash(self, cache_key : str) -> Optional[str]:
+        return self.hashes.get(cache_key)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "urls"          : len(self.hashes)        ,
+                 "stored"        : int(self.stored       ) ,
+                 "skipped"       : int(self.skipped      ) ,
+                 "bytes_stored"  : int(self.bytes_stored ) ,
+                 "bytes_avoided" : int(self.bytes_avoided) }
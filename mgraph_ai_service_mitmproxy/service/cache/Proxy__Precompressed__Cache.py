@@ -0,0 +1,52 @@
+import hashlib
+import threading
+from typing                                                                         import Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+DEFAULT__PRECOMPRESSED_CACHE__MAX_ENTRIES = 256                                     # compressed variants kept in memory (oldest dropped first)
+
+
+class Proxy__Precompressed__Cache(Type_Safe):                                       # Compressed variants (gzip, br) of transformed bodies, so a body that is served again is not compressed again
+    max_entries : Safe_UInt = Safe_UInt(DEFAULT__PRECOMPRESSED_CACHE__MAX_ENTRIES)  # 0 disables the cache
+    hits        : Safe_UInt                                                         # variants served from memory
+    misses      : Safe_UInt                                                         # lookups that had to compress
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock    = threading.Lock()                                             # used from the request and background threads
+        self.entries = {}                                                           # (body_key, encoding) -> compressed bytes (oldest first)
+
+    def body_key(self, body : bytes) -> str:                                        # Identity of a body (same bytes, same variants)
+        return hashlib.md5(body).hexdigest()
+
+    def get(self, body_key : str ,
+                  encoding : str
+             ) -> Optional[bytes]:
+        with self.lock:
+            data = self.entries.pop((body_key, encoding), None)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries[(body_key, encoding)] = data                               # re-inserted, so the dict stays ordered by last use
+            self.hits += 1
+            return data
+
+    def put(self, body_key : str   ,
+                  encoding : str   ,
+                  data     : bytes
+             ) -> None:
+        if not self.max_entries:
+            return
+        with self.lock:
+            self.entries.pop((body_key, encoding), None)
+            self.entries[(body_key, encoding)] = data
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        with self.lock:
+            return { "entries" : len(self.entries)                                ,
+                     "bytes"   : sum(len(data) for data in self.entries.values()) ,
+                     "hits"    : int(self.hits  )                                 ,
+                     "misses"  : int(self.misses)                                 }
@@ -0,0 +1,87 @@
+import threading
+from typing                                                                         import Any, Callable, Hashable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+
+
+class Proxy__Single_Flight__Call:                                                   # One in-flight call (shared by the leader and all its followers)
+    def __init__(self):
+        self.done      = threading.Event()
+        self.result    = None
+        self.error     = None
+        self.lock      = threading.Lock()
+        self.callbacks = []                                                         # run once the call is done (how followers on an event loop are woken up)
+
+    def add_done_callback(self, callback : Callable[['Proxy__Single_Flight__Call'], None]) -> None:
+        with self.lock:
+            if not self.done.is_set():
+                self.callbacks.append(callback)
+                return
+        callback(self)                                                              # already done
+
+    def set_done(self) -> None:
+        with self.lock:
+            self.done.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class Proxy__Single_Flight(Type_Safe):                                              # Coalesces concurrent calls with the same key into one execution
+    leaders   : Safe_UInt                                                           # calls that executed the target
+    followers : Safe_UInt                                                           # calls that waited for (and shared) a leader's result
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock  = threading.Lock()                                               # makes join (check then insert) and finish atomic, and guards the counters: keys are joined from
+                                                                                    # route threads, background executors and (via Proxy__Single_Flight__Async) the event loop
+        self.calls = {}                                                             # key -> Proxy__Single_Flight__Call
+
+    def join(self, key : Hashable) -> tuple:                                        # (call, is_leader): the call in flight for key, or a new one this caller must run (and finish)
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                return call, False
+            call            = Proxy__Single_Flight__Call()
+            self.calls[key] = call
+            return call, True
+
+    def finish(self, key  : Hashable                   ,                            # Called by the leader once call.result (or call.error) is set
+                     call : Proxy__Single_Flight__Call
+                ) -> None:
+        with self.lock:
+            self.calls.pop(key, None)                                               # the next call for this key starts a new flight (and will usually hit the cache)
+        call.set_done()
+
+    def do(self, key    : Hashable       ,                                          # Run target once per key, concurrent callers get the same result (or exception)
+                 target : Callable[[], Any]
+            ) -> Any:
+        call, is_leader = self.join(key)
+        with self.lock:
+            if is_leader:
+                self.leaders   += 1
+            else:
+                self.followers += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = target()
+            return call.result
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            self.finish(key, call)
+
+    def in_flight(self) -> int:
+        return len(self.calls)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "leaders"   : int(self.leaders   ) ,
+                 "followers" : int(self.followers ) ,
+                 "in_flight" : self.in_flight()     }
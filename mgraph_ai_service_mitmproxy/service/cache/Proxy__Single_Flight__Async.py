@@ -0,0 +1,59 @@
+import asyncio
+from typing                                                                         import Any, Awaitable, Callable, Hashable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight                 import Proxy__Single_Flight, Proxy__Single_Flight__Call
+
+
+class Proxy__Single_Flight__Async(Type_Safe):                                       # Async version of Proxy__Single_Flight (followers await the leader's call without blocking the event loop)
+    flights   : Proxy__Single_Flight                                                # calls in flight (pass the sync pipeline's, so both pipelines coalesce on the same keys)
+    leaders   : Safe_UInt                                                           # calls that executed the target
+    followers : Safe_UInt                                                           # calls that awaited (and shared) a leader's result
+
+    async def do(self, key    : Hashable                      ,                     # Run target once per key, concurrent callers get the same result (or exception)
+                       target : Callable[[], Awaitable[Any]]
+                  ) -> Any:
+        call, is_leader = self.flights.join(key)
+        if not is_leader:
+            self.followers += 1
+            return await self.wait(call)
+
+        self.leaders += 1
+        try:
+            call.result = await target()
+            return call.result
+        except Exception as error:
+            call.error = error
+            raise
+        except asyncio.CancelledError as error:                                     # leader was cancelled, so its followers are too
+            call.error = error
+            raise
+        finally:
+            self.flights.finish(key, call)
+
+    async def wait(self, call : Proxy__Single_Flight__Call) -> Any:                 # Await a call led by another task (or by a thread of the sync pipeline)
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        call.add_done_callback(lambda done_call: loop.call_soon_threadsafe(self.resolve, future, done_call))
+        return await asyncio.shield(future)                                         # a cancelled follower must not cancel the leader's call
+
+    def resolve(self, future : asyncio.Future              ,
+                      call   : Proxy__Single_Flight__Call
+                 ) -> None:
+        if future.done():
+            return
+        if isinstance(call.error, asyncio.CancelledError):
+            future.cancel()
+        elif call.error is not None:
+            future.set_exception(call.error)
+            future.exception()                                                      # mark as retrieved (the follower might have been cancelled)
+        else:
+            future.set_result(call.result)
+
+    def in_flight(self) -> int:
+        return self.flights.in_flight()
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "leaders"   : int(self.leaders   ) ,
+                 "followers" : int(self.followers ) ,
+                 "in_flight" : self.in_flight()     }
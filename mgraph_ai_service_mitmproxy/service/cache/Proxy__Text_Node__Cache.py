@@ -0,0 +1,184 @@
+import threading
+from collections                                                                    import OrderedDict
+from typing                                                                         import Any, Callable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from osbot_utils.utils.Json                                                         import json_dumps, json_loads
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Revalidator            import Proxy__Cache__Revalidator
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                import Proxy__Cache__Service, DEFAULT__TEXT__CACHE_NOT_FOUND
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                        import NAME__CIRCUIT_BREAKER__CACHE_SERVICE
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers               import circuit_breakers
+
+DEFAULT__TEXT_NODE_CACHE__MAX_ENTRIES = 50000                                       # max (profile, text_hash) -> transformed text mappings kept in memory
+TEXT_NODE_CACHE__CACHE_KEY_PREFIX     = 'text-nodes'                                # cache service entries live at text-nodes/{profile}
+TEXT_NODE_CACHE__DATA_KEY             = 'transformed-mapping'
+TEXT_NODE_CACHE__SHARD_FILE_ID_PREFIX = 'shard'                                     # entries are stored in data files shard-{first char of text_hash}
+TEXT_NODE_CACHE__SHARD_PREFIX_LENGTH  = 1
+TEXT_NODE_CACHE__SHARDS               = 16                                          # text hashes are hex, so one char gives 16 shards
+
+
+class Proxy__Text_Node__Cache(Type_Safe):                                           # Bounded map of (profile, text_hash) -> transformed text, so repeated text nodes (nav, footers, boilerplate) are only classified once
+    max_entries   : Safe_UInt             = Safe_UInt(DEFAULT__TEXT_NODE_CACHE__MAX_ENTRIES)  # 0 disables the cache
+    cache_service : Proxy__Cache__Service = None                                    # Optional backing store (entries survive restarts and are shared between proxies)
+    entries       : OrderedDict                                                     # (profile, text_hash) -> transformed text, oldest first
+    hits          : Safe_UInt                                                       # text nodes served from the cache
+    misses        : Safe_UInt                                                       # text nodes that had to be sent to the semantic-text service
+    evictions     : Safe_UInt                                                       # entries dropped because max_entries was reached
+    flushes       : Proxy__Cache__Revalidator                                       # background writes of new entries to the backing store
+    flush_count   : Safe_UInt
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock          = threading.Lock()                                       # guards entries, the counters and the backing store bookkeeping below: split and update run on
+                                                                                    # route threads, the deadline executor and (from the async service) asyncio.to_thread, flushes on their own thread
+        self.loaded_shards = {}                                                     # profile -> shards already loaded from the backing store
+        self.pending       = {}                                                     # profile -> {text_hash: text} not yet written to the backing store
+        self.flushing      = set()                                                  # profiles with a flush running
+
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def backing_enabled(self) -> bool:
+        return bool(self.cache_service and self.cache_service.cache_config and self.cache_service.cache_config.enabled)
+
+    # todo: refactor tuple with Type_Safe class
+    def split(self, profile      : str  ,                                           # Split hash_mapping into (known, unseen): known holds the cached transformed text
+                    hash_mapping : dict
+               ) -> tuple:
+        if not self.enabled():
+            return {}, dict(hash_mapping)
+        self.load_shards(profile, hash_mapping)
+        known  = {}
+        unseen = {}
+        with self.lock:
+            for text_hash, text in hash_mapping.items():
+                key = (profile, str(text_hash))
+                if key in self.entries:
+                    self.entries.move_to_end(key)                                   # mark as most recently used
+                    known[text_hash] = self.entries[key]
+                else:
+                    unseen[text_hash] = text
+            self.hits   += len(known )
+            self.misses += len(unseen)
+        return known, unseen
+
+    def update(self, profile             : str ,                                    # Remember the transformed text of newly classified nodes
+                     transformed_mapping : dict
+                ) -> int:                                                           # number of new entries
+        if not self.enabled():
+            return 0
+        new_mappings = {}
+        with self.lock:
+            for text_hash, text in transformed_mapping.items():
+                key = (profile, str(text_hash))
+                if key not in self.entries:
+                    new_mappings[str(text_hash)] = str(text)
+                self.entries[key] = str(text)
+                self.entries.move_to_end(key)
+            self.evict()
+        if new_mappings and self.backing_enabled():
+            self.schedule_flush(profile, new_mappings)
+        return len(new_mappings)
+
+    def profile_mapping(self, profile : str) -> dict:                               # text_hash -> transformed text (for one profile)
+        with self.lock:
+            return {text_hash: text for (entry_profile, text_hash), text in self.entries.items() if entry_profile == profile}
+
+    def cache_key(self, profile : str) -> str:
+        return f"{TEXT_NODE_CACHE__CACHE_KEY_PREFIX}/{profile}"
+
+    def shard(self, text_hash : str) -> str:                                        # Entries are stored in one file per text_hash prefix, so a flush only rewrites the files its new entries fall in
+        return f"{TEXT_NODE_CACHE__SHARD_FILE_ID_PREFIX}-{str(text_hash)[:TEXT_NODE_CACHE__SHARD_PREFIX_LENGTH]}"
+
+    def cache_call(self, target : Callable[[], Any]                                 # Run a backing store operation through the cache's circuit breaker
+                   ) -> Any:
+        return circuit_breakers.breaker(NAME__CIRCUIT_BREAKER__CACHE_SERVICE).call(target)
+
+    def load_shards(self, profile      : str ,                                      # Pull the stored shards that hash_mapping's text hashes fall in (each shard once)
+                          hash_mapping : dict
+                     ) -> None:
+        if not self.backing_enabled():
+            return
+        shards = {self.shard(text_hash) for text_hash in hash_mapping} - self.loaded_shards.get(profile, set())
+        for shard in sorted(shards):
+            try:
+                stored = self.cache_call(lambda: self.retrieve_shard(profile, shard))
+            except Exception as error:                                              # left unloaded, so it is tried again on a later page (cheap while the breaker is open)
+                print(f"    ⚠️  Text node cache load error: {error}")
+                continue
+            with self.lock:
+                self.loaded_shards.setdefault(profile, set()).add(shard)
+                for text_hash, text in stored.items():
+                    self.entries.setdefault((profile, text_hash), text)
+                self.evict()
+
+    def retrieve_shard(self, profile : str ,                                        # text_hash -> transformed text, as stored in one shard
+                             shard   : str
+                        ) -> dict:
+        page_refs = self.cache_service.get_or_create_entry(self.cache_key(profile), dict(cache_key=self.cache_key(profile)))[0]
+        stored    = self.cache_service.retrieve_string(page_refs.cache_id, TEXT_NODE_CACHE__DATA_KEY, shard)
+        if not stored or stored == DEFAULT__TEXT__CACHE_NOT_FOUND:
+            return {}
+        if isinstance(stored, str):                                                 # the cache client already parses json-looking strings
+            stored = json_loads(stored)
+        return stored
+
+    def schedule_flush(self, profile      : str ,                                   # Queue new entries for the backing store (written by a background flush, never on the request path)
+                             new_mappings : dict
+                        ) -> None:
+        with self.lock:
+            self.pending.setdefault(profile, {}).update(new_mappings)
+            if profile in self.flushing:                                            # the running flush picks them up before it finishes
+                return
+            self.flushing.add(profile)
+            self.flush_count += 1
+            flush_key = (profile, int(self.flush_count))                            # unique, since 'flushing' (not the revalidator) decides if a flush is running
+        self.flushes.submit(flush_key, lambda: self.flush(profile))
+
+    def flush(self, profile : str) -> None:                                         # Write a profile's pending entries, batching whatever arrives while a write is in flight
+        while True:
+            with self.lock:
+                batch = self.pending.pop(profile, None)
+                if not batch:
+                    self.flushing.discard(profile)                                  # under the same lock as schedule_flush's check, so no entry is left behind
+                    return
+            by_shard = {}
+            for text_hash, text in batch.items():
+                by_shard.setdefault(self.shard(text_hash), {})[text_hash] = text
+            for shard, new_mappings in by_shard.items():
+                try:
+                    self.cache_call(lambda: self.store_shard(profile, shard, new_mappings))
+                except Exception as error:                                          # the entries are still in memory, they are just not shared
+                    print(f"    ⚠️  Text node cache save error: {error}")
+
+    def store_shard(self, profile      : str ,                                      # Merge new entries into what is stored in a shard (so proxies sharing a profile add to, not overwrite, each other's entries)
+                          shard        : str ,
+                          new_mappings : dict
+                     ) -> None:
+        stored = self.retrieve_shard(profile, shard)
+        stored.update(new_mappings)
+        max_shard_entries = max(1, int(self.max_entries) // TEXT_NODE_CACHE__SHARDS)
+        for text_hash in list(stored)[:max(0, len(stored) - max_shard_entries)]:    # oldest first, so a shard stays bounded like the in-memory map
+            del stored[text_hash]
+        page_refs = self.cache_service.get_or_create_entry(self.cache_key(profile), dict(cache_key=self.cache_key(profile)))[0]
+        self.cache_service.store_string(page_refs.cache_id, TEXT_NODE_CACHE__DATA_KEY, shard, json_dumps(stored))
+
+    def evict(self) -> None:                                                        # (called with the lock held)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.loaded_shards.clear()
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "size"        : self.size()           ,
+                 "max_entries" : int(self.max_entries) ,
+                 "hits"        : int(self.hits)        ,
+                 "misses"      : int(self.misses)      ,
+                 "evictions"   : int(self.evictions)   }
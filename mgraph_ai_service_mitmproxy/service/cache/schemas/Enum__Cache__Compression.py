@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Enum__Cache__Compression(str, Enum):                              # How large strings (html, transformations) are compressed before they go to the cache service
+    NONE = "none"                                                        # stored as is
+    GZIP = "gzip"                                                        # stdlib, always available
+    ZSTD = "zstd"                                                        # faster (and a bit smaller) than gzip, needs the zstandard package (falls back to gzip without it)
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class Enum__Cache__Prewarm__State(str, Enum):                                       # Lifecycle of a cache pre-warm job
+    PENDING   = "pending"                                                           # created, not started yet
+    RUNNING   = "running"                                                           # fetching and transforming pages
+    COMPLETED = "completed"                                                         # every url was processed (some may have failed, see errors)
+    FAILED    = "failed"                                                            # the job itself failed (e.g. the sitemap could not be read)
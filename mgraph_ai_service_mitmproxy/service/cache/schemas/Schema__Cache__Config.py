@@ -3,6 +3,7 @@ from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Url
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id      import Safe_Str__Id
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                 import Safe_UInt
 from mgraph_ai_service_cache_client.schemas.cache.enums.Enum__Cache__Store__Strategy import Enum__Cache__Store__Strategy
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Compression      import Enum__Cache__Compression
 
 
 class Schema__Cache__Config(Type_Safe):                                                             # Cache service configuration
@@ -21,4 +22,16 @@ class Schema__Cache__Config(Type_Safe):
 
     # Feature flags
     cache_metadata   : bool                         = True                                          # Whether to cache WCF metadata
-    track_stats      : bool                         = True                                          # Whether to track cache statistics
\ No newline at end of file
+    track_stats      : bool                         = True                                          # Whether to track cache statistics
+
+    # In-memory page_refs LRU (avoids repeated get_or_create_page_entry round trips)
+    page_refs_cache_size : Safe_UInt                = Safe_UInt(1024)                               # Max cache_key -> page_refs mappings kept in memory (0 disables it)
+    page_refs_cache_ttl  : Safe_UInt                = Safe_UInt(300)                                # Seconds a page_refs mapping is trusted (0 means no expiry)
+
+    # Freshness of cached transformations (stale-while-revalidate)
+    stale_while_revalidate     : bool           = True                                          # Serve stale transformations while a background task refreshes them
+    transformation_ttl_seconds : Safe_UInt      = Safe_UInt(0)                                  # Seconds a transformation is fresh for (0 uses the mode's default, see Enum__HTML__Transformation_Mode.cache_ttl_seconds)
+
+    # Compression of the html (and transformations) stored in this namespace
+    compression                : Enum__Cache__Compression = Enum__Cache__Compression.GZIP   # Format for new writes (reads detect the format of each stored value)
+    compression_min_size       : Safe_UInt      = Safe_UInt(1024)                               # Strings smaller than this (in characters) are stored as is
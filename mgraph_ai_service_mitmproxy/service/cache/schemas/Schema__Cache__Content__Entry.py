@@ -0,0 +1,10 @@
+from osbot_utils.type_safe.Type_Safe                                                        import Type_Safe
+from osbot_utils.type_safe.primitives.domains.cryptography.safe_str.Safe_Str__Cache_Hash    import Safe_Str__Cache_Hash
+from osbot_utils.type_safe.primitives.domains.identifiers.safe_int.Timestamp_Now            import Timestamp_Now
+from mgraph_ai_service_mitmproxy.service.cache.schemas.safe_str.Safe_Str__Proxy__Cache_Key  import Safe_Str__Proxy__Cache_Key
+
+
+class Schema__Cache__Content__Entry(Type_Safe):         # Content-addressed cache entry (transformations of one html content, shared by every url that served it)
+    cache_key      : Safe_Str__Proxy__Cache_Key         # contents/{content_hash}
+    content_hash   : Safe_Str__Cache_Hash               # hash of the source html
+    created_at     : Timestamp_Now
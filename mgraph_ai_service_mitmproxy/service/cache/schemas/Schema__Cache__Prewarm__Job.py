@@ -0,0 +1,30 @@
+from typing                                                                             import List, Optional
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                                   import Safe_Float
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                    import Safe_UInt
+from osbot_utils.type_safe.primitives.domains.common.safe_str.Safe_Str__Text            import Safe_Str__Text
+from osbot_utils.type_safe.primitives.domains.identifiers.Random_Guid                   import Random_Guid
+from osbot_utils.type_safe.primitives.domains.identifiers.safe_int.Timestamp_Now        import Timestamp_Now
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode           import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Prewarm__State      import Enum__Cache__Prewarm__State
+
+
+class Schema__Cache__Prewarm__Job(Type_Safe):                                       # Progress of a cache pre-warm job
+    job_id          : Random_Guid
+    state           : Enum__Cache__Prewarm__State           = Enum__Cache__Prewarm__State.PENDING
+    modes           : List[Enum__HTML__Transformation_Mode]
+    total_urls      : Safe_UInt                                                     # urls to process (known once the sitemap was read)
+    pages_done      : Safe_UInt                                                     # urls processed (fetched and transformed, or failed)
+    transformations : Safe_UInt                                                     # (page, mode) pairs that went through the pipeline
+    cache_hits      : Safe_UInt                                                     # (page, mode) pairs that were already cached
+    pending         : Safe_UInt                                                     # (page, mode) pairs whose transformation was left running in the background (not cached yet)
+    not_transformed : Safe_UInt                                                     # (page, mode) pairs that came back as the original html (failed, backed off or out of budget)
+    errors          : Safe_UInt                                                     # urls that could not be fetched or transformed
+    last_error      : Optional[Safe_Str__Text]              = None
+    started_at      : Timestamp_Now
+    duration_ms     : Safe_Float
+
+    def progress(self) -> float:                                                    # 0.0 .. 1.0
+        if not self.total_urls:
+            return 1.0 if self.state == Enum__Cache__Prewarm__State.COMPLETED else 0.0
+        return round(int(self.pages_done) / int(self.total_urls), 4)
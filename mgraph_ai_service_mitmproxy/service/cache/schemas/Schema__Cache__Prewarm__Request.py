@@ -0,0 +1,16 @@
+from typing                                                                         import List
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Url            import Safe_Str__Url
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+
+DEFAULT__PREWARM__MAX_CONCURRENCY = 4                                               # pages fetched and transformed at the same time
+DEFAULT__PREWARM__MAX_URLS        = 500                                             # cap on the urls of one job (after expanding the sitemap)
+
+
+class Schema__Cache__Prewarm__Request(Type_Safe):                                   # Pages (and modes) to transform ahead of the first visitor
+    urls            : List[Safe_Str__Url]                                           # Explicit list of urls
+    sitemap_url     : Safe_Str__Url                                                 # sitemap.xml (or sitemap index) to read more urls from (optional)
+    modes           : List[Enum__HTML__Transformation_Mode]                         # Modes to warm (defaults to xxx when empty)
+    max_concurrency : Safe_UInt                             = Safe_UInt(DEFAULT__PREWARM__MAX_CONCURRENCY)
+    max_urls        : Safe_UInt                             = Safe_UInt(DEFAULT__PREWARM__MAX_URLS       )
@@ -7,6 +7,7 @@ class Schema__Cache__Stats(Type_Safe):                          # Cache statisti
     cache_misses             : Safe_UInt = Safe_UInt(0)         # Number of cache misses
     wcf_calls_saved          : Safe_UInt = Safe_UInt(0)         # Number of WCF calls avoided
     total_pages_cached       : Safe_UInt = Safe_UInt(0)         # Total unique pages cached
+    total_contents_cached    : Safe_UInt = Safe_UInt(0)         # Total unique html contents cached (content-addressed tier)
 
     # Performance metrics (in milliseconds)
     avg_cache_hit_time_ms    : float = 0.0                      # Average cache hit latency
@@ -0,0 +1,17 @@
+import time
+from osbot_utils.type_safe.Type_Safe                                                        import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                        import Safe_UInt
+from osbot_utils.type_safe.primitives.domains.identifiers.safe_int.Timestamp_Now            import Timestamp_Now
+
+
+class Schema__Cache__Transformation__Meta(Type_Safe):   # Freshness of a cached transformation (kept in memory, see Proxy__Cache__Freshness)
+    cached_at   : Timestamp_Now                         # when the transformation was stored (ms since epoch)
+    ttl_seconds : Safe_UInt                             # how long it is fresh for (0 means it never goes stale)
+
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - int(self.cached_at) / 1000)
+
+    def is_stale(self) -> bool:
+        if not self.ttl_seconds:
+            return False
+        return self.age_seconds() > int(self.ttl_seconds)
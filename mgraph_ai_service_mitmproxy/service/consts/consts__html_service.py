@@ -5,4 +5,7 @@ ENV_VAR__AUTH__TARGET_SERVER__HTML_SERVICE__KEY_NAME  = "AUTH__TARGET_SERVER__HT
 ENV_VAR__AUTH__TARGET_SERVER__HTML_SERVICE__KEY_VALUE = "AUTH__TARGET_SERVER__HTML_SERVICE__KEY_VALUE"
 
 DEFAULT__HTML_SERVICE__BASE_URL = "https://html.dev.mgraph.ai"                                    # Default HTML Service endpoint
-DEFAULT__HTML_SERVICE__TIMEOUT  = 30.0                                                            # Default timeout in seconds
\ No newline at end of file
+DEFAULT__HTML_SERVICE__TIMEOUT  = 30.0                                                            # Default timeout in seconds
+
+ENV_VAR__HTML_TRANSFORMATION__PIPELINE = "HTML_TRANSFORMATION__PIPELINE"                         # see Enum__HTML__Transformation__Pipeline
+ENV_VAR__HTML_TRANSFORMATION__DEFER    = "HTML_TRANSFORMATION__DEFER"                            # see Enum__HTML__Transformation__Defer
@@ -0,0 +1,26 @@
+# mgraph_ai_service_mitmproxy/service/consts/consts__http.py
+
+ENV_VAR__HTTP_POOL__POOL_CONNECTIONS = "HTTP_POOL__POOL_CONNECTIONS"                              # number of per-host connection pools kept by each session
+ENV_VAR__HTTP_POOL__POOL_MAXSIZE     = "HTTP_POOL__POOL_MAXSIZE"                                  # max keep-alive connections per host
+ENV_VAR__HTTP_POOL__MAX_RETRIES      = "HTTP_POOL__MAX_RETRIES"                                   # retries for connection errors (and 502/503/504 on idempotent methods)
+ENV_VAR__HTTP_POOL__BACKOFF_FACTOR   = "HTTP_POOL__BACKOFF_FACTOR"                                # exponential backoff factor between retries
+
+DEFAULT__HTTP_POOL__POOL_CONNECTIONS = 10
+DEFAULT__HTTP_POOL__POOL_MAXSIZE     = 20
+DEFAULT__HTTP_POOL__MAX_RETRIES      = 2
+DEFAULT__HTTP_POOL__BACKOFF_FACTOR   = 0.2
+DEFAULT__HTTP_POOL__RETRY_STATUSES   = (502, 503, 504)
+DEFAULT__HTTP_POOL__RETRY_METHODS    = ("GET", "HEAD", "OPTIONS")                                 # never retry POSTs on status (paid GETs, like WCF's, use a pool with retry_on_status=False)
+
+ENV_VAR__HTTP_ASYNC__MAX_CONNECTIONS = "HTTP_ASYNC__MAX_CONNECTIONS"                              # max concurrent connections held by the async (httpx) client
+DEFAULT__HTTP_ASYNC__MAX_CONNECTIONS = 200                                                        # async workers can have hundreds of transforms in flight
+
+ENV_VAR__CIRCUIT_BREAKER__FAILURE_RATE = "CIRCUIT_BREAKER__FAILURE_RATE"                          # failure rate (0..1) over the window that opens a backend's breaker (0 disables the breakers)
+ENV_VAR__CIRCUIT_BREAKER__MIN_CALLS    = "CIRCUIT_BREAKER__MIN_CALLS"                             # calls in the window before the failure rate is acted on
+ENV_VAR__CIRCUIT_BREAKER__OPEN_SECONDS = "CIRCUIT_BREAKER__OPEN_SECONDS"                           # seconds an open breaker fails fast before letting a probe through
+
+DEFAULT__CIRCUIT_BREAKER__FAILURE_RATE = 0.5
+DEFAULT__CIRCUIT_BREAKER__MIN_CALLS    = 5
+DEFAULT__CIRCUIT_BREAKER__OPEN_SECONDS = 30
+DEFAULT__CIRCUIT_BREAKER__WINDOW_SIZE  = 20                                                       # most recent calls the failure rate is computed over
+NAME__CIRCUIT_BREAKER__CACHE_SERVICE   = "cache-service"                                          # the cache client has its own session, so its breaker is named (not keyed by host)
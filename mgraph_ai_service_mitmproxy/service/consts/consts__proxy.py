@@ -3,6 +3,37 @@ ENV_VAR__WCF_SERVICE__AUTH__API_KEY__VALUE             = "WCF_SERVICE__AUTH__API
 ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__BASE_URL  = "AUTH__TARGET_SERVER__CACHE_SERVICE__BASE_URL"
 ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_NAME  = "AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_NAME"
 ENV_VAR__AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_VALUE = "AUTH__TARGET_SERVER__CACHE_SERVICE__KEY_VALUE"
+ENV_VAR__CACHE_SERVICE__COMPRESSION                   = "CACHE_SERVICE__COMPRESSION"                      # see Enum__Cache__Compression (defaults to gzip)
 
 
-DEFAULT__WCF__PROXY__TIMEOUT = 90.0                                           # max 90 seconds (which match the current settings for the proxy)
\ No newline at end of file
+DEFAULT__WCF__PROXY__TIMEOUT = 90.0                                           # max 90 seconds (which match the current settings for the proxy)
+
+ENV_VAR__PROXY__INTERCEPTOR_BYPASS                     = "PROXY__INTERCEPTOR_BYPASS"        # set to 'false' to make the interceptor send all traffic to this service
+ENV_VAR__PROXY__INTERCEPTOR_HEADERS_ONLY               = "PROXY__INTERCEPTOR_HEADERS_ONLY"  # set to 'false' to make the interceptor always send the response body
+DEFAULT__PROXY__INTERCEPTOR_RULES__REFRESH_SECONDS     = 60                                  # how often the interceptor re-fetches the rules
+PROXY__ADMIN_PATH_PREFIX                               = "/mitm-proxy"                       # admin UI paths (always handled by this service)
+PROXY__CACHE_TEST_COOKIE                               = "cache_test"                        # cookie used by Proxy__Content__Service.check_cached_response
+PROXY__BLOCKED_PATH_MARKERS                            = ("/blocked",)                       # paths containing these are blocked in the request phase
+PROXY__SENSITIVE_HEADER_MARKERS                        = ("Secret", "Private", "Token")      # request headers containing these are removed
+
+
+CONTENT_TYPE__PROXY_FRAME          = "application/x-mgraph-proxy-frame"        # length-prefixed frame: [4 byte metadata size][metadata json][raw body bytes]
+PROXY_FRAME__METADATA_SIZE__BYTES  = 4                                          # big-endian unsigned int holding the size of the metadata json
+
+
+HEADER__PROXY__BUDGET_EXCEEDED                 = "x-proxy-budget-exceeded"       # steps skipped (or cut short) because the response's latency budget ran out
+DEFAULT__PROXY__BUDGET__MIN_TRANSFORMATION_MS  = 100                             # remaining budget needed to start a transformation (a cache hit still needs a lookup)
+DEFAULT__PROXY__BUDGET__MAX_WORKERS            = 32                              # transformations running with a deadline (each stops before its next step once the budget is spent)
+STEP__HTML_TO_HASHES                           = "html_to_hashes"                # pipeline steps checked against the budget (listed in x-proxy-budget-exceeded when skipped)
+STEP__SEMANTIC_TEXT                            = "semantic_text"
+STEP__HASHES_TO_HTML                           = "hashes_to_html"
+
+
+ENV_VAR__PROXY__RESPONSE_COMPRESSION           = "PROXY__RESPONSE_COMPRESSION"   # set to 'false' to send modified bodies uncompressed
+CONTENT_ENCODING__GZIP                         = "gzip"
+CONTENT_ENCODING__BROTLI                       = "br"
+DEFAULT__RESPONSE_COMPRESSION__MIN_SIZE        = 1024                            # smaller bodies are sent as they are
+
+
+ENV_VAR__PROXY__CONDITIONAL_REQUESTS           = "PROXY__CONDITIONAL_REQUESTS"   # set to 'false' to stop sending etags (and answering If-None-Match with 304)
+DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS          = 300                             # max time an etag is answered with 304 without asking upstream (and never beyond upstream's own freshness)
@@ -8,6 +8,7 @@ from osbot_utils.type_safe.primitives.core.Safe_Float
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                               import Safe_Str__Id
 from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Url                                      import Safe_Str__Url
 from mgraph_ai_service_mitmproxy.service.health_check.schemas.Enum__Health_Status                             import Enum__Health_Status
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                                              import http_session_pool
 from mgraph_ai_service_mitmproxy.service.health_check.schemas.Schema__Cache_Service_Info                      import Schema__Cache_Service_Info
 from mgraph_ai_service_mitmproxy.service.health_check.schemas.Schema__Health_Check_Result                     import Schema__Health_Check_Result
 
@@ -31,9 +32,9 @@ class Cache__Health_Check__Service(Type_Safe):
         result     = Schema__Health_Check_Result()
 
         try:
-            response    = requests.get(f"{self.base_url}/",
-                                      headers = self.get_headers(),
-                                      timeout = float(self.timeout))
+            response    = http_session_pool.get(f"{self.base_url}/",
+                                                headers = self.get_headers(),
+                                                timeout = float(self.timeout))
 
             duration_ms        = (time.time() - start_time) * 1000
             result.duration_ms = duration_ms
@@ -74,9 +75,9 @@ class Cache__Health_Check__Service(Type_Safe):
 
         try:
             url      = f"{self.base_url}/server/storage/info"
-            response = requests.get(url,
-                                   headers = self.get_headers(),
-                                   timeout = float(self.timeout))
+            response = http_session_pool.get(url,
+                                             headers = self.get_headers(),
+                                             timeout = float(self.timeout))
 
             duration_ms        = (time.time() - start_time) * 1000
             result.duration_ms = duration_ms
@@ -125,9 +126,9 @@ class Cache__Health_Check__Service(Type_Safe):
         for endpoint_path, expected_statuses in endpoints_to_check:
             try:
                 url      = f"{self.base_url}{endpoint_path}"
-                response = requests.get(url,
-                                       headers = self.get_headers(),
-                                       timeout = float(self.timeout))
+                response = http_session_pool.get(url,
+                                                 headers = self.get_headers(),
+                                                 timeout = float(self.timeout))
 
                 if response.status_code in expected_statuses:
                     result.add_passed_check(f"endpoint_{endpoint_path}")
@@ -160,9 +161,9 @@ class Cache__Health_Check__Service(Type_Safe):
     @type_safe
     def get_service_info(self) -> Optional[Schema__Cache_Service_Info]:            # Get comprehensive service information
         try:
-            storage_response = requests.get(url     = f"{self.base_url}/server/storage/info",
-                                            headers = self.get_headers(),
-                                            timeout = float(self.timeout))
+            storage_response = http_session_pool.get(url     = f"{self.base_url}/server/storage/info",
+                                                     headers = self.get_headers(),
+                                                     timeout = float(self.timeout))
 
             if storage_response.status_code != 200:
                 return None
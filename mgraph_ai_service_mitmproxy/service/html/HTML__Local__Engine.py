@@ -0,0 +1,85 @@
+from typing                                                                         import Dict
+from osbot_utils.helpers.html.transformers.Html_Dict__To__Html                      import Html_Dict__To__Html
+from osbot_utils.helpers.html.transformers.Html__To__Html_Dict                      import Html__To__Html_Dict, STRING__SCHEMA_NODES, STRING__SCHEMA_TEXT
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Html           import Safe_Str__Html
+from osbot_utils.utils.Misc                                                         import str_md5
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Response import Schema__Html__To__Dict__Hashes__Response
+
+DEFAULT__LOCAL_ENGINE__MAX_DEPTH = 256                                              # same default as the HTML Service
+DEFAULT__LOCAL_ENGINE__HASH_SIZE = 10                                               # same hash length as the HTML Service (md5 prefix)
+LOCAL_ENGINE__SKIP_TEXT_IN_TAGS  = ('style', 'script')                              # text under these tags is not hashed
+
+
+class HTML__Local__Engine(Type_Safe):                                               # In-process version of the HTML Service hash endpoints (same html_dict, hashes and output)
+    hash_size : int = DEFAULT__LOCAL_ENGINE__HASH_SIZE
+
+    def html_to_dict_hashes(self, html      : str                                 ,  # Same algorithm as the HTML Service's /html/to/dict/hashes
+                                  max_depth : int = DEFAULT__LOCAL_ENGINE__MAX_DEPTH
+                             ) -> Schema__Html__To__Dict__Hashes__Response:
+        html_dict    = Html__To__Html_Dict(html=html).convert() if html else {}
+        hash_mapping = {}
+        if not html_dict:
+            return Schema__Html__To__Dict__Hashes__Response(html_dict={}, hash_mapping={})
+
+        self.replace_text_with_hashes(html_dict, hash_mapping, depth=0, max_depth=max_depth, parent_tag=None)
+        tree_depth = self.max_depth(html_dict)
+        return Schema__Html__To__Dict__Hashes__Response(html_dict         = html_dict               ,
+                                                        hash_mapping      = hash_mapping            ,
+                                                        node_count        = self.count_nodes(html_dict),
+                                                        max_depth         = tree_depth              ,
+                                                        total_text_hashes = len(hash_mapping)       ,
+                                                        max_depth_reached = tree_depth >= max_depth )
+
+    def replace_text_with_hashes(self, node         : Dict ,                        # Swap (in place) each text node's data for its hash
+                                       hash_mapping : Dict ,
+                                       depth        : int  ,
+                                       max_depth    : int  ,
+                                       parent_tag   : str
+                                  ) -> None:
+        if depth > max_depth or not isinstance(node, dict):
+            return
+        if node.get('type') == STRING__SCHEMA_TEXT:
+            text = node.get('data', '')
+            if text.strip() and parent_tag not in LOCAL_ENGINE__SKIP_TEXT_IN_TAGS:
+                text_hash               = self.text_hash(text)
+                hash_mapping[text_hash] = text
+                node['data']            = text_hash
+        node_tag = node.get('tag')
+        for child in node.get(STRING__SCHEMA_NODES, []):
+            self.replace_text_with_hashes(child, hash_mapping, depth + 1, max_depth, node_tag)
+
+    def text_hash(self, text : str) -> str:
+        return str_md5(text)[:self.hash_size]
+
+    def count_nodes(self, node : Dict) -> int:                                      # element and text nodes
+        if not isinstance(node, dict):
+            return 0
+        return 1 + sum(self.count_nodes(child) for child in node.get(STRING__SCHEMA_NODES, []))
+
+    def max_depth(self, node : Dict, depth : int = 0) -> int:
+        if not isinstance(node, dict):
+            return depth
+        return max([depth] + [self.max_depth(child, depth + 1) for child in node.get(STRING__SCHEMA_NODES, [])])
+
+    def replace_hashes_with_text(self, node         : Dict ,                        # Copy of node with each text node's hash swapped for its (transformed) text
+                                       hash_mapping : Dict                          # (only whole text nodes are replaced, so text that happens to contain a hash is left alone)
+                                  ) -> Dict:
+        if not isinstance(node, dict):
+            return node
+        replaced = dict(node)                                                       # html_dict is not changed (batch reconstructs the same page in several modes)
+        if node.get('type') == STRING__SCHEMA_TEXT:
+            text_hash = node.get('data')
+            if text_hash in hash_mapping:
+                replaced['data'] = hash_mapping[text_hash]
+        if STRING__SCHEMA_NODES in node:
+            replaced[STRING__SCHEMA_NODES] = [self.replace_hashes_with_text(child, hash_mapping) for child in node[STRING__SCHEMA_NODES]]
+        return replaced
+
+    def reconstruct_from_hashes(self, html_dict    : Dict ,                         # Same algorithm as the HTML Service's /hashes/to/html
+                                      hash_mapping : Dict
+                                 ) -> Safe_Str__Html:
+        html_dict__replaced    = self.replace_hashes_with_text(html_dict, {str(hash_value): str(text) for hash_value, text in hash_mapping.items()})
+        html                   = Html_Dict__To__Html(root=html_dict__replaced).convert()
+        html_dict__transformed = Html__To__Html_Dict(html=html).convert()           # re-parse and re-render, so that the output is byte-identical to the service's (including text that holds markup)
+        return Safe_Str__Html(Html_Dict__To__Html(root=html_dict__transformed).convert())   # same normalisation as Schema__HTML__Service__Response.body
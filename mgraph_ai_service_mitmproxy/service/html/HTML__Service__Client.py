@@ -1,5 +1,6 @@
 import requests
 import json
+from typing                                                                             import Optional
 from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_Float                                   import Safe_Float
 from osbot_utils.utils.Env                                                              import get_env
@@ -13,6 +14,7 @@ from mgraph_ai_service_mitmproxy.service.consts.consts__html_service
                                                                                                 ENV_VAR__AUTH__TARGET_SERVER__HTML_SERVICE__KEY_VALUE,
                                                                                                 DEFAULT__HTML_SERVICE__BASE_URL                      ,
                                                                                                 DEFAULT__HTML_SERVICE__TIMEOUT                       )
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                       import http_session_pool
 
 
 class HTML__Service__Client(Type_Safe):                                                    # HTTP client for HTML Service API
@@ -54,10 +56,10 @@ class HTML__Service__Client(Type_Safe):
         payload = request.to_json_payload()
 
         try:
-            response = requests.post(url     = url                 ,
-                                     headers = headers             ,
-                                     json    = payload             ,
-                                     timeout = float(self.timeout) )
+            response = http_session_pool.post(url     = url                 ,
+                                              headers = headers             ,
+                                              json    = payload             ,
+                                              timeout = float(self.timeout) )
 
             content_type = response.headers.get('content-type', 'text/plain')
 
@@ -100,40 +102,40 @@ class HTML__Service__Client(Type_Safe):
                                                    error_message = f"Unexpected error: {str(e)}")
 
 
-    def get_dict_hashes(self, request: Schema__Html__To__Dict__Hashes__Request) -> Schema__Html__To__Dict__Hashes__Response:    # Call HTML Service to get hash mapping
+    def get_dict_hashes(self, request : Schema__Html__To__Dict__Hashes__Request ,          # Call HTML Service to get hash mapping
+                              timeout : Optional[float] = None                           # seconds (None uses the client's timeout)
+                         ) -> Schema__Html__To__Dict__Hashes__Response:
         endpoint_path = "/html/to/dict/hashes"
         url           = f"{self.base_url}{endpoint_path}"
         headers       = self.get_auth_headers()
         payload       = request.json()
 
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=float(self.timeout))
+            response = http_session_pool.post(url, headers=headers, json=payload, timeout=float(self.timeout if timeout is None else timeout))
 
             if response.status_code == 200:
                 data = response.json()
                 return Schema__Html__To__Dict__Hashes__Response(**data)
             else:
-                return Schema__Html__To__Dict__Hashes__Response(
-                    html_dict={},
-                    hash_mapping={},
-                    node_count=0,
-                    max_depth=0,
-                    total_text_hashes=0,
-                    max_depth_reached=False
-                )
+                return self.empty_dict_hashes_response()
         except Exception as e:
             print(f"Error calling get_dict_hashes: {e}")
-            return Schema__Html__To__Dict__Hashes__Response(
-                html_dict={},
-                hash_mapping={},
-                node_count=0,
-                max_depth=0,
-                total_text_hashes=0,
-                max_depth_reached=False
-            )
-
-
-    def reconstruct_from_hashes(self, request: Schema__Hashes__To__Html__Request) -> Schema__HTML__Service__Response:
+            return self.empty_dict_hashes_response()
+
+    def empty_dict_hashes_response(self) -> Schema__Html__To__Dict__Hashes__Response:     # Response used when the HTML service call fails
+        return Schema__Html__To__Dict__Hashes__Response(
+            html_dict={},
+            hash_mapping={},
+            node_count=0,
+            max_depth=0,
+            total_text_hashes=0,
+            max_depth_reached=False
+        )
+
+
+    def reconstruct_from_hashes(self, request : Schema__Hashes__To__Html__Request ,
+                                      timeout : Optional[float] = None                     # seconds (None uses the client's timeout)
+                                 ) -> Schema__HTML__Service__Response:
         """Call HTML Service to reconstruct HTML from hashes"""
         endpoint_path = "/hashes/to/html"
         url = f"{self.base_url}{endpoint_path}"
@@ -141,7 +143,7 @@ class HTML__Service__Client(Type_Safe):
         payload = request.json()
 
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=float(self.timeout))
+            response = http_session_pool.post(url, headers=headers, json=payload, timeout=float(self.timeout if timeout is None else timeout))
 
             content_type = response.headers.get('content-type', 'text/html')
             body = response.content.decode('utf-8') if response.status_code == 200 else ""
@@ -0,0 +1,60 @@
+import httpx
+from typing                                                                             import Optional
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Service__Response           import Schema__HTML__Service__Response
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Hashes__To__Html__Request         import Schema__Hashes__To__Html__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Request   import Schema__Html__To__Dict__Hashes__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Response  import Schema__Html__To__Dict__Hashes__Response
+from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client                     import HTML__Service__Client
+from mgraph_ai_service_mitmproxy.service.http.Http__Async__Client__Pool                 import http_async_client_pool
+
+
+class HTML__Service__Client__Async(HTML__Service__Client):                                 # Async (httpx) version of the HTML Service calls used by the transformation pipeline
+
+    async def get_dict_hashes(self, request : Schema__Html__To__Dict__Hashes__Request ,    # Call HTML Service to get hash mapping
+                                    timeout : Optional[float] = None                     # seconds (None uses the client's timeout)
+                               ) -> Schema__Html__To__Dict__Hashes__Response:
+        url     = f"{self.base_url}/html/to/dict/hashes"
+        headers = self.get_auth_headers()
+        payload = request.json()
+
+        try:
+            response = await http_async_client_pool.post(url, headers=headers, json=payload, timeout=float(self.timeout if timeout is None else timeout))
+
+            if response.status_code == 200:
+                return Schema__Html__To__Dict__Hashes__Response(**response.json())
+            return self.empty_dict_hashes_response()
+        except Exception as e:
+            print(f"Error calling get_dict_hashes: {e}")
+            return self.empty_dict_hashes_response()
+
+    async def reconstruct_from_hashes(self, request : Schema__Hashes__To__Html__Request ,  # Call HTML Service to reconstruct HTML from hashes
+                                            timeout : Optional[float] = None               # seconds (None uses the client's timeout)
+                                       ) -> Schema__HTML__Service__Response:
+        url     = f"{self.base_url}/hashes/to/html"
+        headers = self.get_auth_headers()
+        payload = request.json()
+
+        try:
+            response     = await http_async_client_pool.post(url, headers=headers, json=payload, timeout=float(self.timeout if timeout is None else timeout))
+            content_type = response.headers.get('content-type', 'text/html')
+            body         = response.content.decode('utf-8') if response.status_code == 200 else ""
+
+            return Schema__HTML__Service__Response(status_code  = response.status_code       ,
+                                                   content_type = content_type               ,
+                                                   body         = body                       ,
+                                                   headers      = dict(response.headers)     ,
+                                                   success      = response.status_code == 200)
+        except httpx.TimeoutException as e:
+            return Schema__HTML__Service__Response(status_code   = 504                              ,
+                                                   content_type  = "text/plain"                     ,
+                                                   body          = ""                               ,
+                                                   headers       = {}                               ,
+                                                   success       = False                            ,
+                                                   error_message = f"HTML Service timeout: {str(e)}")
+        except Exception as e:
+            return Schema__HTML__Service__Response(status_code   = 500                                        ,
+                                                   content_type  = "text/plain"                               ,
+                                                   body          = ""                                         ,
+                                                   headers       = {}                                         ,
+                                                   success       = False                                      ,
+                                                   error_message = f"Error reconstructing HTML: {str(e)}")
@@ -1,5 +1,6 @@
 import time
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as Future__Timeout_Error
+from typing import Any, Callable, Optional, List
 
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Classification__Criterion_Filter import Schema__Classification__Criterion_Filter
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.enums.Enum__Classification__Filter_Mode import Enum__Classification__Filter_Mode
@@ -17,7 +18,26 @@ from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Re
 from mgraph_ai_service_mitmproxy.schemas.html.safe_dict.Safe_Dict__Hash__To__Text                            import Safe_Dict__Hash__To__Text
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.enums.Enum__Text__Transformation__Mode         import Enum__Text__Transformation__Mode
 from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client                                          import HTML__Service__Client
+from mgraph_ai_service_mitmproxy.service.html.HTML__Local__Engine                                            import HTML__Local__Engine
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Local                           import HTML__Transformation__Service__Local
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline                           import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.service.consts.consts__html_service                                         import ENV_VAR__HTML_TRANSFORMATION__PIPELINE, ENV_VAR__HTML_TRANSFORMATION__DEFER
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Defer                              import Enum__HTML__Transformation__Defer
+from osbot_utils.utils.Env                                                                                   import get_env
 from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                                         import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs                             import Schema__Cache__Page__Refs
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight                                          import Proxy__Single_Flight
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Text_Node__Cache                                       import Proxy__Text_Node__Cache
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Revalidator                                     import Proxy__Cache__Revalidator
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Negative__Cache                                        import Proxy__Negative__Cache
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Original_Html__Dedup                                   import Proxy__Original_Html__Dedup
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Precompressed__Cache                                   import Proxy__Precompressed__Cache
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta                   import Schema__Cache__Transformation__Meta
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                                                 import NAME__CIRCUIT_BREAKER__CACHE_SERVICE
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker                                         import Http__Circuit__Breaker
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers                                        import circuit_breakers
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                                                import DEFAULT__PROXY__BUDGET__MIN_TRANSFORMATION_MS, DEFAULT__PROXY__BUDGET__MAX_WORKERS, CONTENT_ENCODING__GZIP, STEP__HTML_TO_HASHES, STEP__SEMANTIC_TEXT, STEP__HASHES_TO_HTML
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                                               import Proxy__Deadline, Proxy__Deadline__Exceeded
 from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client                        import Semantic_Text__Service__Client
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Request import Schema__Semantic_Text__Transformation__Request
 
@@ -26,32 +46,177 @@ class HTML__Transformation__Service(Type_Safe):
     html_service_client      : HTML__Service__Client           = None                        # HTML Service HTTP client
     semantic_text_client     : Semantic_Text__Service__Client  = None                        # Semantic Text Service HTTP client
     cache_service            : Proxy__Cache__Service           = None                        # Cache service integration
+    local_engine             : HTML__Local__Engine                                           # In-process html_dict/hashes engine
+    local_transformations    : HTML__Transformation__Service__Local                          # In-process hash mapping transformations (xxx-random, hashes-random, abcde-by-size)
+    single_flight            : Proxy__Single_Flight                                          # Concurrent transforms of the same page+mode share one pipeline run
+    text_node_cache          : Proxy__Text_Node__Cache                                       # text_hash -> transformed text (only unseen text nodes go to the Semantic Text Service)
+    revalidator              : Proxy__Cache__Revalidator                                     # Background refresh of stale cached transformations
+    negative_cache           : Proxy__Negative__Cache                                        # (url, mode) pairs whose transformation recently failed (served as passthrough while backing off)
+    deferred                 : Proxy__Cache__Revalidator                                     # Background transformations of cache misses that were served as the original html
+    original_html_dedup      : Proxy__Original_Html__Dedup                                   # Hash of the original html last stored per url (unchanged pages are not uploaded again)
+    original_html_uploads    : Proxy__Cache__Revalidator                                     # Background uploads of the original html (provenance)
+    precompressed            : Proxy__Precompressed__Cache                                   # gzip/br variants of cached transformations (sent to the client without compressing them again)
+    pipeline                 : Enum__HTML__Transformation__Pipeline = Enum__HTML__Transformation__Pipeline.REMOTE
+    defer                    : Enum__HTML__Transformation__Defer    = Enum__HTML__Transformation__Defer.NEVER
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.deadline_executor = ThreadPoolExecutor(max_workers        = DEFAULT__PROXY__BUDGET__MAX_WORKERS,     # runs transformations that have a deadline (threads are only started when used)
+                                                    thread_name_prefix = 'html-transformation'             )
 
     def setup(self) -> 'HTML__Transformation__Service':                                      # Initialize service dependencies
         self.html_service_client  = HTML__Service__Client().setup()
         self.semantic_text_client = Semantic_Text__Service__Client()
         self.cache_service        = Proxy__Cache__Service().setup()
+        self.text_node_cache.cache_service = self.cache_service
+        self.setup__pipeline()
+        self.setup__defer()
         return self
 
+    def setup__pipeline(self):                                                               # Pick the pipeline from HTML_TRANSFORMATION__PIPELINE (defaults to remote)
+        pipeline = get_env(ENV_VAR__HTML_TRANSFORMATION__PIPELINE)
+        if pipeline:
+            self.pipeline = Enum__HTML__Transformation__Pipeline(pipeline)
+        return self
+
+    def setup__defer(self):                                                                  # Pick which cache misses are deferred from HTML_TRANSFORMATION__DEFER (defaults to never)
+        defer = get_env(ENV_VAR__HTML_TRANSFORMATION__DEFER)
+        if defer:
+            self.defer = Enum__HTML__Transformation__Defer(defer)
+        return self
+
+    def defers(self, mode : Enum__HTML__Transformation_Mode) -> bool:                        # True when a cache miss for mode is served as the original html (needs the cache, to hand over the result)
+        if self.defer == Enum__HTML__Transformation__Defer.NEVER or not mode.requires_caching() or not self.cache_enabled():
+            return False
+        return self.defer == Enum__HTML__Transformation__Defer.ALWAYS or not self.transforms_locally(mode)
+
+    def extracts_locally(self) -> bool:                                                      # True when step 1 doesn't need the HTML Service
+        return self.pipeline == Enum__HTML__Transformation__Pipeline.LOCAL
+
+    def reconstructs_locally(self) -> bool:                                                  # True when step 3 doesn't need to ship html_dict back to the HTML Service
+        return self.pipeline in (Enum__HTML__Transformation__Pipeline.LOCAL            ,
+                                 Enum__HTML__Transformation__Pipeline.LOCAL_RECONSTRUCT)
+
+    def transforms_locally(self, mode : Enum__HTML__Transformation_Mode) -> bool:           # True when step 2 doesn't need the Semantic Text Service
+        return self.extracts_locally() and mode.is_local_transformation()
+
     def transform_html(self, source_html   : str                                  ,          # Source HTML content
                              target_url    : str                                  ,          # Original URL (for cache key)
-                             mode          : Enum__HTML__Transformation_Mode                 # Transformation mode
+                             mode          : Enum__HTML__Transformation_Mode ,               # Transformation mode
+                             deadline      : Optional[Proxy__Deadline] = None                # Latency budget of the response (None, or unbounded, waits for the transformation)
                        ) -> Schema__HTML__Transformation__Result:                            # Transformation result
 
         if not mode.is_active():                                                              # No transformation needed
             return self._create_passthrough_result(source_html, mode)
 
-        cached_result = self.get_cached_transformation(target_url, mode)                     # Try cache first
+        if self.defers(mode):
+            return self._transform_html__deferred(source_html, target_url, mode)
+
+        if deadline is None or not deadline.is_bounded():
+            return self._transform_html__single_flight(source_html, target_url, mode)
+
+        if not deadline.allows('transformation', DEFAULT__PROXY__BUDGET__MIN_TRANSFORMATION_MS):    # not enough budget left to even look up the cache
+            return self._create_passthrough_result(source_html, mode)
+        future = self.deadline_executor.submit(self._transform_html__single_flight, source_html, target_url, mode, deadline)
+        try:
+            return future.result(timeout=deadline.remaining_seconds())
+        except Future__Timeout_Error:                                                         # out of budget: serve the original html (the pipeline stops before its next step)
+            deadline.skip('transformation')
+            return self._create_passthrough_result(source_html, mode)
+
+    def _transform_html__single_flight(self, source_html : str                             ,
+                                             target_url  : str                             ,
+                                             mode        : Enum__HTML__Transformation_Mode ,
+                                             deadline    : Optional[Proxy__Deadline] = None    # budget of the leader (its followers share the result)
+                                       ) -> Schema__HTML__Transformation__Result:
+        content_hash = self.content_hash(source_html)                                         # Transformations are keyed on the html itself (not just the url)
+        return self.single_flight.do(self.single_flight_key(target_url, mode, content_hash),  # Concurrent callers for the same content+mode wait for one transformation
+                                     lambda: self._transform_html(source_html, target_url, mode, content_hash, deadline))
+
+    def _transform_html__deferred(self, source_html : str                             ,     # Cached transformation, or the original html (with the transformation started in the background)
+                                        target_url  : str                             ,
+                                        mode        : Enum__HTML__Transformation_Mode
+                                  ) -> Schema__HTML__Transformation__Result:
+        content_hash  = self.content_hash(source_html)
+        cached_result = self.cache_call(lambda: self.get_cached_transformation(target_url, mode, content_hash))
         if cached_result:
+            self.cache_call(lambda: self.revalidate_if_stale(source_html, target_url, mode, content_hash))
             return cached_result
+        if self.negative_cache.is_blocked(self.negative_cache_key(target_url, mode)):         # failed recently: nothing to wait for
+            return self._create_passthrough_result(source_html, mode)
 
-        transformation_result = self._transform_via_services(source_html, mode)              # Cache miss - perform transformation
+        self.deferred.submit(self.single_flight_key(target_url, mode, content_hash),          # one background transformation per content+mode (the next request gets it from the cache)
+                             lambda: self._transform_html__single_flight(source_html, target_url, mode))
+        return self._create_pending_result(source_html, mode)
+
+    def content_hash(self, source_html : str                                                  # Hash of the source html (None when there is no cache service)
+                     ) -> Optional[str]:
+        if self.cache_service:
+            return self.cache_service.content_hash(source_html)
+        return None
+
+    def single_flight_key(self, target_url   : str                             ,             # (content_hash or cache_key, mode), so callers that would share a cache entry share the in-flight call
+                                mode         : Enum__HTML__Transformation_Mode ,
+                                content_hash : Optional[str] = None
+                          ) -> tuple:
+        if content_hash:
+            return (str(content_hash), mode.value)
+        cache_key = self.cache_service.url_to_cache_key(target_url) if self.cache_service else target_url
+        return (str(cache_key), mode.value)
+
+    def negative_cache_key(self, target_url : str                             ,              # (cache_key, mode), so failures are remembered per page+mode
+                                 mode       : Enum__HTML__Transformation_Mode
+                           ) -> tuple:
+        return self.single_flight_key(target_url, mode)                                      # without a content hash, that is the (cache_key, mode) key
+
+    def _transform_html(self, source_html   : str                                  ,         # Cache lookup, transformation and cache store (run once per single-flight key)
+                              target_url    : str                                  ,
+                              mode          : Enum__HTML__Transformation_Mode      ,
+                              content_hash  : Optional[str]             = None       ,
+                              deadline      : Optional[Proxy__Deadline] = None
+                        ) -> Schema__HTML__Transformation__Result:
+        cached_result = self.cache_call(lambda: self.get_cached_transformation(target_url, mode, content_hash))     # Try cache first
+        if cached_result:
+            self.cache_call(lambda: self.revalidate_if_stale(source_html, target_url, mode, content_hash))          # stale entries are still served (and refreshed in the background)
+            return cached_result
+
+        negative_key = self.negative_cache_key(target_url, mode)
+        if self.negative_cache.is_blocked(negative_key):                                      # failed recently: don't wait for the services again until the backoff expires
+            return self._create_passthrough_result(source_html, mode)
+
+        start_time = time.time()
+        try:
+            transformation_result = self._pipeline_result(source_html, mode, deadline)        # Cache miss - perform transformation
+        except Proxy__Deadline__Exceeded as step:                                             # out of budget (not a failure of the services, so no backoff and nothing cached)
+            print(f"    ⏱️  Transformation stopped before '{step}' (out of budget)")
+            return self._create_passthrough_result(source_html, mode)
+        except Exception as e:
+            backoff = self.negative_cache.record_failure(negative_key, e)
+            print(f"    ⚠️  Transformation error (retry in {backoff:.0f}s): {e}")
+            return self._create_error_result(source_html, mode, start_time)                   # errors are not cached as transformations
+        self.negative_cache.record_success(negative_key)
 
         if transformation_result.transformed_html:                                            # Store successful transformation
-            self._store_transformation_in_cache(target_url, mode, transformation_result)
+            self.cache_call(lambda: self._store_transformation_in_cache(target_url, mode, transformation_result, content_hash))
 
         return transformation_result
 
+    def cache_breaker(self) -> Http__Circuit__Breaker:
+        return circuit_breakers.breaker(NAME__CIRCUIT_BREAKER__CACHE_SERVICE)
+
+    def cache_enabled(self) -> bool:
+        return bool(self.cache_service and self.cache_service.cache_config.enabled)
+
+    def cache_call(self, target : Callable[[], Any]                                          # Run a cache operation through the cache's circuit breaker (errors are logged and return None, so the page is still transformed)
+                   ) -> Any:
+        if not self.cache_enabled():
+            return target()
+        try:
+            return self.cache_breaker().call(target)
+        except Exception as error:
+            print(f"    ⚠️  Cache error (non-fatal): {error}")
+            return None
+
     def _transform_via_services(self, source_html : str                             ,        # Source HTML to transform
                                       mode        : Enum__HTML__Transformation_Mode          # Transformation mode
                                 ) -> Schema__HTML__Transformation__Result:                   # Transformation result
@@ -59,37 +224,75 @@ class HTML__Transformation__Service(Type_Safe):
         start_time = time.time()
 
         try:
-            step_1_result = self._step_1__get_hash_mapping(source_html)                     # Step 1: HTML → Hash Mapping
-            html_dict     = step_1_result.html_dict
-            hash_mapping  = step_1_result.hash_mapping
-            transformed_mapping = self._step_2__transform_mapping(hash_mapping, mode)       # Step 2: Transform Hash Mapping
-
-            transformed_html = self._step_3__reconstruct_html(html_dict,                    # Step 3: Hash Mapping → HTML
-                                                              transformed_mapping)
-
-            call_duration_ms = (time.time() - start_time) * 1000
-
-            print(f"    ✅ Transformation complete in {call_duration_ms/1000:.2f}s")
-
-            return Schema__HTML__Transformation__Result(
-                transformed_html       = transformed_html,
-                transformation_mode    = mode,
-                content_type           = mode.to_content_type(),
-                cache_hit              = False,
-                transformation_time_ms = Safe_Float(call_duration_ms)
-            )
-
+            return self._pipeline_result(source_html, mode)
         except Exception as e:
             print(f"    ⚠️  Transformation error: {e}")
             return self._create_error_result(source_html, mode, start_time)
 
-    def _step_1__get_hash_mapping(self, source_html : Safe_Str__Html                         # Get hash mapping from HTML
-                                   ) -> Schema__HTML__Transformation__Step_1:
+    def _pipeline_result(self, source_html : str                             ,              # Run the pipeline and wrap its html in a result (raises on errors)
+                               mode        : Enum__HTML__Transformation_Mode ,
+                               deadline    : Optional[Proxy__Deadline] = None
+                         ) -> Schema__HTML__Transformation__Result:
+        start_time       = time.time()
+        transformed_html = self._run_pipeline(source_html, mode, deadline)
+        call_duration_ms = (time.time() - start_time) * 1000
 
-        print(f"    📋 Step 1: Getting hash mapping from HTML Service...")
+        print(f"    ✅ Transformation complete in {call_duration_ms/1000:.2f}s")
 
-        request  = Schema__Html__To__Dict__Hashes__Request(html=source_html)
-        response = self.html_service_client.get_dict_hashes(request)
+        return Schema__HTML__Transformation__Result(
+            transformed_html       = transformed_html,
+            transformation_mode    = mode,
+            content_type           = mode.to_content_type(),
+            cache_hit              = False,
+            transformation_time_ms = Safe_Float(call_duration_ms),
+            success                = True
+        )
+
+    def _run_pipeline(self, source_html : str                             ,                 # Steps 1 to 3 (raises on errors, and Proxy__Deadline__Exceeded when the budget runs out between steps)
+                            mode        : Enum__HTML__Transformation_Mode ,
+                            deadline    : Optional[Proxy__Deadline] = None
+                      ) -> Safe_Str__Html:
+        self.check_deadline(deadline, STEP__HTML_TO_HASHES)
+        step_1_result = self._step_1__get_hash_mapping(source_html, deadline)               # Step 1: HTML → Hash Mapping
+        html_dict     = step_1_result.html_dict
+        hash_mapping  = step_1_result.hash_mapping
+        self.check_deadline(deadline, STEP__SEMANTIC_TEXT)
+        transformed_mapping = self._step_2__transform_mapping(hash_mapping, mode, deadline) # Step 2: Transform Hash Mapping
+
+        self.check_deadline(deadline, STEP__HASHES_TO_HTML)
+        return self._step_3__reconstruct_html(html_dict,                                    # Step 3: Hash Mapping → HTML
+                                              transformed_mapping,
+                                              deadline)
+
+    def check_deadline(self, deadline : Optional[Proxy__Deadline] ,                          # Stop the pipeline before step when the budget is spent (or the caller already gave up)
+                             step     : str
+                       ) -> None:
+        if deadline is not None:
+            deadline.check(step)
+
+    def step_timeout(self, client_timeout : float                     ,                      # Timeout of a step's outbound call: the client's, capped by the budget left
+                           deadline       : Optional[Proxy__Deadline] ,
+                           step           : str
+                     ) -> float:
+        if deadline is None:
+            return float(client_timeout)
+        timeout = deadline.timeout_seconds(client_timeout)
+        if deadline.is_bounded() and timeout <= 0:                                          # spent since the step was checked (a 0 timeout would mean no timeout to the clients)
+            deadline.skip(step)
+            raise Proxy__Deadline__Exceeded(step)
+        return timeout
+
+    def _step_1__get_hash_mapping(self, source_html : Safe_Str__Html                     ,   # Get hash mapping from HTML
+                                        deadline    : Optional[Proxy__Deadline] = None
+                                   ) -> Schema__HTML__Transformation__Step_1:
+
+        if self.extracts_locally():
+            print(f"    📋 Step 1: Getting hash mapping locally...")
+            response = self.local_engine.html_to_dict_hashes(source_html)
+        else:
+            print(f"    📋 Step 1: Getting hash mapping from HTML Service...")
+            request  = Schema__Html__To__Dict__Hashes__Request(html=source_html)
+            response = self.html_service_client.get_dict_hashes(request, timeout=self.step_timeout(self.html_service_client.timeout, deadline, STEP__HTML_TO_HASHES))
 
         if not response.is_successful():
             raise Exception("Failed to get hash mapping from HTML Service")
@@ -100,11 +303,44 @@ class HTML__Transformation__Service(Type_Safe):
                                                     hash_mapping = response.hash_mapping)
 
     # todo: see if we can convert the Enum__Text__Transformation__Mode into Enum__HTML__Transformation_Mode (even better if we can make them compatible by making one the base class of the other)
-    def _step_2__transform_mapping(self, hash_mapping : Safe_Dict__Hash__To__Text      ,      # Hash mapping to transform
-                                         mode         : Enum__HTML__Transformation_Mode      # Transformation mode
+    def _step_2__transform_mapping(self, hash_mapping : Safe_Dict__Hash__To__Text        ,    # Hash mapping to transform
+                                         mode         : Enum__HTML__Transformation_Mode  ,    # Transformation mode
+                                         deadline     : Optional[Proxy__Deadline] = None
                                    ) -> Safe_Dict__Hash__To__Text:                                                # Transformed mapping
 
-        print(f"    🔄 Step 2: Transforming via Semantic Text Service...")
+        if self.transforms_locally(mode):
+            print(f"    🔄 Step 2: Transforming locally...")
+            return self.local_transformations.transform_mapping(hash_mapping, mode)
+
+        profile       = mode.value                                                          # the same text gets the same result for the same mode (i.e. same filters)
+        known, unseen = self.text_node_cache.split(profile, hash_mapping)
+        if not unseen:
+            print(f"    🔄 Step 2: All {len(known)} nodes served from the text node cache")
+            return Safe_Dict__Hash__To__Text(known)
+
+        print(f"    🔄 Step 2: Transforming {len(unseen)} nodes via Semantic Text Service ({len(known)} from the text node cache)...")
+
+        request  = self._build_semantic_text_request(Safe_Dict__Hash__To__Text(unseen), mode)
+        response = self.semantic_text_client.transform_text(request, timeout=self.step_timeout(self.semantic_text_client.timeout, deadline, STEP__SEMANTIC_TEXT))
+
+        if not response.success:
+            raise Exception(f"Semantic Text Service failed: {response.error_message}")
+
+        print(f"    🔄 Transformed {response.transformed_hashes}/{response.total_hashes} nodes")
+
+        self.text_node_cache.update(profile, response.transformed_mapping)
+        return self.merge_transformed_mapping(response.transformed_mapping, known)
+
+    def merge_transformed_mapping(self, transformed_mapping : Safe_Dict__Hash__To__Text ,    # Add the text nodes served from the text node cache to the service's response
+                                        known               : dict
+                                  ) -> Safe_Dict__Hash__To__Text:
+        for text_hash, text in known.items():
+            transformed_mapping[text_hash] = text
+        return transformed_mapping
+
+    def _build_semantic_text_request(self, hash_mapping : Safe_Dict__Hash__To__Text      ,   # Hash mapping to transform
+                                           mode         : Enum__HTML__Transformation_Mode     # Transformation mode
+                                     ) -> Schema__Semantic_Text__Transformation__Request:
 
         # semantic_mode = Enum__Text__Transformation__Mode(mode)                                # Convert to semantic-text mode
         #
@@ -127,32 +363,29 @@ class HTML__Transformation__Service(Type_Safe):
         visual_mode = mode.to_visual_mode()
 
         # 🆕 Build complete request with sentiment filters
-        request = Schema__Semantic_Text__Transformation__Request(
+        return Schema__Semantic_Text__Transformation__Request(
             hash_mapping=hash_mapping,
             engine_mode=engine_mode,                    # ← AWS Comprehend!
             criterion_filters=criterion_filters,         # ← Sentiment filters!
             logic_operator=logic_operator,              # ← AND/OR
             transformation_mode=visual_mode             # ← xxx, hashes
         )
-        response = self.semantic_text_client.transform_text(request)
 
-        if not response.success:
-            raise Exception(f"Semantic Text Service failed: {response.error_message}")
-
-        print(f"    🔄 Transformed {response.transformed_hashes}/{response.total_hashes} nodes")
-
-        return response.transformed_mapping
-
-    def _step_3__reconstruct_html(self, html_dict          : dict                   ,        # HTML structure
-                                        transformed_mapping : Safe_Dict__Hash__To__Text      # Transformed hash mapping
+    def _step_3__reconstruct_html(self, html_dict           : dict                           ,   # HTML structure
+                                        transformed_mapping : Safe_Dict__Hash__To__Text      ,   # Transformed hash mapping
+                                        deadline            : Optional[Proxy__Deadline] = None
                                   ) -> Safe_Str__Html:                                       # Reconstructed HTML
 
+        if self.reconstructs_locally():
+            print(f"    🔨 Step 3: Reconstructing HTML (locally)...")
+            return self.local_engine.reconstruct_from_hashes(html_dict, transformed_mapping)
+
         print(f"    🔨 Step 3: Reconstructing HTML...")
 
         request = Schema__Hashes__To__Html__Request(html_dict    = html_dict,
                                                     hash_mapping = transformed_mapping)
 
-        response = self.html_service_client.reconstruct_from_hashes(request)
+        response = self.html_service_client.reconstruct_from_hashes(request, timeout=self.step_timeout(self.html_service_client.timeout, deadline, STEP__HASHES_TO_HTML))
 
         if not response.is_successful():
             raise Exception("Failed to reconstruct HTML from hashes")
@@ -161,8 +394,16 @@ class HTML__Transformation__Service(Type_Safe):
 
         return response.body
 
-    def get_cached_transformation(self, target_url : str                                ,    # Target URL for cache lookup
-                                        mode       : Enum__HTML__Transformation_Mode         # Transformation mode
+    def transformation_refs(self, target_url   : str           ,                             # Entry that holds the transformations: the content entry (when the html hash is known) or the url entry
+                                  content_hash : Optional[str]
+                            ) -> Schema__Cache__Page__Refs:
+        if content_hash:
+            return self.cache_service.get_or_create_content_entry(content_hash)
+        return self.cache_service.get_or_create_page_entry(target_url)
+
+    def get_cached_transformation(self, target_url   : str                                ,  # Target URL for cache lookup
+                                        mode         : Enum__HTML__Transformation_Mode    ,  # Transformation mode
+                                        content_hash : Optional[str] = None                  # Hash of the source html (uses the content-addressed tier)
                                   ) -> Optional[Schema__HTML__Transformation__Result]:       # Cached result or None
 
         if not self.cache_service or not self.cache_service.cache_config.enabled:
@@ -171,33 +412,40 @@ class HTML__Transformation__Service(Type_Safe):
         if not mode.requires_caching():
             return None
 
-        page_refs    = self.cache_service.get_or_create_page_entry(target_url)
+        page_refs    = self.transformation_refs(target_url, content_hash)
         cache_id     = page_refs.cache_id
         data_key     = mode.to_cache_data_key()
         data_file_id = f'transformation-{mode}'
 
-        retrieve     = self.cache_service.cache_client.data().retrieve()
-        cached_html  = retrieve.data__string__with__id_and_key(cache_id     = cache_id        ,
-                                                               data_key     = data_key        ,
-                                                               data_file_id = data_file_id    ,
-                                                               namespace    = self.namespace())
+        cached_html, gzip_body = self.cache_service.retrieve_string__with_gzip(cache_id     = cache_id     ,   # decompressed (see Proxy__Cache__Compression)
+                                                                               data_key     = data_key     ,
+                                                                               data_file_id = data_file_id )
 
         if cached_html:
             self.cache_service.increment_cache_hit()
+            self.remember_precompressed(cached_html, gzip_body)
             print(f"         >>> Cache HIT for {mode.value}: {target_url}")
 
             return Schema__HTML__Transformation__Result(transformed_html       = cached_html            ,
                                                         transformation_mode    = mode                   ,
                                                         content_type           = mode.to_content_type() ,
                                                         cache_hit              = True                   ,
-                                                        transformation_time_ms = Safe_Float(0.0)        )
+                                                        transformation_time_ms = Safe_Float(0.0)        ,
+                                                        success                = True                   )
         else:
             self.cache_service.increment_cache_miss()
             return None
 
-    def _store_transformation_in_cache(self, target_url : str                                           ,  # Target URL for cache key
-                                             mode       : Enum__HTML__Transformation_Mode               ,  # Transformation mode
-                                             result     : Schema__HTML__Transformation__Result             # Result to cache
+    def remember_precompressed(self, html      : str            ,                            # Keep the gzip bytes a cached transformation was stored as, so its response needs no compression
+                                     gzip_body : Optional[bytes]
+                                ) -> None:
+        if gzip_body:
+            self.precompressed.put(self.precompressed.body_key(html.encode('utf-8')), CONTENT_ENCODING__GZIP, gzip_body)
+
+    def _store_transformation_in_cache(self, target_url   : str                                           ,  # Target URL for cache key
+                                             mode         : Enum__HTML__Transformation_Mode               ,  # Transformation mode
+                                             result       : Schema__HTML__Transformation__Result          ,  # Result to cache
+                                             content_hash : Optional[str] = None                             # Hash of the source html (uses the content-addressed tier)
                                         ) -> None:                                                       # No return value
 
         if not self.cache_service or not self.cache_service.cache_config.enabled:
@@ -206,37 +454,92 @@ class HTML__Transformation__Service(Type_Safe):
         if not mode.requires_caching():
             return
 
-        page_refs    = self.cache_service.get_or_create_page_entry(target_url)
+        page_refs    = self.transformation_refs(target_url, content_hash)
         cache_id     = page_refs.cache_id
         data_key     = mode.to_cache_data_key()
         data_file_id = f'transformation-{mode}'
 
-        self.cache_service.cache_client.data_store().data__store_string__with__id_and_key(body         = result.transformed_html,
-                                                                                          cache_id     = cache_id               ,
-                                                                                          data_file_id = data_file_id           ,
-                                                                                          data_key     = data_key               ,
-                                                                                          namespace    = self.namespace()       )
+        self.cache_service.store_string(body         = result.transformed_html,                # compressed (see Proxy__Cache__Compression)
+                                        cache_id     = cache_id               ,
+                                        data_file_id = data_file_id           ,
+                                        data_key     = data_key               )
+        self.store_transformation_meta(target_url, mode, content_hash)
 
         print(f"         >>> Cached {mode.value} transformation for {target_url}")
 
+    def transformation_ttl_seconds(self, mode : Enum__HTML__Transformation_Mode) -> int:     # Config override, or the mode's default (local modes never go stale)
+        if mode.is_local_transformation():
+            return mode.cache_ttl_seconds()
+        ttl_seconds = self.cache_service.cache_config.transformation_ttl_seconds
+        if ttl_seconds:
+            return int(ttl_seconds)
+        return mode.cache_ttl_seconds()
+
+    def store_transformation_meta(self, target_url   : str                             ,     # Remember when the transformation was cached (and for how long it is fresh)
+                                        mode         : Enum__HTML__Transformation_Mode ,
+                                        content_hash : Optional[str]                       = None,
+                                        meta         : Schema__Cache__Transformation__Meta = None
+                                  ) -> None:
+        meta = meta or Schema__Cache__Transformation__Meta(ttl_seconds=self.transformation_ttl_seconds(mode))
+        self.cache_service.freshness.put(self.single_flight_key(target_url, mode, content_hash), meta)
+
+    def transformation_meta(self, target_url   : str                             ,           # Freshness of the cached transformation (from memory, so a cache hit needs no extra read)
+                                  mode         : Enum__HTML__Transformation_Mode ,
+                                  content_hash : Optional[str] = None
+                            ) -> Schema__Cache__Transformation__Meta:
+        return self.cache_service.freshness.get(self.single_flight_key(target_url, mode, content_hash), self.transformation_ttl_seconds(mode))
+
+    def revalidate_if_stale(self, source_html  : str                             ,           # Start a background refresh when the cached transformation is stale
+                                  target_url   : str                             ,
+                                  mode         : Enum__HTML__Transformation_Mode ,
+                                  content_hash : Optional[str] = None
+                            ) -> bool:                                                        # True when a refresh was started
+        if not self.cache_service.cache_config.stale_while_revalidate:
+            return False
+        if not self.transformation_meta(target_url, mode, content_hash).is_stale():
+            return False
+        return self.revalidator.submit(self.single_flight_key(target_url, mode, content_hash),
+                                       lambda: self.revalidate(source_html, target_url, mode, content_hash))
+
+    def revalidate(self, source_html  : str                             ,                    # Recompute a transformation and overwrite the cached one
+                         target_url   : str                             ,
+                         mode         : Enum__HTML__Transformation_Mode ,
+                         content_hash : Optional[str] = None
+                   ) -> Schema__HTML__Transformation__Result:
+        result = self._pipeline_result(source_html, mode)                                    # errors propagate (so a failed refresh keeps the stale entry)
+        self._store_transformation_in_cache(target_url, mode, result, content_hash)
+        return result
+
     def store_original_html(self, target_url    : str                               ,          # Target URL for cache key
                                   original_html : str                                          # Original HTML to store
-                             ) -> None:                                                       # No return value
-
-        if not self.cache_service or not self.cache_service.cache_config.enabled:
-            return
-
-        page_refs    = self.cache_service.get_or_create_page_entry(target_url)
-        cache_id     = page_refs.cache_id
-        data_file_id = 'original-html'
-
-        self.cache_service.cache_client.data_store().data__store_string__with__id_and_key(
-            body         = original_html,
-            cache_id     = cache_id,
-            data_key     = "transformations/html",
-            data_file_id = data_file_id,
-            namespace    = self.namespace()
-        )
+                             ) -> bool:                                                       # True when an upload was started
+        if not self.cache_enabled():
+            return False
+
+        cache_key    = str(self.cache_service.url_to_cache_key(target_url))
+        content_hash = str(self.content_hash(original_html))
+        if not self.original_html_dedup.should_store(cache_key, content_hash, len(original_html.encode('utf-8'))):
+            return False                                                                      # same html as the last one stored for this url
+        if not self.original_html_uploads.submit(cache_key, lambda: self.upload_original_html(target_url, original_html)):
+            self.original_html_dedup.forget(cache_key)                                        # an upload for this url is still running (so the next response stores this html)
+            return False
+        return True
+
+    def original_html_stats(self) -> dict:                                                   # todo: refactor to Type_Safe class
+        return dict(self.original_html_dedup.stats(), uploads=self.original_html_uploads.stats())
+
+    def upload_original_html(self, target_url    : str ,                                     # Store the original html in the url's cache entry (runs in the background)
+                                   original_html : str
+                              ) -> None:
+        try:
+            page_refs = self.cache_service.get_or_create_page_entry(target_url)
+            self.cache_service.store_string(body         = original_html          ,
+                                            cache_id     = page_refs.cache_id     ,
+                                            data_key     = "transformations/html" ,
+                                            data_file_id = 'original-html'        )
+        except Exception:
+            self.original_html_dedup.forget(str(self.cache_service.url_to_cache_key(target_url)))     # not stored, so the next response tries again
+            raise
 
     def namespace(self):                                                                  # Return cache namespace
         return self.cache_service.cache_config.namespace
@@ -253,6 +556,13 @@ class HTML__Transformation__Service(Type_Safe):
             transformation_time_ms = Safe_Float(0.0)
         )
 
+    def _create_pending_result(self, source_html : str                             ,         # Original html, flagged as waiting for a background transformation
+                                     mode        : Enum__HTML__Transformation_Mode
+                               ) -> Schema__HTML__Transformation__Result:
+        result = self._create_passthrough_result(source_html, mode)
+        result.transformation_pending = True
+        return result
+
     def _create_error_result(self, source_html : str                                ,         # Source HTML
                                    mode        : Enum__HTML__Transformation_Mode    ,         # Transformation mode
                                    start_time  : float                                        # Start time
@@ -0,0 +1,375 @@
+import time
+import asyncio
+from typing                                                                                 import Any, Awaitable, Callable, Optional
+from osbot_utils.type_safe.primitives.core.Safe_Float                                       import Safe_Float
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Html                   import Safe_Str__Html
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode               import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result          import Schema__HTML__Transformation__Result
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Step_1          import Schema__HTML__Transformation__Step_1
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Hashes__To__Html__Request             import Schema__Hashes__To__Html__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Request       import Schema__Html__To__Dict__Hashes__Request
+from mgraph_ai_service_mitmproxy.schemas.html.safe_dict.Safe_Dict__Hash__To__Text           import Safe_Dict__Hash__To__Text
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service__Async                 import Proxy__Cache__Service__Async
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs            import Schema__Cache__Page__Refs
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight__Async                  import Proxy__Single_Flight__Async
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Revalidator__Async             import Proxy__Cache__Revalidator__Async
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta  import Schema__Cache__Transformation__Meta
+from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client__Async                  import HTML__Service__Client__Async
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service                 import HTML__Transformation__Service
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client__Async import Semantic_Text__Service__Client__Async
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                               import DEFAULT__PROXY__BUDGET__MIN_TRANSFORMATION_MS, STEP__HTML_TO_HASHES, STEP__SEMANTIC_TEXT, STEP__HASHES_TO_HTML
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                              import Proxy__Deadline, Proxy__Deadline__Exceeded
+
+
+class HTML__Transformation__Service__Async(HTML__Transformation__Service):                  # Async version of the 3-step transformation pipeline
+    html_service_client      : HTML__Service__Client__Async          = None
+    semantic_text_client     : Semantic_Text__Service__Client__Async = None
+    cache_service            : Proxy__Cache__Service__Async          = None
+    single_flight            : Proxy__Single_Flight__Async
+    revalidator              : Proxy__Cache__Revalidator__Async
+    deferred                 : Proxy__Cache__Revalidator__Async
+    original_html_uploads    : Proxy__Cache__Revalidator__Async
+
+    def setup(self) -> 'HTML__Transformation__Service__Async':
+        self.setup__clients()
+        self.cache_service        = Proxy__Cache__Service__Async().setup()
+        self.text_node_cache.cache_service = self.cache_service.cache_service
+        self.setup__pipeline()
+        self.setup__defer()
+        return self
+
+    def setup__clients(self) -> 'HTML__Transformation__Service__Async':            # httpx clients of the HTML and Semantic Text services (all that share_state doesn't provide)
+        self.html_service_client  = HTML__Service__Client__Async().setup()
+        self.semantic_text_client = Semantic_Text__Service__Client__Async()
+        return self
+
+    def share_state(self, service : HTML__Transformation__Service                  # Use the sync pipeline's settings, in-flight calls, failures and caches (so a page is handled the same whichever pipeline gets it)
+                     ) -> 'HTML__Transformation__Service__Async':               # (the circuit breakers are already shared: circuit_breakers is global)
+        self.pipeline            = service.pipeline
+        self.defer               = service.defer
+        self.cache_service       = Proxy__Cache__Service__Async(cache_service=service.cache_service)
+        self.single_flight       = Proxy__Single_Flight__Async (flights      =service.single_flight)
+        self.negative_cache      = service.negative_cache
+        self.text_node_cache     = service.text_node_cache
+        self.original_html_dedup = service.original_html_dedup
+        self.precompressed       = service.precompressed
+        return self
+
+    async def transform_html(self, source_html   : str                                  ,
+                                   target_url    : str                                  ,
+                                   mode          : Enum__HTML__Transformation_Mode ,
+                                   deadline      : Optional[Proxy__Deadline] = None
+                             ) -> Schema__HTML__Transformation__Result:
+
+        if not mode.is_active():
+            return self._create_passthrough_result(source_html, mode)
+
+        if self.defers(mode):
+            return await self._transform_html__deferred(source_html, target_url, mode)
+
+        if deadline is None or not deadline.is_bounded():
+            return await self._transform_html__single_flight(source_html, target_url, mode)
+
+        if not deadline.allows('transformation', DEFAULT__PROXY__BUDGET__MIN_TRANSFORMATION_MS):
+            return self._create_passthrough_result(source_html, mode)
+        task = asyncio.ensure_future(self._transform_html__single_flight(source_html, target_url, mode, deadline))
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=deadline.remaining_seconds())   # shielded: on timeout the call in flight completes (and the pipeline stops before its next step)
+        except asyncio.TimeoutError:
+            deadline.skip('transformation')
+            return self._create_passthrough_result(source_html, mode)
+
+    async def _transform_html__single_flight(self, source_html : str                             ,
+                                                   target_url  : str                             ,
+                                                   mode        : Enum__HTML__Transformation_Mode ,
+                                                   deadline    : Optional[Proxy__Deadline] = None
+                                             ) -> Schema__HTML__Transformation__Result:
+        content_hash = self.content_hash(source_html)
+        return await self.single_flight.do(self.single_flight_key(target_url, mode, content_hash),
+                                           lambda: self._transform_html(source_html, target_url, mode, content_hash, deadline))
+
+    async def _transform_html__deferred(self, source_html : str                             ,
+                                              target_url  : str                             ,
+                                              mode        : Enum__HTML__Transformation_Mode
+                                        ) -> Schema__HTML__Transformation__Result:
+        content_hash  = self.content_hash(source_html)
+        cached_result = await self.cache_call(lambda: self.get_cached_transformation(target_url, mode, content_hash))
+        if cached_result:
+            await self.cache_call(lambda: self.revalidate_if_stale(source_html, target_url, mode, content_hash))
+            return cached_result
+        if self.negative_cache.is_blocked(self.negative_cache_key(target_url, mode)):
+            return self._create_passthrough_result(source_html, mode)
+
+        self.deferred.submit(self.single_flight_key(target_url, mode, content_hash),
+                             lambda: self._transform_html__single_flight(source_html, target_url, mode))
+        return self._create_pending_result(source_html, mode)
+
+    def single_flight_key(self, target_url   : str                             ,
+                                mode         : Enum__HTML__Transformation_Mode ,
+                                content_hash : Optional[str] = None
+                          ) -> tuple:
+        if content_hash:
+            return (str(content_hash), mode.value)
+        cache_key = self.cache_service.cache_service.url_to_cache_key(target_url) if self.cache_service and self.cache_service.cache_service else target_url
+        return (str(cache_key), mode.value)
+
+    async def _transform_html(self, source_html   : str                                  ,
+                                    target_url    : str                                  ,
+                                    mode          : Enum__HTML__Transformation_Mode      ,
+                                    content_hash  : Optional[str]             = None       ,
+                                    deadline      : Optional[Proxy__Deadline] = None
+                              ) -> Schema__HTML__Transformation__Result:
+        cached_result = await self.cache_call(lambda: self.get_cached_transformation(target_url, mode, content_hash))
+        if cached_result:
+            await self.cache_call(lambda: self.revalidate_if_stale(source_html, target_url, mode, content_hash))
+            return cached_result
+
+        negative_key = self.negative_cache_key(target_url, mode)
+        if self.negative_cache.is_blocked(negative_key):
+            return self._create_passthrough_result(source_html, mode)
+
+        start_time = time.time()
+        try:
+            transformation_result = await self._pipeline_result(source_html, mode, deadline)
+        except Proxy__Deadline__Exceeded as step:
+            print(f"    ⏱️  Transformation stopped before '{step}' (out of budget)")
+            return self._create_passthrough_result(source_html, mode)
+        except Exception as e:
+            backoff = self.negative_cache.record_failure(negative_key, e)
+            print(f"    ⚠️  Transformation error (retry in {backoff:.0f}s): {e}")
+            return self._create_error_result(source_html, mode, start_time)
+        self.negative_cache.record_success(negative_key)
+
+        if transformation_result.transformed_html:
+            await self.cache_call(lambda: self._store_transformation_in_cache(target_url, mode, transformation_result, content_hash))
+
+        return transformation_result
+
+    def cache_enabled(self) -> bool:
+        return bool(self.cache_service and self.cache_service.enabled())
+
+    async def cache_call(self, target : Callable[[], Awaitable[Any]]) -> Any:
+        if not self.cache_enabled():
+            return await target()
+        breaker = self.cache_breaker()
+        if not breaker.allow():
+            return None
+        try:
+            result = await target()
+        except Exception as error:
+            breaker.record_failure()
+            print(f"    ⚠️  Cache error (non-fatal): {error}")
+            return None
+        breaker.record_success()
+        return result
+
+    async def _transform_via_services(self, source_html : str                             ,
+                                            mode        : Enum__HTML__Transformation_Mode
+                                      ) -> Schema__HTML__Transformation__Result:
+        start_time = time.time()
+
+        try:
+            return await self._pipeline_result(source_html, mode)
+        except Exception as e:
+            print(f"    ⚠️  Transformation error: {e}")
+            return self._create_error_result(source_html, mode, start_time)
+
+    async def _pipeline_result(self, source_html : str                             ,
+                                     mode        : Enum__HTML__Transformation_Mode ,
+                                     deadline    : Optional[Proxy__Deadline] = None
+                               ) -> Schema__HTML__Transformation__Result:
+        start_time          = time.time()
+        transformed_html    = await self._run_pipeline(source_html, mode, deadline)
+        call_duration_ms    = (time.time() - start_time) * 1000
+
+        print(f"    ✅ Transformation complete in {call_duration_ms/1000:.2f}s (async)")
+
+        return Schema__HTML__Transformation__Result(transformed_html       = transformed_html           ,
+                                                    transformation_mode    = mode                       ,
+                                                    content_type           = mode.to_content_type()     ,
+                                                    cache_hit              = False                      ,
+                                                    transformation_time_ms = Safe_Float(call_duration_ms),
+                                                    success                = True                       )
+
+    async def _run_pipeline(self, source_html : str                             ,
+                                  mode        : Enum__HTML__Transformation_Mode ,
+                                  deadline    : Optional[Proxy__Deadline] = None
+                            ) -> Safe_Str__Html:
+        self.check_deadline(deadline, STEP__HTML_TO_HASHES)
+        step_1_result       = await self._step_1__get_hash_mapping(source_html, deadline)
+        self.check_deadline(deadline, STEP__SEMANTIC_TEXT)
+        transformed_mapping = await self._step_2__transform_mapping(step_1_result.hash_mapping, mode, deadline)
+        self.check_deadline(deadline, STEP__HASHES_TO_HTML)
+        return await self._step_3__reconstruct_html(step_1_result.html_dict, transformed_mapping, deadline)
+
+    async def _step_1__get_hash_mapping(self, source_html : Safe_Str__Html                     ,
+                                              deadline    : Optional[Proxy__Deadline] = None
+                                         ) -> Schema__HTML__Transformation__Step_1:
+        if self.extracts_locally():
+            response = self.local_engine.html_to_dict_hashes(source_html)
+        else:
+            request  = Schema__Html__To__Dict__Hashes__Request(html=source_html)
+            response = await self.html_service_client.get_dict_hashes(request, timeout=self.step_timeout(self.html_service_client.timeout, deadline, STEP__HTML_TO_HASHES))
+
+        if not response.is_successful():
+            raise Exception("Failed to get hash mapping from HTML Service")
+
+        return Schema__HTML__Transformation__Step_1(html_dict    = response.html_dict   ,
+                                                    hash_mapping = response.hash_mapping)
+
+    async def _step_2__transform_mapping(self, hash_mapping : Safe_Dict__Hash__To__Text        ,
+                                               mode         : Enum__HTML__Transformation_Mode  ,
+                                               deadline     : Optional[Proxy__Deadline] = None
+                                         ) -> Safe_Dict__Hash__To__Text:
+        if self.transforms_locally(mode):
+            return self.local_transformations.transform_mapping(hash_mapping, mode)
+
+        profile       = mode.value
+        known, unseen = await asyncio.to_thread(self.text_node_cache.split, profile, hash_mapping)     # the first split of a profile may load it from the cache service
+        if not unseen:
+            return Safe_Dict__Hash__To__Text(known)
+
+        request  = self._build_semantic_text_request(Safe_Dict__Hash__To__Text(unseen), mode)
+        response = await self.semantic_text_client.transform_text(request, timeout=self.step_timeout(self.semantic_text_client.timeout, deadline, STEP__SEMANTIC_TEXT))
+
+        if not response.success:
+            raise Exception(f"Semantic Text Service failed: {response.error_message}")
+
+        await asyncio.to_thread(self.text_node_cache.update, profile, response.transformed_mapping)    # may save the profile to the cache service
+        return self.merge_transformed_mapping(response.transformed_mapping, known)
+
+    async def _step_3__reconstruct_html(self, html_dict           : dict                           ,
+                                              transformed_mapping : Safe_Dict__Hash__To__Text      ,
+                                              deadline            : Optional[Proxy__Deadline] = None
+                                        ) -> Safe_Str__Html:
+        if self.reconstructs_locally():
+            return self.local_engine.reconstruct_from_hashes(html_dict, transformed_mapping)
+
+        request  = Schema__Hashes__To__Html__Request(html_dict    = html_dict          ,
+                                                     hash_mapping = transformed_mapping)
+        response = await self.html_service_client.reconstruct_from_hashes(request, timeout=self.step_timeout(self.html_service_client.timeout, deadline, STEP__HASHES_TO_HTML))
+
+        if not response.is_successful():
+            raise Exception("Failed to reconstruct HTML from hashes")
+
+        return response.body
+
+    async def transformation_refs(self, target_url   : str           ,
+                                        content_hash : Optional[str]
+                                  ) -> Schema__Cache__Page__Refs:
+        if content_hash:
+            return await self.cache_service.get_or_create_content_entry(content_hash)
+        return await self.cache_service.get_or_create_page_entry(target_url)
+
+    async def get_cached_transformation(self, target_url   : str                                ,
+                                              mode         : Enum__HTML__Transformation_Mode    ,
+                                              content_hash : Optional[str] = None
+                                        ) -> Optional[Schema__HTML__Transformation__Result]:
+        if not self.cache_service or not self.cache_service.enabled():
+            return None
+        if not mode.requires_caching():
+            return None
+
+        page_refs   = await self.transformation_refs(target_url, content_hash)
+        cached_html, gzip_body = await self.cache_service.retrieve_string__with_gzip(cache_id     = page_refs.cache_id        ,
+                                                                                     data_key     = mode.to_cache_data_key()  ,
+                                                                                     data_file_id = f'transformation-{mode}'  )
+        if cached_html:
+            self.cache_service.increment_cache_hit()
+            self.remember_precompressed(cached_html, gzip_body)
+            return Schema__HTML__Transformation__Result(transformed_html       = cached_html            ,
+                                                        transformation_mode    = mode                   ,
+                                                        content_type           = mode.to_content_type() ,
+                                                        cache_hit              = True                   ,
+                                                        transformation_time_ms = Safe_Float(0.0)        ,
+                                                        success                = True                   )
+        self.cache_service.increment_cache_miss()
+        return None
+
+    async def _store_transformation_in_cache(self, target_url   : str                                 ,
+                                                   mode         : Enum__HTML__Transformation_Mode     ,
+                                                   result       : Schema__HTML__Transformation__Result,
+                                                   content_hash : Optional[str] = None
+                                              ) -> None:
+        if not self.cache_service or not self.cache_service.enabled():
+            return
+        if not mode.requires_caching():
+            return
+
+        page_refs = await self.transformation_refs(target_url, content_hash)
+        await self.cache_service.store_string(cache_id     = page_refs.cache_id        ,
+                                              data_key     = mode.to_cache_data_key()  ,
+                                              data_file_id = f'transformation-{mode}'  ,
+                                              body         = result.transformed_html   )
+        self.store_transformation_meta(target_url, mode, content_hash)
+
+    def transformation_ttl_seconds(self, mode : Enum__HTML__Transformation_Mode) -> int:
+        if mode.is_local_transformation():
+            return mode.cache_ttl_seconds()
+        ttl_seconds = self.cache_service.cache_service.cache_config.transformation_ttl_seconds
+        if ttl_seconds:
+            return int(ttl_seconds)
+        return mode.cache_ttl_seconds()
+
+    def store_transformation_meta(self, target_url   : str                             ,     # in memory, shared with the sync service (see Proxy__Cache__Freshness)
+                                        mode         : Enum__HTML__Transformation_Mode ,
+                                        content_hash : Optional[str]                       = None,
+                                        meta         : Schema__Cache__Transformation__Meta = None
+                                  ) -> None:
+        meta = meta or Schema__Cache__Transformation__Meta(ttl_seconds=self.transformation_ttl_seconds(mode))
+        self.cache_service.cache_service.freshness.put(self.single_flight_key(target_url, mode, content_hash), meta)
+
+    def transformation_meta(self, target_url   : str                             ,
+                                  mode         : Enum__HTML__Transformation_Mode ,
+                                  content_hash : Optional[str] = None
+                            ) -> Schema__Cache__Transformation__Meta:
+        return self.cache_service.cache_service.freshness.get(self.single_flight_key(target_url, mode, content_hash), self.transformation_ttl_seconds(mode))
+
+    async def revalidate_if_stale(self, source_html  : str                             ,
+                                        target_url   : str                             ,
+                                        mode         : Enum__HTML__Transformation_Mode ,
+                                        content_hash : Optional[str] = None
+                                  ) -> bool:
+        if not self.cache_service.cache_service.cache_config.stale_while_revalidate:
+            return False
+        if not self.transformation_meta(target_url, mode, content_hash).is_stale():
+            return False
+        return self.revalidator.submit(self.single_flight_key(target_url, mode, content_hash),
+                                       lambda: self.revalidate(source_html, target_url, mode, content_hash))
+
+    async def revalidate(self, source_html  : str                             ,
+                               target_url   : str                             ,
+                               mode         : Enum__HTML__Transformation_Mode ,
+                               content_hash : Optional[str] = None
+                         ) -> Schema__HTML__Transformation__Result:
+        result = await self._pipeline_result(source_html, mode)
+        await self._store_transformation_in_cache(target_url, mode, result, content_hash)
+        return result
+
+    async def store_original_html(self, target_url    : str ,
+                                        original_html : str
+                                   ) -> bool:
+        if not self.cache_enabled():
+            return False
+
+        cache_key    = str(self.cache_service.cache_service.url_to_cache_key(target_url))
+        content_hash = str(self.content_hash(original_html))
+        if not self.original_html_dedup.should_store(cache_key, content_hash, len(original_html.encode('utf-8'))):
+            return False
+        if not self.original_html_uploads.submit(cache_key, lambda: self.upload_original_html(target_url, original_html)):
+            self.original_html_dedup.forget(cache_key)
+            return False
+        return True
+
+    async def upload_original_html(self, target_url    : str ,
+                                         original_html : str
+                                    ) -> None:
+        try:
+            page_refs = await self.cache_service.get_or_create_page_entry(target_url)
+            await self.cache_service.store_string(cache_id     = page_refs.cache_id     ,
+                                                  data_key     = "transformations/html" ,
+                                                  data_file_id = 'original-html'        ,
+                                                  body         = original_html          )
+        except Exception:
+            self.original_html_dedup.forget(str(self.cache_service.cache_service.url_to_cache_key(target_url)))
+            raise
@@ -0,0 +1,124 @@
+import time
+from concurrent.futures                                                                     import ThreadPoolExecutor
+from typing                                                                                 import Callable
+from osbot_utils.type_safe.Type_Safe                                                        import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                                       import Safe_Float
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                        import Safe_UInt
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode               import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Request  import Schema__HTML__Transformation__Batch__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Response import Schema__HTML__Transformation__Batch__Response
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result          import Schema__HTML__Transformation__Result
+from mgraph_ai_service_mitmproxy.schemas.html.safe_dict.Safe_Dict__Hash__To__Text           import Safe_Dict__Hash__To__Text
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service                 import HTML__Transformation__Service
+
+DEFAULT__HTML_BATCH__MAX_WORKERS = 8                                                        # pages extracted / reconstructed in parallel
+
+
+class HTML__Transformation__Service__Batch(Type_Safe):                                      # Transforms many pages in one call: one step 2 (semantic-text) request per mode, with text nodes de-duplicated across pages
+    html_transformation_service : HTML__Transformation__Service = None                      # Shares caches (pages, contents, text nodes) with the proxy's pipeline
+    max_workers                 : Safe_UInt                     = Safe_UInt(DEFAULT__HTML_BATCH__MAX_WORKERS)
+
+    def setup(self) -> 'HTML__Transformation__Service__Batch':
+        self.html_transformation_service = HTML__Transformation__Service().setup()
+        return self
+
+    def transform_html_batch(self, request : Schema__HTML__Transformation__Batch__Request
+                              ) -> Schema__HTML__Transformation__Batch__Response:
+        start_time = time.time()
+        service    = self.html_transformation_service
+        items      = request.items
+        response   = Schema__HTML__Transformation__Batch__Response(total_items=len(items))
+        results    = [None] * len(items)
+        pages      = {}                                                                     # (content_hash, mode) -> indexes of the items with that html and mode
+        hashes     = {}                                                                     # (content_hash, mode) -> content_hash (None when there is no cache service)
+
+        for index, item in enumerate(items):                                                # passthroughs, cache hits and duplicate pages don't need the pipeline
+            if not item.mode.is_active() or service.negative_cache.is_blocked(service.negative_cache_key(item.target_url, item.mode)):
+                results[index] = service._create_passthrough_result(item.source_html, item.mode)
+                continue
+            content_hash = service.content_hash(item.source_html)
+            cached       = service.get_cached_transformation(item.target_url, item.mode, content_hash)
+            if cached:
+                results[index]       = cached
+                response.cache_hits += 1
+                continue
+            page_key = (str(content_hash) if content_hash else index, item.mode)            # without a content hash, pages can't be de-duplicated
+            pages .setdefault(page_key, []).append(index)
+            hashes[page_key] = content_hash
+
+        page_keys       = list(pages)
+        leaders         = [items[pages[page_key][0]] for page_key in page_keys]
+        step_1_results  = self.in_parallel(lambda item: service._step_1__get_hash_mapping(item.source_html), leaders)
+
+        transformed_by_mode = {}
+        for mode in dict.fromkeys(page_key[1] for page_key in page_keys):                   # Step 2: one call per mode with the hashes of all its pages
+            merged_mapping = Safe_Dict__Hash__To__Text()
+            for page_key, step_1 in zip(page_keys, step_1_results):
+                if page_key[1] == mode and not isinstance(step_1, Exception):
+                    response.text_nodes_total += len(step_1.hash_mapping)
+                    merged_mapping.update(step_1.hash_mapping)
+            response.text_nodes_unique += len(merged_mapping)
+            try:
+                transformed_by_mode[mode] = service._step_2__transform_mapping(merged_mapping, mode) if merged_mapping else Safe_Dict__Hash__To__Text()
+            except Exception as error:
+                print(f"    ⚠️  Batch transformation error ({mode.value}): {error}")
+                transformed_by_mode[mode] = error
+
+        def reconstruct(page):                                                              # Step 3: each page gets the slice of the mapping it uses
+            step_1, transformed_mapping = page
+            if isinstance(step_1, Exception):
+                return step_1
+            if isinstance(transformed_mapping, Exception):
+                return transformed_mapping
+            page_mapping = Safe_Dict__Hash__To__Text({text_hash: transformed_mapping[text_hash] for text_hash in step_1.hash_mapping if text_hash in transformed_mapping})
+            return service._step_3__reconstruct_html(step_1.html_dict, page_mapping)
+
+        reconstructed = self.in_parallel(reconstruct, [(step_1, transformed_by_mode[page_key[1]]) for page_key, step_1 in zip(page_keys, step_1_results)])
+
+        for page_key, transformed_html in zip(page_keys, reconstructed):
+            indexes      = pages[page_key]
+            mode         = page_key[1]
+            content_hash = hashes[page_key]
+            if isinstance(transformed_html, Exception):
+                for index in indexes:
+                    service.negative_cache.record_failure(service.negative_cache_key(items[index].target_url, mode), transformed_html)
+                    results[index] = service._create_error_result(items[index].source_html, mode, start_time)
+                continue
+            response.transformed_pages += 1
+            result = Schema__HTML__Transformation__Result(transformed_html       = transformed_html                             ,
+                                                          transformation_mode    = mode                                         ,
+                                                          content_type           = mode.to_content_type()                       ,
+                                                          cache_hit              = False                                        ,
+                                                          transformation_time_ms = Safe_Float((time.time() - start_time) * 1000),
+                                                          success                = True                                         )
+            self.store_in_cache(items[indexes[0]].target_url, mode, result, content_hash)
+            for index in indexes:
+                results[index] = result
+
+        response.results     = results
+        response.duration_ms = Safe_Float((time.time() - start_time) * 1000)
+        return response
+
+    def store_in_cache(self, target_url   : str                                  ,          # Store the page's transformation once (the content entry is keyed on the html, so every url that served it finds it)
+                             mode         : Enum__HTML__Transformation_Mode      ,
+                             result       : Schema__HTML__Transformation__Result ,
+                             content_hash : str = None
+                        ) -> None:
+        service = self.html_transformation_service
+        try:
+            service._store_transformation_in_cache(target_url, mode, result, content_hash)
+        except Exception as error:
+            print(f"    ⚠️  Batch cache store error: {error}")
+
+    def in_parallel(self, target : Callable ,                                               # Run target on every value (on up to max_workers threads), exceptions are returned instead of raised
+                          values : list
+                     ) -> list:
+        def run(value):
+            try:
+                return target(value)
+            except Exception as error:
+                return error
+        if len(values) <= 1:
+            return [run(value) for value in values]
+        with ThreadPoolExecutor(max_workers=min(int(self.max_workers) or 1, len(values))) as executor:
+            return list(executor.map(run, values))
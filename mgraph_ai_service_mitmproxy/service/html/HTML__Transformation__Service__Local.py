@@ -4,6 +4,8 @@ from osbot_utils.type_safe.Type_Safe import Type_Safe
 from osbot_utils.type_safe.primitives.domains.cryptography.safe_str.Safe_Str__Hash import Safe_Str__Hash
 from osbot_utils.utils.Dev import pprint
 
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode import Enum__HTML__Transformation_Mode
+
 from mgraph_ai_service_mitmproxy.service.html.Text__Grouping__Service import Text__Grouping__Service
 
 
@@ -23,6 +25,24 @@ class HTML__Transformation__Service__Local(Type_Safe):
 
     randomness_percentage: float = 0.5  # Default: 50% of text nodes will be transformed
 
+    def transform_mapping(self,
+                          hash_mapping: Dict[Safe_Str__Hash, str],
+                          mode: Enum__HTML__Transformation_Mode
+                         ) -> Dict[Safe_Str__Hash, str]:
+        """
+        Apply a local transformation mode to a hash mapping.
+
+        Used by the 'local' pipeline, where the hash mapping comes from
+        HTML__Local__Engine, so local modes never leave the process.
+        """
+        transformations = { Enum__HTML__Transformation_Mode.XXX_RANDOM    : self.transform_xxx_random_via_hashes   ,
+                            Enum__HTML__Transformation_Mode.HASHES_RANDOM : self.transform_hashes_random_via_hashes ,
+                            Enum__HTML__Transformation_Mode.ABCDE_BY_SIZE : self.transform_abcde_by_size_via_hashes}
+        transformation = transformations.get(mode)
+        if transformation is None:
+            raise ValueError(f"Mode is not a local transformation: {mode}")
+        return transformation(html_dict={}, hash_mapping=hash_mapping)
+
     def transform_xxx_random_via_hashes(self,
                                        html_dict: dict,
                                        hash_mapping: Dict[Safe_Str__Hash, str]
@@ -0,0 +1,99 @@
+import asyncio
+import httpx
+from urllib.parse                                                   import urlparse
+from osbot_utils.type_safe.Type_Safe                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                import Safe_UInt
+from osbot_utils.utils.Env                                          import get_env
+from mgraph_ai_service_mitmproxy.service.consts.consts__http        import (ENV_VAR__HTTP_ASYNC__MAX_CONNECTIONS,
+                                                                            ENV_VAR__HTTP_POOL__POOL_MAXSIZE    ,
+                                                                            ENV_VAR__HTTP_POOL__MAX_RETRIES     ,
+                                                                            DEFAULT__HTTP_ASYNC__MAX_CONNECTIONS,
+                                                                            DEFAULT__HTTP_POOL__POOL_MAXSIZE    ,
+                                                                            DEFAULT__HTTP_POOL__MAX_RETRIES     )
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker      import Http__Circuit__Open__Error
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers     import circuit_breakers
+
+class Http__Async__Client__Pool(Type_Safe):                                         # Shared keep-alive httpx.AsyncClient for the async pipeline
+    max_connections           : Safe_UInt = Safe_UInt(DEFAULT__HTTP_ASYNC__MAX_CONNECTIONS)
+    max_keepalive_connections : Safe_UInt = Safe_UInt(DEFAULT__HTTP_POOL__POOL_MAXSIZE    )
+    max_retries               : Safe_UInt = Safe_UInt(DEFAULT__HTTP_POOL__MAX_RETRIES     ) # httpx only retries connect errors, so POSTs are never replayed
+    clients_created           : Safe_UInt
+    requests_total            : Safe_UInt
+    errors_total              : Safe_UInt
+    in_flight                 : Safe_UInt                                           # requests currently awaiting a response
+    in_flight_peak            : Safe_UInt
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.async_client = None                                                    # httpx.AsyncClient is bound to the event loop that created it
+        self.client_loop  = None
+
+    def setup(self) -> 'Http__Async__Client__Pool':                                 # Load pool configuration from environment variables
+        max_connections = get_env(ENV_VAR__HTTP_ASYNC__MAX_CONNECTIONS)
+        pool_maxsize    = get_env(ENV_VAR__HTTP_POOL__POOL_MAXSIZE    )
+        max_retries     = get_env(ENV_VAR__HTTP_POOL__MAX_RETRIES     )
+        if max_connections: self.max_connections           = int(max_connections)
+        if pool_maxsize   : self.max_keepalive_connections = int(pool_maxsize   )
+        if max_retries    : self.max_retries               = int(max_retries    )
+        return self
+
+    def client(self) -> httpx.AsyncClient:                                          # Get (or create) the client for the running event loop
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or self.client_loop is not loop or self.async_client.is_closed:
+            limits            = httpx.Limits(max_connections           = int(self.max_connections          ),
+                                             max_keepalive_connections = int(self.max_keepalive_connections))
+            transport         = httpx.AsyncHTTPTransport(limits=limits, retries=int(self.max_retries))
+            self.async_client = httpx.AsyncClient(transport=transport)
+            self.client_loop  = loop
+            self.clients_created += 1
+        return self.async_client
+
+    async def request(self, method : str, url : str, **kwargs) -> httpx.Response:  # Same kwargs as httpx.AsyncClient.request (headers, json, timeout, ...)
+        parsed  = urlparse(str(url))
+        host    = f"{parsed.scheme}://{parsed.netloc}"                               # same key as Http__Session__Pool.host_key (so both pools share a backend's breaker)
+        breaker = circuit_breakers.breaker(host)
+        if not breaker.allow():                                                     # backend is unhealthy: fail fast instead of waiting for its timeout
+            raise Http__Circuit__Open__Error(f"circuit breaker open for {host}")
+        client               = self.client()
+        self.requests_total += 1
+        self.in_flight      += 1
+        if self.in_flight > self.in_flight_peak:
+            self.in_flight_peak = self.in_flight
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def get(self, url : str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url : str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self) -> None:
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+            self.client_loop  = None
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "max_connections"           : int(self.max_connections          ) ,
+                 "max_keepalive_connections" : int(self.max_keepalive_connections) ,
+                 "max_retries"               : int(self.max_retries              ) ,
+                 "clients_created"           : int(self.clients_created          ) ,
+                 "requests_total"            : int(self.requests_total           ) ,
+                 "errors_total"              : int(self.errors_total             ) ,
+                 "in_flight"                 : int(self.in_flight                ) ,
+                 "in_flight_peak"            : int(self.in_flight_peak           ) }
+
+
+http_async_client_pool = Http__Async__Client__Pool().setup()                        # Singleton shared by all async backend clients
@@ -0,0 +1,103 @@
+import time
+import threading
+import requests
+from collections                                                                    import deque
+from typing                                                                         import Any, Callable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                        import (DEFAULT__CIRCUIT_BREAKER__FAILURE_RATE,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__MIN_CALLS   ,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__OPEN_SECONDS,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__WINDOW_SIZE )
+from mgraph_ai_service_mitmproxy.service.http.schemas.Enum__Circuit_Breaker__State  import Enum__Circuit_Breaker__State
+
+
+class Http__Circuit__Open__Error(requests.RequestException):                        # Raised instead of calling a backend whose breaker is open (a RequestException, so the clients' existing error handling applies)
+    pass
+
+
+class Http__Circuit__Breaker(Type_Safe):                                            # Fails fast while a backend's recent failure rate is too high, then lets one probe through to check if it recovered
+    name          : str                                                             # backend (host) this breaker protects
+    failure_rate  : float     = DEFAULT__CIRCUIT_BREAKER__FAILURE_RATE              # 0 disables the breaker
+    min_calls     : Safe_UInt = Safe_UInt(DEFAULT__CIRCUIT_BREAKER__MIN_CALLS   )
+    open_seconds  : Safe_UInt = Safe_UInt(DEFAULT__CIRCUIT_BREAKER__OPEN_SECONDS)
+    window_size   : Safe_UInt = Safe_UInt(DEFAULT__CIRCUIT_BREAKER__WINDOW_SIZE )
+    state         : Enum__Circuit_Breaker__State = Enum__Circuit_Breaker__State.CLOSED
+    times_opened  : Safe_UInt
+    rejected      : Safe_UInt                                                       # calls failed fast while open
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock      = threading.Lock()                                           # shared by FastAPI's worker threads
+        self.outcomes  = deque(maxlen=int(self.window_size))                        # True = success, most recent last
+        self.opened_at = 0.0                                                        # time.monotonic() when the breaker last opened
+        self.probing   = False                                                      # a half-open probe is in flight
+
+    def enabled(self) -> bool:
+        return self.failure_rate > 0
+
+    def allow(self) -> bool:                                                        # Can a call go through now? (moves open -> half_open once open_seconds have passed)
+        if not self.enabled():
+            return True
+        with self.lock:
+            if self.state == Enum__Circuit_Breaker__State.CLOSED:
+                return True
+            if self.state == Enum__Circuit_Breaker__State.OPEN and time.monotonic() - self.opened_at >= int(self.open_seconds):
+                self.state = Enum__Circuit_Breaker__State.HALF_OPEN
+            if self.state == Enum__Circuit_Breaker__State.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            if self.state == Enum__Circuit_Breaker__State.HALF_OPEN:                # the probe worked: start afresh
+                self.outcomes.clear()
+                self.state   = Enum__Circuit_Breaker__State.CLOSED
+                self.probing = False
+            self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.outcomes.append(False)
+            if self.state == Enum__Circuit_Breaker__State.HALF_OPEN:                # the probe failed: stay open for another open_seconds
+                self.open()
+            elif self.state == Enum__Circuit_Breaker__State.CLOSED and len(self.outcomes) >= int(self.min_calls):
+                if self.current_failure_rate() >= self.failure_rate:
+                    self.open()
+
+    def open(self) -> None:                                                         # (called with the lock held)
+        self.state         = Enum__Circuit_Breaker__State.OPEN
+        self.opened_at     = time.monotonic()
+        self.probing       = False
+        self.times_opened += 1
+
+    def current_failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def call(self, target : Callable[[], Any]) -> Any:                              # Run target through the breaker (raises Http__Circuit__Open__Error when open)
+        if not self.allow():
+            raise Http__Circuit__Open__Error(f"circuit breaker open for {self.name}")
+        try:
+            result = target()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        with self.lock:
+            self.outcomes.clear()
+            self.state   = Enum__Circuit_Breaker__State.CLOSED
+            self.probing = False
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "state"        : self.state.value                     ,
+                 "failure_rate" : round(self.current_failure_rate(), 3),
+                 "calls"        : len(self.outcomes)                   ,
+                 "times_opened" : int(self.times_opened)               ,
+                 "rejected"     : int(self.rejected    )               }
@@ -0,0 +1,54 @@
+import threading
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from osbot_utils.utils.Env                                                          import get_env
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                        import (ENV_VAR__CIRCUIT_BREAKER__FAILURE_RATE,
+                                                                                            ENV_VAR__CIRCUIT_BREAKER__MIN_CALLS   ,
+                                                                                            ENV_VAR__CIRCUIT_BREAKER__OPEN_SECONDS,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__FAILURE_RATE,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__MIN_CALLS   ,
+                                                                                            DEFAULT__CIRCUIT_BREAKER__OPEN_SECONDS)
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker                import Http__Circuit__Breaker
+
+
+class Http__Circuit__Breakers(Type_Safe):                                           # One circuit breaker per backend (keyed by host), created on first use
+    failure_rate : float     = DEFAULT__CIRCUIT_BREAKER__FAILURE_RATE
+    min_calls    : Safe_UInt = Safe_UInt(DEFAULT__CIRCUIT_BREAKER__MIN_CALLS   )
+    open_seconds : Safe_UInt = Safe_UInt(DEFAULT__CIRCUIT_BREAKER__OPEN_SECONDS)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock     = threading.Lock()
+        self.breakers = {}                                                          # name -> Http__Circuit__Breaker
+
+    def setup(self) -> 'Http__Circuit__Breakers':                                   # Load the thresholds from environment variables
+        failure_rate = get_env(ENV_VAR__CIRCUIT_BREAKER__FAILURE_RATE)
+        min_calls    = get_env(ENV_VAR__CIRCUIT_BREAKER__MIN_CALLS   )
+        open_seconds = get_env(ENV_VAR__CIRCUIT_BREAKER__OPEN_SECONDS)
+        if failure_rate: self.failure_rate = float(failure_rate)
+        if min_calls   : self.min_calls    = int  (min_calls   )
+        if open_seconds: self.open_seconds = int  (open_seconds)
+        return self
+
+    def breaker(self, name : str) -> Http__Circuit__Breaker:                        # Get (or lazily create) the breaker for name
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            with self.lock:
+                breaker = self.breakers.get(name)
+                if breaker is None:
+                    breaker = Http__Circuit__Breaker(name         = name             ,
+                                                     failure_rate = self.failure_rate,
+                                                     min_calls    = self.min_calls   ,
+                                                     open_seconds = self.open_seconds)
+                    self.breakers[name] = breaker
+        return breaker
+
+    def reset(self) -> None:                                                        # Close every breaker (e.g. after a backend was fixed)
+        for breaker in list(self.breakers.values()):
+            breaker.reset()
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { name: breaker.stats() for name, breaker in list(self.breakers.items()) }
+
+
+circuit_breakers = Http__Circuit__Breakers().setup()                                # Singleton shared by the session pool, the async client pool and the cache
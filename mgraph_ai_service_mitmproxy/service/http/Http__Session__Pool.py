@@ -0,0 +1,152 @@
+import threading
+import requests
+from urllib.parse                                                   import urlparse
+from requests.adapters                                              import HTTPAdapter
+from urllib3.util.retry                                             import Retry
+from osbot_utils.type_safe.Type_Safe                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                import Safe_UInt
+from osbot_utils.utils.Env                                          import get_env
+from mgraph_ai_service_mitmproxy.service.consts.consts__http        import (ENV_VAR__HTTP_POOL__POOL_CONNECTIONS,
+                                                                            ENV_VAR__HTTP_POOL__POOL_MAXSIZE    ,
+                                                                            ENV_VAR__HTTP_POOL__MAX_RETRIES     ,
+                                                                            ENV_VAR__HTTP_POOL__BACKOFF_FACTOR  ,
+                                                                            DEFAULT__HTTP_POOL__POOL_CONNECTIONS,
+                                                                            DEFAULT__HTTP_POOL__POOL_MAXSIZE    ,
+                                                                            DEFAULT__HTTP_POOL__MAX_RETRIES     ,
+                                                                            DEFAULT__HTTP_POOL__BACKOFF_FACTOR  ,
+                                                                            DEFAULT__HTTP_POOL__RETRY_STATUSES  ,
+                                                                            DEFAULT__HTTP_POOL__RETRY_METHODS   )
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker      import Http__Circuit__Open__Error
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers     import circuit_breakers
+
+
+class Http__Session__Pool(Type_Safe):                                               # Shared keep-alive requests.Session per backend host
+    pool_connections : Safe_UInt = Safe_UInt(DEFAULT__HTTP_POOL__POOL_CONNECTIONS)  # urllib3 pools cached per session
+    pool_maxsize     : Safe_UInt = Safe_UInt(DEFAULT__HTTP_POOL__POOL_MAXSIZE    )  # keep-alive connections kept per host
+    max_retries      : Safe_UInt = Safe_UInt(DEFAULT__HTTP_POOL__MAX_RETRIES     )  # 0 disables retries
+    backoff_factor   : float     = DEFAULT__HTTP_POOL__BACKOFF_FACTOR               # sleep = backoff_factor * 2 ** (retry - 1)
+    retry_on_status  : bool      = True                                             # False for paid backends: a 502/503/504 is returned to the caller, never replayed
+    sessions         : dict                                                         # host (scheme://netloc) -> requests.Session
+    host_requests    : dict                                                         # host -> number of requests sent via the pool
+    host_errors      : dict                                                         # host -> number of requests that raised
+    sessions_created : Safe_UInt
+    requests_total   : Safe_UInt
+    errors_total     : Safe_UInt
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # sessions are created lazily from FastAPI's worker threads
+
+    def setup(self) -> 'Http__Session__Pool':                                       # Load pool configuration from environment variables
+        pool_connections = get_env(ENV_VAR__HTTP_POOL__POOL_CONNECTIONS)
+        pool_maxsize     = get_env(ENV_VAR__HTTP_POOL__POOL_MAXSIZE    )
+        max_retries      = get_env(ENV_VAR__HTTP_POOL__MAX_RETRIES     )
+        backoff_factor   = get_env(ENV_VAR__HTTP_POOL__BACKOFF_FACTOR  )
+        if pool_connections: self.pool_connections = int  (pool_connections)
+        if pool_maxsize    : self.pool_maxsize     = int  (pool_maxsize    )
+        if max_retries     : self.max_retries      = int  (max_retries     )
+        if backoff_factor  : self.backoff_factor   = float(backoff_factor  )
+        return self
+
+    def host_key(self, url : str) -> str:                                           # Sessions are keyed by scheme://netloc
+        parsed = urlparse(str(url))
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def retry_policy(self) -> Retry:                                                # Connect errors are always safe to retry (nothing was sent),
+        status_retries = int(self.max_retries) if self.retry_on_status else 0       # status retries only apply to idempotent methods (and never to paid backends)
+        return Retry(total            = int(self.max_retries)                                           ,
+                     connect          = int(self.max_retries)                                           ,
+                     read             = 0                                                               ,
+                     status           = status_retries                                                  ,
+                     backoff_factor   = self.backoff_factor                                             ,
+                     status_forcelist = DEFAULT__HTTP_POOL__RETRY_STATUSES if self.retry_on_status else (),
+                     allowed_methods  = DEFAULT__HTTP_POOL__RETRY_METHODS                               ,
+                     raise_on_status  = False                                                           )
+
+    def new_session(self) -> requests.Session:
+        adapter = HTTPAdapter(pool_connections = int(self.pool_connections),
+                              pool_maxsize     = int(self.pool_maxsize    ),
+                              max_retries      = self.retry_policy()       )
+        session = requests.Session()
+        session.mount('http://' , adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session(self, url : str) -> requests.Session:                               # Get (or lazily create) the session for url's host
+        host    = self.host_key(url)
+        session = self.sessions.get(host)
+        if session is None:
+            with self.lock:
+                session = self.sessions.get(host)
+                if session is None:
+                    session                 = self.new_session()
+                    self.sessions[host]     = session
+                    self.sessions_created  += 1
+        return session
+
+    def request(self, method : str, url : str, **kwargs) -> requests.Response:     # Same kwargs as requests.request (headers, json, timeout, ...)
+        host    = self.host_key(url)
+        breaker = circuit_breakers.breaker(host)
+        if not breaker.allow():                                                     # backend is unhealthy: fail fast instead of waiting for its timeout
+            raise Http__Circuit__Open__Error(f"circuit breaker open for {host}")
+        with self.lock:
+            self.requests_total     += 1
+            self.host_requests[host] = self.host_requests.get(host, 0) + 1
+        try:
+            response = self.session(url).request(method, url, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            with self.lock:
+                self.errors_total     += 1
+                self.host_errors[host] = self.host_errors.get(host, 0) + 1
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url : str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url : str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def connection_stats(self, session : requests.Session) -> dict:                # Connections opened vs requests sent (from urllib3's pools)
+        connections_opened = 0
+        requests_sent      = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool:
+                    connections_opened += pool.num_connections
+                    requests_sent      += pool.num_requests
+        return { "connections_opened" : connections_opened                       ,
+                 "connections_reused" : max(requests_sent - connections_opened, 0)}
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        hosts = {}
+        for host, session in list(self.sessions.items()):
+            hosts[host] = { "requests" : self.host_requests.get(host, 0) ,
+                            "errors"   : self.host_errors  .get(host, 0) ,
+                            **self.connection_stats(session)             }
+        return { "pool_connections" : int(self.pool_connections) ,
+                 "pool_maxsize"     : int(self.pool_maxsize    ) ,
+                 "max_retries"      : int(self.max_retries     ) ,
+                 "backoff_factor"   : self.backoff_factor        ,
+                 "retry_on_status"  : self.retry_on_status       ,
+                 "sessions_created" : int(self.sessions_created) ,
+                 "requests_total"   : int(self.requests_total  ) ,
+                 "errors_total"     : int(self.errors_total    ) ,
+                 "hosts"            : hosts                      }
+
+    def close(self) -> None:                                                        # Close all sessions (and their keep-alive connections)
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+http_session_pool       = Http__Session__Pool().setup()                             # Singleton shared by all backend clients
+http_session_pool__paid = Http__Session__Pool(retry_on_status=False).setup()        # Paid backends (WCF's LLM calls): connect errors are retried (nothing was sent), 5xx responses never are
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Enum__Circuit_Breaker__State(str, Enum):                                      # State of a backend's circuit breaker
+    CLOSED    = "closed"                                                            # healthy: calls go through
+    OPEN      = "open"                                                              # unhealthy: calls fail fast until open_seconds have passed
+    HALF_OPEN = "half_open"                                                         # probing: one call goes through, its outcome closes or re-opens the breaker
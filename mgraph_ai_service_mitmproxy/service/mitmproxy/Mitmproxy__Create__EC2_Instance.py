@@ -60,6 +60,7 @@ class Mitmproxy__Create__EC2_Instance(Type_Safe):
             _.exec('sudo apt-get update'                                       )
             _.exec('sudo apt install -y python3-pip'                           )
             _.exec('sudo apt install mitmproxy -y'                             )
+            _.exec('sudo apt install -y python3-aiohttp'                       )     # used by fastapi_interceptor.py (async keep-alive client)
             _.exec('mitmproxy --version')
 
             _.scp().copy_file_to_host(file_mitmproxy__certs  , '.'                                      )
@@ -0,0 +1,48 @@
+import json
+import struct
+from typing                                                                          import Optional, Tuple
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                        import PROXY_FRAME__METADATA_SIZE__BYTES
+
+PROXY_FRAME__METADATA_SIZE__FORMAT = '>I'                                             # big-endian unsigned int (matches PROXY_FRAME__METADATA_SIZE__BYTES)
+
+
+class Proxy__Body__Frame(Type_Safe):                                                  # Length-prefixed binary transport between the mitmproxy interceptor and this service
+                                                                                      # the (small) metadata goes as json, the (large) body goes as raw bytes, so it is never json-escaped or base64-ed
+    def encode(self, metadata : dict ,                                                # json-serialisable metadata (request/response/stats/version, or modifications)
+                     body     : bytes                                                 # raw body (can be empty)
+                ) -> bytes:
+        metadata_bytes = json.dumps(metadata).encode('utf-8')
+        return struct.pack(PROXY_FRAME__METADATA_SIZE__FORMAT, len(metadata_bytes)) + metadata_bytes + (body or b'')
+
+    def decode(self, frame : bytes                                                    # frame created by encode (here or in the interceptor)
+                ) -> Tuple[dict, bytes]:                                              # (metadata, body)
+        if len(frame) < PROXY_FRAME__METADATA_SIZE__BYTES:
+            raise ValueError(f"Invalid proxy frame: only {len(frame)} bytes received")
+        frame_view    = memoryview(frame)                                             # avoid copying the body while slicing
+        metadata_size = struct.unpack(PROXY_FRAME__METADATA_SIZE__FORMAT, frame_view[:PROXY_FRAME__METADATA_SIZE__BYTES])[0]
+        metadata_end  = PROXY_FRAME__METADATA_SIZE__BYTES + metadata_size
+        if metadata_end > len(frame):
+            raise ValueError(f"Invalid proxy frame: metadata size {metadata_size} is larger than the frame")
+        metadata = json.loads(bytes(frame_view[PROXY_FRAME__METADATA_SIZE__BYTES:metadata_end]))
+        body     = bytes(frame_view[metadata_end:])
+        return metadata, body
+
+    def decode__response_data(self, frame : bytes                                     # frame sent by the interceptor's response hook
+                               ) -> Schema__Proxy__Response_Data:
+        metadata, body = self.decode(frame)
+        return Schema__Proxy__Response_Data.from_frame(metadata, body)
+
+    def encode__modifications(self, modifications : Schema__Proxy__Modifications   ,  # modified_body goes as the raw frame body (not inside the json)
+                                    body          : Optional[bytes] = None         ,  # already encoded body (e.g. gzip), used instead of modified_body's utf-8 bytes
+                                    body_encoding : Optional[str]   = None            # its content-encoding (tells the interceptor to write the bytes as they are)
+                               ) -> bytes:
+        metadata      = modifications.json()
+        modified_body = metadata.pop('modified_body', None) or ''
+        if body is None:
+            body = modified_body.encode('utf-8')
+        if body_encoding:
+            metadata['modified_body_encoding'] = body_encoding
+        return self.encode(metadata, body)
@@ -3,6 +3,7 @@ from osbot_utils.type_safe.Type_Safe
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data           import Schema__Proxy__Request_Data
 from datetime                                                                        import datetime
 from typing                                                                          import Dict, Optional
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                        import PROXY__CACHE_TEST_COOKIE
 
 class Proxy__Content__Service(Type_Safe):                            # Content processing service
 
@@ -22,7 +23,7 @@ class Proxy__Content__Service(Type_Safe):                            # Content p
                               ) -> Optional[Dict]:
         cookies = self.parse_cookies(request_data.headers)
 
-        if cookies.get('cache_test') == 'true':
+        if cookies.get(PROXY__CACHE_TEST_COOKIE) == 'true':
             try:
                 cached_html = """
                <!DOCTYPE html>
@@ -9,6 +9,12 @@ from osbot_utils.type_safe.type_safe_core.decorators.type_safe
 
 from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode import Enum__HTML__Transformation_Mode
 from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Command_Type          import Enum__WCF__Command_Type
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Cookie__Context   import Schema__Proxy__Cookie__Context
+
+COOKIE_HEADER__SPECIAL_CHARS        = ('{', '"', '\\')                         # when none of these is present, a plain split is enough
+COOKIE_HEADER__SEPARATORS__REGEX    = re.compile(r'[;,]')                       # fast path: split on separators
+COOKIE_HEADER__TOKENS__REGEX        = re.compile(r'\\.|[^;,{}"\\]+|.', re.S)    # slow path: runs of plain chars, escapes, or one special char
+COOKIE__TRUE_VALUES                 = ('true', '1', 'yes', 'on')
 
 class Safe_Str__Cookie_Name(Safe_Str):                                          # Cookie names: alphanumeric, dots, underscores, hyphens
     max_length       = 256                                                      # Max cookie name length per RFC 6265
@@ -41,6 +47,7 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
     - mitm-rating: Set minimum rating for filtering (e.g., 0.5)
     - mitm-model: Override WCF model to use
     - mitm-cache: Enable response caching (true/false)
+    - mitm-mode: HTML transformation mode (xxx, hashes, etc)
     """
 
     COOKIE_PREFIX = "mitm-"                                      # Prefix for all proxy control cookies
@@ -53,15 +60,77 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
     COOKIE_RATING  = "mitm-rating"                               # Minimum rating
     COOKIE_MODEL   = "mitm-model"                                # WCF model override
     COOKIE_CACHE   = "mitm-cache"                                # Cache responses
+    COOKIE_MODE    = "mitm-mode"                                 # HTML transformation mode
+
+    BODY_COOKIES     = (COOKIE_SHOW, COOKIE_INJECT, COOKIE_REPLACE, COOKIE_DEBUG, COOKIE_MODE)  # the only cookies that can change the response body
+    BODY_OFF_VALUES  = ('', 'off', 'false', '0', 'no')                                        # values of those cookies that change nothing
 
     def parse_cookies(self, headers: Dict[str, str]) -> Dict[str, str]: # Parse all cookies from request headers"""
-        cookie_header = headers.get('cookie') or headers.get('Cookie')
+        return dict(self.cookie_context(headers).cookies)               # todo: change to return Schema__Cookie_Parser__Result instead of the json representation
+
+    def cookie_header(self, headers: Dict[str, str]) -> str:            # Raw Cookie header (either case)
+        return headers.get('cookie') or headers.get('Cookie') or ''
+
+    def cookie_context(self, headers: Dict[str, str]                    # Parsed cookies for these request headers (a new context per call: the
+                       ) -> Schema__Proxy__Cookie__Context:             # request and response pipelines build it once and pass it to their steps)
+        return self.build_cookie_context(self.cookie_header(headers))
+
+    def build_cookie_context(self, cookie_header: str                   # Single pass over the cookies, computing everything the consumers need
+                             ) -> Schema__Proxy__Cookie__Context:
         if not cookie_header:
-            return {}
+            return Schema__Proxy__Cookie__Context()
+        cookies       = self.parse_cookies_from_header(cookie_header).cookies.json()
+        proxy_cookies = {key: value for key, value in cookies.items() if key.startswith(self.COOKIE_PREFIX)}
+        show_command  = cookies.get(self.COOKIE_SHOW)
+        return Schema__Proxy__Cookie__Context(cookie_header   = cookie_header                                                        ,
+                                              cookies         = cookies                                                              ,
+                                              proxy_cookies   = proxy_cookies                                                        ,
+                                              show_command    = show_command                                                         ,
+                                              inject_command  = cookies.get(self.COOKIE_INJECT )                                     ,
+                                              replace_command = cookies.get(self.COOKIE_REPLACE)                                     ,
+                                              model_override  = cookies.get(self.COOKIE_MODEL  )                                     ,
+                                              rating          = self.parse_rating(cookies.get(self.COOKIE_RATING))                   ,
+                                              debug_enabled   = cookies.get(self.COOKIE_DEBUG, '').lower() in COOKIE__TRUE_VALUES    ,
+                                              cache_enabled   = cookies.get(self.COOKIE_CACHE, '').lower() in COOKIE__TRUE_VALUES    ,
+                                              is_wcf_command  = bool(show_command) and Enum__WCF__Command_Type.is_wcf_command(show_command),
+                                              mitm_mode       = Enum__HTML__Transformation_Mode.from_cookie_value(cookies.get(self.COOKIE_MODE, '')))
+
+    def parse_rating(self, rating_str: Optional[str]) -> Optional[float]:
+        if rating_str:
+            try:
+                return float(rating_str)
+            except ValueError:
+                return None
+        return None
 
-        parser_result = self.parse_cookies_from_header(cookie_header)
-        return parser_result.cookies.json()                             # todo: change to return Schema__Cookie_Parser__Result instead of the json representation
+    def split_cookie_header(self, cookie_header: str                    # Split on ';' or ',' (but not inside {...} or "...")
+                            ) -> List[str]:                             # Non-empty, stripped tokens
+        if not any(char in cookie_header for char in COOKIE_HEADER__SPECIAL_CHARS):     # fast path (the usual case): no json or quoted values
+            return [token for token in (part.strip() for part in COOKIE_HEADER__SEPARATORS__REGEX.split(cookie_header)) if token]
+
+        parts    = []                                                   # Collected token strings
+        cur      = []                                                   # Current token being built
+        braces   = 0                                                    # Depth of { } nesting
+        in_quote = False                                                # Inside " " quotes
+        for chunk in COOKIE_HEADER__TOKENS__REGEX.findall(cookie_header):   # plain runs are handled in one step, only special chars are inspected
+            if chunk == '"':                                            # Quote toggle
+                in_quote = not in_quote
+            elif chunk == '{' and not in_quote:                         # Open brace (not in string)
+                braces += 1
+            elif chunk == '}' and not in_quote and braces > 0:          # Close brace (not in string)
+                braces -= 1
+            elif (chunk == ';' or chunk == ',') and braces == 0 and not in_quote:   # Separator at depth zero
+                token = ''.join(cur).strip()
+                if token:
+                    parts.append(token)
+                cur = []
+                continue
+            cur.append(chunk)                                           # plain run, escape sequence (kept as is) or special char
 
+        last = ''.join(cur).strip()                                     # Final token
+        if last:
+            parts.append(last)
+        return parts
 
 
     @type_safe
@@ -75,55 +144,11 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
         - Flag-like cookies without values
 
         Algorithm:
-        1. Character-by-character scan tracking brace/quote depth
-        2. Split on comma/semicolon only when depth is zero
-        3. Extract name=value pairs from tokens
-        4. Return sanitized Safe_Str types
+        1. Split into tokens (see split_cookie_header), on comma/semicolon only when not inside braces or quotes
+        2. Extract name=value pairs from tokens
+        3. Return sanitized Safe_Str types
         """
-        parts           = []                                                     # Collected token strings
-        cur             = []                                                     # Current token being built
-        braces          = 0                                                      # Depth of { } nesting
-        in_quote        = False                                                  # Inside " " quotes
-        escape          = False                                                  # Next char is escaped
-
-        for ch in cookie_header:                                                 # Character-by-character parsing
-            if escape:                                                           # Previous char was backslash
-                cur.append(ch)                                                   # Add escaped character literally
-                escape = False
-                continue
-
-            if ch == '\\':                                                       # Escape sequence start
-                cur.append(ch)                                                   # Preserve backslash
-                escape = True
-                continue
-
-            if ch == '"':                                                        # Quote toggle
-                in_quote = not in_quote                                          # Track quote state
-                cur.append(ch)
-                continue
-
-            if ch == '{' and not in_quote:                                       # Open brace (not in string)
-                braces += 1                                                      # Increase nesting depth
-                cur.append(ch)
-                continue
-
-            if ch == '}' and not in_quote and braces > 0:                        # Close brace (not in string)
-                braces -= 1                                                      # Decrease nesting depth
-                cur.append(ch)
-                continue
-
-            if (ch == ';' or ch == ',') and braces == 0 and not in_quote:        # Separator at depth zero
-                token = ''.join(cur).strip()                                     # Complete current token
-                if token:
-                    parts.append(token)
-                cur = []                                                         # Start new token
-                continue
-
-            cur.append(ch)                                                       # Regular character
-
-        last = ''.join(cur).strip()                                             # Final token after loop
-        if last:
-            parts.append(last)
+        parts = self.split_cookie_header(cookie_header)
 
         cookies         = {}                                                     # Result dictionary
         parse_errors    = []                                                     # Tokens that failed parsing
@@ -155,73 +180,45 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
     def get_proxy_cookies(self, headers: Dict[str, str]          # Get only proxy control cookies
                          ) -> Dict[str, str]:                    # Proxy cookie name/value pairs
         """Extract only mitm-* cookies from request headers"""
-        all_cookies = self.parse_cookies(headers)
-
-        # Filter for proxy control cookies (mitm-*)
-        proxy_cookies = {}
-        for key, value in all_cookies.items():
-            if key.startswith(self.COOKIE_PREFIX):
-                proxy_cookies[key] = value
-        return proxy_cookies
+        return dict(self.cookie_context(headers).proxy_cookies)
 
     def get_show_command(self, headers: Dict[str, str]           # Get the 'show' command from mitm-show cookie
                         ) -> Optional[str]:                      # Show command value or None
-        cookies = self.parse_cookies(headers)
-        return cookies.get(self.COOKIE_SHOW)
+        return self.cookie_context(headers).show_command
 
     def get_inject_command(self, headers: Dict[str, str]         # Get inject command from cookies
                           ) -> Optional[str]:                    # Inject command value or None
         """Get the 'inject' command from mitm-inject cookie"""
-        cookies = self.parse_cookies(headers)
-        return cookies.get(self.COOKIE_INJECT)
+        return self.cookie_context(headers).inject_command
 
     def get_replace_command(self, headers: Dict[str, str]        # Get replace command from cookies
                            ) -> Optional[str]:                   # Replace command value or None
         """Get the 'replace' command from mitm-replace cookie"""
-        cookies = self.parse_cookies(headers)
-        return cookies.get(self.COOKIE_REPLACE)
+        return self.cookie_context(headers).replace_command
 
     def is_debug_enabled(self, headers: Dict[str, str]           # Check if debug mode enabled
                         ) -> bool:                               # Debug mode active
         """Check if debug mode is enabled via mitm-debug cookie"""
-        cookies = self.parse_cookies(headers)
-        debug_value = cookies.get(self.COOKIE_DEBUG, '').lower()
-        return debug_value in ('true', '1', 'yes', 'on')
+        return self.cookie_context(headers).debug_enabled
 
     def get_rating(self, headers: Dict[str, str]                 # Get rating from cookies
                   ) -> Optional[float]:                          # Rating value or None
         """Get minimum rating value from mitm-rating cookie"""
-        cookies = self.parse_cookies(headers)
-        rating_str = cookies.get(self.COOKIE_RATING)
-
-        if rating_str:
-            try:
-                return float(rating_str)
-            except ValueError:
-                return None
-
-        return None
+        return self.cookie_context(headers).rating
 
     def get_model_override(self, headers: Dict[str, str]         # Get model override from cookies
                           ) -> Optional[str]:                    # Model name or None
         """Get WCF model override from mitm-model cookie"""
-        cookies = self.parse_cookies(headers)
-        return cookies.get(self.COOKIE_MODEL)
+        return self.cookie_context(headers).model_override
 
     def is_cache_enabled(self, headers: Dict[str, str]           # Check if response caching is enabled via mitm-cache cookie
                         ) -> bool:                               # Cache enabled
-        cookies = self.parse_cookies(headers)
-        cache_value = cookies.get(self.COOKIE_CACHE, '').lower()
-        return cache_value in ('true', '1', 'yes', 'on')
+        return self.cookie_context(headers).cache_enabled
 
     def is_wcf_show_command(self, headers: Dict[str, str]        # Check if show command is WCF
                            ) -> bool:                            # Is WCF command
         """Check if the mitm-show cookie contains a WCF command"""
-        show_value = self.get_show_command(headers)
-        if not show_value:
-            return False
-
-        return Enum__WCF__Command_Type.is_wcf_command(show_value)
+        return self.cookie_context(headers).is_wcf_command
 
     def get_wcf_command_type(self, headers: Dict[str, str]          # Get WCF command type from cookies
                             ) -> Optional[Enum__WCF__Command_Type]:  # Command type or None
@@ -233,45 +230,49 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
 
     def convert_to_debug_params(self, headers: Dict[str, str]    # Convert cookies to debug params format
                                  ) -> Dict[str, str]:           # Debug params dict
-        debug_params = {}
-
-        # Get show command
-        show_value = self.get_show_command(headers)                 # todo: review how this data is extracted, since we should be able to optimise this
-        if show_value:
-            debug_params['show'] = show_value
+        return self.context_debug_params(self.cookie_context(headers))
 
-        # Get inject command
-        inject_value = self.get_inject_command(headers)
-        if inject_value:
-            debug_params['inject'] = inject_value
+    def context_debug_params(self, context: Schema__Proxy__Cookie__Context     # debug params from an already parsed context
+                             ) -> Dict[str, str]:
+        debug_params = {}
+        if context.show_command:
+            debug_params['show'   ] = context.show_command
+        if context.inject_command:
+            debug_params['inject' ] = context.inject_command
+        if context.replace_command:
+            debug_params['replace'] = context.replace_command
+        if context.debug_enabled:
+            debug_params['debug'  ] = 'true'
+        return debug_params
 
-        # Get replace command
-        replace_value = self.get_replace_command(headers)
-        if replace_value:
-            debug_params['replace'] = replace_value
+    def body_cookie_is_on(self, value: Optional[str]                          # True when this value of a BODY_COOKIES cookie can change the body (the same test
+                          ) -> bool:                                          # the interceptor's needs_body applies with the published body_cookie_off_values)
+        return value is not None and value.strip().lower() not in self.BODY_OFF_VALUES
 
-        # Get debug mode
-        if self.is_debug_enabled(headers):
-            debug_params['debug'] = 'true'
-        return debug_params
+    def context_modifies_body(self, context: Schema__Proxy__Cookie__Context    # False when no cookie can change the response body (so only headers need processing)
+                              ) -> bool:
+        return any(self.body_cookie_is_on(context.cookies.get(cookie_name)) for cookie_name in self.BODY_COOKIES)
 
     def get_cookie_summary(self, headers: Dict[str, str]            # Get a summary of all active proxy control cookies
                           ) -> Dict[str, any]:                      # Cookie summary
-        return { 'show_command'    : self.get_show_command(headers),            # todo: review if we actually need this data to be sent like this to the caller
-                 'inject_command'  : self.get_inject_command(headers),
-                 'replace_command' : self.get_replace_command(headers),
-                 'debug_enabled'   : self.is_debug_enabled(headers),
-                 'rating'          : self.get_rating(headers),
-                 'model_override'  : self.get_model_override(headers),
-                 'cache_enabled'   : self.is_cache_enabled(headers),
-                 'is_wcf_command'  : self.is_wcf_show_command(headers),
-                 'all_proxy_cookies': self.get_proxy_cookies(headers) }
+        return self.context_cookie_summary(self.cookie_context(headers))
+
+    def context_cookie_summary(self, context: Schema__Proxy__Cookie__Context   # cookie summary from an already parsed context
+                               ) -> Dict[str, any]:
+        return { 'show_command'    : context.show_command    ,                 # todo: review if we actually need this data to be sent like this to the caller
+                 'inject_command'  : context.inject_command  ,
+                 'replace_command' : context.replace_command ,
+                 'debug_enabled'   : context.debug_enabled   ,
+                 'rating'          : context.rating          ,
+                 'model_override'  : context.model_override  ,
+                 'cache_enabled'   : context.cache_enabled   ,
+                 'is_wcf_command'  : context.is_wcf_command  ,
+                 'all_proxy_cookies': dict(context.proxy_cookies) }
 
     def has_any_proxy_cookies(self, headers: Dict[str, str]      # Check if any proxy cookies present
                              ) -> bool:                          # Has proxy cookies
         """Check if request has any proxy control cookies"""
-        proxy_cookies = self.get_proxy_cookies(headers)
-        return len(proxy_cookies) > 0
+        return len(self.cookie_context(headers).proxy_cookies) > 0
 
     def validate_show_command(self, show_value: str              # Validate show command value
                              ) -> tuple[bool, Optional[str]]:    # (is_valid, error_message)
@@ -314,22 +315,7 @@ class Proxy__Cookie__Service(Type_Safe):                         # Cookie-based
 
 
     def get_mitm_mode(self, headers: Dict[str, str]) -> Enum__HTML__Transformation_Mode:            # Extract mitm-mode cookie value and convert to transformation mode
-
-        cookie_header = headers.get('Cookie', headers.get('cookie', ''))
-
-        if not cookie_header:
-            return Enum__HTML__Transformation_Mode.OFF
-
-        parser_result = self.parse_cookies_from_header(cookie_header)
-        cookies = parser_result.cookies
-
-        mitm_mode_value = ''                                                                        # Get mitm-mode value
-        for cookie_name, cookie_value in cookies.items():
-            if str(cookie_name) == 'mitm-mode':
-                mitm_mode_value = str(cookie_value)
-                break
-
-        return Enum__HTML__Transformation_Mode.from_cookie_value(mitm_mode_value)                   # Parse mode (now supports sentiment modes!)
+        return self.cookie_context(headers).mitm_mode                                               # (now supports sentiment modes!)
 
 
     def has_mitm_mode_cookie(self,                                                      # Check if mitm-mode cookie is present in headers
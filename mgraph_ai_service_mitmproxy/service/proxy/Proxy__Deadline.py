@@ -0,0 +1,63 @@
+import time
+from typing                                                                         import Dict, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import HEADER__PROXY__BUDGET_EXCEEDED
+
+
+class Proxy__Deadline__Exceeded(Exception):                                         # Raised before a step that the budget no longer allows (the pipeline stops there)
+    pass
+
+
+class Proxy__Deadline(Type_Safe):                                                   # Latency budget of one response (set by the interceptor), checked by each step before it starts
+    budget_ms     : Safe_UInt                                                       # 0 means no budget (steps are never skipped)
+    started_at    : float                                                           # time.monotonic() when the response arrived
+    steps_skipped : List[str]                                                       # steps skipped (or cut short) because the budget ran out
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not self.started_at:
+            self.started_at = time.monotonic()
+
+    def is_bounded(self) -> bool:
+        return self.budget_ms > 0
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started_at) * 1000
+
+    def remaining_ms(self) -> float:
+        return max(0.0, int(self.budget_ms) - self.elapsed_ms())
+
+    def remaining_seconds(self) -> Optional[float]:                                 # for timeouts (None when there is no budget)
+        if not self.is_bounded():
+            return None
+        return self.remaining_ms() / 1000
+
+    def timeout_seconds(self, timeout : float) -> float:                            # timeout of an outbound call, capped by the budget left
+        if not self.is_bounded():
+            return float(timeout)
+        return min(float(timeout), self.remaining_seconds())
+
+    def allows(self, step   : str ,                                                 # True if step can start (records it as skipped otherwise)
+                     min_ms : int = 0
+                ) -> bool:
+        if not self.is_bounded() or self.remaining_ms() > min_ms:
+            return True
+        self.skip(step)
+        return False
+
+    def skip(self, step : str) -> None:
+        if step not in self.steps_skipped:
+            self.steps_skipped.append(step)
+
+    def exceeded(self) -> bool:
+        return len(self.steps_skipped) > 0
+
+    def check(self, step : str) -> None:                                            # raises Proxy__Deadline__Exceeded when step can't start (budget spent, or already exceeded by an earlier step)
+        if self.exceeded() or not self.allows(step):
+            raise Proxy__Deadline__Exceeded(step)
+
+    def to_headers(self) -> Dict[str, str]:
+        if self.exceeded():
+            return { HEADER__PROXY__BUDGET_EXCEEDED : ','.join(self.steps_skipped) }
+        return {}
@@ -0,0 +1,135 @@
+import time
+import threading
+from email.utils                                                                    import parsedate_to_datetime
+from typing                                                                         import Dict, List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from osbot_utils.utils.Env                                                          import get_env
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import ENV_VAR__PROXY__CONDITIONAL_REQUESTS, DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS
+
+DEFAULT__ETAG__MAX_ENTRIES = 10000                                                  # pages remembered (oldest dropped first)
+
+
+class Proxy__ETag__Service(Type_Safe):                                              # Strong etags of cached transformations (response phase), and 304s for the clients that already have them (request phase)
+    enabled         : bool      = True
+    max_age_seconds : Safe_UInt = Safe_UInt(DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS)  # cap on how long an etag is answered with 304 (within upstream's own freshness) after upstream last sent the page
+    max_entries     : Safe_UInt = Safe_UInt(DEFAULT__ETAG__MAX_ENTRIES)
+    etags_issued    : Safe_UInt                                                     # responses sent with an etag
+    not_modified    : Safe_UInt                                                     # requests answered with 304
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock    = threading.Lock()                                             # shared by the request and response pipelines (which run in the route's worker threads)
+        self.entries = {}                                                           # (page_key, mode) -> (etag, expires_at) (oldest first)
+
+    def setup(self) -> 'Proxy__ETag__Service':
+        self.enabled = (get_env(ENV_VAR__PROXY__CONDITIONAL_REQUESTS) or 'true').lower() != 'false'
+        return self
+
+    def etag(self, content_hash : str                             ,                 # (source content hash, mode): the same html in the same mode always transforms to the same cached body
+                   mode         : Enum__HTML__Transformation_Mode
+              ) -> str:
+        return f'"{content_hash}-{mode.value}"'
+
+    def page_key(self, host : str ,                                                 # host + path (the only parts of the url both phases see)
+                       path : str
+                  ) -> str:
+        return f"{host}{path}"
+
+    def encoded_etag(self, etag     : str ,                                         # Etag of the body sent with a content-coding (a strong etag must differ per encoding of the body)
+                           encoding : str
+                      ) -> str:
+        return f'{etag[:-1]}+{encoding}"'
+
+    def decoded_etag(self, etag : str) -> str:                                      # Etag of the identity body (the inverse of encoded_etag)
+        if '+' not in etag:
+            return etag
+        return etag.split('+', 1)[0] + '"'
+
+    def upstream_fresh_seconds(self, headers : Dict[str, str]                       # How long upstream says the page is fresh for: s-maxage/max-age (minus Age), or Expires - Date
+                                ) -> int:                                           # (0 when upstream gives no freshness, or asks caches to revalidate)
+        headers       = {str(name).lower(): str(value) for name, value in (headers or {}).items()}
+        directives    = [directive.strip().lower() for directive in headers.get('cache-control', '').split(',') if directive.strip()]
+        if any(directive in ('no-cache', 'no-store', 'private') for directive in directives):
+            return 0
+        age = int(headers.get('age')) if headers.get('age', '').isdigit() else 0
+        for name in ('s-maxage', 'max-age'):                                        # s-maxage wins (the proxy is a shared cache)
+            for directive in directives:
+                if directive.startswith(f'{name}=') and directive[len(name) + 1:].isdigit():
+                    return max(0, int(directive[len(name) + 1:]) - age)
+        try:
+            expires = parsedate_to_datetime(headers['expires'])
+            date    = parsedate_to_datetime(headers['date']) if 'date' in headers else None
+            if date is None:
+                return max(0, int(expires.timestamp() - time.time()))
+            return max(0, int((expires - date).total_seconds()) - age)
+        except (KeyError, TypeError, ValueError):                                   # no (or an invalid) Expires: not fresh
+            return 0
+
+    def remember(self, host          : str                             ,            # Record the etag just sent for this page+mode
+                       path          : str                             ,
+                       mode          : Enum__HTML__Transformation_Mode ,
+                       etag          : str                             ,
+                       fresh_seconds : int = 0                                      # how long the page is fresh for (see upstream_fresh_seconds), capped by max_age_seconds
+                  ) -> None:                                                        # (0 means requests for it always go upstream)
+        if not self.enabled:
+            return
+        max_age = min(int(self.max_age_seconds), int(fresh_seconds))
+        key     = (self.page_key(host, path), mode.value)
+        with self.lock:
+            self.entries.pop(key, None)                                             # re-inserted, so the dict stays ordered by last response
+            self.etags_issued += 1
+            if max_age <= 0:
+                return
+            self.entries[key] = (etag, time.monotonic() + max_age)
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+
+    def current_etag(self, host : str                             ,                 # Etag last sent for this page+mode (None when unknown or expired)
+                           path : str                             ,
+                           mode : Enum__HTML__Transformation_Mode
+                      ) -> Optional[str]:
+        key = (self.page_key(host, path), mode.value)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            etag, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self.entries.pop(key, None)
+                return None
+            return etag
+
+    def if_none_match_etags(self, if_none_match : str) -> List[str]:                # Etags of an If-None-Match header (weak comparison, so W/ is dropped)
+        etags = []
+        for etag in (if_none_match or '').split(','):
+            etag = etag.strip()
+            if etag.startswith('W/'):
+                etag = etag[2:]
+            if etag:
+                etags.append(etag)
+        return etags
+
+    def check_not_modified(self, host          : str                             ,      # The etag to answer with 304 (the client's, so it keeps its encoding), or None when the request must go upstream
+                                 path          : str                             ,
+                                 mode          : Enum__HTML__Transformation_Mode ,
+                                 if_none_match : str
+                            ) -> Optional[str]:
+        if not self.enabled or not mode.is_active() or not if_none_match:
+            return None
+        etag = self.current_etag(host, path, mode)
+        if etag is None:
+            return None
+        for client_etag in self.if_none_match_etags(if_none_match):
+            if client_etag == '*' or self.decoded_etag(client_etag) == etag:
+                with self.lock:
+                    self.not_modified += 1
+                return etag if client_etag == '*' else client_etag
+        return None
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "enabled"      : self.enabled            ,
+                 "pages"        : len(self.entries)       ,
+                 "etags_issued" : int(self.etags_issued)  ,
+                 "not_modified" : int(self.not_modified)  }
@@ -0,0 +1,37 @@
+import json
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from osbot_utils.utils.Env                                                           import get_env
+from osbot_utils.utils.Misc                                                          import str_md5
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Interceptor__Rules     import Schema__Proxy__Interceptor__Rules
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service                import Proxy__Cookie__Service
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                        import (ENV_VAR__PROXY__INTERCEPTOR_BYPASS                ,
+                                                                                             ENV_VAR__PROXY__INTERCEPTOR_HEADERS_ONLY          ,
+                                                                                             DEFAULT__PROXY__INTERCEPTOR_RULES__REFRESH_SECONDS,
+                                                                                             PROXY__ADMIN_PATH_PREFIX                          ,
+                                                                                             PROXY__CACHE_TEST_COOKIE                          ,
+                                                                                             PROXY__BLOCKED_PATH_MARKERS                       ,
+                                                                                             PROXY__SENSITIVE_HEADER_MARKERS                   )
+
+
+class Proxy__Interceptor__Rules__Service(Type_Safe):                 # Publishes the rules the interceptor uses to skip flows that don't need this service
+                                                                     # (no mitm-* cookies, not an admin path, not blocked) so that most traffic never leaves the proxy
+                                                                     # and to send only the headers of responses whose body no cookie can change
+    def bypass_enabled(self) -> bool:
+        return (get_env(ENV_VAR__PROXY__INTERCEPTOR_BYPASS) or 'true').lower() != 'false'
+
+    def headers_only_enabled(self) -> bool:
+        return (get_env(ENV_VAR__PROXY__INTERCEPTOR_HEADERS_ONLY) or 'true').lower() != 'false'
+
+    def get_rules(self) -> Schema__Proxy__Interceptor__Rules:
+        rules = Schema__Proxy__Interceptor__Rules(bypass_enabled           = self.bypass_enabled()                              ,
+                                                  refresh_seconds          = DEFAULT__PROXY__INTERCEPTOR_RULES__REFRESH_SECONDS ,
+                                                  cookie_prefixes          = [Proxy__Cookie__Service.COOKIE_PREFIX]             ,
+                                                  cookie_names             = [PROXY__CACHE_TEST_COOKIE]                         ,
+                                                  admin_path_prefixes      = [PROXY__ADMIN_PATH_PREFIX]                         ,
+                                                  blocked_path_markers     = list(PROXY__BLOCKED_PATH_MARKERS)                  ,
+                                                  sensitive_header_markers = list(PROXY__SENSITIVE_HEADER_MARKERS)              ,
+                                                  headers_only_enabled     = self.headers_only_enabled()                        ,
+                                                  body_cookie_names        = list(Proxy__Cookie__Service.BODY_COOKIES)          ,
+                                                  body_cookie_off_values   = list(Proxy__Cookie__Service.BODY_OFF_VALUES)       )
+        rules.rules_hash = str_md5(json.dumps(rules.json(), sort_keys=True))[:10]
+        return rules
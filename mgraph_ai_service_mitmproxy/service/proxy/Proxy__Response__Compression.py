@@ -0,0 +1,118 @@
+import gzip
+import time
+import threading
+from typing                                                                         import List, Optional
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                import Safe_UInt
+from osbot_utils.utils.Env                                                          import get_env
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Precompressed__Cache          import Proxy__Precompressed__Cache
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import (ENV_VAR__PROXY__RESPONSE_COMPRESSION   ,
+                                                                                            CONTENT_ENCODING__GZIP                 ,
+                                                                                            CONTENT_ENCODING__BROTLI               ,
+                                                                                            DEFAULT__RESPONSE_COMPRESSION__MIN_SIZE)
+
+try:
+    import brotli                                                                   # optional (without it only gzip is offered)
+except ImportError:
+    brotli = None
+
+DEFAULT__RESPONSE_COMPRESSION__GZIP_LEVEL     = 6
+DEFAULT__RESPONSE_COMPRESSION__BROTLI_QUALITY = 5                                   # brotli's fast levels still beat gzip -6 on html
+
+
+class Proxy__Response__Compression(Type_Safe):                                      # Compresses modified bodies with the best encoding the client accepts (Accept-Encoding)
+    enabled          : bool      = True
+    min_size         : Safe_UInt = Safe_UInt(DEFAULT__RESPONSE_COMPRESSION__MIN_SIZE)
+    compressed       : Safe_UInt                                                    # bodies compressed here
+    precompressed    : Safe_UInt                                                    # bodies sent from a precompressed variant (no cpu spent)
+    bytes_in         : Safe_UInt                                                    # utf-8 bytes of the bodies that were sent encoded
+    bytes_out        : Safe_UInt                                                    # encoded bytes sent instead
+    compress_time_ms : float                                                        # cpu time spent compressing
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()                                                # counters are updated from the route's worker threads
+
+    def setup(self) -> 'Proxy__Response__Compression':
+        self.enabled = (get_env(ENV_VAR__PROXY__RESPONSE_COMPRESSION) or 'true').lower() != 'false'
+        return self
+
+    def supported_encodings(self) -> List[str]:                                     # in order of preference
+        if brotli is None:
+            return [CONTENT_ENCODING__GZIP]
+        return [CONTENT_ENCODING__BROTLI, CONTENT_ENCODING__GZIP]
+
+    def accepted_encodings(self, accept_encoding : str                              # Supported encodings the client accepts (highest q first, then our preference)
+                            ) -> List[str]:
+        qualities = {}
+        for part in (accept_encoding or '').split(','):
+            name, _, params = part.strip().partition(';')
+            quality = 1.0
+            params  = params.strip().replace(' ', '')
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                qualities[name.strip().lower()] = quality
+        wildcard  = qualities.get('*', 0.0)
+        supported = self.supported_encodings()
+        accepted  = [encoding for encoding in supported if qualities.get(encoding, wildcard) > 0]
+        return sorted(accepted, key=lambda encoding: (-qualities.get(encoding, wildcard), supported.index(encoding)))
+
+    # todo: refactor tuple with Type_Safe class
+    def compress(self, body            : str                                   ,    # Encoded body for this client, or (None, None) when it should be sent as it is
+                       accept_encoding : str                                   ,
+                       precompressed   : Optional[Proxy__Precompressed__Cache] = None
+                  ) -> tuple:                                                       # (encoded bytes, content-encoding)
+        if not self.enabled or not body:
+            return None, None
+        encodings = self.accepted_encodings(accept_encoding)
+        data      = body.encode('utf-8')
+        if not encodings or len(data) < self.min_size:
+            return None, None
+        if precompressed is not None:
+            body_key = precompressed.body_key(data)
+            for encoding in encodings:                                              # any precompressed variant the client accepts beats compressing
+                encoded = precompressed.get(body_key, encoding)
+                if encoded is not None:
+                    self.record(data, encoded, precompressed=True)
+                    return encoded, encoding
+        encoding   = encodings[0]
+        start_time = time.process_time()
+        encoded    = self.compress_bytes(data, encoding)
+        with self.lock:
+            self.compress_time_ms += (time.process_time() - start_time) * 1000
+        if precompressed is not None:
+            precompressed.put(body_key, encoding, encoded)
+        self.record(data, encoded, precompressed=False)
+        return encoded, encoding
+
+    def compress_bytes(self, data     : bytes ,
+                             encoding : str
+                        ) -> bytes:
+        if encoding == CONTENT_ENCODING__BROTLI:
+            return brotli.compress(data, quality=DEFAULT__RESPONSE_COMPRESSION__BROTLI_QUALITY)
+        return gzip.compress(data, compresslevel=DEFAULT__RESPONSE_COMPRESSION__GZIP_LEVEL, mtime=0)
+
+    def record(self, data          : bytes ,
+                     encoded       : bytes ,
+                     precompressed : bool
+                ) -> None:
+        with self.lock:
+            if precompressed:
+                self.precompressed += 1
+            else:
+                self.compressed    += 1
+            self.bytes_in  += len(data   )
+            self.bytes_out += len(encoded)
+
+    def stats(self) -> dict:                                                        # todo: refactor to Type_Safe class
+        return { "enabled"          : self.enabled                       ,
+                 "encodings"        : self.supported_encodings()         ,
+                 "compressed"       : int(self.compressed   )            ,
+                 "precompressed"    : int(self.precompressed)            ,
+                 "bytes_in"         : int(self.bytes_in     )            ,
+                 "bytes_out"        : int(self.bytes_out    )            ,
+                 "compress_time_ms" : round(self.compress_time_ms, 3)    }
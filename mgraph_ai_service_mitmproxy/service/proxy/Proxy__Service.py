@@ -1,23 +1,44 @@
+import asyncio
 from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data           import Schema__Proxy__Request_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
 from mgraph_ai_service_mitmproxy.service.proxy.response.Proxy__Response__Service     import Proxy__Response__Service
+from mgraph_ai_service_mitmproxy.service.proxy.response.Proxy__Response__Service__Async import Proxy__Response__Service__Async
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Stats__Service                 import Proxy__Stats__Service
 from mgraph_ai_service_mitmproxy.service.proxy.request.Proxy__Request__Service       import Proxy__Request__Service
 from mgraph_ai_service_mitmproxy.service.admin.Proxy__Admin__Service                 import Proxy__Admin__Service
-from typing                                                                          import Dict, Any
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Interceptor__Rules__Service    import Proxy__Interceptor__Rules__Service
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Interceptor__Rules     import Schema__Proxy__Interceptor__Rules
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Request  import Schema__HTML__Transformation__Batch__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Response import Schema__HTML__Transformation__Batch__Response
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Batch   import HTML__Transformation__Service__Batch
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Async   import HTML__Transformation__Service__Async
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Prewarm__Service        import Proxy__Cache__Prewarm__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Request import Schema__Cache__Prewarm__Request
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Job   import Schema__Cache__Prewarm__Job
+from typing                                                                          import Dict, Any, List, Optional
 
 class Proxy__Service(Type_Safe):                                      # Main proxy service orchestration
-    stats_service    : Proxy__Stats__Service                          # Statistics tracking
-    request_service  : Proxy__Request__Service      = None            # Request processing
-    response_service : Proxy__Response__Service     = None            # Response processing
-    admin_service    : Proxy__Admin__Service        = None            # Admin page generation
+    stats_service           : Proxy__Stats__Service                          # Statistics tracking
+    request_service         : Proxy__Request__Service         = None         # Request processing
+    response_service        : Proxy__Response__Service        = None         # Response processing
+    response_service__async : Proxy__Response__Service__Async = None         # Response processing (async pipeline)
+    admin_service           : Proxy__Admin__Service           = None         # Admin page generation
+    interceptor_rules       : Proxy__Interceptor__Rules__Service             # Rules the interceptor uses to skip untouched traffic
+    html_batch_service      : HTML__Transformation__Service__Batch = None    # Transforms many pages per call (shares caches with response_service)
+    prewarm_service         : Proxy__Cache__Prewarm__Service       = None    # Background jobs that warm the caches for a list of urls (or a sitemap)
 
     def setup(self):
-        self.admin_service    = Proxy__Admin__Service   ().setup()
-        self.response_service = Proxy__Response__Service().setup()
-        self.request_service  = Proxy__Request__Service ().setup()
+        self.admin_service           = Proxy__Admin__Service          ().setup()
+        self.response_service        = Proxy__Response__Service       ().setup()
+        html_service__async          = HTML__Transformation__Service__Async().setup__clients().share_state(self.response_service.html_transformation_service)     # one cache service, single-flight, negative cache and text node cache for both pipelines (and for batch/prewarm)
+        self.response_service__async = Proxy__Response__Service__Async(etag_service                = self.response_service.etag_service        ,     # one etag registry: the etags sent by either pipeline
+                                                                       response_compression        = self.response_service.response_compression,
+                                                                       html_transformation_service = html_service__async                       ).setup()
+        self.request_service         = Proxy__Request__Service        (etag_service=self.response_service.etag_service).setup()    # are the ones answered with 304 in the request phase
+        self.html_batch_service      = HTML__Transformation__Service__Batch(html_transformation_service=self.response_service.html_transformation_service)
+        self.prewarm_service         = Proxy__Cache__Prewarm__Service      (html_transformation_service=self.response_service.html_transformation_service)
         return self
 
     def process_request(self, request_data : Schema__Proxy__Request_Data  # Process incoming request
@@ -31,6 +52,48 @@ class Proxy__Service(Type_Safe):                                      # Main pro
         processing_result = self.response_service.process_response(response_data)           # Convert processing result to modifications
         return processing_result.modifications
 
+    # todo: refactor tuple with Type_Safe class
+    async def process_response_frame(self, response_data : Schema__Proxy__Response_Data     # Process incoming response on the async pipeline (for the frame transport, which can carry a compressed body)
+                                      ) -> tuple:                                           # (modifications, encoded body or None, content-encoding or None)
+        self.log_response(response_data)
+        processing_result = await self.response_service__async.process_response(response_data)
+        body, encoding    = await asyncio.to_thread(self.response_service__async.compress_response, response_data, processing_result)     # gzip/br of a large body would block the event loop
+        return processing_result.modifications, body, encoding
+
+    def get_response_compression_stats(self) -> Dict[str, Any]:     # Modified bodies sent compressed (and how many came from a precompressed variant)
+        return dict(response_compression = self.response_service.response_compression.stats()                       ,
+                    precompressed        = self.response_service.html_transformation_service.precompressed.stats())
+
+    def get_etag_stats(self) -> Dict[str, Any]:                      # Etags sent, and requests answered with 304
+        return self.response_service.etag_service.stats()
+
+    async def process_response_async(self, response_data : Schema__Proxy__Response_Data  # Process incoming response (without blocking the worker)
+                                     ) -> Schema__Proxy__Modifications:
+        self.log_response(response_data)
+        processing_result = await self.response_service__async.process_response(response_data)
+        return processing_result.modifications
+
+    def transform_html_batch(self, request : Schema__HTML__Transformation__Batch__Request   # Transform many pages in one call (e.g. to pre-warm the cache for a site)
+                              ) -> Schema__HTML__Transformation__Batch__Response:
+        return self.html_batch_service.transform_html_batch(request)
+
+    def prewarm_start(self, request : Schema__Cache__Prewarm__Request                     # Start a cache pre-warm job (runs in the background)
+                       ) -> Schema__Cache__Prewarm__Job:
+        return self.prewarm_service.start(request)
+
+    def prewarm_job(self, job_id : str) -> Optional[Schema__Cache__Prewarm__Job]:        # Progress of a pre-warm job (None if unknown)
+        return self.prewarm_service.job(job_id)
+
+    def prewarm_jobs(self) -> List[Schema__Cache__Prewarm__Job]:                         # Recent pre-warm jobs (newest first)
+        return self.prewarm_service.jobs_status()
+
+    def get_interceptor_rules(self) -> Schema__Proxy__Interceptor__Rules:  # Rules for the interceptor's local (no round trip) decisions
+        return self.interceptor_rules.get_rules()
+
+    def get_original_html_stats(self) -> Dict[str, Any]:             # Original html uploads (provenance) started and avoided, per pipeline
+        return dict(response_service        = self.response_service       .html_transformation_service.original_html_stats(),
+                    response_service__async = self.response_service__async.html_transformation_service.original_html_stats())
+
     def get_stats(self) -> Dict[str, Any]:                           # Get current statistics
         return self.stats_service.get_stats()
 
@@ -21,6 +21,15 @@ class Proxy__Stats__Service(Type_Safe):                              # Statistic
     def increment_content_modification(self) -> None:                # Record content modification
         self.stats.content_modifications += 1
 
+    def increment_budget_exceeded(self) -> None:                     # Record a response that ran out of latency budget
+        self.stats.budget_exceeded += 1
+
+    def increment_headers_only(self) -> None:                        # Record a response processed without its body
+        self.stats.headers_only += 1
+
+    def increment_not_modified(self) -> None:                        # Record a request answered with 304
+        self.stats.not_modified += 1
+
     def get_stats(self) -> Dict[str, Any]:                           # Get current statistics
         return {
             "total_requests"       : self.stats.total_requests        ,
@@ -30,7 +39,10 @@ class Proxy__Stats__Service(Type_Safe):                              # Statistic
             # "hosts_count"          : len(self.stats.hosts_seen)       ,
             # "paths_count"          : len(self.stats.paths_seen)       ,
             "total_bytes_processed": self.stats.total_bytes_processed ,
-            "content_modifications": self.stats.content_modifications
+            "content_modifications": self.stats.content_modifications ,
+            "budget_exceeded"      : self.stats.budget_exceeded       ,
+            "headers_only"         : self.stats.headers_only          ,
+            "not_modified"         : self.stats.not_modified
         }
 
     def reset_stats(self) -> Dict[str, Any]:                         # Reset statistics
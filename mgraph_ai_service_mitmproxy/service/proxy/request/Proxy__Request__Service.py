@@ -1,12 +1,16 @@
 from osbot_utils.type_safe.Type_Safe                                        import Type_Safe
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data  import Schema__Proxy__Request_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Cookie__Context import Schema__Proxy__Cookie__Context
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Stats__Service        import Proxy__Stats__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Content__Service      import Proxy__Content__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service       import Proxy__Cookie__Service
 from mgraph_ai_service_mitmproxy.service.admin.Proxy__Admin__Service        import Proxy__Admin__Service
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__ETag__Service         import Proxy__ETag__Service
 from mgraph_ai_service_mitmproxy.utils.Version                              import version__mgraph_ai_service_mitmproxy
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy               import PROXY__BLOCKED_PATH_MARKERS, PROXY__SENSITIVE_HEADER_MARKERS
 from datetime                                                               import datetime
+from typing                                                                 import Dict, Optional
 import json
 
 class Proxy__Request__Service(Type_Safe):                            # Request processing orchestration
@@ -14,9 +18,11 @@ class Proxy__Request__Service(Type_Safe):                            # Request p
     content_service : Proxy__Content__Service                        # Content processing
     cookie_service  : Proxy__Cookie__Service                         # Cookie-based control
     admin_service   : Proxy__Admin__Service      = None              # Admin page generation
+    etag_service    : Proxy__ETag__Service                           # Etags sent by the response service (shared with it, see Proxy__Service.setup)
 
     def setup(self):
         self.admin_service = Proxy__Admin__Service ().setup()
+        self.etag_service.setup()
         return self
 
     def process_request(self, request_data : Schema__Proxy__Request_Data  # Process incoming request
@@ -29,7 +35,8 @@ class Proxy__Request__Service(Type_Safe):                            # Request p
         self.stats_service.increment_request(host = request_data.host,
                                              path = request_data.path)
 
-        modifications = Schema__Proxy__Modifications()                              # Create response with modifications
+        modifications  = Schema__Proxy__Modifications()                             # Create response with modifications
+        cookie_context = self.cookie_service.cookie_context(request_data.headers)  # Cookie header is parsed once, and shared by the steps below
 
         # Check for cached response using cookies
         #if self.cookie_service.is_cache_enabled(request_data.headers):
@@ -40,6 +47,11 @@ class Proxy__Request__Service(Type_Safe):                            # Request p
             print(f"      🎯   Returning CACHED response (enabled via mitm-cache cookie)")
             return modifications
 
+        not_modified_response = self.not_modified_response(request_data, cookie_context)           # The client already has the cached transformation of this page (If-None-Match)
+        if not_modified_response:
+            modifications.cached_response = not_modified_response
+            return modifications
+
         # Add custom headers
         modifications.headers_to_add = { "x-mgraph-proxy"          : "v1.0"                                          ,
                                          "x-request-id"            : f"req-{self.stats_service.stats.total_requests}",
@@ -49,24 +61,47 @@ class Proxy__Request__Service(Type_Safe):                            # Request p
                                          "y-version-service"       : version__mgraph_ai_service_mitmproxy            ,
                                          "y-version-interceptor"   : request_data.version                            }
 
-        debug_params = self.cookie_service.convert_to_debug_params(request_data.headers)           # Extract cookie-based debug params and merge with path-based params
+        debug_params   = self.cookie_service.context_debug_params(cookie_context)                  # Extract cookie-based debug params and merge with path-based params
 
-        if self.cookie_service.has_any_proxy_cookies(request_data.headers):                                     # Add cookie summary to headers if any proxy cookies present
-            cookie_summary = self.cookie_service.get_cookie_summary(request_data.headers)
+        if cookie_context.proxy_cookies:                                                                        # Add cookie summary to headers if any proxy cookies present
+            cookie_summary = self.cookie_service.context_cookie_summary(cookie_context)
             modifications.headers_to_add["x-proxy-cookies"] = json.dumps(cookie_summary)
 
         modifications.headers_to_add["x-debug-params"] = json.dumps(debug_params)
 
-        if "/blocked" in request_data.path:                                                             # Block certain paths
+        if any(marker in request_data.path for marker in PROXY__BLOCKED_PATH_MARKERS):                   # Block certain paths
             modifications.block_request = True
             modifications.block_message = f"Path {request_data.path} is blocked by policy"
 
         for header in request_data.headers:                                                             # Remove sensitive headers
-            if any(sensitive in header for sensitive in ["Secret", "Private", "Token"]):
+            if any(sensitive in header for sensitive in PROXY__SENSITIVE_HEADER_MARKERS):
                 modifications.headers_to_remove.append(header)
 
         return modifications
 
+    def not_modified_response(self, request_data   : Schema__Proxy__Request_Data   ,  # 304 response when If-None-Match has the etag of the page's cached transformation
+                                    cookie_context : Schema__Proxy__Cookie__Context
+                              ) -> Optional[Dict]:                                  # (None when the request must go upstream)
+        if str(request_data.method).upper() not in ('GET', 'HEAD'):
+            return None
+        if_none_match = next((value for name, value in request_data.headers.items() if name.lower() == 'if-none-match'), '')
+        if not if_none_match:
+            return None
+        mode = cookie_context.mitm_mode
+        etag = self.etag_service.check_not_modified(host          = str(request_data.host),
+                                                    path          = request_data.path     ,
+                                                    mode          = mode                  ,
+                                                    if_none_match = if_none_match         )
+        if etag is None:
+            return None
+        self.stats_service.increment_not_modified()
+        return { "status_code": 304 ,
+                 "body"       : ""  ,
+                 "headers"    : { "etag"                   : etag       ,
+                                  "x-mgraph-proxy"         : "v1.0"     ,
+                                  "x-proxy-transformation" : mode.value ,
+                                  "x-proxy-not-modified"   : "true"     }}
+
     def handle_admin_request(self,request_data : Schema__Proxy__Request_Data    # Admin request data
                              ) -> Schema__Proxy__Modifications:                 # Modifications with cached response
         modifications   = Schema__Proxy__Modifications()
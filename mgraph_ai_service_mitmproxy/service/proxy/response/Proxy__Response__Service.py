@@ -1,14 +1,20 @@
 import uuid
-from typing                                                                          import Dict
+from typing                                                                          import Dict, Optional
 from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Cookie__Context        import Schema__Proxy__Cookie__Context
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Response__Processing_Result   import Schema__Response__Processing_Result
 from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service          import HTML__Transformation__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Debug__Service                 import Proxy__Debug__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Stats__Service                 import Proxy__Stats__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Headers__Service               import Proxy__Headers__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service                import Proxy__Cookie__Service
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                       import Proxy__Deadline
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Response__Compression          import Proxy__Response__Compression
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__ETag__Service                  import Proxy__ETag__Service
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode        import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result   import Schema__HTML__Transformation__Result
 
 
 
@@ -18,10 +24,14 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
     headers_service             : Proxy__Headers__Service                    # Standard headers
     cookie_service              : Proxy__Cookie__Service                     # Cookie-based control
     html_transformation_service : HTML__Transformation__Service = None
+    response_compression        : Proxy__Response__Compression               # gzip/br encoding of modified bodies (frame transport only)
+    etag_service                : Proxy__ETag__Service                       # etags of cached transformations (shared with the request service, which answers them with 304)
 
     def setup(self):
         self.debug_service               = Proxy__Debug__Service().setup()
         self.html_transformation_service = HTML__Transformation__Service().setup()
+        self.response_compression.setup()
+        self.etag_service.setup()
         return self
 
     def generate_request_id(self) -> str:                        # Generate unique request ID
@@ -31,19 +41,12 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
     def process_response(self, response_data : Schema__Proxy__Response_Data        # Main entry point for response processing
                           ) -> Schema__Response__Processing_Result:           # Complete processing result
         try:
-            request_id       = self.generate_request_id()                                                 # todo: review if we should not be setting this request id in get_standard_headers (since that is the only place this value is used)
-            body_size        = len(response_data.response.get("body", ""))                                 # Update statistics
-            modifications    = Schema__Proxy__Modifications()                                          # Create modifications object
-            request_headers  = response_data.request.get('headers', {})                              # Extract request headers (includes Cookie header)
-            debug_params     = self.cookie_service.convert_to_debug_params(request_headers)             # Parse cookie-based debug params from request headers, The interceptor sends request headers in response_data.request['headers']
-            standard_headers = self.headers_service.get_standard_headers(response_data,request_id)  # Add standard headers
-
-            self.stats_service.increment_response(bytes_processed = body_size)
-            modifications.headers_to_add.update(standard_headers)
-
-            if self.cookie_service.has_any_proxy_cookies(request_headers):                          # Add cookie summary header if any proxy cookies present
-                cookie_summary = self.cookie_service.get_cookie_summary(request_headers)
-                modifications.headers_to_add["x-proxy-cookie-summary"] = str(cookie_summary)
+            deadline = Proxy__Deadline(budget_ms=response_data.budget_ms)                              # started before any backend call
+            request_id, modifications, cookie_context, debug_params = self.start_response_processing(response_data)
+
+            if self.is_headers_only(response_data, cookie_context):                                 # No cookie can change the body: only the headers are processed
+                return self.finalize_headers_only_response(response_data, modifications, request_id)
+
             self.debug_service.process_debug_commands(debug_params  = debug_params ,                # Process debug commands (this may override response)
                                                       response_data = response_data,
                                                       modifications = modifications)
@@ -57,12 +60,10 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
 
             # Process HTML transformation based on mitm-mode cookie
             transformed_html, transformation_headers = self.process_html_transformation(response_data   = response_data    ,
-                                                                                        request_headers = request_headers  )
-
-            if transformed_html:
-                modifications.modified_body = transformed_html
-                modifications.headers_to_add.update(transformation_headers)
-                self.stats_service.increment_content_modification()
+                                                                                        cookie_context  = cookie_context   ,
+                                                                                        deadline        = deadline         )
+            self.apply_html_transformation(modifications, transformed_html, transformation_headers)
+            self.apply_deadline(modifications, deadline)
 
             return self._finalize_regular_response(response_data,                                   # Finalize regular response
                                                    modifications,
@@ -74,6 +75,55 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
             traceback.print_exc()
             return self._create_error_result( response_data, str(e))        # Handle any processing errors
 
+    # todo: refactor tuple with Type_Safe class
+    def start_response_processing(self, response_data : Schema__Proxy__Response_Data       # Steps shared by the sync and async pipelines (before any backend call)
+                                   ) -> tuple:                                              # (request_id, modifications, cookie_context, debug_params)
+        request_id       = self.generate_request_id()                                                 # todo: review if we should not be setting this request id in get_standard_headers (since that is the only place this value is used)
+        body_size        = len(response_data.response.get("body", ""))                                 # Update statistics
+        modifications    = Schema__Proxy__Modifications()                                          # Create modifications object
+        request_headers  = response_data.request.get('headers', {})                              # Extract request headers (includes Cookie header)
+        cookie_context   = self.cookie_service.cookie_context(request_headers)                      # Parse the cookies once (the interceptor sends request headers in response_data.request['headers'])
+        debug_params     = self.cookie_service.context_debug_params(cookie_context)                 # Cookie-based debug params
+        standard_headers = self.headers_service.get_standard_headers(response_data,request_id)  # Add standard headers
+
+        self.stats_service.increment_response(bytes_processed = body_size)
+        modifications.headers_to_add.update(standard_headers)
+
+        if cookie_context.proxy_cookies:                                                         # Add cookie summary header if any proxy cookies present
+            cookie_summary = self.cookie_service.context_cookie_summary(cookie_context)
+            modifications.headers_to_add["x-proxy-cookie-summary"] = str(cookie_summary)
+        return request_id, modifications, cookie_context, debug_params
+
+    def is_headers_only(self, response_data  : Schema__Proxy__Response_Data  ,                  # True when the body was not sent, or when no cookie can change it
+                              cookie_context : Schema__Proxy__Cookie__Context
+                         ) -> bool:
+        if response_data.body_omitted:
+            return True
+        return not self.cookie_service.context_modifies_body(cookie_context)
+
+    def finalize_headers_only_response(self, response_data : Schema__Proxy__Response_Data,     # Skips debug commands and transformations (they could only change the body)
+                                             modifications : Schema__Proxy__Modifications,
+                                             request_id    : str
+                                        ) -> Schema__Response__Processing_Result:
+        self.stats_service.increment_headers_only()
+        return self._finalize_regular_response(response_data, modifications, request_id)
+
+    def apply_html_transformation(self, modifications          : Schema__Proxy__Modifications,
+                                        transformed_html       : Optional[str]               ,
+                                        transformation_headers : Dict[str, str]
+                                   ) -> None:
+        if transformed_html:
+            modifications.modified_body = transformed_html
+            modifications.headers_to_add.update(transformation_headers)
+            self.stats_service.increment_content_modification()
+
+    def apply_deadline(self, modifications : Schema__Proxy__Modifications,           # Flag (and count) responses whose steps were skipped to stay within their latency budget
+                             deadline      : Proxy__Deadline
+                        ) -> None:
+        if deadline.exceeded():
+            modifications.headers_to_add.update(deadline.to_headers())
+            self.stats_service.increment_budget_exceeded()
+
     def finalize_overridden_response(self, response_data  : Schema__Proxy__Response_Data,
                                            modifications  : Schema__Proxy__Modifications,
                                       ) -> Schema__Response__Processing_Result:             # Finalize a response that was overridden by debug command
@@ -124,6 +174,42 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
                                                     content_was_modified = bool(modifications.modified_body),
                                                     response_overridden  = False                            )
 
+    # todo: refactor tuple with Type_Safe class
+    def compress_response(self, response_data     : Schema__Proxy__Response_Data       ,   # Encode the modified body with the best encoding the client accepts, and correct the headers
+                                processing_result : Schema__Response__Processing_Result    # (only for transports that carry raw bytes, i.e. the frame)
+                           ) -> tuple:                                                  # (encoded body, content-encoding), or (None, None) when the body is sent as it is
+        modifications = processing_result.modifications
+        if not modifications.modified_body or processing_result.has_error():
+            return None, None
+        accept_encoding = self.header_value(response_data.request.get('headers', {}), 'accept-encoding')
+        precompressed   = self.html_transformation_service.precompressed if self.html_transformation_service else None
+        body, encoding  = self.response_compression.compress(modifications.modified_body, accept_encoding, precompressed)
+        if encoding is None:
+            return None, None
+
+        vary = self.header_value(response_data.response.get('headers', {}), 'vary')            # the body now depends on Accept-Encoding (caches must key on it)
+        if 'accept-encoding' not in vary.lower():
+            vary = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+        encoding_headers = { 'content-encoding' : encoding  ,
+                             'vary'             : vary      ,
+                             'content-length'   : str(len(body)) }
+        etag = self.header_value(processing_result.final_headers, 'etag')
+        if etag:                                                                                # the encoded body is a different representation, so it gets its own strong etag
+            encoding_headers['etag'] = self.etag_service.encoded_etag(etag, encoding)
+        modifications.headers_to_add.update({name: value for name, value in encoding_headers.items() if name != 'content-length'})     # the interceptor sets content-length from the bytes it writes
+        final_headers = {name: value for name, value in processing_result.final_headers.items() if str(name).lower() not in encoding_headers}
+        final_headers.update(encoding_headers)
+        processing_result.final_headers = final_headers
+        return body, encoding
+
+    def header_value(self, headers : Dict[str, str] ,                                       # Case-insensitive header lookup ('' when missing)
+                           name    : str
+                      ) -> str:
+        for header_name, value in headers.items():
+            if header_name.lower() == name:
+                return str(value)
+        return ''
+
     def build_final_headers(self, response_data   : Schema__Proxy__Response_Data,  # Build the complete set of final headers
                                   modifications   : Schema__Proxy__Modifications,
                                   content_type    : str,
@@ -131,8 +217,9 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
                              ) -> Dict[str, str]:                 # Final headers
 
         final_headers   = response_data.response.get("headers", {}).copy()                            # Start with original response headers
-        content_headers = self.headers_service.get_content_headers(content_type, content_length)    # Add content headers
-        final_headers.update(content_headers)
+        if not response_data.body_omitted:                                                          # (without the body its length is unknown, so the upstream content headers are kept)
+            content_headers = self.headers_service.get_content_headers(content_type, content_length)    # Add content headers
+            final_headers.update(content_headers)
 
         # Add all headers from modifications (includes standard, debug)
         final_headers.update(modifications.headers_to_add)
@@ -167,27 +254,16 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
     # todo: refactor tuple with Type_Safe class
     def process_html_transformation(self,                                                   # Process HTML transformation based on mitm-mode cookie
                                           response_data  : Schema__Proxy__Response_Data,    # Response data with HTML
-                                          request_headers: Dict[str, str]                   # Request headers with cookies
+                                          cookie_context : Schema__Proxy__Cookie__Context ,  # Cookies of the request (parsed once per response)
+                                          deadline       : Optional[Proxy__Deadline] = None # Latency budget (steps are skipped when it runs low)
                                 ) -> tuple:                                                 # (transformed_html, headers_to_add)
-        transformation_mode = self.cookie_service.get_mitm_mode(request_headers)        # Extract transformation mode from cookie
-
-        if not transformation_mode.is_active():                                          # No transformation needed
+        transformation_input = self.html_transformation_input(response_data, cookie_context)
+        if transformation_input is None:
             return (None, {})
+        transformation_mode, response_body, target_url = transformation_input
+        deadline = deadline or Proxy__Deadline()
 
-        response_body = response_data.response.get("body", "")                           # Extract HTML from response
-        target_url    = self._construct_target_url(response_data)
-
-        if not response_body:                                                            # No body to transform
-            return (None, {})
-
-        content_type = response_data.response.get("headers", {}).get("content-type", "")    # Only transform HTML content
-        if "text/html" not in content_type.lower():
-            print(f"         >>> Skipping transformation - not HTML: {content_type}")
-            return (None, {})
-
-        print(f"    🔄 Transforming HTML with mode: {transformation_mode.value}")
-
-        self.html_transformation_service.store_original_html(                            # Store original HTML for provenance
+        self.html_transformation_service.store_original_html(                            # Store original HTML for provenance (in the background, and only when it changed)
             target_url    = target_url     ,
             original_html = response_body
         )
@@ -195,13 +271,63 @@ class Proxy__Response__Service(Type_Safe):                       # Main response
         result = self.html_transformation_service.transform_html(                        # Perform transformation
             source_html = response_body       ,
             target_url  = target_url          ,
-            mode        = transformation_mode
+            mode        = transformation_mode ,
+            deadline    = deadline
         )
 
         headers_to_add = result.to_headers()                                             # Generate transformation headers
+        headers_to_add.update(self.etag_headers(response_data, transformation_mode, response_body, result, deadline))
 
         return (result.transformed_html, headers_to_add)
 
+    def etag_headers(self, response_data : Schema__Proxy__Response_Data        ,          # Strong etag of a cached transformation (and remember it, so the next request with it gets a 304)
+                           mode          : Enum__HTML__Transformation_Mode     ,
+                           source_html   : str                                 ,
+                           result        : Schema__HTML__Transformation__Result,
+                           deadline      : Proxy__Deadline
+                      ) -> Dict[str, str]:
+        if not self.etag_service.enabled or not self.html_transformation_service.cache_enabled():   # without the cache, the same html is not guaranteed to give the same body
+            return {}
+        if not result.success or not result.transformed_html or deadline.exceeded():                # the original html was served (passthrough, error, open breaker, or transformation still pending)
+            return {}
+        content_hash = self.html_transformation_service.content_hash(source_html)
+        if not content_hash:
+            return {}
+        etag          = self.etag_service.etag(content_hash, mode)
+        fresh_seconds = self.etag_service.upstream_fresh_seconds(response_data.response.get('headers', {}))    # the request phase can't see upstream, so only skip it while upstream says the page is fresh
+        ttl_seconds   = self.html_transformation_service.transformation_ttl_seconds(mode)
+        if ttl_seconds:
+            fresh_seconds = min(fresh_seconds, ttl_seconds)
+        self.etag_service.remember(host          = response_data.request.get('host', '') ,
+                                   path          = response_data.request.get('path', '/'),
+                                   mode          = mode                                  ,
+                                   etag          = etag                                  ,
+                                   fresh_seconds = fresh_seconds                         )
+        return {'etag': etag}
+
+    # todo: refactor tuple with Type_Safe class
+    def html_transformation_input(self, response_data  : Schema__Proxy__Response_Data,     # Decide if (and how) the response body should be transformed
+                                        cookie_context : Schema__Proxy__Cookie__Context
+                                   ) -> Optional[tuple]:                                    # (transformation_mode, response_body, target_url) or None
+        transformation_mode = cookie_context.mitm_mode                                   # Transformation mode from the mitm-mode cookie
+
+        if not transformation_mode.is_active():                                          # No transformation needed
+            return None
+
+        response_body = response_data.response.get("body", "")                           # Extract HTML from response
+        target_url    = self._construct_target_url(response_data)
+
+        if not response_body:                                                            # No body to transform
+            return None
+
+        content_type = response_data.response.get("headers", {}).get("content-type", "")    # Only transform HTML content
+        if "text/html" not in content_type.lower():
+            print(f"         >>> Skipping transformation - not HTML: {content_type}")
+            return None
+
+        print(f"    🔄 Transforming HTML with mode: {transformation_mode.value}")
+        return transformation_mode, response_body, target_url
+
 
     def _construct_target_url(self, response_data: 'Schema__Proxy__Response_Data'       # Response data
                               ) -> str:                                                  # Constructed URL
@@ -0,0 +1,75 @@
+import asyncio
+from typing                                                                          import Optional
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Response__Processing_Result   import Schema__Response__Processing_Result
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Cookie__Context        import Schema__Proxy__Cookie__Context
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Async   import HTML__Transformation__Service__Async
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Debug__Service                 import Proxy__Debug__Service
+from mgraph_ai_service_mitmproxy.service.proxy.response.Proxy__Response__Service     import Proxy__Response__Service
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                       import Proxy__Deadline
+
+
+class Proxy__Response__Service__Async(Proxy__Response__Service):                    # Async version of the response pipeline (one worker, many in-flight transforms)
+    html_transformation_service : HTML__Transformation__Service__Async = None     # pass one that shares the sync pipeline's state (see HTML__Transformation__Service__Async.share_state)
+
+    def setup(self):
+        self.debug_service               = Proxy__Debug__Service().setup()
+        if self.html_transformation_service is None:
+            self.html_transformation_service = HTML__Transformation__Service__Async().setup()
+        self.response_compression.setup()
+        self.etag_service.setup()
+        return self
+
+    async def process_response(self, response_data : Schema__Proxy__Response_Data
+                                ) -> Schema__Response__Processing_Result:
+        try:
+            deadline = Proxy__Deadline(budget_ms=response_data.budget_ms)
+            request_id, modifications, cookie_context, debug_params = self.start_response_processing(response_data)
+
+            if self.is_headers_only(response_data, cookie_context):
+                return self.finalize_headers_only_response(response_data, modifications, request_id)
+
+            if debug_params:                                                        # debug commands (WCF, etc) still use the sync clients
+                await asyncio.to_thread(self.debug_service.process_debug_commands,
+                                        debug_params  = debug_params ,
+                                        response_data = response_data,
+                                        modifications = modifications)
+
+            if modifications.override_response:
+                return self.finalize_overridden_response(response_data = response_data ,
+                                                         modifications = modifications )
+            if modifications.modified_body:
+                self.stats_service.increment_content_modification()
+
+            transformed_html, transformation_headers = await self.process_html_transformation(response_data   = response_data  ,
+                                                                                              cookie_context  = cookie_context ,
+                                                                                              deadline        = deadline       )
+            self.apply_html_transformation(modifications, transformed_html, transformation_headers)
+            self.apply_deadline(modifications, deadline)
+
+            return self._finalize_regular_response(response_data, modifications, request_id)
+
+        except Exception as e:
+            print('Error:' , e)
+            return self._create_error_result(response_data, str(e))
+
+    async def process_html_transformation(self, response_data  : Schema__Proxy__Response_Data,
+                                                cookie_context : Schema__Proxy__Cookie__Context,
+                                                deadline       : Optional[Proxy__Deadline] = None
+                                          ) -> tuple:                               # (transformed_html, headers_to_add)
+        transformation_input = self.html_transformation_input(response_data, cookie_context)
+        if transformation_input is None:
+            return (None, {})
+        transformation_mode, response_body, target_url = transformation_input
+        deadline = deadline or Proxy__Deadline()
+
+        await self.html_transformation_service.store_original_html(target_url    = target_url   ,
+                                                                   original_html = response_body)
+
+        result = await self.html_transformation_service.transform_html(source_html = response_body      ,
+                                                                       target_url  = target_url         ,
+                                                                       mode        = transformation_mode,
+                                                                       deadline    = deadline           )
+        headers_to_add = result.to_headers()
+        headers_to_add.update(self.etag_headers(response_data, transformation_mode, response_body, result, deadline))
+        return (result.transformed_html, headers_to_add)
@@ -1,7 +1,7 @@
-import requests
-from typing                                                                                                     import Dict
+from typing                                                                                                     import Dict, Optional
 from osbot_utils.decorators.methods.cache_on_self                                                               import cache_on_self
 from osbot_utils.type_safe.Type_Safe                                                                            import Type_Safe
+from osbot_utils.type_safe.primitives.core.Safe_Float                                                           import Safe_Float
 from osbot_utils.type_safe.primitives.domains.http.safe_str.Safe_Str__Http__Header__Name                        import Safe_Str__Http__Header__Name
 from osbot_utils.type_safe.primitives.domains.http.safe_str.Safe_Str__Http__Header__Value                       import Safe_Str__Http__Header__Value
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                                 import Safe_Str__Id
@@ -12,10 +12,12 @@ from osbot_utils.utils.Json import json_dumps
 
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Response   import Schema__Semantic_Text__Transformation__Response
 from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Request    import Schema__Semantic_Text__Transformation__Request
-from mgraph_ai_service_mitmproxy.schemas.semantic_text.const__semantic_text                                     import ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL, ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_NAME, ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.const__semantic_text                                     import ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL, ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_NAME, ENV_VAR__AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__KEY_VALUE, DEFAULT__SEMANTIC_TEXT_SERVICE__TIMEOUT
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                                               import http_session_pool
 
 
 class Semantic_Text__Service__Client(Type_Safe):                                                       # HTTP client for Semantic Text Service API
+    timeout : Safe_Float = Safe_Float(DEFAULT__SEMANTIC_TEXT_SERVICE__TIMEOUT)                          # Request timeout in seconds
 
     @cache_on_self
     def server_base_url(self):
@@ -35,7 +37,8 @@ class Semantic_Text__Service__Client(Type_Safe):
         return headers
 
     @type_safe
-    def transform_text(self, request  : Schema__Semantic_Text__Transformation__Request  # Transform text using Semantic Text Service
+    def transform_text(self, request  : Schema__Semantic_Text__Transformation__Request ,       # Transform text using Semantic Text Service
+                             timeout  : Optional[float] = None                                   # seconds (None uses the client's timeout)
                        ) -> Schema__Semantic_Text__Transformation__Response:                                           # Transformation response
 
         endpoint_path = "/text-transformation/transform"
@@ -51,8 +54,10 @@ class Semantic_Text__Service__Client(Type_Safe):
         # print(json_dumps(post_json))
         # print()
         # print()
-        response = requests.post(url     = url          ,
-                                 headers = post_headers ,
-                                 json    = post_json    )
+        response = http_session_pool.post(url     = url                            ,
+                                          headers = post_headers                   ,
+                                          json    = post_json                      ,
+                                          timeout = float(self.timeout if timeout is None else timeout) )
+        response.raise_for_status()                                                                         # an error page is not a transformation (raises, so the pipeline backs off)
 
         return Schema__Semantic_Text__Transformation__Response.from_json(response.json())
\ No newline at end of file
@@ -0,0 +1,25 @@
+from typing                                                                                                     import Optional
+from osbot_utils.utils.Http                                                                                     import url_join_safe
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Response   import Schema__Semantic_Text__Transformation__Response
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Request    import Schema__Semantic_Text__Transformation__Request
+from mgraph_ai_service_mitmproxy.service.http.Http__Async__Client__Pool                                         import http_async_client_pool
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client                           import Semantic_Text__Service__Client
+
+
+class Semantic_Text__Service__Client__Async(Semantic_Text__Service__Client):                          # Async (httpx) version of Semantic_Text__Service__Client
+
+    async def transform_text(self, request  : Schema__Semantic_Text__Transformation__Request ,  # Transform text using Semantic Text Service
+                                   timeout  : Optional[float] = None                              # seconds (None uses the client's timeout)
+                             ) -> Schema__Semantic_Text__Transformation__Response:                      # Transformation response
+        server = self.server_base_url()
+        if not server:
+            raise ValueError("in transform_text, the target server was not be set")
+
+        url      = url_join_safe(server, "/text-transformation/transform")
+        response = await http_async_client_pool.post(url     = url                            ,
+                                                     headers = self.headers()                 ,
+                                                     json    = request.json()                 ,
+                                                     timeout = float(self.timeout if timeout is None else timeout) )
+        response.raise_for_status()                                                                         # an error page is not a transformation (raises, so the pipeline backs off)
+
+        return Schema__Semantic_Text__Transformation__Response.from_json(response.json())
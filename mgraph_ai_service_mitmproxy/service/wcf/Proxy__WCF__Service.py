@@ -6,6 +6,8 @@ from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Content_Type      impo
 from mgraph_ai_service_mitmproxy.schemas.wcf.Schema__WCF__Request           import Schema__WCF__Request
 from mgraph_ai_service_mitmproxy.schemas.wcf.Schema__WCF__Response          import Schema__WCF__Response
 from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service        import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Negative__Cache       import Proxy__Negative__Cache
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight         import Proxy__Single_Flight
 from mgraph_ai_service_mitmproxy.service.consts.consts__proxy               import DEFAULT__WCF__PROXY__TIMEOUT
 from mgraph_ai_service_mitmproxy.service.wcf.WCF__Cache__Integrator         import WCF__Cache__Integrator
 from mgraph_ai_service_mitmproxy.service.wcf.WCF__Command__Processor        import WCF__Command__Processor
@@ -20,6 +22,8 @@ class Proxy__WCF__Service(Type_Safe):                                          #
     request_handler  : WCF__Request__Handler                                   # Handles WCF requests
     command_processor: WCF__Command__Processor                                 # Processes show commands
     cache_integrator : WCF__Cache__Integrator = None                           # Integrates cache
+    single_flight    : Proxy__Single_Flight                                    # Concurrent show commands for the same url share one WCF call
+    negative_cache   : Proxy__Negative__Cache                                  # (url, command) pairs the WCF recently failed on (skipped while backing off)
 
     def setup(self):
         self.request_handler   = WCF__Request__Handler(wcf_base_url = self.wcf_base_url,
@@ -53,6 +57,15 @@ class Proxy__WCF__Service(Type_Safe):                                          #
 
         command_type, rating, model_to_use, modified_url_suffix = parsed
 
+        return self.single_flight.do((target_url, show_value),                           # Concurrent callers for the same url+command wait for one WCF call
+                                     lambda: self._process_show_command(show_value, target_url, command_type, rating, model_to_use))
+
+    def _process_show_command(self, show_value   : str                     ,              # Cache lookup, WCF call and cache store (run once per single-flight key)
+                                    target_url   : str                     ,
+                                    command_type : Enum__WCF__Command_Type ,
+                                    rating       : Optional[float]         ,
+                                    model_to_use : Optional[str]
+                               ) -> Optional[Schema__WCF__Response]:
         cached_response = self.cache_integrator.try_get_cached_response(target_url   = target_url  , # Check cache first
                                                                         show_value   = show_value  ,
                                                                         command_type = command_type)
@@ -60,6 +73,11 @@ class Proxy__WCF__Service(Type_Safe):                                          #
             print(f"         >>> Cached response for: {target_url}")
             return cached_response
 
+        negative_key = (target_url, show_value)
+        if self.negative_cache.is_blocked(negative_key):                                # failed recently: the proxy response is left as is until the backoff expires
+            print(f"         >>> Skipping WCF (failed recently) for: {target_url}")
+            return None
+
         start_time   = time.time()                                                      # Cache miss - call WCF service
         #modified_url = target_url + modified_url_suffix                                # todo: fix this logic since modified_url_suffix is actually the extra params to send to the wcf server
 
@@ -73,6 +91,11 @@ class Proxy__WCF__Service(Type_Safe):                                          #
 
         print(f"       WCF took {call_duration_ms/1000:.2f} seconds for {target_url}")
 
+        if wcf_response and wcf_response.success:
+            self.negative_cache.record_success(negative_key)
+        else:
+            self.negative_cache.record_failure(negative_key, wcf_response.error_message if wcf_response else 'no response')
+
         self.cache_integrator.store_wcf_response(target_url       = target_url      ,      # Store successful responses in cache
                                                  show_value       = show_value      ,
                                                  wcf_response     = wcf_response    ,
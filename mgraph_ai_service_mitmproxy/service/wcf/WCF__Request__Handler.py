@@ -8,6 +8,7 @@ from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Content_Type      impo
 from mgraph_ai_service_mitmproxy.schemas.wcf.Schema__WCF__Request           import Schema__WCF__Request
 from mgraph_ai_service_mitmproxy.schemas.wcf.Schema__WCF__Response          import Schema__WCF__Response
 from mgraph_ai_service_mitmproxy.service.wcf.Proxy__WCF__Service            import DEFAULT__WCF__PROXY__TIMEOUT
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool           import http_session_pool__paid
 
 
 class WCF__Request__Handler(Type_Safe):                                     # Handles WCF request creation and execution
@@ -35,9 +36,9 @@ class WCF__Request__Handler(Type_Safe):                                     # Ha
 
             print(f"    WCF: {url}")
             try:
-                response = requests.get(url     = url         ,                 # Make HTTP request
-                                        headers = headers     ,
-                                        timeout = self.timeout)
+                response = http_session_pool__paid.get(url     = url         ,  # Make HTTP request (via the keep-alive pool that never replays a 5xx: each call is a paid LLM call)
+                                                       headers = headers     ,
+                                                       timeout = self.timeout)
             except ConnectTimeout as error:
                 print(f"    WCF TIMEOUT on : {url}")
                 return Schema__WCF__Response(error_message = str(error.args[0]),
@@ -0,0 +1,272 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from contextlib                                                                     import contextmanager, redirect_stdout
+from pathlib                                                                        import Path
+from typing                                                                         import List, Callable
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Json                                                         import json_load_file, json_save_file
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline  import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data          import Schema__Proxy__Request_Data
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data         import Schema__Proxy__Response_Data
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config        import Schema__Cache__Config
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Service                       import Proxy__Service
+from tests.benchmark.proxy.Proxy__Benchmark__Corpus                                 import Proxy__Benchmark__Corpus, Proxy__Benchmark__Page
+from tests.benchmark.proxy.Proxy__Benchmark__Stubs                                  import Proxy__Benchmark__HTML__Service__Client, Proxy__Benchmark__Semantic_Text__Client, Proxy__Benchmark__Cache__Client
+
+# Replays the corpus through Proxy__Service.process_request / process_response for every Enum__HTML__Transformation_Mode
+# (with stub HTML, Semantic Text and cache services, so only the proxy's own hot path is measured)
+#
+#   python -m tests.benchmark.proxy.Proxy__Benchmark                       # run and compare with the saved baseline
+#   python -m tests.benchmark.proxy.Proxy__Benchmark --save-baseline       # run and replace the saved baseline
+
+FILE__PROXY_BENCHMARK__BASELINE     = Path(__file__).parent / 'proxy_benchmark__baseline.json'
+DEFAULT__PROXY_BENCHMARK__ITERATIONS = 5                                            # timed passes over the corpus (per phase, mode and cache state)
+DEFAULT__PROXY_BENCHMARK__TOLERANCE  = 1.5                                          # a metric regresses when it is more than 1.5x its baseline value
+PROXY_BENCHMARK__REGRESSION_METRICS  = ('p50_ms', 'p95_ms', 'alloc_kb_per_request')
+
+BENCHMARK__PHASE__REQUEST   = 'request'
+BENCHMARK__PHASE__RESPONSE  = 'response'
+BENCHMARK__CACHE__NONE      = 'none'                                                # request phase never touches the cache
+BENCHMARK__CACHE__MISS      = 'miss'                                                # cache disabled: every response is transformed
+BENCHMARK__CACHE__HIT       = 'hit'                                                 # cache enabled and warmed: transformations come from the cache
+
+
+class Schema__Proxy__Benchmark__Result(Type_Safe):                                  # Latency/throughput/allocation numbers for one (phase, mode, cache) combination
+    phase                : str
+    mode                 : str
+    cache                : str
+    requests             : int                                                      # timed requests
+    p50_ms               : float
+    p95_ms               : float
+    p99_ms               : float
+    mean_ms              : float
+    requests_per_sec     : float
+    alloc_kb_per_request : float                                                    # average tracemalloc peak (above the starting point) per request
+
+    def key(self) -> str:
+        return f'{self.phase}:{self.mode}:{self.cache}'
+
+
+class Proxy__Benchmark(Type_Safe):                                                  # Benchmark harness for the proxy request/response hot path
+    iterations    : int                                   = DEFAULT__PROXY_BENCHMARK__ITERATIONS
+    tolerance     : float                                 = DEFAULT__PROXY_BENCHMARK__TOLERANCE
+    pipeline      : Enum__HTML__Transformation__Pipeline  = Enum__HTML__Transformation__Pipeline.REMOTE
+    modes         : List[Enum__HTML__Transformation_Mode]                           # empty means every mode
+    pages         : List[Proxy__Benchmark__Page]                                    # empty means the whole corpus
+    proxy_service : Proxy__Service                        = None
+    cache_client  : Proxy__Benchmark__Cache__Client       = None
+
+    def setup(self) -> 'Proxy__Benchmark':
+        if not self.modes:
+            self.modes = list(Enum__HTML__Transformation_Mode)
+        if not self.pages:
+            self.pages = Proxy__Benchmark__Corpus().pages()
+        with self.quiet():
+            self.proxy_service = Proxy__Service().setup()
+        self.cache_client = Proxy__Benchmark__Cache__Client()
+
+        html_transformation_service                      = self.proxy_service.response_service.html_transformation_service
+        html_transformation_service.pipeline             = self.pipeline
+        html_transformation_service.html_service_client  = Proxy__Benchmark__HTML__Service__Client()
+        html_transformation_service.semantic_text_client = Proxy__Benchmark__Semantic_Text__Client()
+        html_transformation_service.cache_service        = Proxy__Cache__Service(cache_client = self.cache_client          ,
+                                                                                 cache_config = Schema__Cache__Config())
+        return self
+
+    def cache_service(self) -> Proxy__Cache__Service:
+        return self.proxy_service.response_service.html_transformation_service.cache_service
+
+    @contextmanager
+    def quiet(self):                                                                # the services log every step to stdout, which we don't want in the timings or the report
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            yield
+
+    def request_data(self, page : Proxy__Benchmark__Page,
+                           mode : Enum__HTML__Transformation_Mode
+                      ) -> Schema__Proxy__Request_Data:
+        return Schema__Proxy__Request_Data(method  = 'GET'                                            ,
+                                           host    = page.host()                                      ,
+                                           path    = page.path()                                      ,
+                                           headers = {'host'       : page.host()                      ,
+                                                      'user-agent' : 'Mozilla/5.0 (proxy benchmark)'  ,
+                                                      'accept'     : 'text/html'                      ,
+                                                      'cookie'     : f'mitm-mode={mode.value}; session=abc123'},
+                                           version = 'v1.0.0'                                          )
+
+    def response_data(self, page : Proxy__Benchmark__Page,
+                            mode : Enum__HTML__Transformation_Mode
+                       ) -> Schema__Proxy__Response_Data:
+        request_data = self.request_data(page, mode)
+        return Schema__Proxy__Response_Data(request  = dict(method  = 'GET'                ,
+                                                            host    = page.host()          ,
+                                                            path    = page.path()          ,
+                                                            scheme  = 'https'              ,
+                                                            port    = 443                  ,
+                                                            url     = page.url             ,
+                                                            headers = request_data.headers),
+                                            response = dict(status_code  = 200                                  ,
+                                                            headers      = {'content-type': 'text/html; charset=utf-8'},
+                                                            body         = page.html                            ,
+                                                            content_type = 'text/html; charset=utf-8'           ),
+                                            stats    = {}                                                       ,
+                                            version  = 'v1.0.0'                                                 )
+
+    def run(self) -> List[Schema__Proxy__Benchmark__Result]:
+        results = []
+        with self.quiet():
+            for mode in self.modes:
+                requests  = [self.request_data(page, mode) for page in self.pages]
+                results.append(self.measure(BENCHMARK__PHASE__REQUEST, mode, BENCHMARK__CACHE__NONE,
+                                            self.proxy_service.process_request, requests))
+            for cache_state in (BENCHMARK__CACHE__MISS, BENCHMARK__CACHE__HIT):
+                self.reset_cache(enabled = cache_state == BENCHMARK__CACHE__HIT)
+                for mode in self.modes:
+                    responses = [self.response_data(page, mode) for page in self.pages]
+                    results.append(self.measure(BENCHMARK__PHASE__RESPONSE, mode, cache_state,
+                                                self.proxy_service.process_response, responses))
+        return results
+
+    def reset_cache(self, enabled : bool) -> None:
+        cache_service = self.cache_service()
+        cache_service.cache_config.enabled = enabled
+        cache_service.page_refs_cache.clear()
+        self.cache_client.page_entries.clear()
+        self.cache_client.data_files  .clear()
+
+    def measure(self, phase    : str                                  ,
+                      mode     : Enum__HTML__Transformation_Mode      ,
+                      cache    : str                                  ,
+                      target   : Callable                             ,
+                      items    : list
+                 ) -> Schema__Proxy__Benchmark__Result:
+        for item in items:                                                          # warm up (also fills the cache for the 'hit' runs)
+            target(item)
+
+        latencies = []
+        started   = time.perf_counter()
+        for _ in range(self.iterations):
+            for item in items:
+                request_start = time.perf_counter()
+                target(item)
+                latencies.append((time.perf_counter() - request_start) * 1000)
+        elapsed = time.perf_counter() - started
+
+        return Schema__Proxy__Benchmark__Result(phase                = phase                                      ,
+                                                mode                 = mode.value                                 ,
+                                                cache                = cache                                      ,
+                                                requests             = len(latencies)                             ,
+                                                p50_ms               = self.percentile(latencies, 50)             ,
+                                                p95_ms               = self.percentile(latencies, 95)             ,
+                                                p99_ms               = self.percentile(latencies, 99)             ,
+                                                mean_ms              = sum(latencies) / max(len(latencies), 1)    ,
+                                                requests_per_sec     = len(latencies) / elapsed if elapsed else 0.0,
+                                                alloc_kb_per_request = self.allocations(target, items)            )
+
+    def allocations(self, target : Callable,                                        # separate pass, since tracemalloc slows everything down
+                          items  : list
+                     ) -> float:
+        if not items:
+            return 0.0
+        total = 0
+        tracemalloc.start()
+        try:
+            for item in items:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                target(item)
+                _, peak   = tracemalloc.get_traced_memory()
+                total    += peak - before
+        finally:
+            tracemalloc.stop()
+        return total / len(items) / 1024
+
+    def percentile(self, values : List[float], percent : int) -> float:             # nearest-rank percentile
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index   = max(0, -(-len(ordered) * percent // 100) - 1)
+        return ordered[index]
+
+    def report(self, results : List[Schema__Proxy__Benchmark__Result]) -> str:
+        lines = [f"{'phase':<9} {'mode':<18} {'cache':<5} {'reqs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9} {'alloc kb':>9}"]
+        for result in results:
+            lines.append(f'{result.phase:<9} {result.mode:<18} {result.cache:<5} {result.requests:>5} '
+                         f'{result.p50_ms:>8.2f} {result.p95_ms:>8.2f} {result.p99_ms:>8.2f} '
+                         f'{result.requests_per_sec:>9.1f} {result.alloc_kb_per_request:>9.1f}')
+        return '\n'.join(lines)
+
+    def baseline_data(self, results : List[Schema__Proxy__Benchmark__Result]) -> dict:
+        return dict(settings = dict(iterations = self.iterations            ,
+                                    pipeline   = self.pipeline.value        ,
+                                    pages      = [page.name for page in self.pages]),
+                    results  = {result.key(): result.json() for result in results})
+
+    def save_baseline(self, results : List[Schema__Proxy__Benchmark__Result],
+                            path    : Path = FILE__PROXY_BENCHMARK__BASELINE
+                       ) -> dict:
+        baseline = self.baseline_data(results)
+        json_save_file(baseline, str(path))
+        return baseline
+
+    def load_baseline(self, path : Path = FILE__PROXY_BENCHMARK__BASELINE) -> dict:
+        if Path(path).exists():
+            return json_load_file(str(path))
+        return {}
+
+    def compare_with_baseline(self, results  : List[Schema__Proxy__Benchmark__Result],  # List of regressions (empty when everything is within tolerance)
+                                    baseline : dict
+                               ) -> List[str]:
+        regressions      = []
+        baseline_results = baseline.get('results', {})
+        for result in results:
+            previous = baseline_results.get(result.key())
+            if not previous:
+                continue
+            for metric in PROXY_BENCHMARK__REGRESSION_METRICS:
+                before = previous.get(metric, 0)
+                after  = getattr(result, metric)
+                if before > 0 and after > before * self.tolerance:
+                    regressions.append(f'{result.key()} {metric}: {before:.2f} -> {after:.2f} ({after / before:.1f}x)')
+        return regressions
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark Proxy__Service.process_request / process_response')
+    parser.add_argument('--iterations'   , type=int  , default=DEFAULT__PROXY_BENCHMARK__ITERATIONS)
+    parser.add_argument('--tolerance'    , type=float, default=DEFAULT__PROXY_BENCHMARK__TOLERANCE )
+    parser.add_argument('--pipeline'     , default=Enum__HTML__Transformation__Pipeline.REMOTE.value,
+                                           choices=[pipeline.value for pipeline in Enum__HTML__Transformation__Pipeline])
+    parser.add_argument('--modes'        , nargs='*' , default=[]                                   )
+    parser.add_argument('--save-baseline', action='store_true'                                      )
+    options = parser.parse_args(args)
+
+    modes     = [Enum__HTML__Transformation_Mode(mode) for mode in options.modes]
+    benchmark = Proxy__Benchmark(iterations = options.iterations                                    ,
+                                 tolerance  = options.tolerance                                     ,
+                                 pipeline   = Enum__HTML__Transformation__Pipeline(options.pipeline),
+                                 modes      = modes                                                 ).setup()
+    results   = benchmark.run()
+    print(benchmark.report(results))
+
+    if options.save_baseline:
+        benchmark.save_baseline(results)
+        print(f'\nbaseline saved to {FILE__PROXY_BENCHMARK__BASELINE}')
+        return 0
+
+    regressions = benchmark.compare_with_baseline(results, benchmark.load_baseline())
+    if regressions:
+        print('\nregressions (vs baseline):')
+        for regression in regressions:
+            print(f'  {regression}')
+        return 1
+    print('\nno regressions (vs baseline)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import random
+from pathlib                                                                        import Path
+from typing                                                                         import List
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Env                                                          import get_env
+
+ENV_VAR__PROXY_BENCHMARK__CORPUS_DIR = 'PROXY_BENCHMARK__CORPUS_DIR'                # folder with captured pages (<host>.html), used instead of the synthetic pages
+
+# Synthetic stand-ins for the sites in docs/dev/interesting-sites-to-test.txt (the benchmark must run offline)
+# name                , url                                     , sections, paragraphs, links, scripts
+CORPUS__SYNTHETIC_PAGES = [('bbc-sport'         , 'https://www.bbc.co.uk/sport'            , 24 , 3 , 180, 12),
+                           ('guardian-uk'       , 'https://www.theguardian.com/uk'         , 30 , 2 , 220, 15),
+                           ('npr'               , 'https://www.npr.org/'                   , 16 , 3 , 120,  8),
+                           ('paulgraham-essay'  , 'https://paulgraham.com/foundermode.html',  1 , 40,   6,  0),
+                           ('lite-cnn'          , 'https://lite.cnn.com/'                  ,  1 , 0 , 100,  0),
+                           ('text-npr'          , 'https://text.npr.org/'                  ,  1 , 0 ,  40,  0),
+                           ('readspike'         , 'https://readspike.com/'                 , 12 , 0 , 300,  2),
+                           ('bbc-404'           , 'https://www.bbc.co.uk/404'              ,  1 , 2 ,  10,  3)]
+
+WORDS = ('the government said on monday that new figures showed a rise in the number of people '
+         'working from home while the team won the final after a late goal from the captain and '
+         'markets fell sharply as investors worried about the outlook for interest rates this year').split()
+
+
+class Proxy__Benchmark__Page(Type_Safe):                                            # One page replayed through the proxy
+    name : str                                                                      # short id used in reports
+    url  : str                                                                      # original url (used for the request host/path and the cache key)
+    html : str                                                                      # response body
+
+    def host(self) -> str:
+        return self.url.split('://', 1)[-1].split('/', 1)[0]
+
+    def path(self) -> str:
+        path = self.url.split('://', 1)[-1]
+        return '/' + path.split('/', 1)[1] if '/' in path else '/'
+
+
+class Proxy__Benchmark__Corpus(Type_Safe):                                          # Deterministic set of representative pages
+    seed : int = 42
+
+    def pages(self) -> List[Proxy__Benchmark__Page]:                                # captured pages (if configured) or the synthetic ones
+        corpus_dir = get_env(ENV_VAR__PROXY_BENCHMARK__CORPUS_DIR)
+        if corpus_dir:
+            return self.captured_pages(corpus_dir)
+        return self.synthetic_pages()
+
+    def captured_pages(self, corpus_dir : str) -> List[Proxy__Benchmark__Page]:     # <host>.html files saved from the real sites
+        pages = []
+        for file in sorted(Path(corpus_dir).glob('*.html')):
+            pages.append(Proxy__Benchmark__Page(name = file.stem                                     ,
+                                                url  = f'https://{file.stem}/'                       ,
+                                                html = file.read_text(encoding='utf-8', errors='ignore')))
+        return pages
+
+    def synthetic_pages(self) -> List[Proxy__Benchmark__Page]:
+        pages = []
+        for name, url, sections, paragraphs, links, scripts in CORPUS__SYNTHETIC_PAGES:
+            html = self.synthetic_html(name, sections, paragraphs, links, scripts)
+            pages.append(Proxy__Benchmark__Page(name=name, url=url, html=html))
+        return pages
+
+    def synthetic_html(self, name       : str,                                      # same shape as the real page: nav, headline sections, article text, footer links
+                             sections   : int,
+                             paragraphs : int,
+                             links      : int,
+                             scripts    : int
+                        ) -> str:
+        rnd   = random.Random(f'{self.seed}-{name}')
+        parts = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+                 f'<title>{self.sentence(rnd, 6)}</title>'                    ,
+                 '<style>body{font-family:sans-serif}.nav a{margin:0 4px}</style>']
+        for index in range(scripts):
+            parts.append(f'<script>window.__data_{index} = {{"id": {index}, "track": true}};</script>')
+        parts.append('</head><body><div class="nav"><ul>')
+        for index in range(min(links, 12)):
+            parts.append(f'<li><a href="/section/{index}">{self.sentence(rnd, 2)}</a></li>')
+        parts.append('</ul></div><main>')
+        links_left = max(links - 12, 0)
+        for section in range(sections):
+            parts.append(f'<section id="s{section}"><h2>{self.sentence(rnd, 5)}</h2><ul>')
+            for _ in range(links_left // max(sections, 1)):
+                parts.append(f'<li><a href="/story/{rnd.randint(1000, 99999)}">{self.sentence(rnd, 8)}</a> '
+                             f'<span class="time">{rnd.randint(1, 59)} mins ago</span></li>')
+            parts.append('</ul>')
+            for _ in range(paragraphs):
+                parts.append(f'<p>{self.sentence(rnd, 40)} <b>{self.sentence(rnd, 3)}</b> {self.sentence(rnd, 25)}</p>')
+            parts.append('</section>')
+        parts.append(f'</main><footer><p>{self.sentence(rnd, 12)}</p></footer></body></html>')
+        return '\n'.join(parts)
+
+    def sentence(self, rnd : random.Random, words : int) -> str:
+        return ' '.join(rnd.choice(WORDS) for _ in range(words)).capitalize()
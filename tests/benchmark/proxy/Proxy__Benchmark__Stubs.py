@@ -0,0 +1,83 @@
+import hashlib
+from typing                                                                                                     import Dict, Optional
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client                                   import Service__Fast_API__Client
+from osbot_utils.type_safe.primitives.core.Safe_UInt                                                            import Safe_UInt
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Service__Response                                   import Schema__HTML__Service__Response
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Hashes__To__Html__Request                                 import Schema__Hashes__To__Html__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Request                           import Schema__Html__To__Dict__Hashes__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Response                          import Schema__Html__To__Dict__Hashes__Response
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Request    import Schema__Semantic_Text__Transformation__Request
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Response   import Schema__Semantic_Text__Transformation__Response
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.enums.Enum__Text__Transformation__Mode            import Enum__Text__Transformation__Mode
+from mgraph_ai_service_mitmproxy.service.html.HTML__Local__Engine                                               import HTML__Local__Engine
+from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client                                             import HTML__Service__Client
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client                           import Semantic_Text__Service__Client
+
+
+class Proxy__Benchmark__HTML__Service__Client(HTML__Service__Client):              # HTML Service stand-in (same algorithms, no network)
+    local_engine : HTML__Local__Engine
+
+    def get_dict_hashes(self, request : Schema__Html__To__Dict__Hashes__Request ,
+                              timeout : Optional[float] = None
+                         ) -> Schema__Html__To__Dict__Hashes__Response:
+        return self.local_engine.html_to_dict_hashes(request.html, request.max_depth)
+
+    def reconstruct_from_hashes(self, request : Schema__Hashes__To__Html__Request ,
+                                      timeout : Optional[float] = None
+                                 ) -> Schema__HTML__Service__Response:
+        body = self.local_engine.reconstruct_from_hashes(request.html_dict, request.hash_mapping)
+        return Schema__HTML__Service__Response(status_code  = 200         ,
+                                               content_type = 'text/html' ,
+                                               body         = body        ,
+                                               headers      = {}          ,
+                                               success      = True        )
+
+
+class Proxy__Benchmark__Semantic_Text__Client(Semantic_Text__Service__Client):      # Semantic Text Service stand-in (deterministic TEXT_HASH behaviour)
+
+    def transform_text(self, request : Schema__Semantic_Text__Transformation__Request ,
+                             timeout : Optional[float] = None
+                        ) -> Schema__Semantic_Text__Transformation__Response:
+        transformed_mapping = {}
+        for text_hash, text in request.hash_mapping.items():
+            if request.transformation_mode == Enum__Text__Transformation__Mode.HASHES:
+                transformed_mapping[text_hash] = str(text_hash)
+            else:
+                transformed_mapping[text_hash] = ''.join(char if char.isspace() else 'x' for char in text)
+        total_hashes = len(transformed_mapping)
+        return Schema__Semantic_Text__Transformation__Response(transformed_mapping = transformed_mapping          ,
+                                                               transformation_mode = request.transformation_mode  ,
+                                                               success             = True                         ,
+                                                               total_hashes        = Safe_UInt(total_hashes)      ,
+                                                               transformed_hashes  = Safe_UInt(total_hashes)      )
+
+
+class Proxy__Benchmark__Cache__Client(Service__Fast_API__Client):                   # In-memory stand-in for the cache service client
+    page_entries : Dict[str, dict]                                                  # cache_hash -> page entry metadata
+    data_files   : Dict[str, str]                                                   # (namespace/cache_id/data_key/data_file_id) -> stored string
+
+    # the real client returns one helper object per operation group, here they all share this in-memory store
+    def store     (self): return self
+    def retrieve  (self): return self
+    def data      (self): return self
+    def data_store(self): return self
+
+    def retrieve__hash__cache_hash(self, cache_hash, namespace):
+        page_entry = self.page_entries.get(f'{namespace}/{cache_hash}')
+        return dict(metadata=page_entry) if page_entry else {}
+
+    def store__json__cache_key(self, namespace, strategy, cache_key, file_id, body, json_field_path):
+        cache_hash = hashlib.sha256(cache_key.encode()).hexdigest()[:16]
+        cache_id   = hashlib.md5(f'{namespace}/{cache_key}'.encode()).hexdigest()
+        cache_id   = f'{cache_id[:8]}-{cache_id[8:12]}-{cache_id[12:16]}-{cache_id[16:20]}-{cache_id[20:32]}'
+        self.page_entries[f'{namespace}/{cache_hash}'] = dict(cache_id=cache_id)
+        return dict(cache_id=cache_id, cache_hash=cache_hash)
+
+    def data__string__with__id_and_key(self, cache_id, data_key, data_file_id, namespace):
+        return self.data_files.get(self.data_file_key(namespace, cache_id, data_key, data_file_id))
+
+    def data__store_string__with__id_and_key(self, body, cache_id, data_file_id, data_key, namespace):
+        self.data_files[self.data_file_key(namespace, cache_id, data_key, data_file_id)] = str(body)
+
+    def data_file_key(self, namespace, cache_id, data_key, data_file_id) -> str:
+        return f'{namespace}/{cache_id}/{data_key}/{data_file_id}'
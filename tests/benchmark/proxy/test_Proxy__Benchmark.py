@@ -0,0 +1,67 @@
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+from tests.benchmark.proxy.Proxy__Benchmark                                         import Proxy__Benchmark, Schema__Proxy__Benchmark__Result, FILE__PROXY_BENCHMARK__BASELINE
+from tests.benchmark.proxy.Proxy__Benchmark__Corpus                                 import Proxy__Benchmark__Corpus, CORPUS__SYNTHETIC_PAGES
+
+
+class test_Proxy__Benchmark(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus    = Proxy__Benchmark__Corpus()
+        cls.pages     = cls.corpus.synthetic_pages()
+        cls.modes     = [Enum__HTML__Transformation_Mode.OFF, Enum__HTML__Transformation_Mode.XXX]
+        cls.benchmark = Proxy__Benchmark(iterations = 1            ,
+                                         modes      = cls.modes    ,
+                                         pages      = cls.pages[3:5]).setup()      # paulgraham-essay and lite-cnn (the smaller pages)
+
+    def test_corpus(self):
+        assert len(self.pages)                 == len(CORPUS__SYNTHETIC_PAGES)
+        assert self.pages[0].host()            == 'www.bbc.co.uk'
+        assert self.pages[0].path()            == '/sport'
+        assert self.pages[3].path()            == '/foundermode.html'
+        assert self.corpus.synthetic_pages()[0].html == self.pages[0].html           # pages are deterministic
+
+    def test_stubs__transform_without_network(self):
+        page = self.pages[4]
+        with self.benchmark.quiet():
+            modifications = self.benchmark.proxy_service.process_response(self.benchmark.response_data(page, Enum__HTML__Transformation_Mode.XXX))
+        assert modifications.modified_body
+        assert 'xxxx'                      in modifications.modified_body
+        assert modifications.headers_to_add.get('x-proxy-transformation') == 'xxx'
+
+    def test_run(self):
+        results = self.benchmark.run()
+        keys    = [result.key() for result in results]
+        assert keys == ['request:off:none'  , 'request:xxx:none' ,
+                        'response:off:miss' , 'response:xxx:miss',
+                        'response:off:hit'  , 'response:xxx:hit' ]
+        for result in results:
+            assert result.requests             == 2
+            assert 0 < result.p50_ms           <= result.p95_ms <= result.p99_ms
+            assert result.requests_per_sec     > 0
+            assert result.alloc_kb_per_request > 0
+        assert self.benchmark.cache_service().stats.cache_hits > 0                  # 'hit' runs are served from the (stub) cache
+        assert 'p50 ms' in self.benchmark.report(results)
+
+    def test_compare_with_baseline(self):
+        result   = Schema__Proxy__Benchmark__Result(phase='response', mode='xxx', cache='miss', p50_ms=10.0, p95_ms=20.0, alloc_kb_per_request=100.0)
+        baseline = {'results': {'response:xxx:miss': dict(p50_ms=5.0, p95_ms=19.0, alloc_kb_per_request=100.0)}}
+        assert self.benchmark.compare_with_baseline([result], baseline) == ['response:xxx:miss p50_ms: 5.00 -> 10.00 (2.0x)']
+        assert self.benchmark.compare_with_baseline([result], {})       == []
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        assert self.benchmark.percentile(values, 50) == 50.0
+        assert self.benchmark.percentile(values, 95) == 95.0
+        assert self.benchmark.percentile(values, 99) == 99.0
+        assert self.benchmark.percentile([]    , 50) == 0.0
+
+    def test_saved_baseline(self):
+        baseline = self.benchmark.load_baseline(FILE__PROXY_BENCHMARK__BASELINE)
+        modes    = [mode.value for mode in Enum__HTML__Transformation_Mode]
+        assert baseline['settings']['pages'] == [name for name, *_ in CORPUS__SYNTHETIC_PAGES]
+        for mode in modes:                                                          # every mode is in the baseline
+            assert f'request:{mode}:none'  in baseline['results']
+            assert f'response:{mode}:miss' in baseline['results']
+            assert f'response:{mode}:hit'  in baseline['results']
@@ -47,10 +47,18 @@ class test_Routes__Cache(TestCase):
                                      cache_misses                = 0     ,
                                      wcf_calls_saved             = 0     ,
                                      total_pages_cached          = 0     ,
+                                     total_contents_cached       = 0     ,
                                      avg_cache_hit_time_ms       = 0.0   ,
                                      avg_cache_miss_time_ms      = 0.0   ,
                                      avg_wcf_call_time_ms        = 0.0   ,
-                                     estimated_time_saved_seconds= 0.0   )
+                                     estimated_time_saved_seconds= 0.0   ,
+                                     page_refs_cache             = __(size        = 0    ,
+                                                                      max_entries = 1024 ,
+                                                                      ttl_seconds = 300.0,
+                                                                      hits        = 0    ,
+                                                                      misses      = 0    ,
+                                                                      evictions   = 0    ,
+                                                                      expirations = 0    ))
 
     def test_config(self):                     # Test /cache/config endpoint logic
         with self.routes_cache as _:                                        # at the moment the auth is not configure in GH actions
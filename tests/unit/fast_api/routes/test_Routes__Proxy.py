@@ -1,7 +1,9 @@
+import asyncio
 from unittest                                                                        import TestCase
 from mgraph_ai_service_mitmproxy.fast_api.routes.Routes__Proxy                       import Routes__Proxy
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data           import Schema__Proxy__Request_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
 
 class test_Routes__Proxy(TestCase):
 
@@ -28,6 +30,22 @@ class test_Routes__Proxy(TestCase):
                 assert type(modifications) is Schema__Proxy__Modifications
                 assert modifications.headers_to_add != {}
 
+    def test_get_http_pool_stats(self):                              # Test connection pool stats route
+        stats = self.routes.get_http_pool_stats()
+        assert list(stats)                      == ['session_pool', 'paid_session_pool', 'async_client_pool']
+        assert list(stats['session_pool'])      == ['pool_connections', 'pool_maxsize', 'max_retries', 'backoff_factor', 'retry_on_status',
+                                                    'sessions_created', 'requests_total', 'errors_total', 'hosts'                          ]
+        assert stats['session_pool'     ]['retry_on_status'] is True
+        assert stats['paid_session_pool']['retry_on_status'] is False
+        assert list(stats['async_client_pool']) == ['max_connections', 'max_keepalive_connections', 'max_retries', 'clients_created',
+                                                    'requests_total' , 'errors_total'             , 'in_flight'  , 'in_flight_peak' ]
+
+    def test_get_interceptor_rules(self):                            # Test rules published to the interceptor
+        rules = self.routes.get_interceptor_rules()
+        assert rules.bypass_enabled       is True
+        assert rules.cookie_prefixes      == ['mitm-']
+        assert rules.admin_path_prefixes  == ['/mitm-proxy']
+
     def test_reset_proxy_stats(self):                                # Test stats reset
         # First, ensure we have some stats
         with Schema__Proxy__Request_Data() as request:
@@ -44,4 +62,25 @@ class test_Routes__Proxy(TestCase):
 
         # Verify stats were reset
         # with self.routes.get_proxy_stats() as stats:
-        #     assert stats["total_requests"] == 0
\ No newline at end of file
+        #     assert stats["total_requests"] == 0
+
+    def test_process_response_frame__uses_async_pipeline(self):                   # the frame route awaits the async pipeline (which shares the sync one's state)
+        proxy_service = self.routes.proxy_service
+        sync_html     = proxy_service.response_service.html_transformation_service
+        async_html    = proxy_service.response_service__async.html_transformation_service
+        assert proxy_service.response_service__async.response_compression is proxy_service.response_service.response_compression
+        assert proxy_service.response_service__async.etag_service         is proxy_service.response_service.etag_service
+        assert async_html.cache_service.cache_service                     is sync_html.cache_service
+
+        response_data = Schema__Proxy__Response_Data(request  = {'headers': {'cookie': 'mitm-replace=ok:done', 'accept-encoding': 'gzip'}, 'host': 'example.com', 'path': '/'},
+                                                     response = {'status_code': 200, 'headers': {'content-type': 'text/html'}, 'content_type': 'text/html', 'body': '<p>ok</p>' * 200})
+        proxy_service.response_service.process_response = lambda response_data: self.fail('the sync pipeline was used')
+        loop = asyncio.new_event_loop()                                             # (not asyncio.run, which clears the main thread's loop that the lambda handler tests use)
+        try:
+            modifications, body, encoding = loop.run_until_complete(proxy_service.process_response_frame(response_data))
+        finally:
+            loop.close()
+            del proxy_service.response_service.process_response
+        assert modifications.modified_body == '<p>[done]</p>' * 200
+        assert encoding                    == 'gzip'
+        assert body                        is not None
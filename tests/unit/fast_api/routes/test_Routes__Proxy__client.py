@@ -1,7 +1,10 @@
+import gzip
 from unittest                                                           import TestCase
 from osbot_utils.testing.__                                             import __, __SKIP__
 from osbot_utils.type_safe.type_safe_core.collections.Type_Safe__Dict   import Type_Safe__Dict
 from mgraph_ai_service_mitmproxy.fast_api.routes.Routes__Proxy          import Schema__Proxy__Response_Data, Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy           import CONTENT_TYPE__PROXY_FRAME
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Body__Frame       import Proxy__Body__Frame
 from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                   import setup__service_fast_api_test_objs, TEST_API_KEY__NAME, TEST_API_KEY__VALUE
 
 
@@ -41,3 +44,102 @@ class test_Routes__Proxy__client(TestCase):
         assert type(headers_to_add)              == Type_Safe__Dict
         assert headers_to_add['x-proxy-service'] == 'mgraph-proxy'
         assert headers_to_add['x-wcf-skipped'  ] == 'non-html-content'
+
+    def test_process_response_async(self):
+        request       = {'headers': {'cookie': 'mitm-mode=off'}, 'host': 'example.com', 'path': '/'}
+        response      = {'status_code': 200, 'headers': {'content-type': 'text/html'}, 'body': '<html><body>ok</body></html>'}
+        response_data = Schema__Proxy__Response_Data(request=request, response=response)
+        response      = self.client.post('/proxy/process-response-async', json=response_data.json())
+        modifications = Schema__Proxy__Modifications.from_json(response.json())
+
+        assert response.status_code                             == 200
+        assert modifications.modified_body                      is None                 # mode is off, so the body is not changed
+        assert modifications.headers_to_add['x-proxy-service'] == 'mgraph-proxy'
+
+    def test_process_response_frame(self):
+        body_frame    = Proxy__Body__Frame()
+        metadata      = {'request' : {'headers': {'cookie': 'mitm-mode=off'}, 'host': 'example.com', 'path': '/'},
+                         'response': {'status_code': 200, 'headers': {'content-type': 'text/html'}, 'content_type': 'text/html'}}
+        frame         = body_frame.encode(metadata, b'<html><body>ok</body></html>')
+        response      = self.client.post('/proxy/process-response-frame', content=frame, headers={'content-type': CONTENT_TYPE__PROXY_FRAME})
+        modifications, modified_body = body_frame.decode(response.content)
+
+        assert response.status_code                             == 200
+        assert response.headers['content-type']                 == CONTENT_TYPE__PROXY_FRAME
+        assert modified_body                                    == b''                  # mode is off, so the body is not changed
+        assert modifications['headers_to_add']['x-proxy-service'] == 'mgraph-proxy'
+
+    def test_process_response_frame__compressed(self):                                   # modified bodies go back gzip encoded when the client accepts it
+        body_frame    = Proxy__Body__Frame()
+        source_html   = '<html><body>' + '<p>ok</p>' * 200 + '</body></html>'
+        metadata      = {'request' : {'headers': {'cookie': 'mitm-replace=ok:done', 'accept-encoding': 'gzip, deflate'}, 'host': 'example.com', 'path': '/'},
+                         'response': {'status_code': 200, 'headers': {'content-type': 'text/html'}, 'content_type': 'text/html'}}
+        response      = self.client.post('/proxy/process-response-frame', content=body_frame.encode(metadata, source_html.encode()), headers={'content-type': CONTENT_TYPE__PROXY_FRAME})
+        modifications, modified_body = body_frame.decode(response.content)
+
+        assert modifications['modified_body_encoding']            == 'gzip'
+        assert modifications['headers_to_add']['content-encoding'] == 'gzip'
+        assert modifications['headers_to_add']['vary']             == 'Accept-Encoding'
+        assert gzip.decompress(modified_body).decode()             == source_html.replace('ok', '[done]')
+        assert len(modified_body)                                  < len(source_html) / 10
+
+        metadata['request']['headers']['accept-encoding'] = 'identity'
+        response      = self.client.post('/proxy/process-response-frame', content=body_frame.encode(metadata, source_html.encode()), headers={'content-type': CONTENT_TYPE__PROXY_FRAME})
+        modifications, modified_body = body_frame.decode(response.content)
+        assert 'modified_body_encoding'                            not in modifications
+        assert modified_body.decode()                              == source_html.replace('ok', '[done]')
+
+    def test_process_response_frame__async_pipeline(self):                              # the frame transport (the interceptor's default) runs on the async pipeline
+        body_frame    = Proxy__Body__Frame()
+        metadata      = {'request' : {'headers': {'cookie': 'mitm-replace=ok:done'}, 'host': 'example.com', 'path': '/'},
+                         'response': {'status_code': 200, 'headers': {'content-type': 'text/html'}, 'content_type': 'text/html'}}
+        response      = self.client.post('/proxy/process-response-frame', content=body_frame.encode(metadata, b'<p>ok</p>'), headers={'content-type': CONTENT_TYPE__PROXY_FRAME})
+        modifications, modified_body = body_frame.decode(response.content)
+        assert response.status_code == 200
+        assert modified_body        == b'<p>[done]</p>'
+
+    def test_get_response_compression_stats(self):
+        stats = self.client.get('/proxy/get-response-compression-stats').json()
+        assert list(stats)                         == ['response_compression', 'precompressed']
+        assert list(stats['precompressed'])        == ['entries', 'bytes', 'hits', 'misses']
+        assert stats['response_compression']['enabled'] is True
+
+    def test_get_etag_stats(self):
+        stats = self.client.get('/proxy/get-etag-stats').json()
+        assert list(stats)      == ['enabled', 'pages', 'etags_issued', 'not_modified']
+        assert stats['enabled'] is True
+
+    def test_transform_html_batch(self):
+        items    = [dict(target_url='https://example.com/a', source_html='<html><body><p>A</p></body></html>', mode='off'),
+                    dict(target_url='https://example.com/b', source_html='<html><body><p>B</p></body></html>', mode='off')]
+        response = self.client.post('/proxy/transform-html-batch', json=dict(items=items))
+        assert response.status_code == 200
+        result   = response.json()
+        assert result['total_items']       == 2
+        assert result['transformed_pages'] == 0                                     # 'off' items are passthroughs
+        assert [item['transformed_html'] for item in result['results']] == [items[0]['source_html'], items[1]['source_html']]
+
+    def test_prewarm_start__prewarm_status(self):
+        job = self.client.post('/proxy/prewarm-start', json=dict(urls=[], modes=['xxx'])).json()     # no urls, so nothing is fetched
+        assert job['modes']       == ['xxx']
+        assert job['state']       in ['pending', 'running', 'completed']
+        status = self.client.get('/proxy/prewarm-status', params=dict(job_id=job['job_id'])).json()
+        assert status['job_id']   == job['job_id']
+        assert 'progress'         in status
+        jobs   = self.client.get('/proxy/prewarm-jobs').json()
+        assert job['job_id']      in [item['job_id'] for item in jobs['jobs']]
+        assert self.client.get('/proxy/prewarm-status', params=dict(job_id='unknown')).json() == dict(error='pre-warm job not found: unknown')
+
+    def test_get_circuit_breakers(self):
+        breakers = self.client.get('/proxy/get-circuit-breakers').json()
+        assert type(breakers) is dict
+        for stats in breakers.values():
+            assert stats['state'] in ['closed', 'open', 'half_open']
+        breakers = self.client.post('/proxy/reset-circuit-breakers').json()
+        assert {stats['state'] for stats in breakers.values()} <= {'closed'}
+
+    def test_get_original_html_stats(self):
+        stats = self.client.get('/proxy/get-original-html-stats').json()
+        assert list(stats) == ['response_service', 'response_service__async']
+        for pipeline_stats in stats.values():
+            assert list(pipeline_stats) == ['urls', 'stored', 'skipped', 'bytes_stored', 'bytes_avoided', 'uploads']
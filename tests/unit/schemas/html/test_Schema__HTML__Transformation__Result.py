@@ -75,6 +75,16 @@ class test_Schema__HTML__Transformation__Result(TestCase):
             assert headers["x-proxy-cache"]          == "miss"
             assert headers["x-html-service-time"]    == "234.7ms"
             assert headers["content-type"]           == "text/plain"
+            assert "x-proxy-transformation-pending"  not in headers
+
+    def test_to_headers__pending(self):                                             # Original html served while the transformation runs in the background
+        with Schema__HTML__Transformation__Result(transformation_mode    = Enum__HTML__Transformation_Mode.XXX,
+                                                   content_type           = "text/html"                         ,
+                                                   transformation_pending = True                                ) as _:
+            headers = _.to_headers()
+
+            assert headers["x-proxy-cache"]                  == "miss"
+            assert headers["x-proxy-transformation-pending"] == "true"
 
     def test_to_headers__different_modes(self):                                     # Test headers for all transformation modes
         modes_and_content_types = [
@@ -114,4 +124,6 @@ class test_Schema__HTML__Transformation__Result(TestCase):
                                  transformation_mode    = Enum__HTML__Transformation_Mode.XXX    ,
                                  content_type           = "text/html"                            ,
                                  cache_hit              = False                                  ,
-                                 transformation_time_ms = Safe_Float(75.5)                       )
\ No newline at end of file
+                                 transformation_time_ms = Safe_Float(75.5)                       ,
+                                 transformation_pending = False                                  ,
+                                 success                = False                                  )
\ No newline at end of file
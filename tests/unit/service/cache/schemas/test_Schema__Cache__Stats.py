@@ -11,6 +11,7 @@ class test_Schema__Cache__Stats(TestCase):
             assert _.cache_misses == 0
             assert _.wcf_calls_saved == 0
             assert _.total_pages_cached == 0
+            assert _.total_contents_cached == 0
 
 
     def test__hit_rate(self):                                   # Test hit rate calculation
@@ -0,0 +1,17 @@
+import time
+from unittest                                                                               import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta  import Schema__Cache__Transformation__Meta
+
+
+class test_Schema__Cache__Transformation__Meta(TestCase):
+
+    def test_is_stale(self):
+        now_ms = int(time.time() * 1000)
+        assert Schema__Cache__Transformation__Meta(ttl_seconds=60).is_stale()                                   is False
+        assert Schema__Cache__Transformation__Meta(ttl_seconds=60, cached_at=now_ms - 120_000).is_stale()       is True
+        assert Schema__Cache__Transformation__Meta(ttl_seconds=0 , cached_at=now_ms - 120_000).is_stale()       is False    # 0 = never stale
+        assert 119 < Schema__Cache__Transformation__Meta(cached_at=now_ms - 120_000).age_seconds() < 125
+
+    def test_json_round_trip(self):
+        meta = Schema__Cache__Transformation__Meta(ttl_seconds=60)
+        assert Schema__Cache__Transformation__Meta.from_json(meta.json()).json() == meta.json()
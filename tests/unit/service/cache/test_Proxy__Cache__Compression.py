@@ -0,0 +1,79 @@
+import gzip
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Compression            import Proxy__Cache__Compression, zstandard, DEFAULT__COMPRESSION__MIN_SIZE
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Compression     import Enum__Cache__Compression
+
+HTML__LARGE = "<html><body>" + "".join(f"<p>Paragraph {i} with some repeated text</p>" for i in range(200)) + "</body></html>"
+
+
+class test_Proxy__Cache__Compression(TestCase):
+
+    def setUp(self):
+        self.compression = Proxy__Cache__Compression()
+
+    def test__init__(self):
+        with self.compression as _:
+            assert _.format   == Enum__Cache__Compression.GZIP
+            assert _.min_size == DEFAULT__COMPRESSION__MIN_SIZE
+            assert _.stats()  == dict(format='gzip', compressed=0, decompressed=0, bytes_in=0, bytes_out=0, ratio=0.0,
+                                      compress_time_ms=0.0, decompress_time_ms=0.0)
+
+    def test_compress(self):
+        with self.compression as _:
+            stored = _.compress(HTML__LARGE)
+            assert stored.startswith('~compressed:gzip~')
+            assert len(stored)             <  len(HTML__LARGE) / 5
+            assert _.is_compressed(stored) is True
+            assert _.decompress(stored)    == HTML__LARGE
+            stats = _.stats()
+            assert stats['compressed']       == 1
+            assert stats['decompressed']     == 1
+            assert stats['bytes_in']         == len(HTML__LARGE)
+            assert stats['bytes_out']        == len(stored)
+            assert stats['ratio']            >  5
+            assert stats['compress_time_ms'] >= 0
+
+    def test_compress__stored_as_is(self):
+        with self.compression as _:
+            assert _.compress('<p>small</p>')          == '<p>small</p>'           # below min_size
+            assert _.compress({'a': 1})                == {'a': 1}                 # not a string
+            assert _.decompress('<p>legacy value</p>') == '<p>legacy value</p>'    # values stored before compression was added
+            assert _.decompress({'a': 1})              == {'a': 1}                 # the cache client parses json values
+            assert _.decompress('')                    == ''
+            assert _.compressed                        == 0
+        with Proxy__Cache__Compression(format=Enum__Cache__Compression.NONE) as _:
+            assert _.compress(HTML__LARGE) == HTML__LARGE
+        with Proxy__Cache__Compression(min_size=10) as _:
+            random_like = 'aZ9$kP2!qW7@xM4#'                                        # doesn't get smaller
+            assert _.compress(random_like) == random_like
+
+    def test_compress__format_per_call(self):                                       # the cache service passes the format (and min size) of each namespace's config
+        with self.compression as _:
+            assert _.compress(HTML__LARGE, compression_format=Enum__Cache__Compression.NONE) == HTML__LARGE
+            assert _.compress('<p>small</p>' * 10, min_size=10).startswith('~compressed:gzip~')
+            assert _.active_format(Enum__Cache__Compression.NONE) == Enum__Cache__Compression.NONE
+            assert _.active_format()                              == Enum__Cache__Compression.GZIP
+
+    def test_gzip_payload(self):                                                    # gzip stored values are valid 'content-encoding: gzip' bodies
+        with self.compression as _:
+            stored = _.compress(HTML__LARGE)
+            assert gzip.decompress(_.gzip_payload(stored)).decode() == HTML__LARGE
+            assert _.gzip_payload('<p>legacy value</p>')             is None
+            assert _.gzip_payload({'a': 1})                          is None
+
+    def test_decompress__any_format(self):                                          # reads don't depend on the current write format
+        stored = Proxy__Cache__Compression().compress(HTML__LARGE)
+        with Proxy__Cache__Compression(format=Enum__Cache__Compression.NONE) as _:
+            assert _.decompress(stored) == HTML__LARGE
+
+    def test_zstd(self):
+        with Proxy__Cache__Compression(format=Enum__Cache__Compression.ZSTD) as _:
+            stored = _.compress(HTML__LARGE)
+            if zstandard is None:                                                   # falls back to gzip
+                assert _.active_format() == Enum__Cache__Compression.GZIP
+                assert stored.startswith('~compressed:gzip~')
+                with self.assertRaises(ValueError):
+                    _.decompress('~compressed:zstd~AAAA')
+            else:
+                assert stored.startswith('~compressed:zstd~')
+            assert _.decompress(stored) == HTML__LARGE
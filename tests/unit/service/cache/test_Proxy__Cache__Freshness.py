@@ -0,0 +1,33 @@
+import time
+from unittest                                                                               import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Freshness                      import Proxy__Cache__Freshness, DEFAULT__CACHE_FRESHNESS__MAX_ENTRIES
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta  import Schema__Cache__Transformation__Meta
+
+
+class test_Proxy__Cache__Freshness(TestCase):
+
+    def test__init__(self):
+        with Proxy__Cache__Freshness() as _:
+            assert _.max_entries == DEFAULT__CACHE_FRESHNESS__MAX_ENTRIES
+            assert _.stats()     == dict(size=0, max_entries=DEFAULT__CACHE_FRESHNESS__MAX_ENTRIES, evictions=0)
+
+    def test_get__put(self):
+        with Proxy__Cache__Freshness() as _:
+            stale = Schema__Cache__Transformation__Meta(cached_at=int(time.time() * 1000) - 120_000, ttl_seconds=60)
+            _.put(('aaa', 'xxx'), stale)
+            assert _.get(('aaa', 'xxx'), ttl_seconds=60).is_stale() is True
+
+            meta = _.get(('bbb', 'xxx'), ttl_seconds=60)                            # not seen before: counts as cached now
+            assert meta.ttl_seconds  == 60
+            assert meta.is_stale()   is False
+            assert _.get(('bbb', 'xxx'), ttl_seconds=60) is meta
+            assert _.size()          == 2
+
+    def test_put__evicts_least_recently_used(self):
+        with Proxy__Cache__Freshness(max_entries=2) as _:
+            _.get('aaa', 60)
+            _.get('bbb', 60)
+            _.get('aaa', 60)                                                        # 'aaa' is now the most recently used
+            _.get('ccc', 60)
+            assert list(_.entries) == ['aaa', 'ccc']
+            assert _.evictions     == 1
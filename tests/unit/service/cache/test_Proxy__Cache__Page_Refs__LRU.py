@@ -0,0 +1,82 @@
+import time
+from unittest                                                                       import TestCase
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Objects                                                      import base_classes
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Page_Refs__LRU         import Proxy__Cache__Page_Refs__LRU, DEFAULT__PAGE_REFS_LRU__MAX_ENTRIES, DEFAULT__PAGE_REFS_LRU__TTL_SECONDS
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs    import Schema__Cache__Page__Refs
+
+
+class test_Proxy__Cache__Page_Refs__LRU(TestCase):
+
+    def page_refs(self, cache_key):
+        return Schema__Cache__Page__Refs(cache_key=cache_key, json_field_path='cache_key')
+
+    def test__init__(self):
+        with Proxy__Cache__Page_Refs__LRU() as _:
+            assert type(_)         is Proxy__Cache__Page_Refs__LRU
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.max_entries   == DEFAULT__PAGE_REFS_LRU__MAX_ENTRIES
+            assert _.ttl_seconds   == DEFAULT__PAGE_REFS_LRU__TTL_SECONDS
+            assert _.enabled()     is True
+            assert _.size()        == 0
+            assert _.stats()       == dict(size=0, max_entries=1024, ttl_seconds=300.0, hits=0, misses=0, evictions=0, expirations=0)
+
+    def test_get__put(self):
+        with Proxy__Cache__Page_Refs__LRU() as _:
+            page_refs = self.page_refs('sites/example.com/pages/index')
+
+            assert _.get('sites/example.com/pages/index') is None                   # miss
+            _.put('sites/example.com/pages/index', page_refs)
+            assert _.get('sites/example.com/pages/index').json() == page_refs.json()    # hit
+            assert (_.hits, _.misses, _.size()) == (1, 1, 1)
+
+    def test_get__returns_a_copy(self):                                             # callers can't change the entry other threads get
+        with Proxy__Cache__Page_Refs__LRU() as _:
+            page_refs = self.page_refs('a')
+            _.put('a', page_refs)
+            page_refs.cache_key = 'changed-after-put'
+            first = _.get('a')
+            first.cache_key     = 'changed-after-get'
+            assert first         is not _.get('a')
+            assert _.get('a').cache_key == 'a'
+
+    def test_put__evicts_least_recently_used(self):
+        with Proxy__Cache__Page_Refs__LRU(max_entries=2) as _:
+            _.put('a', self.page_refs('a'))
+            _.put('b', self.page_refs('b'))
+            _.get('a')                                                              # 'a' is now the most recently used
+            _.put('c', self.page_refs('c'))                                         # so 'b' gets evicted
+
+            assert list(_.entries) == ['a', 'c']
+            assert _.evictions     == 1
+            assert _.get('b')      is None
+
+    def test_get__expired_entries(self):
+        with Proxy__Cache__Page_Refs__LRU(ttl_seconds=0.01) as _:
+            _.put('a', self.page_refs('a'))
+            time.sleep(0.02)
+            assert _.get('a')      is None
+            assert _.expirations   == 1
+            assert _.size()        == 0
+
+        with Proxy__Cache__Page_Refs__LRU(ttl_seconds=0) as _:                      # ttl of 0 means never expire
+            _.put('a', self.page_refs('a'))
+            assert _.is_expired(time.monotonic() - 10_000) is False
+            assert _.get('a')      is not None
+
+    def test__disabled(self):
+        with Proxy__Cache__Page_Refs__LRU(max_entries=0) as _:
+            _.put('a', self.page_refs('a'))
+            assert _.enabled()     is False
+            assert _.get('a')      is None
+            assert _.size()        == 0
+            assert _.misses        == 0                                             # disabled LRU doesn't count lookups
+
+    def test_remove__clear(self):
+        with Proxy__Cache__Page_Refs__LRU() as _:
+            _.put('a', self.page_refs('a'))
+            _.put('b', self.page_refs('b'))
+            assert _.remove('a')   is True
+            assert _.remove('a')   is False
+            _.clear()
+            assert _.size()        == 0
@@ -0,0 +1,113 @@
+import time
+from unittest                                                                           import TestCase
+from typing                                                                             import Dict
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode           import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline      import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Prewarm__Fetcher           import Proxy__Cache__Prewarm__Fetcher
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Prewarm__Service           import Proxy__Cache__Prewarm__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Prewarm__State      import Enum__Cache__Prewarm__State
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Job      import Schema__Cache__Prewarm__Job
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Prewarm__Request  import Schema__Cache__Prewarm__Request
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service             import HTML__Transformation__Service
+
+SITEMAP__INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>https://example.com/sitemap-news.xml</loc></sitemap>
+</sitemapindex>"""
+SITEMAP__NEWS  = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>https://example.com/news/1</loc></url>
+    <url><loc>https://example.com/news/2</loc></url>
+</urlset>"""
+
+
+class Proxy__Cache__Prewarm__Fetcher__Stub(Proxy__Cache__Prewarm__Fetcher):         # offline fetcher (url -> content)
+    pages : Dict[str, str]
+
+    def fetch(self, url):
+        return self.pages.get(str(url))
+
+
+class test_Proxy__Cache__Prewarm__Service(TestCase):
+
+    def setUp(self):
+        self.fetcher = Proxy__Cache__Prewarm__Fetcher__Stub(pages={ 'https://example.com/'                 : '<html><body><p>Home page</p></body></html>' ,
+                                                                    'https://example.com/news/1'           : '<html><body><p>First news</p></body></html>',
+                                                                    'https://example.com/news/2'           : '<html><body><p>Other news</p></body></html>',
+                                                                    'https://example.com/sitemap.xml'      : SITEMAP__INDEX                               ,
+                                                                    'https://example.com/sitemap-news.xml' : SITEMAP__NEWS                                })
+        html_transformation_service = HTML__Transformation__Service(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL)    # local modes: no external services needed
+        self.prewarm_service        = Proxy__Cache__Prewarm__Service(html_transformation_service=html_transformation_service,
+                                                                     fetcher                    =self.fetcher              )
+        self.modes                  = [Enum__HTML__Transformation_Mode.HASHES_RANDOM, Enum__HTML__Transformation_Mode.ABCDE_BY_SIZE]
+
+    def test__init__(self):
+        with Proxy__Cache__Prewarm__Service() as _:
+            assert _.html_transformation_service is None
+            assert type(_.fetcher)               is Proxy__Cache__Prewarm__Fetcher
+            assert _.jobs                        == {}
+
+    def test_urls(self):
+        request = Schema__Cache__Prewarm__Request(urls=['https://example.com/', 'https://example.com/news/1'], sitemap_url='https://example.com/sitemap.xml')
+        assert self.prewarm_service.urls(request) == ['https://example.com/', 'https://example.com/news/1', 'https://example.com/news/2']     # de-duplicated, sitemap index followed
+        request.max_urls = 2
+        assert self.prewarm_service.urls(request) == ['https://example.com/', 'https://example.com/news/1']
+
+    def test_run(self):
+        request = Schema__Cache__Prewarm__Request(urls=['https://example.com/', 'https://example.com/missing'], sitemap_url='https://example.com/sitemap-news.xml', modes=self.modes, max_concurrency=2)
+        job     = self.prewarm_service.new_job(request)
+        assert job.state == Enum__Cache__Prewarm__State.PENDING
+        self.prewarm_service.run(job, request)
+
+        assert job.state           == Enum__Cache__Prewarm__State.COMPLETED
+        assert job.total_urls      == 4
+        assert job.pages_done      == 4
+        assert job.transformations == 6                                             # 3 pages x 2 modes
+        assert job.errors          == 1
+        assert job.last_error      == 'no content for https://example.com/missing'
+        assert job.progress()      == 1.0
+        assert self.prewarm_service.job(job.job_id)   is job
+        assert self.prewarm_service.jobs_status()     == [job]
+
+    def test_run__bad_sitemap(self):
+        request = Schema__Cache__Prewarm__Request(sitemap_url='https://example.com/no-sitemap.xml')
+        job     = self.prewarm_service.run(self.prewarm_service.new_job(request), request)
+        assert job.state      == Enum__Cache__Prewarm__State.FAILED
+        assert job.last_error == 'could not fetch sitemap https://example.com/no-sitemap.xml'
+        assert job.modes      == [Enum__HTML__Transformation_Mode.XXX]             # default mode
+
+    def test_start(self):                                                           # runs in a background thread
+        request = Schema__Cache__Prewarm__Request(urls=['https://example.com/'], modes=self.modes)
+        job     = self.prewarm_service.start(request)
+        for _ in range(100):
+            if job.state == Enum__Cache__Prewarm__State.COMPLETED:
+                break
+            time.sleep(0.02)
+        assert type(job)           is Schema__Cache__Prewarm__Job
+        assert job.state           == Enum__Cache__Prewarm__State.COMPLETED
+        assert job.transformations == 2
+
+    def test_run__deferring_service(self):                                          # a deferring service would hand back pending results: the job waits for the transformation instead
+        html_transformation_service = self.prewarm_service.html_transformation_service
+        html_transformation_service.transform_html = lambda *args, **kwargs: html_transformation_service._create_pending_result(args[0], args[2])
+        request = Schema__Cache__Prewarm__Request(urls=['https://example.com/'], modes=self.modes + [Enum__HTML__Transformation_Mode.OFF])
+        job     = self.prewarm_service.run(self.prewarm_service.new_job(request), request)
+        assert (job.transformations, job.pending, job.not_transformed) == (2, 0, 0)   # OFF is skipped (nothing to cache)
+        del html_transformation_service.transform_html
+
+    def test_record_result(self):
+        service = self.prewarm_service.html_transformation_service
+        mode    = Enum__HTML__Transformation_Mode.XXX
+        job     = Schema__Cache__Prewarm__Job()
+        cached  = service._create_passthrough_result('<p>a</p>', mode)
+        cached.cache_hit = True
+        done    = service._create_passthrough_result('<p>a</p>', mode)
+        done.success     = True
+        for result in [cached, done, service._create_pending_result('<p>a</p>', mode), service._create_passthrough_result('<p>a</p>', mode)]:
+            self.prewarm_service.record_result(job, result)
+        assert (job.cache_hits, job.transformations, job.pending, job.not_transformed) == (1, 1, 1, 1)
+
+    def test_new_job__keeps_recent_jobs(self):
+        self.prewarm_service.max_jobs_kept = 2
+        jobs = [self.prewarm_service.new_job(Schema__Cache__Prewarm__Request()) for _ in range(3)]
+        assert self.prewarm_service.jobs_status() == [jobs[2], jobs[1]]
@@ -0,0 +1,34 @@
+import threading
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Revalidator            import Proxy__Cache__Revalidator
+
+
+class test_Proxy__Cache__Revalidator(TestCase):
+
+    def setUp(self):
+        self.revalidator = Proxy__Cache__Revalidator()
+
+    def test_submit(self):
+        calls = []
+        assert self.revalidator.submit('key', lambda: calls.append('refreshed')) is True
+        self.revalidator.wait(timeout=5)
+        assert calls                     == ['refreshed']
+        assert self.revalidator.stats()  == dict(started=1, completed=1, failed=0, skipped=0, in_progress=0)
+
+    def test_submit__same_key_while_running(self):                                  # one refresh per key at a time
+        release = threading.Event()
+        assert self.revalidator.submit('key'  , lambda: release.wait(5)) is True
+        assert self.revalidator.submit('key'  , lambda: None           ) is False
+        assert self.revalidator.submit('other', lambda: None           ) is True
+        release.set()
+        self.revalidator.wait(timeout=5)
+        assert self.revalidator.stats()  == dict(started=2, completed=2, failed=0, skipped=1, in_progress=0)
+        assert self.revalidator.submit('key', lambda: None) is True                 # can be refreshed again once done
+        self.revalidator.wait(timeout=5)
+
+    def test_submit__error(self):
+        def target():
+            raise ValueError('backend down')
+        self.revalidator.submit('key', target)
+        self.revalidator.wait(timeout=5)
+        assert self.revalidator.stats() == dict(started=1, completed=0, failed=1, skipped=0, in_progress=0)
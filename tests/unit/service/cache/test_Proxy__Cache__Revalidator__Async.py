@@ -0,0 +1,27 @@
+import asyncio
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Revalidator__Async     import Proxy__Cache__Revalidator__Async
+
+
+class test_Proxy__Cache__Revalidator__Async(TestCase):
+
+    def test_submit(self):
+        revalidator = Proxy__Cache__Revalidator__Async()
+        calls       = []
+
+        async def refresh():
+            await asyncio.sleep(0.01)
+            calls.append('refreshed')
+
+        async def failing():
+            raise ValueError('backend down')
+
+        async def run():
+            assert revalidator.submit('key'  , refresh) is True
+            assert revalidator.submit('key'  , refresh) is False                    # already being refreshed
+            assert revalidator.submit('other', failing) is True
+            await revalidator.wait()
+
+        asyncio.run(run())
+        assert calls               == ['refreshed']
+        assert revalidator.stats() == dict(started=2, completed=1, failed=1, skipped=1, in_progress=0)
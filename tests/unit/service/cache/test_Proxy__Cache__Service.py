@@ -16,6 +16,9 @@ from osbot_utils.utils.Http
 from osbot_utils.utils.Json                                                             import str_to_json
 from osbot_utils.utils.Misc                                                             import list_set, is_guid
 from osbot_utils.testing.__helpers                                                      import obj
+from osbot_utils.testing.Temp_Env_Vars                                                  import Temp_Env_Vars
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Enum__Cache__Compression         import Enum__Cache__Compression
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                           import ENV_VAR__CACHE_SERVICE__COMPRESSION
 from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                    import Proxy__Cache__Service
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config            import Schema__Cache__Config
 from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Page__Refs        import Schema__Cache__Page__Refs
@@ -148,6 +151,53 @@ class test_Proxy__Cache__Service(TestCase):
             assert page_refs_1.obj() == page_refs_2.obj()                                       # confirm both are the same
             assert _.stats.total_pages_cached >= 1                                              # Stats should show one page cached
 
+    def test__get_or_create_content_entry(self):                                                # Content-addressed entry: same html => same entry (whatever the url)
+        with self.cache_service as _:
+            html         = '<html><body><p>Same content</p></body></html>'
+            content_hash = _.content_hash(html)
+            assert content_hash                           == Cache__Hash__Generator().from_string(html)
+            assert content_hash                           == _.content_hash(html)                       # deterministic
+            assert content_hash                           != _.content_hash(html + ' ')
+            assert _.content_to_cache_key(content_hash)   == f'contents/{content_hash}'
+
+            content_refs = _.get_or_create_content_entry(content_hash)
+            assert type(content_refs)     is Schema__Cache__Page__Refs
+            assert is_guid(content_refs.cache_id)
+            assert content_refs.cache_key == f'contents/{content_hash}'
+            assert _.stats.total_contents_cached == 1
+
+            _.page_refs_cache.clear()                                                                   # second lookup goes back to the cache service and finds the same entry
+            assert _.get_or_create_content_entry(content_hash).cache_id == content_refs.cache_id
+            assert _.stats.total_contents_cached == 1
+
+    def test__get_or_create_page_entry__uses_page_refs_cache(self):                             # Second lookup must be served from memory (no cache service round trip)
+        url = "https://example.com/an-lru-entry"
+
+        with Proxy__Cache__Service(cache_client=self.cache_client, cache_config=self.cache_config) as _:        # separate instance, so that the shared stats are not affected
+            cache_key   = _.url_to_cache_key(url)
+            hits_before = int(_.page_refs_cache.hits)
+            page_refs_1 = _.get_or_create_page_entry(url)
+
+            assert _.page_refs_cache.get(cache_key).obj() == page_refs_1.obj()                   # mapping was stored after the remote call
+            assert int(_.page_refs_cache.hits)      == hits_before + 1
+
+            remote_calls = []
+            original     = _.get_page_entry__via__cache_hash
+            _.get_page_entry__via__cache_hash = lambda **kwargs: remote_calls.append(kwargs) or original(**kwargs)
+            try:
+                page_refs_2 = _.get_or_create_page_entry(url)
+            finally:
+                del _.get_page_entry__via__cache_hash
+
+            assert remote_calls                 == []
+            assert page_refs_2.obj()            == page_refs_1.obj()
+            assert int(_.page_refs_cache.hits)  == hits_before + 2
+
+            _.page_refs_cache.remove(cache_key)                                                 # after removal, the remote entry is still found (and re-cached)
+            page_refs_3 = _.get_or_create_page_entry(url)
+            assert page_refs_3.cache_id         == page_refs_1.cache_id
+            assert _.page_refs_cache.get(cache_key).cache_id == page_refs_1.cache_id
+
     def test__store_transformation(self):                      # Test storing WCF transformation as child data
         with self.cache_service as _:
             url = "https://example.com/test-page-2"
@@ -182,6 +232,53 @@ class test_Proxy__Cache__Service(TestCase):
             assert cached_content is not None
             assert cached_content == expected_content
 
+    def test__get_cached_transformation__compressed(self):     # Large content is stored compressed (with a format marker) and decompressed on read
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.server_url, namespace="proxy-cache-tests-compressed")
+        cache_service = Proxy__Cache__Service(cache_client=self.cache_client, cache_config=cache_config)     # own stats, so test__get_stats is not affected
+        with cache_service as _:
+            url              = "https://example.com/test-page-compressed"
+            wcf_command      = "url-to-html"
+            expected_content = "<html><body>" + "<p>Some repeated paragraph text</p>" * 200 + "</body></html>"
+            compressed       = _.compression.compressed
+
+            cache_id = _.store_transformation(target_url  = url             ,
+                                              wcf_command = wcf_command     ,
+                                              content     = expected_content,
+                                              metadata    = {}              )
+            stored   = _.cache_client.data().retrieve().data__string__with__id_and_key(cache_id     = cache_id                         ,
+                                                                                       namespace    = _.cache_config.namespace         ,
+                                                                                       data_key     = _._wcf_command_to_data_key(wcf_command),
+                                                                                       data_file_id = _.cache_config.data_file_id      )
+            assert stored.startswith('~compressed:gzip~')
+            assert len(stored)                                     < len(expected_content) / 5
+            assert _.get_cached_transformation(url, wcf_command)   == expected_content
+            assert _.compression.compressed                        == compressed + 1
+            assert _.get_cache_stats()['compression']['ratio']     > 5
+
+    def test__store_string__compression_per_namespace(self):   # each namespace's config picks the format of its writes (even with a shared Proxy__Cache__Compression)
+        content         = "<html><body>" + "<p>Some repeated paragraph text</p>" * 200 + "</body></html>"
+        config__gzip    = Schema__Cache__Config(enabled=True, base_url=self.server_url, namespace="proxy-cache-tests-gzip")
+        config__none    = Schema__Cache__Config(enabled=True, base_url=self.server_url, namespace="proxy-cache-tests-none", compression=Enum__Cache__Compression.NONE)
+        service__gzip   = Proxy__Cache__Service(cache_client=self.cache_client, cache_config=config__gzip)
+        service__none   = Proxy__Cache__Service(cache_client=self.cache_client, cache_config=config__none, compression=service__gzip.compression)
+        for service, prefix in ((service__gzip, '~compressed:gzip~'), (service__none, '<html>')):
+            with service as _:
+                cache_id = _.store_transformation(target_url  = "https://example.com/test-page-namespaces",
+                                                  wcf_command = "url-to-html"                            ,
+                                                  content     = content                                  ,
+                                                  metadata    = {}                                       )
+                stored   = _.retrieve_stored(cache_id, _._wcf_command_to_data_key("url-to-html"), _.cache_config.data_file_id)
+                assert stored.startswith(prefix)
+                assert _.get_cached_transformation("https://example.com/test-page-namespaces", "url-to-html") == content
+
+    def test__compression_format__from_env(self):
+        with Proxy__Cache__Service(cache_config=Schema__Cache__Config(namespace="wcf-results")) as _:
+            assert _.compression_format__from_env() is None
+            with Temp_Env_Vars(env_vars={ENV_VAR__CACHE_SERVICE__COMPRESSION: 'none'}):
+                assert _.compression_format__from_env() == Enum__Cache__Compression.NONE
+                with Temp_Env_Vars(env_vars={f'{ENV_VAR__CACHE_SERVICE__COMPRESSION}__WCF_RESULTS': 'gzip'}):    # the namespace's own setting wins
+                    assert _.compression_format__from_env() == Enum__Cache__Compression.GZIP
+
     def test__cache_miss(self):                                # Test cache miss scenario
         with self.cache_service as _:
             url = "https://example.com/non-existent-page"
@@ -321,10 +418,13 @@ class test_Proxy__Cache__Service(TestCase):
                                 cache_misses                 = Safe_UInt(2)     ,
                                 wcf_calls_saved              = Safe_UInt(2)     ,
                                 total_pages_cached           = Safe_UInt(7)     ,
+                                total_contents_cached        = Safe_UInt(1)     ,
                                 avg_cache_hit_time_ms        = __SKIP__         ,
                                 avg_cache_miss_time_ms       = __SKIP__         ,
                                 avg_wcf_call_time_ms         = __SKIP__         ,
-                                estimated_time_saved_seconds  = __SKIP__        )  # todo: review the use of this estimated_time_saved_seconds value, since I don't think we need it
+                                estimated_time_saved_seconds  = __SKIP__        ,  # todo: review the use of this estimated_time_saved_seconds value, since I don't think we need it
+                                page_refs_cache              = __SKIP__         ,
+                                compression                  = __SKIP__         )
 
     def test__get_page_by_cache_hash(self):      # Test retrieving specific page by cache_key
         test_url  = "https://example.com"                     # Get one of our test pages
@@ -0,0 +1,50 @@
+import time
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Negative__Cache               import (Proxy__Negative__Cache                ,
+                                                                                            DEFAULT__NEGATIVE_CACHE__BASE_BACKOFF ,
+                                                                                            DEFAULT__NEGATIVE_CACHE__MAX_BACKOFF  )
+
+
+class test_Proxy__Negative__Cache(TestCase):
+
+    def setUp(self):
+        self.negative_cache = Proxy__Negative__Cache()
+
+    def test__init__(self):
+        with self.negative_cache as _:
+            assert _.base_backoff_seconds == DEFAULT__NEGATIVE_CACHE__BASE_BACKOFF
+            assert _.max_backoff_seconds  == DEFAULT__NEGATIVE_CACHE__MAX_BACKOFF
+            assert _.enabled()            is True
+            assert _.stats()              == dict(failing_keys=0, failures=0, short_circuits=0)
+
+    def test_record_failure__exponential_backoff(self):
+        with Proxy__Negative__Cache(base_backoff_seconds=5, max_backoff_seconds=30) as _:
+            assert [_.record_failure('key', 'timeout') for _i in range(5)] == [5.0, 10.0, 20.0, 30.0, 30.0]
+            assert _.entry('key').failures   == 5
+            assert _.entry('key').last_error == 'timeout'
+            assert _.is_blocked('key')       is True
+            assert _.is_blocked('other')     is False
+            assert _.stats()                 == dict(failing_keys=1, failures=5, short_circuits=1)
+
+    def test_is_blocked__expires(self):
+        with self.negative_cache as _:
+            _.record_failure('key')
+            _.entry('key').retry_at = time.monotonic() - 1                          # backoff over: the next request tries again
+            assert _.is_blocked('key') is False
+            assert _.record_failure('key') == DEFAULT__NEGATIVE_CACHE__BASE_BACKOFF * 2
+
+    def test_record_success(self):
+        with self.negative_cache as _:
+            _.record_failure('key')
+            _.record_success('key')
+            assert _.is_blocked('key') is False
+            assert _.entry('key')      is None
+
+    def test__max_entries__and__disabled(self):
+        with Proxy__Negative__Cache(max_entries=2) as _:
+            for key in ('a', 'b', 'c'):
+                _.record_failure(key)
+            assert list(_.entries) == ['b', 'c']
+        with Proxy__Negative__Cache(base_backoff_seconds=0) as _:
+            assert _.record_failure('key') == 0.0
+            assert _.is_blocked('key')     is False
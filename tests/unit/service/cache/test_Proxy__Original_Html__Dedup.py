@@ -0,0 +1,42 @@
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Original_Html__Dedup          import Proxy__Original_Html__Dedup, DEFAULT__ORIGINAL_HTML_DEDUP__MAX_ENTRIES
+
+
+class test_Proxy__Original_Html__Dedup(TestCase):
+
+    def setUp(self):
+        self.dedup = Proxy__Original_Html__Dedup()
+
+    def test__init__(self):
+        with self.dedup as _:
+            assert _.max_entries == DEFAULT__ORIGINAL_HTML_DEDUP__MAX_ENTRIES
+            assert _.enabled()   is True
+            assert _.stats()     == dict(urls=0, stored=0, skipped=0, bytes_stored=0, bytes_avoided=0)
+
+    def test_should_store(self):
+        with self.dedup as _:
+            assert _.should_store('sites/example.com/pages/a', 'hash-1', 100) is True       # first time
+            assert _.should_store('sites/example.com/pages/a', 'hash-1', 100) is False      # unchanged
+            assert _.should_store('sites/example.com/pages/a', 'hash-1', 100) is False
+            assert _.should_store('sites/example.com/pages/a', 'hash-2', 120) is True       # page changed
+            assert _.should_store('sites/example.com/pages/b', 'hash-2', 120) is True       # same html, other url
+            assert _.content_hash('sites/example.com/pages/a')                == 'hash-2'
+            assert _.stats() == dict(urls=2, stored=3, skipped=2, bytes_stored=340, bytes_avoided=200)
+
+    def test_forget(self):
+        with self.dedup as _:
+            _.should_store('sites/example.com/pages/a', 'hash-1', 100)
+            _.forget('sites/example.com/pages/a')                                           # upload failed
+            assert _.should_store('sites/example.com/pages/a', 'hash-1', 100) is True
+
+    def test_max_entries(self):
+        with Proxy__Original_Html__Dedup(max_entries=2) as _:
+            _.should_store('a', 'hash-a', 1)
+            _.should_store('b', 'hash-b', 1)
+            _.should_store('a', 'hash-a', 1)                                                # a is now the most recently used
+            _.should_store('c', 'hash-c', 1)                                                # evicts b
+            assert list(_.hashes) == ['a', 'c']
+        with Proxy__Original_Html__Dedup(max_entries=0) as _:                               # disabled: every page is stored
+            assert _.should_store('a', 'hash-a', 1) is True
+            assert _.should_store('a', 'hash-a', 1) is True
+            assert _.stats()['urls'] == 0
@@ -0,0 +1,36 @@
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Precompressed__Cache          import Proxy__Precompressed__Cache, DEFAULT__PRECOMPRESSED_CACHE__MAX_ENTRIES
+
+
+class test_Proxy__Precompressed__Cache(TestCase):
+
+    def setUp(self):
+        self.cache = Proxy__Precompressed__Cache()
+
+    def test__init__(self):
+        with self.cache as _:
+            assert _.max_entries == DEFAULT__PRECOMPRESSED_CACHE__MAX_ENTRIES
+            assert _.entries     == {}
+            assert _.stats()     == dict(entries=0, bytes=0, hits=0, misses=0)
+
+    def test_get__put(self):
+        with self.cache as _:
+            body_key = _.body_key(b'<html>page</html>')
+            assert body_key                     == _.body_key(b'<html>page</html>')
+            assert body_key                     != _.body_key(b'<html>other</html>')
+            assert _.get(body_key, 'gzip')      is None
+            _.put(body_key, 'gzip', b'gzip-bytes')
+            assert _.get(body_key, 'gzip')      == b'gzip-bytes'
+            assert _.get(body_key, 'br'  )      is None                             # variants are per encoding
+            assert _.stats()                    == dict(entries=1, bytes=10, hits=1, misses=2)
+
+    def test_put__max_entries(self):                                                # least recently used variants are dropped first
+        with Proxy__Precompressed__Cache(max_entries=2) as _:
+            _.put('a', 'gzip', b'a')
+            _.put('b', 'gzip', b'b')
+            _.get('a', 'gzip')
+            _.put('c', 'gzip', b'c')
+            assert list(_.entries) == [('a', 'gzip'), ('c', 'gzip')]
+        with Proxy__Precompressed__Cache(max_entries=0) as _:
+            _.put('a', 'gzip', b'a')
+            assert _.entries == {}
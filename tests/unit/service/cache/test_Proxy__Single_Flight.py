@@ -0,0 +1,68 @@
+import time
+import threading
+from unittest                                                                       import TestCase
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from osbot_utils.utils.Objects                                                      import base_classes
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight                 import Proxy__Single_Flight
+
+
+class test_Proxy__Single_Flight(TestCase):
+
+    def run_concurrently(self, single_flight, key, target, callers):               # start all callers at (roughly) the same time and collect their results
+        results = []
+        errors  = []
+        def caller():
+            try:
+                results.append(single_flight.do(key, target))
+            except Exception as error:
+                errors.append(error)
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test__init__(self):
+        with Proxy__Single_Flight() as _:
+            assert type(_)         is Proxy__Single_Flight
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.stats()       == dict(leaders=0, followers=0, in_flight=0)
+
+    def test_do(self):
+        with Proxy__Single_Flight() as _:
+            assert _.do('a', lambda: 42) == 42
+            assert _.do('a', lambda: 43) == 43                                      # no call in flight, so the target runs again
+            assert _.stats()             == dict(leaders=2, followers=0, in_flight=0)
+
+    def test_do__concurrent_callers_share_one_execution(self):
+        executions = []
+        def target():
+            executions.append(1)
+            time.sleep(0.1)                                                         # keep the call in flight while the other callers arrive
+            return 'transformed'
+
+        with Proxy__Single_Flight() as _:
+            results, errors = self.run_concurrently(_, ('sites/example.com/pages/index', 'xxx'), target, callers=5)
+            assert results        == ['transformed'] * 5
+            assert errors         == []
+            assert len(executions) == 1
+            assert _.stats()      == dict(leaders=1, followers=4, in_flight=0)
+
+    def test_do__different_keys_run_independently(self):
+        with Proxy__Single_Flight() as _:
+            assert _.do(('page-a', 'xxx'   ), lambda: 'a-xxx'   ) == 'a-xxx'
+            assert _.do(('page-a', 'hashes'), lambda: 'a-hashes') == 'a-hashes'
+            assert _.leaders == 2
+
+    def test_do__error_is_shared_and_not_cached(self):
+        def target():
+            time.sleep(0.1)
+            raise ValueError('backend failed')
+
+        with Proxy__Single_Flight() as _:
+            results, errors = self.run_concurrently(_, 'a', target, callers=3)
+            assert results                                == []
+            assert [str(error) for error in errors]       == ['backend failed'] * 3
+            assert _.in_flight()                          == 0
+            assert _.do('a', lambda: 'recovered')         == 'recovered'            # failed flights are not remembered
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight__Async          import Proxy__Single_Flight__Async
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Single_Flight                 import Proxy__Single_Flight
+
+
+class test_Proxy__Single_Flight__Async(TestCase):
+
+    def test__init__(self):
+        with Proxy__Single_Flight__Async() as _:
+            assert type(_)   is Proxy__Single_Flight__Async
+            assert _.stats() == dict(leaders=0, followers=0, in_flight=0)
+
+    def test_do__concurrent_callers_share_one_execution(self):
+        executions = []
+        async def target():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return 'transformed'
+
+        async def run():
+            return await asyncio.gather(*[single_flight.do(('sites/example.com/pages/index', 'xxx'), target) for _ in range(5)])
+
+        single_flight = Proxy__Single_Flight__Async()
+        assert asyncio.run(run())     == ['transformed'] * 5
+        assert len(executions)        == 1
+        assert single_flight.stats()  == dict(leaders=1, followers=4, in_flight=0)
+
+    def test_do__error_is_shared_and_not_cached(self):
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError('backend failed')
+
+        async def working():
+            return 'recovered'
+
+        async def run():
+            results = await asyncio.gather(*[single_flight.do('a', failing) for _ in range(3)], return_exceptions=True)
+            return results, await single_flight.do('a', working)
+
+        single_flight     = Proxy__Single_Flight__Async()
+        results, retried  = asyncio.run(run())
+        assert [str(result) for result in results] == ['backend failed'] * 3
+        assert retried                              == 'recovered'
+        assert single_flight.in_flight()            == 0
+
+    def test_do__cancelled_follower_does_not_cancel_leader(self):
+        async def target():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def run():
+            leader   = asyncio.create_task(single_flight.do('a', target))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(single_flight.do('a', target))
+            await asyncio.sleep(0)
+            follower.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+            return await leader
+
+        single_flight = Proxy__Single_Flight__Async()
+        assert asyncio.run(run()) == 'done'
+
+    def test_do__shared_with_sync_pipeline(self):                                   # an async caller joins the call a sync (threaded) caller is running, and vice versa
+        flights       = Proxy__Single_Flight()
+        single_flight = Proxy__Single_Flight__Async(flights=flights)
+        executions    = []
+        started       = threading.Event()
+
+        def sync_target():
+            executions.append('sync')
+            started.set()
+            time.sleep(0.1)
+            return 'from-sync'
+
+        async def async_target():
+            executions.append('async')
+            return 'from-async'
+
+        thread = threading.Thread(target=lambda: flights.do('a', sync_target))
+        thread.start()
+        started.wait()
+        assert asyncio.run(single_flight.do('a', async_target)) == 'from-sync'      # awaited the sync leader (without blocking the loop)
+        thread.join()
+        assert executions                                       == ['sync']
+        assert single_flight.stats()                            == dict(leaders=0, followers=1, in_flight=0)
+
+        async def run():                                                            # async leader, sync follower
+            async def slow_target():
+                executions.append('async')
+                await asyncio.sleep(0.1)
+                return 'from-async'
+            leader = asyncio.create_task(single_flight.do('b', slow_target))
+            await asyncio.sleep(0.01)
+            follower = await asyncio.to_thread(flights.do, 'b', sync_target)
+            return await leader, follower
+        assert asyncio.run(run())                               == ('from-async', 'from-async')
+        assert executions                                       == ['sync', 'async']
@@ -0,0 +1,106 @@
+from unittest                                                                           import TestCase
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client           import Service__Fast_API__Client
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client__Config   import Service__Fast_API__Client__Config
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                    import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Text_Node__Cache                  import Proxy__Text_Node__Cache, DEFAULT__TEXT_NODE_CACHE__MAX_ENTRIES
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config            import Schema__Cache__Config
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                                  import get__cache_service__fast_api_server
+
+
+class test_Proxy__Text_Node__Cache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__cache_service__fast_api_server() as _:
+            cls.cache_service_server   = _.fast_api_server
+            cls.cache_service_base_url = _.server_url
+        cls.cache_service_server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache_service_server.stop()
+
+    def setUp(self):
+        self.text_node_cache = Proxy__Text_Node__Cache()
+
+    def cache_service(self, namespace):
+        cache_client = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace=namespace)
+        return Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+
+    def test__init__(self):
+        with self.text_node_cache as _:
+            assert type(_)          is Proxy__Text_Node__Cache
+            assert isinstance(_, Type_Safe)
+            assert _.max_entries    == DEFAULT__TEXT_NODE_CACHE__MAX_ENTRIES
+            assert _.cache_service  is None
+            assert _.enabled()      is True
+            assert _.backing_enabled() is False
+            assert _.stats()        == dict(size=0, max_entries=DEFAULT__TEXT_NODE_CACHE__MAX_ENTRIES, hits=0, misses=0, evictions=0)
+
+    def test_split__update(self):
+        with self.text_node_cache as _:
+            assert _.split('xxx', {'aaa': 'Home', 'bbb': 'News'}) == ({}, {'aaa': 'Home', 'bbb': 'News'})
+            assert _.update('xxx', {'aaa': 'xxxx', 'bbb': 'xxxx'}) == 2
+            assert _.update('xxx', {'aaa': 'xxxx'})                == 0                  # already known
+
+            known, unseen = _.split('xxx', {'aaa': 'Home', 'bbb': 'News', 'ccc': 'A new article'})
+            assert known  == {'aaa': 'xxxx', 'bbb': 'xxxx'}                             # boilerplate seen on a previous page
+            assert unseen == {'ccc': 'A new article'}                                   # only this goes to the semantic-text service
+            assert _.split('hashes', {'aaa': 'Home'}) == ({}, {'aaa': 'Home'})          # profiles (modes) don't share results
+            assert (_.hits, _.misses) == (2, 4)
+
+    def test_update__evicts_least_recently_used(self):
+        with Proxy__Text_Node__Cache(max_entries=2) as _:
+            _.update('xxx', {'aaa': 'x', 'bbb': 'x'})
+            _.split ('xxx', {'aaa': 'Home'})                                            # 'aaa' is now the most recently used
+            _.update('xxx', {'ccc': 'x'})
+            assert _.split('xxx', {'aaa': '', 'bbb': '', 'ccc': ''})[0] == {'aaa': 'x', 'ccc': 'x'}
+            assert _.evictions == 1
+
+    def test__disabled(self):
+        with Proxy__Text_Node__Cache(max_entries=0) as _:
+            assert _.update('xxx', {'aaa': 'x'})   == 0
+            assert _.split ('xxx', {'aaa': 'Home'}) == ({}, {'aaa': 'Home'})
+            assert _.size() == 0
+
+    def test__backing_store(self):                                                  # entries survive a restart (a new cache instance) via the cache service
+        cache_service = self.cache_service('text-node-cache-tests')
+        with Proxy__Text_Node__Cache(cache_service=cache_service) as _:
+            assert _.backing_enabled() is True
+            _.update('xxx', {'aaa': 'xxxx', 'bbb': 'xxxx'})                             # written by a background flush
+            _.flushes.wait()
+            assert _.pending  == {}
+            assert _.flushing == set()
+
+        with Proxy__Text_Node__Cache(cache_service=cache_service) as _:
+            assert _.size() == 0
+            known, unseen = _.split('xxx', {'aaa': 'Home', 'ccc': 'Contact'})
+            assert known  == {'aaa': 'xxxx'}
+            assert unseen == {'ccc': 'Contact'}
+            assert _.profile_mapping('xxx') == {'aaa': 'xxxx'}                          # only the shards the page needed were loaded
+            assert _.loaded_shards          == {'xxx': {'shard-a', 'shard-c'}}
+
+    def test__backing_store__merges_entries(self):                                  # two proxies sharing a profile add to (not overwrite) each other's entries
+        cache_service = self.cache_service('text-node-cache-tests-merge')
+        proxy_1       = Proxy__Text_Node__Cache(cache_service=cache_service)
+        proxy_2       = Proxy__Text_Node__Cache(cache_service=cache_service)
+        proxy_1.update('xxx', {'a01': 'xxxx'})
+        proxy_1.flushes.wait()
+        proxy_2.update('xxx', {'a02': 'yyyy'})                                      # proxy_2 never loaded shard-a
+        proxy_2.flushes.wait()
+        with Proxy__Text_Node__Cache(cache_service=cache_service) as _:
+            assert _.split('xxx', {'a01': '', 'a02': ''})[0] == {'a01': 'xxxx', 'a02': 'yyyy'}
+
+    def test_flush__writes_only_new_entries(self):
+        cache_service = self.cache_service('text-node-cache-tests-flush')
+        written       = []
+        with Proxy__Text_Node__Cache(cache_service=cache_service) as _:
+            _.store_shard = lambda profile, shard, new_mappings: written.append((shard, new_mappings))
+            _.update('xxx', {'aaa': 'x', 'bbb': 'x'})
+            _.flushes.wait()
+            _.update('xxx', {'aaa': 'x', 'abc': 'y'})                               # 'aaa' is already known
+            _.flushes.wait()
+            assert written == [('shard-a', {'aaa': 'x'}), ('shard-b', {'bbb': 'x'}), ('shard-a', {'abc': 'y'})]
+            del _.store_shard
@@ -70,7 +70,7 @@ class test_Cache__Health_Check__Service(TestCase):
             headers = _.get_headers()
             assert headers == {Safe_Str__Id("X-Custom-Key"): self.api_key}
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__success(self, mock_get):                           # Test successful connectivity check
         mock_response             = Mock()
         mock_response.status_code = 200
@@ -93,7 +93,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "connectivity"                 in result.checks_passed
         assert result.details["status_code"]  == 200
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__root_404(self, mock_get):                          # Test connectivity with 404 on root
         mock_response             = Mock()
         mock_response.status_code = 404
@@ -105,7 +105,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "reachable"                    in result.message
         assert "connectivity"                 in result.checks_passed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__unexpected_status(self, mock_get):                 # Test connectivity with unexpected status
         mock_response             = Mock()
         mock_response.status_code = 500
@@ -124,7 +124,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "unexpected status: 500"       in result.message
         assert "connectivity: Status 500"     in result.checks_failed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__connection_error(self, mock_get):                  # Test connectivity with connection error
         error_message = "Connection refused"
         mock_get.side_effect = requests.exceptions.ConnectionError(error_message)
@@ -136,7 +136,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "connectivity: Connection refused"   in result.checks_failed
         assert result.details["error"]              == error_message
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__timeout(self, mock_get):                           # Test connectivity with timeout
         mock_get.side_effect = requests.exceptions.Timeout()
 
@@ -146,7 +146,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "timeout"                      in result.message.lower()
         assert "connectivity: Timeout"        in result.checks_failed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_connectivity__unexpected_error(self, mock_get):                  # Test connectivity with unexpected error
         error_message = "Unexpected network error"
         mock_get.side_effect = Exception(error_message)
@@ -157,7 +157,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "Unexpected error"               in result.message
         assert f"connectivity: {error_message}" in result.checks_failed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_storage_info__success(self, mock_get):                           # Test successful storage info check
         storage_data = { "storage_mode" : "s3"          ,
                          "ttl_hours"    : 24            ,
@@ -176,7 +176,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.details["storage_info"]       == storage_data
         assert result.duration_ms                   > 0
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_storage_info__missing_storage_mode(self, mock_get):              # Test storage info with missing storage_mode
         storage_data = {"ttl_hours": 24}                                            # Missing storage_mode
         mock_response             = Mock()
@@ -196,7 +196,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.status                                 == Enum__Health_Status.DEGRADED
         assert 'storage_mode_present: Missing storage_mode'  in result.checks_failed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_storage_info__endpoint_error(self, mock_get):                    # Test storage info with endpoint error
         mock_response             = Mock()
         mock_response.status_code = 404
@@ -214,7 +214,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "endpoint returned 404"              in result.message
         assert "storage_info: Status 404"           in result.checks_failed
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_storage_info__exception(self, mock_get):                         # Test storage info with exception
         error_message = "Network error"
         mock_get.side_effect = Exception(error_message)
@@ -225,7 +225,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert f"storage_info: {error_message}"  in result.checks_failed
         assert result.details                    == {'error':'Network error'}
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_api_endpoints__all_healthy(self, mock_get):                      # Test all endpoints are healthy
         mock_response             = Mock()
         mock_response.status_code = 200
@@ -239,7 +239,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.details["endpoints_passed"]   == 3
         assert result.details["endpoints_failed"]   == 0
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_api_endpoints__partial_failure(self, mock_get):                  # Test some endpoints fail
         def side_effect(*args, **kwargs):
             if "storage/info" in args[0]:
@@ -263,7 +263,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.status           == Enum__Health_Status.UNHEALTHY
         assert "1/3 endpoints working" in result.message
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_api_endpoints__majority_fail(self, mock_get):                    # Test majority of endpoints fail
         mock_response             = Mock()
         mock_response.status_code = 500
@@ -276,7 +276,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.details["endpoints_passed"]   == 0
         assert result.details["endpoints_failed"]   == 3
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_check_api_endpoints__with_exceptions(self, mock_get):                  # Test endpoints with exceptions
         def side_effect(*args, **kwargs):
             raise requests.exceptions.ConnectionError("Connection failed")
@@ -288,7 +288,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.status                        == Enum__Health_Status.UNHEALTHY
         assert result.details["endpoints_failed"]   == 3
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_get_service_info__success(self, mock_get):                             # Test successful service info retrieval
         storage_data = { "storage_mode": "s3",
                          "ttl_hours": 48,
@@ -314,7 +314,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.s3_bucket     == "production-bucket"
         assert result.is_reachable  is True
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_get_service_info__endpoint_error(self, mock_get):                      # Test service info with endpoint error
         mock_response             = Mock()
         mock_response.status_code = 500
@@ -324,7 +324,7 @@ class test_Cache__Health_Check__Service(TestCase):
 
         assert result is None
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_get_service_info__exception(self, mock_get):                           # Test service info with exception
         mock_get.side_effect = Exception("Network error")
 
@@ -334,7 +334,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result.base_url      == self.base_url
         assert result.is_reachable  is False
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_perform_comprehensive_check__all_healthy(self, mock_get):              # Test comprehensive check with all systems healthy
         storage_data = { "storage_mode": "s3",
                          "ttl_hours": 24,
@@ -358,7 +358,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "storage"                            in result["checks"]
         assert "endpoints"                          in result["checks"]
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_perform_comprehensive_check__with_unhealthy(self, mock_get):           # Test comprehensive check with unhealthy services
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
 
@@ -368,7 +368,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert "critical issues detected"           in result["overall_message"]
         assert result["summary"]["unhealthy"]       > 0
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_perform_comprehensive_check__with_degraded(self, mock_get):            # Test comprehensive check with degraded services
         def side_effect(*args, **kwargs):
             if "storage/info" in args[0]:
@@ -388,7 +388,7 @@ class test_Cache__Health_Check__Service(TestCase):
         assert result["overall_status"]             == Enum__Health_Status.DEGRADED.value
         assert "Some issues detected"               in result["overall_message"]
 
-    @patch('requests.get')
+    @patch('mgraph_ai_service_mitmproxy.service.health_check.Cache__Health_Check__Service.http_session_pool.get')
     def test_perform_comprehensive_check__service_info_present(self, mock_get):     # Test comprehensive check includes service info
         storage_data = {
             "storage_mode": "s3",
@@ -0,0 +1,131 @@
+import json
+from unittest                                                                           import TestCase
+from osbot_utils.helpers.html.transformers.Html_Dict__To__Html                          import Html_Dict__To__Html
+from osbot_utils.helpers.html.transformers.Html__To__Html_Dict                          import Html__To__Html_Dict
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.utils.Files                                                            import path_combine
+from osbot_utils.utils.Objects                                                          import base_classes
+from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Html               import Safe_Str__Html
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Hashes__To__Html__Request         import Schema__Hashes__To__Html__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Request   import Schema__Html__To__Dict__Hashes__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__Html__To__Dict__Hashes__Response  import Schema__Html__To__Dict__Hashes__Response
+from mgraph_ai_service_mitmproxy.service.html.HTML__Local__Engine                       import HTML__Local__Engine
+from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client                     import HTML__Service__Client
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                                  import get__html_service__fast_api_server
+
+FILE__HTML_SERVICE__RECORDED_OUTPUTS = path_combine(__file__, '../html_service__recorded_outputs.json')     # outputs of /html/to/dict/hashes and /hashes/to/html
+
+TEST_HTML__PAGES = [ "<html><body><p>Test content</p></body></html>"                                                       ,
+                     "<html><head><title>Title</title><style>p {color:red}</style></head><body><h1>Hello</h1></body></html>",
+                     "<html><body><div>Mixed <b>bold</b> and <i>italic</i> text</div><ul><li>one</li><li>two</li></ul></body></html>",
+                     "<html><body><p>same text</p><p>same text</p><img src='a.png'/><script>var a = 1;</script></body></html>" ]
+
+
+class test_HTML__Local__Engine(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__html_service__fast_api_server() as _:
+            cls.fast_api_server = _.fast_api_server
+            cls.client          = HTML__Service__Client(base_url=_.server_url)
+        cls.fast_api_server.start()
+        cls.local_engine     = HTML__Local__Engine()
+        with open(FILE__HTML_SERVICE__RECORDED_OUTPUTS) as file:
+            cls.recorded_pages = json.load(file).get('pages')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.fast_api_server.stop()
+
+    def test__init__(self):
+        with HTML__Local__Engine() as _:
+            assert type(_)         is HTML__Local__Engine
+            assert base_classes(_) == [Type_Safe, object]
+            assert _.hash_size     == 10
+
+    def test_html_to_dict_hashes(self):
+        with self.local_engine.html_to_dict_hashes(TEST_HTML__PAGES[0]) as _:
+            assert type(_)                      is Schema__Html__To__Dict__Hashes__Response
+            assert _.is_successful()            is True
+            assert _.json().get('hash_mapping') == {'8bfa8e0684': 'Test content'}
+            assert _.node_count                 == 4
+            assert _.max_depth                  == 3
+            assert _.total_text_hashes          == 1
+            assert _.max_depth_reached          is False
+
+        with self.local_engine.html_to_dict_hashes('') as _:
+            assert _.is_successful()            is False
+            assert _.html_dict                  == {}
+            assert _.json().get('hash_mapping') == {}
+
+    def test_html_to_dict_hashes__skips_style_script_and_whitespace(self):
+        html = "<html><head><style>p {color:red}</style><script>var a = 1;</script></head><body><p>   </p><p>text</p></body></html>"
+        with self.local_engine.html_to_dict_hashes(html) as _:
+            assert list(_.json().get('hash_mapping').values()) == ['text']
+
+    def test_html_to_dict_hashes__max_depth(self):
+        html = "<html><body>" + "<div>" * 10 + "deep" + "</div>" * 10 + "</body></html>"
+        assert self.local_engine.html_to_dict_hashes(html              ).max_depth_reached is False
+        assert self.local_engine.html_to_dict_hashes(html, max_depth=5 ).max_depth_reached is True
+        assert self.local_engine.html_to_dict_hashes(html, max_depth=5 ).total_text_hashes == 0      # text below max_depth is not hashed
+
+    def test_html_to_dict_hashes__parity_with_recorded_outputs(self):             # same html_dict, hashes and counts as the HTML Service
+        assert len(self.recorded_pages) > 0
+        for page in self.recorded_pages:
+            remote = Schema__Html__To__Dict__Hashes__Response(**page.get('dict_hashes'))
+            local  = self.local_engine.html_to_dict_hashes(page.get('html'))
+            assert local.json() == remote.json(), page.get('name')
+
+    def test_html_to_dict_hashes__parity_with_html_service(self):
+        for html in TEST_HTML__PAGES:
+            remote = self.client.get_dict_hashes(Schema__Html__To__Dict__Hashes__Request(html=html))
+            local  = self.local_engine.html_to_dict_hashes(html)
+            assert local.json() == remote.json()
+
+    def test_reconstruct_from_hashes(self):
+        dict_hashes = self.client.get_dict_hashes(Schema__Html__To__Dict__Hashes__Request(html=TEST_HTML__PAGES[0]))
+        hash_mapping = {hash_value: text.upper() for hash_value, text in dict_hashes.hash_mapping.items()}
+        html         = self.local_engine.reconstruct_from_hashes(dict_hashes.html_dict, hash_mapping)
+        assert type(html) is Safe_Str__Html
+        assert html       == ('<!DOCTYPE html>\n'
+                              '<html>\n'
+                              '    <body>\n'
+                              '        <p>TEST CONTENT</p>\n'
+                              '    </body>\n'
+                              '</html>'                  )
+
+    def test_reconstruct_from_hashes__parity_with_recorded_outputs(self):         # local step 1 + step 3 must be byte-identical to the recorded /hashes/to/html
+        for page in self.recorded_pages:
+            if page.get('reconstructed__xxx') is None:                              # nothing to reconstruct (empty page)
+                continue
+            local        = self.local_engine.html_to_dict_hashes(page.get('html'))
+            hash_mapping = {hash_value: 'x' * len(text) for hash_value, text in page.get('dict_hashes').get('hash_mapping').items()}
+            local_html   = self.local_engine.reconstruct_from_hashes(local.html_dict, hash_mapping)
+            assert local_html == Safe_Str__Html(page.get('reconstructed__xxx')), page.get('name')
+
+    def test_reconstruct_from_hashes__text_containing_a_hash(self):                # a text node that holds another node's hash keeps its text (a string replace of the rendered html would swap it too)
+        intro_hash = self.local_engine.text_hash('Intro')
+        html       = f"<html><body><p>Checksum: {intro_hash}</p><p>Intro</p><script>var h = '{intro_hash}';</script></body></html>"
+        local      = self.local_engine.html_to_dict_hashes(html)
+        hashed     = Html_Dict__To__Html(root=local.html_dict).convert()
+        assert list(local.json().get('hash_mapping').values()) == [f'Checksum: {intro_hash}', 'Intro']     # the checksum node is replaced first
+
+        same_text  = {hash_value: text for hash_value, text in local.hash_mapping.items()}
+        round_trip = Safe_Str__Html(Html_Dict__To__Html(root=Html__To__Html_Dict(html=html).convert()).convert())
+        assert self.local_engine.reconstruct_from_hashes(local.html_dict, same_text) == round_trip          # parity with the original page
+
+        xxx_text   = {hash_value: 'x' * len(text) for hash_value, text in local.hash_mapping.items()}
+        html_xxx   = self.local_engine.reconstruct_from_hashes(local.html_dict, xxx_text)
+        assert f"<p>{'x' * 20}</p>"           in html_xxx
+        assert '<p>xxxxx</p>'                 in html_xxx
+        assert f"var h = '{intro_hash}';"     in html_xxx                                                    # script text is never hashed (so never replaced)
+        assert Html_Dict__To__Html(root=local.html_dict).convert() == hashed                                 # html_dict itself is not changed
+
+    def test_reconstruct_from_hashes__parity_with_html_service(self):              # local step 3 must be byte-identical to /hashes/to/html
+        for html in TEST_HTML__PAGES:
+            dict_hashes  = self.client.get_dict_hashes(Schema__Html__To__Dict__Hashes__Request(html=html))
+            hash_mapping = {hash_value: 'x' * len(text) for hash_value, text in dict_hashes.hash_mapping.items()}
+            request      = Schema__Hashes__To__Html__Request(html_dict=dict_hashes.html_dict, hash_mapping=hash_mapping)
+            remote_html  = self.client.reconstruct_from_hashes(request).body
+            local_html   = self.local_engine.reconstruct_from_hashes(dict_hashes.html_dict, hash_mapping)
+            assert local_html == remote_html
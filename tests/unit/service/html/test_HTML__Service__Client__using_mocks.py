@@ -50,7 +50,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
             assert headers['Content-Type'] == 'application/json'
             assert 'X-API-Key' not in headers                                       # No auth key if not configured
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__success(self, mock_post):                              # Test successful transformation
         mock_response           = Mock()
         mock_response.status_code = 200
@@ -81,7 +81,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                         success             = True                           )
 
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__json_response(self, mock_post):                        # Test transformation with JSON response
         mock_response             = Mock()
         mock_response.status_code = 200
@@ -108,7 +108,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                               headers      = __(content_type = 'application/json') ,
                                               success      = True                              )
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__timeout(self, mock_post):                              # Test transformation timeout
         import requests
         mock_post.side_effect = requests.Timeout("Connection timeout")
@@ -130,7 +130,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                         success      = False                                         )
 
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__request_exception(self, mock_post):                    # Test transformation with request exception
         import requests
         mock_post.side_effect = requests.RequestException("Connection error")
@@ -152,7 +152,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                         success       = False                                            )
 
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__generic_exception(self, mock_post):                    # Test transformation with generic exception
         mock_post.side_effect = Exception("Unexpected error")
 
@@ -185,7 +185,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                          success      = False                                   )
 
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__correct_endpoint_called(self, mock_post):              # Test correct endpoint construction
         mock_response             = Mock()
         mock_response.status_code = 200
@@ -211,7 +211,7 @@ class test_HTML__Service__Client__using_mocks(TestCase):
                                         success      = True                            )
 
 
-    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.requests.post')
+    @patch('mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client.http_session_pool.post')
     def test_transform_html__correct_payload_sent(self, mock_post):                 # Test correct payload structure
         mock_response             = Mock()
         mock_response.status_code = 200
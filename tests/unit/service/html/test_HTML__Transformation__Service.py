@@ -1,3 +1,7 @@
+import gzip
+import time
+import pytest
+import threading
 from unittest                                                                       import TestCase
 from osbot_utils.helpers.duration.decorators.print_duration                         import print_duration
 from osbot_utils.testing.Pytest import skip_if_in_github_action
@@ -5,15 +9,25 @@ from osbot_utils.type_safe.primitives.domains.web.safe_str.Safe_Str__Html
 from osbot_utils.type_safe.type_safe_core.collections.Type_Safe__Dict               import Type_Safe__Dict
 from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Step_1  import Schema__HTML__Transformation__Step_1
 from mgraph_ai_service_mitmproxy.schemas.html.safe_dict.Safe_Dict__Hash__To__Text   import Safe_Dict__Hash__To__Text
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client           import Service__Fast_API__Client
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client__Config   import Service__Fast_API__Client__Config
 from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config        import Schema__Cache__Config
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Transformation__Meta import Schema__Cache__Transformation__Meta
 from osbot_utils.testing.__                                                         import __, __SKIP__, __LESS_THAN__
 from osbot_utils.testing.Temp_Env_Vars                                              import Temp_Env_Vars
 from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
 from osbot_utils.utils.Http                                                         import GET_json
 from osbot_utils.utils.Objects                                                      import base_classes
+from osbot_utils.utils.Misc                                                         import random_text
 from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service         import HTML__Transformation__Service
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import STEP__SEMANTIC_TEXT
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                      import Proxy__Deadline, Proxy__Deadline__Exceeded
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client import Semantic_Text__Service__Client
 from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
 from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result  import Schema__HTML__Transformation__Result
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Defer    import Enum__HTML__Transformation__Defer
 from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                              import (get__cache_service__fast_api_server,
                                                                                            get__html_service__fast_api_server,
                                                                                            get__semantic_text_service__fast_api_server)
@@ -105,7 +119,9 @@ class test_HTML__Transformation__Service(TestCase):
                 transformation_mode    = 'off',
                 content_type           = 'text/html',
                 cache_hit              = False,
-                transformation_time_ms = 0.0
+                transformation_time_ms = 0.0,
+                transformation_pending = False,
+                success                = False                                          # passthrough
             )
 
     def test_transform_html__mode_xxx__with_semantic_text_service(self):            # NEW: Test XXX transformation via semantic-text
@@ -132,7 +148,9 @@ class test_HTML__Transformation__Service(TestCase):
                                        transformation_mode    = 'xxx',
                                        content_type           = 'text/html',
                                        cache_hit              = False,
-                                       transformation_time_ms = __LESS_THAN__(100))     # should execute fast (locally in dev laptop this is ~10ms)
+                                       transformation_time_ms = __LESS_THAN__(100),     # should execute fast (locally in dev laptop this is ~10ms)
+                                       transformation_pending = False             ,
+                                       success                = True              )
 
     def test_transform_html__mode_hashes__with_semantic_text_service(self):         # NEW: Test HASHES transformation
         with self.html_transformation_service as _:
@@ -199,7 +217,9 @@ class test_HTML__Transformation__Service(TestCase):
                                           transformation_mode    = 'hashes'                 ,
                                           content_type           = 'text/html'              ,
                                           cache_hit              = False                    ,
-                                          transformation_time_ms = __LESS_THAN__(100)     )
+                                          transformation_time_ms = __LESS_THAN__(100)     ,
+                                          transformation_pending = False                  ,
+                                          success                = True                   )
 
 
     def test_transform_html__caching__with_semantic_text(self):                     # NEW: Test caching with semantic-text transformations
@@ -338,3 +358,346 @@ class test_HTML__Transformation__Service(TestCase):
             assert xxx_result       != hashes_result                                # Different transformations
             #assert xxx_result       != abcde_result                                # todo: look into this (shouldn't they be different?)
             assert hashes_result    != abcde_result
+
+    def test_transform_html__pipeline__local_reconstruct(self):                     # step 3 done in-process gives the same html as the HTML Service
+        source_html = "<html><body><div>Mixed <b>bold</b> text</div><p>Second paragraph</p></body></html>"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        with Temp_Env_Vars(env_vars={'HTML_TRANSFORMATION__PIPELINE': 'local-reconstruct'}):
+            local_service = HTML__Transformation__Service().setup()
+        assert local_service.pipeline               == Enum__HTML__Transformation__Pipeline.LOCAL_RECONSTRUCT
+        assert local_service.reconstructs_locally() is True
+        assert self.html_transformation_service.reconstructs_locally() is False
+
+        remote_result = self.html_transformation_service.transform_html(source_html, "https://example.com/pipeline-remote", mode)
+        local_result  = local_service                   .transform_html(source_html, "https://example.com/pipeline-local" , mode)
+        assert local_result.transformed_html == remote_result.transformed_html
+        assert 'xxxxxx'                      in local_result.transformed_html
+
+    def test_transform_html__pipeline__local(self):                                 # steps 1 and 3 in-process (and step 2 for local modes)
+        source_html = "<html><body><div>Mixed <b>bold</b> text</div><p>Second paragraph</p></body></html>"
+        with Temp_Env_Vars(env_vars={'HTML_TRANSFORMATION__PIPELINE': 'local'}):
+            local_service = HTML__Transformation__Service().setup()
+        assert local_service.pipeline               == Enum__HTML__Transformation__Pipeline.LOCAL
+        assert local_service.extracts_locally()     is True
+        assert local_service.reconstructs_locally() is True
+        assert local_service.transforms_locally(Enum__HTML__Transformation_Mode.ABCDE_BY_SIZE) is True
+        assert local_service.transforms_locally(Enum__HTML__Transformation_Mode.XXX          ) is False
+
+        mode          = Enum__HTML__Transformation_Mode.XXX                         # semantic text step still used, same html as the remote pipeline
+        remote_result = self.html_transformation_service.transform_html(source_html, "https://example.com/pipeline-remote-xxx", mode)
+        local_result  = local_service                   .transform_html(source_html, "https://example.com/pipeline-local-xxx" , mode)
+        assert local_result.transformed_html == remote_result.transformed_html
+
+        local_service.html_service_client .base_url = 'http://localhost:1'          # local modes don't need the HTML or Semantic Text services
+        local_service.semantic_text_client.base_url = 'http://localhost:1'
+        result = local_service._transform_via_services(source_html, Enum__HTML__Transformation_Mode.ABCDE_BY_SIZE)
+        assert result.transformed_html is not None
+        assert 'bold'                  not in result.transformed_html
+        assert '<b>'                       in result.transformed_html
+
+    def test_transform_html__single_flight(self):                                   # concurrent requests for the same page+mode share one pipeline run
+        source_html = "<html><body><p>Popular page</p></body></html>"
+        target_url  = "https://example.com/popular?utm_source=a"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        service     = HTML__Transformation__Service().setup()
+        runs        = []
+        transform   = service._pipeline_result
+
+        def slow_transform(*args):
+            runs.append(1)
+            time.sleep(0.1)                                                         # keep the pipeline in flight while the other requests arrive
+            return transform(*args)
+        service._pipeline_result = slow_transform
+
+        assert service.single_flight_key(target_url, mode)                               == ('sites/example.com/pages/popular', 'xxx')
+        assert service.single_flight_key(target_url, mode, service.content_hash(source_html)) == (service.content_hash(source_html), 'xxx')
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.transform_html(source_html, target_url, mode))) for _ in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        assert len(runs)                       == 1
+        assert len(results)                    == 4
+        assert len({id(result) for result in results}) == 1                         # all callers got the leader's result
+        assert '<p>xxxxxxx xxxx</p>'           in results[0].transformed_html
+        assert service.single_flight.stats()   == dict(leaders=1, followers=3, in_flight=0)
+
+    def test_transform_html__content_addressed_cache(self):                         # same html from different urls shares one transformation, changed html misses
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='content-addressed-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        mode          = Enum__HTML__Transformation_Mode.XXX
+        source_html   = "<html><body><p>Mirrored article</p></body></html>"
+        changed_html  = "<html><body><p>Updated article</p></body></html>"
+
+        result_1 = service.transform_html(source_html , "https://example.com/article?utm_source=a"   , mode)
+        result_2 = service.transform_html(source_html , "https://mirror.example.org/copy-of-article", mode)
+        result_3 = service.transform_html(changed_html, "https://example.com/article?utm_source=a"   , mode)
+
+        assert (result_1.cache_hit, result_2.cache_hit, result_3.cache_hit) == (False, True, False)     # different url, same html => hit ; same url, changed html => miss (no stale transform)
+        assert result_2.transformed_html == result_1.transformed_html
+        assert '<p>xxxxxxx xxxxxxx</p>'  in result_3.transformed_html
+        assert service.cache_service.stats.total_contents_cached == 2
+
+    def test_transform_html__text_node_cache(self):                                 # boilerplate shared between pages is only sent to the Semantic Text Service once
+        service = HTML__Transformation__Service().setup()
+        mode    = Enum__HTML__Transformation_Mode.XXX
+        page_1  = "<html><body><nav>Home News Sport</nav><p>First article</p><footer>Contact us</footer></body></html>"
+        page_2  = "<html><body><nav>Home News Sport</nav><p>Second story</p><footer>Contact us</footer></body></html>"
+
+        result_1 = service.transform_html(page_1, "https://example.com/article-1", mode)
+        assert (service.text_node_cache.hits, service.text_node_cache.misses) == (0, 3)
+
+        result_2 = service.transform_html(page_2, "https://example.com/article-2", mode)
+        assert (service.text_node_cache.hits, service.text_node_cache.misses) == (2, 4)       # only 'Second story' was classified
+        assert '<p>xxxxxx xxxxx</p>'         in result_2.transformed_html
+        assert '<footer>xxxxxxx xx</footer>' in result_2.transformed_html
+        assert result_1.cache_hit is False and result_2.cache_hit is False
+
+        result_3 = service.transform_html(page_1 + ' ', "https://example.com/article-1", mode)  # every node known: no Semantic Text Service call
+        assert service.text_node_cache.misses == 4
+        assert result_3.transformed_html == result_1.transformed_html
+
+    def test_transform_html__stale_while_revalidate(self):                          # stale entries are served straight away and refreshed in the background
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='stale-while-revalidate-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        mode          = Enum__HTML__Transformation_Mode.XXX
+        target_url    = "https://example.com/swr-article"
+        source_html   = "<html><body><p>Fresh article</p></body></html>"
+        content_hash  = service.content_hash(source_html)
+
+        result_1 = service.transform_html(source_html, target_url, mode)
+        meta     = service.transformation_meta(target_url, mode, content_hash)
+        assert result_1.cache_hit is False
+        assert meta.ttl_seconds   == mode.cache_ttl_seconds()
+        assert meta.is_stale()    is False
+
+        result_2 = service.transform_html(source_html, target_url, mode)             # fresh hit: nothing to refresh
+        assert result_2.cache_hit is True
+        assert service.revalidator.started == 0
+
+        stale_result = Schema__HTML__Transformation__Result(transformed_html='<p>stale</p>', transformation_mode=mode, content_type=mode.to_content_type())
+        service._store_transformation_in_cache(target_url, mode, stale_result, content_hash)
+        service.store_transformation_meta(target_url, mode, content_hash, Schema__Cache__Transformation__Meta(cached_at=int(time.time() * 1000) - 2 * 86400 * 1000, ttl_seconds=60))
+        assert service.transformation_meta(target_url, mode, content_hash).is_stale() is True
+
+        result_3 = service.transform_html(source_html, target_url, mode)             # stale hit: served as is, refresh started
+        assert result_3.cache_hit        is True
+        assert result_3.transformed_html == '<p>stale</p>'
+        service.revalidator.wait(timeout=10)
+        assert service.revalidator.stats() == dict(started=1, completed=1, failed=0, skipped=0, in_progress=0)
+
+        result_4 = service.transform_html(source_html, target_url, mode)
+        assert result_4.cache_hit        is True
+        assert result_4.transformed_html == result_1.transformed_html
+        assert service.transformation_meta(target_url, mode, content_hash).is_stale() is False
+        assert service.revalidator.started == 1
+
+        service.cache_service.cache_config.stale_while_revalidate = False             # disabled: stale entries are served without a refresh
+        assert service.revalidate_if_stale(source_html, target_url, mode, content_hash) is False
+
+    def test_transformation_ttl_seconds(self):                                      # content-addressed entries of local modes can't change, so they never go stale
+        cache_config = Schema__Cache__Config(enabled=True, transformation_ttl_seconds=60)
+        service      = HTML__Transformation__Service(cache_service=Proxy__Cache__Service(cache_config=cache_config))
+        assert service.transformation_ttl_seconds(Enum__HTML__Transformation_Mode.XXX          ) == 60
+        assert service.transformation_ttl_seconds(Enum__HTML__Transformation_Mode.HASHES_RANDOM) == 0
+        cache_config.transformation_ttl_seconds = 0
+        assert service.transformation_ttl_seconds(Enum__HTML__Transformation_Mode.XXX          ) == Enum__HTML__Transformation_Mode.XXX.cache_ttl_seconds()
+
+    def test_transform_html__negative_cache(self):                                  # a failing page is served as passthrough (without calling the services) while backing off
+        service     = HTML__Transformation__Service().setup()
+        source_html = "<html><body><p>Broken page</p></body></html>"
+        target_url  = "https://example.com/broken"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        runs        = []
+        transform   = service._pipeline_result
+
+        def counted_transform(*args):
+            runs.append(1)
+            return transform(*args)
+        service._pipeline_result = counted_transform
+
+        with Temp_Env_Vars(env_vars={'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': ''}):
+            service.semantic_text_client = Semantic_Text__Service__Client()
+            result_1 = service.transform_html(source_html, target_url, mode)
+            result_2 = service.transform_html(source_html, target_url, mode)
+        assert result_1.transformed_html == source_html                             # error: original html
+        assert result_2.transformed_html == source_html                             # backing off: passthrough, no pipeline run
+        assert len(runs)                 == 1
+        assert service.negative_cache.stats() == dict(failing_keys=1, failures=1, short_circuits=1)
+
+        service.semantic_text_client = Semantic_Text__Service__Client()
+        service.negative_cache.entry(service.negative_cache_key(target_url, mode)).retry_at = 0   # backoff over
+        result_3 = service.transform_html(source_html, target_url, mode)
+        assert '<p>xxxxxx xxxx</p>'      in result_3.transformed_html
+        assert len(runs)                 == 2
+        assert service.negative_cache.stats()['failing_keys'] == 0
+
+    def test_transform_html__cache_backend_down(self):                              # cache errors don't fail the transformation, and the cache's breaker stops the calls
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url='http://localhost:1'))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url='http://localhost:1', namespace='cache-down-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        breaker       = service.cache_breaker()
+        breaker.reset()
+        try:
+            for i in range(3):
+                result = service.transform_html(f"<html><body><p>Article {i}</p></body></html>", f"https://example.com/article-{i}", Enum__HTML__Transformation_Mode.XXX)
+                assert '<p>xxxxxxx x</p>' in result.transformed_html
+            assert breaker.state.value == 'open'                                    # lookups and stores failed: the cache is now skipped
+            assert breaker.rejected    > 0
+        finally:
+            breaker.reset()
+
+    def test_get_cached_transformation__precompressed(self):                        # cache hits keep the gzip bytes they were stored as (so the response needs no compression)
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='precompressed-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        source_html = "<html><body>{}<p>{}</p></body></html>".format("<p>Some repeated paragraph</p>" * 100, random_text())
+        target_url  = "https://example.com/precompressed-page"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+
+        result_1 = service.transform_html(source_html, target_url, mode)
+        assert result_1.cache_hit                   is False
+        assert service.precompressed.entries        == {}
+        result_2 = service.transform_html(source_html, target_url, mode)
+        assert result_2.cache_hit                   is True
+        body_key = service.precompressed.body_key(str(result_2.transformed_html).encode())
+        assert gzip.decompress(service.precompressed.get(body_key, 'gzip')).decode() == result_2.transformed_html
+
+    def test_transform_html__deadline(self):                                        # out of budget: the original html is served, and the pipeline stops before its next step
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='deadline-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        source_html = "<html><body><p>Slow page {}</p></body></html>".format(random_text())
+        target_url  = "https://example.com/slow-page"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        step_1      = service._step_1__get_hash_mapping
+        steps_2     = []
+        step_2      = service._step_2__transform_mapping
+
+        def slow_step_1(*args):
+            time.sleep(0.5)
+            return step_1(*args)
+
+        def counted_step_2(*args):
+            steps_2.append(1)
+            return step_2(*args)
+        service._step_1__get_hash_mapping  = slow_step_1
+        service._step_2__transform_mapping = counted_step_2
+
+        deadline   = Proxy__Deadline(budget_ms=200)
+        start_time = time.monotonic()
+        result_1   = service.transform_html(source_html, target_url, mode, deadline=deadline)
+        assert time.monotonic() - start_time < 0.45                                 # didn't wait for the pipeline
+        assert result_1.transformed_html     == source_html                         # passthrough
+        assert result_1.cache_hit            is False
+        assert deadline.steps_skipped        == ['transformation']
+
+        time.sleep(0.5)                                                             # step 1 completes, then the pipeline stops
+        assert service.single_flight.in_flight()                               == 0
+        assert steps_2                                                         == []  # the semantic text step was never started
+        assert service.negative_cache.is_blocked(service.negative_cache_key(target_url, mode)) is False  # running out of budget is not a failure
+
+        result_2 = service.transform_html(source_html, target_url, mode)            # nothing was cached by the stopped pipeline
+        assert result_2.transformed_html     != source_html
+        assert result_2.cache_hit            is False
+        result_3 = service.transform_html(source_html, target_url, mode, deadline=Proxy__Deadline(budget_ms=2000))
+        assert result_3.cache_hit            is True
+        assert result_3.transformed_html     == result_2.transformed_html
+
+        deadline = Proxy__Deadline(budget_ms=50)                                    # below the minimum needed to start a transformation
+        assert service.transform_html(source_html, target_url, mode, deadline=deadline).transformed_html == source_html
+        assert deadline.steps_skipped        == ['transformation']
+
+    def test_transform_html__deadline__step_timeouts(self):                         # each outbound call is capped by the budget left
+        service   = HTML__Transformation__Service().setup()
+        timeouts  = []
+        transform = service.semantic_text_client.transform_text
+
+        def recorded_transform_text(request, timeout=None):
+            timeouts.append(timeout)
+            return transform(request, timeout=timeout)
+        service.semantic_text_client.transform_text = recorded_transform_text
+
+        source_html = "<html><body><p>Budgeted page {}</p></body></html>".format(random_text())
+        result      = service.transform_html(source_html, "https://example.com/budgeted", Enum__HTML__Transformation_Mode.XXX, deadline=Proxy__Deadline(budget_ms=5000))
+        assert '<p>xxxxxxxx xxxx' in result.transformed_html
+        assert 0 < timeouts[0]    <= 5.0                                            # not the client's own timeout
+
+        assert service.step_timeout(30, None                           , STEP__SEMANTIC_TEXT) == 30.0
+        assert service.step_timeout(30, Proxy__Deadline()              , STEP__SEMANTIC_TEXT) == 30.0    # unbounded
+        assert service.step_timeout(1 , Proxy__Deadline(budget_ms=5000), STEP__SEMANTIC_TEXT) == 1.0     # the client's timeout is already shorter
+
+        deadline = Proxy__Deadline(budget_ms=100, started_at=time.monotonic() - 1)  # spent after the step was checked: stop, rather than call with a 0 (no) timeout
+        with pytest.raises(Proxy__Deadline__Exceeded, match=STEP__SEMANTIC_TEXT):
+            service.step_timeout(30, deadline, STEP__SEMANTIC_TEXT)
+        assert deadline.steps_skipped == [STEP__SEMANTIC_TEXT]
+
+    def test_transform_html__defer(self):                                           # cache misses are served as the original html while the transformation runs in the background
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='defer-tests')
+        service       = HTML__Transformation__Service(defer=Enum__HTML__Transformation__Defer.REMOTE).setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        source_html   = "<html><body><p>Deferred page {}</p></body></html>".format(random_text())
+        target_url    = "https://example.com/deferred-page"
+        mode          = Enum__HTML__Transformation_Mode.XXX
+
+        result_1 = service.transform_html(source_html, target_url, mode)
+        assert result_1.transformed_html                          == source_html
+        assert result_1.transformation_pending                    is True
+        assert result_1.to_headers()['x-proxy-transformation-pending'] == 'true'
+        service.deferred.wait(timeout=10)
+        assert service.deferred.stats()                           == dict(started=1, completed=1, failed=0, skipped=0, in_progress=0)
+
+        result_2 = service.transform_html(source_html, target_url, mode)             # the next request gets the transformation from the cache
+        assert result_2.cache_hit                                 is True
+        assert result_2.transformation_pending                    is False
+        assert 'x-proxy-transformation-pending'                   not in result_2.to_headers()
+        assert '<p>xxxxxxxx xxxx'                                 in result_2.transformed_html
+
+    def test_defers(self):
+        service = HTML__Transformation__Service(cache_service=Proxy__Cache__Service(cache_config=Schema__Cache__Config(enabled=True)))
+        assert service.defers(Enum__HTML__Transformation_Mode.XXX          ) is False     # never (the default)
+        service.defer = Enum__HTML__Transformation__Defer.REMOTE
+        assert service.defers(Enum__HTML__Transformation_Mode.XXX          ) is True
+        assert service.defers(Enum__HTML__Transformation_Mode.XXX_NEGATIVE ) is True
+        assert service.defers(Enum__HTML__Transformation_Mode.OFF          ) is False
+        service.pipeline = Enum__HTML__Transformation__Pipeline.LOCAL
+        assert service.defers(Enum__HTML__Transformation_Mode.HASHES_RANDOM) is False     # done in-process, so not worth deferring
+        service.defer = Enum__HTML__Transformation__Defer.ALWAYS
+        assert service.defers(Enum__HTML__Transformation_Mode.HASHES_RANDOM) is True
+        service.cache_service.cache_config.enabled = False
+        assert service.defers(Enum__HTML__Transformation_Mode.XXX          ) is False     # without a cache there is nowhere to hand the transformation over
+        with Temp_Env_Vars(env_vars={'HTML_TRANSFORMATION__DEFER': 'remote'}):
+            assert service.setup__defer().defer == Enum__HTML__Transformation__Defer.REMOTE
+
+    def test_store_original_html(self):                                             # uploaded in the background, and only when the page changed
+        cache_client  = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config  = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='original-html-tests')
+        service       = HTML__Transformation__Service().setup()
+        service.cache_service = Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config)
+        target_url    = "https://example.com/provenance-{}".format(random_text())
+        html_1        = "<html><body><p>First version</p></body></html>"
+        html_2        = "<html><body><p>Second version</p></body></html>"
+
+        assert service.store_original_html(target_url, html_1) is True
+        service.original_html_uploads.wait(timeout=10)
+        assert service.store_original_html(target_url, html_1) is False                # unchanged: no upload
+        assert service.store_original_html(target_url, html_1) is False
+        assert service.store_original_html(target_url, html_2) is True
+        service.original_html_uploads.wait(timeout=10)
+
+        page_refs = service.cache_service.get_or_create_page_entry(target_url)
+        stored    = service.cache_service.cache_client.data().retrieve().data__string__with__id_and_key(cache_id     = page_refs.cache_id     ,
+                                                                                                         data_key     = "transformations/html" ,
+                                                                                                         data_file_id = 'original-html'        ,
+                                                                                                         namespace    = service.namespace()    )
+        assert stored == html_2
+        assert service.original_html_stats() == dict(urls=1, stored=2, skipped=2, bytes_avoided=2 * len(html_1), bytes_stored=len(html_1) + len(html_2),
+                                                      uploads=dict(started=2, completed=2, failed=0, skipped=0, in_progress=0))
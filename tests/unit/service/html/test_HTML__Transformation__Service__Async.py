@@ -0,0 +1,162 @@
+import asyncio
+import httpx
+import pytest
+from unittest                                                                           import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                                  import Temp_Env_Vars
+from osbot_utils.utils.Misc                                                             import random_text
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode           import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Defer         import Enum__HTML__Transformation__Defer
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline      import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result      import Schema__HTML__Transformation__Result
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client           import Service__Fast_API__Client
+from mgraph_ai_service_cache_client.client_contract.Service__Fast_API__Client__Config   import Service__Fast_API__Client__Config
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                    import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service__Async             import Proxy__Cache__Service__Async
+from mgraph_ai_service_mitmproxy.service.cache.schemas.Schema__Cache__Config            import Schema__Cache__Config
+from mgraph_ai_service_mitmproxy.service.html.HTML__Service__Client__Async              import HTML__Service__Client__Async
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service             import HTML__Transformation__Service
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Async      import HTML__Transformation__Service__Async
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client__Async import Semantic_Text__Service__Client__Async
+from mgraph_ai_service_mitmproxy.schemas.semantic_text.client.Schema__Semantic_Text__Transformation__Request import Schema__Semantic_Text__Transformation__Request
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                                  import (get__cache_service__fast_api_server,
+                                                                                               get__html_service__fast_api_server,
+                                                                                               get__semantic_text_service__fast_api_server)
+
+
+class test_HTML__Transformation__Service__Async(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__html_service__fast_api_server() as _:
+            cls.html_service_server   = _.fast_api_server
+            cls.html_service_base_url = _.server_url
+        with get__cache_service__fast_api_server() as _:
+            cls.cache_service_server   = _.fast_api_server
+            cls.cache_service_base_url = _.server_url
+        with get__semantic_text_service__fast_api_server() as _:
+            cls.semantic_text_service_server   = _.fast_api_server
+            cls.semantic_text_service_base_url = _.server_url
+
+        cls.html_service_server.start()
+        cls.cache_service_server.start()
+        cls.semantic_text_service_server.start()
+
+        env_vars = { 'AUTH__TARGET_SERVER__HTML_SERVICE__BASE_URL'         : cls.html_service_base_url          ,
+                     'AUTH__TARGET_SERVER__CACHE_SERVICE__BASE_URL'        : cls.cache_service_base_url         ,
+                     'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': cls.semantic_text_service_base_url }
+        cls.temp_env_vars               = Temp_Env_Vars(env_vars=env_vars).set_vars()
+        cls.html_transformation_service = HTML__Transformation__Service__Async().setup()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.html_service_server.stop()
+        cls.cache_service_server.stop()
+        cls.semantic_text_service_server.stop()
+        cls.temp_env_vars.restore_vars()
+
+    def test_setup(self):
+        with self.html_transformation_service as _:
+            assert isinstance(_, HTML__Transformation__Service)
+            assert type(_.html_service_client ) is HTML__Service__Client__Async
+            assert type(_.semantic_text_client) is Semantic_Text__Service__Client__Async
+            assert type(_.cache_service       ) is Proxy__Cache__Service__Async
+            assert _.html_service_client.base_url == self.html_service_base_url
+
+    def test_transform_html__mode_off(self):
+        source_html = "<html><body>Original</body></html>"
+        result      = asyncio.run(self.html_transformation_service.transform_html(source_html = source_html                         ,
+                                                                                  target_url  = "https://example.com"               ,
+                                                                                  mode        = Enum__HTML__Transformation_Mode.OFF))
+        assert result.transformed_html == source_html
+        assert result.cache_hit        is False
+
+    def test_transform_html__mode_xxx(self):                                            # same output as the sync pipeline
+        source_html = "<html><body><p>Test content</p></body></html>"
+        target_url  = "https://example.com/xxx-test"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        result      = asyncio.run(self.html_transformation_service.transform_html(source_html, target_url, mode))
+        sync_result = HTML__Transformation__Service().setup().transform_html(source_html, target_url, mode)
+
+        assert type(result)            is Schema__HTML__Transformation__Result
+        assert result.transformed_html == sync_result.transformed_html
+        assert '<p>xxxx xxxxxxx</p>'   in result.transformed_html
+
+    def test_transform_html__concurrent(self):                                          # many in-flight transforms on a single event loop
+        async def run():
+            pages = [f"<html><body><p>Page number {i}</p></body></html>" for i in range(5)]
+            tasks = [self.html_transformation_service.transform_html(source_html = page                                ,
+                                                                     target_url  = f"https://example.com/page-{i}"      ,
+                                                                     mode        = Enum__HTML__Transformation_Mode.HASHES)
+                     for i, page in enumerate(pages)]
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(run())
+        assert len(results) == 5
+        for i, result in enumerate(results):
+            assert result.transformed_html != f"<html><body><p>Page number {i}</p></body></html>"
+            assert 'Page number'           not in result.transformed_html
+
+    def test_transform_html__concurrent__same_page(self):                               # concurrent transforms of the same page+mode share one pipeline run
+        async def run():
+            tasks = [self.html_transformation_service.transform_html(source_html = "<html><body><p>Same page</p></body></html>",
+                                                                     target_url  = "https://example.com/same-page"              ,
+                                                                     mode        = Enum__HTML__Transformation_Mode.XXX          )
+                     for _ in range(5)]
+            return await asyncio.gather(*tasks)
+
+        followers = self.html_transformation_service.single_flight.followers
+        results   = asyncio.run(run())
+        assert len({id(result) for result in results})                             == 1
+        assert '<p>xxxx xxxx</p>'                                                   in results[0].transformed_html
+        assert self.html_transformation_service.single_flight.followers - followers == 4
+        assert self.html_transformation_service.single_flight.in_flight()           == 0
+
+    def test_transform_html__defer(self):                                               # cache misses are served as the original html while the transformation runs in a background task
+        cache_client = Service__Fast_API__Client(config=Service__Fast_API__Client__Config(base_url=self.cache_service_base_url))
+        cache_config = Schema__Cache__Config(enabled=True, base_url=self.cache_service_base_url, namespace='defer-async-tests')
+        service      = HTML__Transformation__Service__Async(defer=Enum__HTML__Transformation__Defer.ALWAYS).setup()
+        service.cache_service = Proxy__Cache__Service__Async(cache_service=Proxy__Cache__Service(cache_client=cache_client, cache_config=cache_config))
+        source_html = "<html><body><p>Deferred async page {}</p></body></html>".format(random_text())
+        target_url  = "https://example.com/deferred-async-page"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+
+        async def run():
+            result_1 = await service.transform_html(source_html, target_url, mode)
+            await service.deferred.wait()
+            result_2 = await service.transform_html(source_html, target_url, mode)
+            return result_1, result_2
+
+        result_1, result_2 = asyncio.run(run())
+        assert result_1.transformed_html       == source_html
+        assert result_1.transformation_pending is True
+        assert service.deferred.stats()        == dict(started=1, completed=1, failed=0, skipped=0, in_progress=0)
+        assert result_2.cache_hit              is True
+        assert '<p>xxxxxxxx xxxxx xxxx'        in result_2.transformed_html
+
+    def test_share_state(self):                                                         # both pipelines see the same in-flight calls, failures and caches
+        sync_service  = HTML__Transformation__Service().setup()
+        sync_service.pipeline = Enum__HTML__Transformation__Pipeline.LOCAL_RECONSTRUCT
+        async_service = HTML__Transformation__Service__Async().setup__clients().share_state(sync_service)     # no setup(): nothing it builds would be kept
+        assert async_service.pipeline                        == Enum__HTML__Transformation__Pipeline.LOCAL_RECONSTRUCT
+        assert async_service.defer                           == sync_service.defer
+        assert async_service.single_flight.flights           is sync_service.single_flight
+        assert async_service.negative_cache                  is sync_service.negative_cache
+        assert async_service.text_node_cache                 is sync_service.text_node_cache
+        assert async_service.original_html_dedup             is sync_service.original_html_dedup
+        assert async_service.precompressed                   is sync_service.precompressed
+        assert async_service.cache_service.cache_service     is sync_service.cache_service
+
+        source_html = "<html><body><p>Shared page {}</p></body></html>".format(random_text())
+        target_url  = "https://example.com/shared-page"
+        mode        = Enum__HTML__Transformation_Mode.XXX
+        with Temp_Env_Vars(env_vars={'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': ''}):
+            async_service.semantic_text_client = Semantic_Text__Service__Client__Async()
+            asyncio.run(async_service.transform_html(source_html, target_url, mode))    # fails in the async pipeline ...
+        assert sync_service.negative_cache.is_blocked(sync_service.negative_cache_key(target_url, mode)) is True   # ... so the sync one backs off too
+
+    def test_semantic_text_client__error_status(self):                                 # an error page raises (instead of being parsed as a transformation)
+        request = Schema__Semantic_Text__Transformation__Request(hash_mapping={'aaa1234567': 'Some Text'})
+        with Temp_Env_Vars(env_vars={'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': self.html_service_base_url}):    # no such endpoint there
+            client = Semantic_Text__Service__Client__Async()
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(client.transform_text(request))
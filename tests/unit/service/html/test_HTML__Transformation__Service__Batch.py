@@ -0,0 +1,88 @@
+from unittest                                                                                   import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                                          import Temp_Env_Vars
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode                   import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline              import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Request      import Schema__HTML__Transformation__Batch__Request
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Batch__Response     import Schema__HTML__Transformation__Batch__Response
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service                     import HTML__Transformation__Service
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service__Batch              import HTML__Transformation__Service__Batch, DEFAULT__HTML_BATCH__MAX_WORKERS
+from mgraph_ai_service_mitmproxy.service.semantic_text.Semantic_Text__Service__Client           import Semantic_Text__Service__Client
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                                          import get__semantic_text_service__fast_api_server
+
+PAGE__ARTICLE_1 = "<html><body><nav>Home News Sport</nav><p>First article</p><footer>Contact us</footer></body></html>"
+PAGE__ARTICLE_2 = "<html><body><nav>Home News Sport</nav><p>Second story</p><footer>Contact us</footer></body></html>"
+
+
+class Semantic_Text__Service__Client__Counter(Semantic_Text__Service__Client):      # counts the calls (and hashes) sent to the Semantic Text Service
+    requests : list
+
+    def transform_text(self, request, timeout=None):
+        self.requests.append(len(request.hash_mapping))
+        return super().transform_text(request, timeout=timeout)
+
+
+class test_HTML__Transformation__Service__Batch(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__semantic_text_service__fast_api_server() as _:
+            cls.semantic_text_service_server   = _.fast_api_server
+            cls.semantic_text_service_base_url = _.server_url
+        cls.semantic_text_service_server.start()
+        cls.temp_env_vars = Temp_Env_Vars(env_vars={'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': cls.semantic_text_service_base_url}).set_vars()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.semantic_text_service_server.stop()
+        cls.temp_env_vars.restore_vars()
+
+    def setUp(self):
+        html_transformation_service = HTML__Transformation__Service(semantic_text_client = Semantic_Text__Service__Client__Counter()      ,
+                                                                    pipeline             = Enum__HTML__Transformation__Pipeline.LOCAL  )
+        self.batch_service = HTML__Transformation__Service__Batch(html_transformation_service=html_transformation_service)
+        self.requests      = html_transformation_service.semantic_text_client.requests
+
+    def batch_request(self, *items):
+        return Schema__HTML__Transformation__Batch__Request.from_json(dict(items=[dict(target_url=target_url, source_html=source_html, mode=mode.value)
+                                                                                  for target_url, source_html, mode in items]))
+
+    def test__init__(self):
+        with HTML__Transformation__Service__Batch() as _:
+            assert _.html_transformation_service is None
+            assert _.max_workers                 == DEFAULT__HTML_BATCH__MAX_WORKERS
+
+    def test_transform_html_batch(self):
+        request  = self.batch_request(("https://example.com/article-1", PAGE__ARTICLE_1, Enum__HTML__Transformation_Mode.XXX),
+                                      ("https://example.com/article-2", PAGE__ARTICLE_2, Enum__HTML__Transformation_Mode.XXX),
+                                      ("https://example.com/article-3", PAGE__ARTICLE_1, Enum__HTML__Transformation_Mode.OFF))
+        response = self.batch_service.transform_html_batch(request)
+
+        assert type(response)                  is Schema__HTML__Transformation__Batch__Response
+        assert self.requests                   == [4]                                # one semantic-text call, with the shared nav and footer sent once
+        assert response.total_items            == 3
+        assert response.transformed_pages      == 2
+        assert response.text_nodes_total       == 6
+        assert response.text_nodes_unique      == 4
+        assert response.cache_hits             == 0
+        assert len(response.results)           == 3
+        assert '<p>xxxxx xxxxxxx</p>'          in response.results[0].transformed_html
+        assert '<p>xxxxxx xxxxx</p>'           in response.results[1].transformed_html
+        assert '<nav>xxxx xxxx xxxxx</nav>'    in response.results[1].transformed_html
+        assert response.results[2].transformed_html == PAGE__ARTICLE_1               # OFF is a passthrough
+        assert response.results[0].transformation_mode == Enum__HTML__Transformation_Mode.XXX
+
+    def test_transform_html_batch__modes(self):                                     # one semantic-text call per mode (the mode decides the filters)
+        request  = self.batch_request(("https://example.com/article-1", PAGE__ARTICLE_1, Enum__HTML__Transformation_Mode.XXX   ),
+                                      ("https://example.com/article-1", PAGE__ARTICLE_1, Enum__HTML__Transformation_Mode.HASHES))
+        response = self.batch_service.transform_html_batch(request)
+        assert self.requests == [3, 3]
+        assert 'xxxxx xxxxxxx' in     response.results[0].transformed_html
+        assert 'xxxxx xxxxxxx' not in response.results[1].transformed_html
+
+    def test_transform_html_batch__error(self):                                     # a failing step 2 returns the original html for that mode's pages
+        self.batch_service.html_transformation_service.semantic_text_client = Semantic_Text__Service__Client__Counter()
+        with Temp_Env_Vars(env_vars={'AUTH__TARGET_SERVER__SEMANTIC_TEXT_SERVICE__BASE_URL': ''}):
+            request  = self.batch_request(("https://example.com/article-1", PAGE__ARTICLE_1, Enum__HTML__Transformation_Mode.XXX))
+            response = self.batch_service.transform_html_batch(request)
+        assert response.transformed_pages           == 0
+        assert response.results[0].transformed_html == PAGE__ARTICLE_1
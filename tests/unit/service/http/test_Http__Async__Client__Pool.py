@@ -0,0 +1,70 @@
+import asyncio
+import httpx
+import pytest
+from unittest                                                               import TestCase
+from osbot_utils.type_safe.Type_Safe                                        import Type_Safe
+from osbot_utils.utils.Objects                                              import base_classes
+from mgraph_ai_service_mitmproxy.service.http.Http__Async__Client__Pool     import Http__Async__Client__Pool, http_async_client_pool
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                      import get__html_service__fast_api_server
+
+
+class test_Http__Async__Client__Pool(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__html_service__fast_api_server() as _:
+            cls.fast_api_server = _.fast_api_server
+            cls.server_url      = str(_.server_url)
+        cls.fast_api_server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.fast_api_server.stop()
+
+    def test__init__(self):
+        with Http__Async__Client__Pool() as _:
+            assert type(_)          is Http__Async__Client__Pool
+            assert base_classes(_)  == [Type_Safe, object]
+            assert _.async_client   is None
+            assert _.stats()        == dict(max_connections = 200, max_keepalive_connections = 20, max_retries  = 2,
+                                            clients_created = 0  , requests_total            = 0 , errors_total = 0,
+                                            in_flight       = 0  , in_flight_peak            = 0 )
+        assert type(http_async_client_pool) is Http__Async__Client__Pool
+
+    def test_get__concurrent_requests(self):
+        async def run(pool):
+            urls      = [f'{self.server_url}/info/health'] * 5
+            responses = await asyncio.gather(*[pool.get(url, timeout=5) for url in urls])
+            client    = pool.client()
+            await pool.close()
+            return responses, client
+
+        with Http__Async__Client__Pool() as _:
+            responses, client = asyncio.run(run(_))
+            assert [response.status_code for response in responses] == [200] * 5
+            assert type(client)       is httpx.AsyncClient
+            assert client.is_closed   is True
+            assert _.requests_total   == 5
+            assert _.in_flight        == 0
+            assert _.in_flight_peak   == 5                                              # all 5 requests were in flight at the same time
+            assert _.clients_created  == 1
+
+    def test_client__new_event_loop(self):                                              # clients are bound to their event loop
+        async def get_client(pool):
+            return pool.client()
+
+        with Http__Async__Client__Pool() as _:
+            client_1 = asyncio.run(get_client(_))
+            client_2 = asyncio.run(get_client(_))
+            assert client_1          is not client_2
+            assert _.clients_created == 2
+
+    def test_post__errors_are_counted(self):
+        async def run(pool):
+            await pool.post('http://localhost:1/not-listening', json={}, timeout=1)
+
+        with Http__Async__Client__Pool(max_retries=0) as _:
+            with pytest.raises(httpx.ConnectError):
+                asyncio.run(run(_))
+            assert _.errors_total == 1
+            assert _.in_flight    == 0
@@ -0,0 +1,58 @@
+import pytest
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker                import Http__Circuit__Breaker, Http__Circuit__Open__Error
+from mgraph_ai_service_mitmproxy.service.http.schemas.Enum__Circuit_Breaker__State  import Enum__Circuit_Breaker__State
+
+
+class test_Http__Circuit__Breaker(TestCase):
+
+    def setUp(self):
+        self.breaker = Http__Circuit__Breaker(name='https://semantic-text.example.com', min_calls=4, open_seconds=30)
+
+    def fail(self):
+        raise ConnectionError('backend down')
+
+    def test__init__(self):
+        with Http__Circuit__Breaker() as _:
+            assert _.state     == Enum__Circuit_Breaker__State.CLOSED
+            assert _.enabled() is True
+            assert _.stats()   == dict(state='closed', failure_rate=0.0, calls=0, times_opened=0, rejected=0)
+
+    def test_call__opens_on_failure_rate(self):
+        with self.breaker as _:
+            assert _.call(lambda: 'ok') == 'ok'
+            for i in range(2):
+                with pytest.raises(ConnectionError):
+                    _.call(self.fail)
+            assert _.state == Enum__Circuit_Breaker__State.CLOSED                   # 2 of 3: not enough calls yet
+            with pytest.raises(ConnectionError):
+                _.call(self.fail)
+            assert _.state == Enum__Circuit_Breaker__State.OPEN                     # 3 of 4 failed (>= 50%)
+
+            with pytest.raises(Http__Circuit__Open__Error, match='circuit breaker open for https://semantic-text.example.com'):
+                _.call(lambda: 'not called')                                        # fails fast (no call to the backend)
+            assert _.stats() == dict(state='open', failure_rate=0.75, calls=4, times_opened=1, rejected=1)
+
+    def test_allow__half_open_probe(self):
+        with self.breaker as _:
+            for i in range(4):
+                _.record_failure()
+            assert _.allow() is False
+            _.opened_at -= 31                                                       # open_seconds have passed
+            assert _.allow() is True                                                # one probe goes through ...
+            assert _.state   == Enum__Circuit_Breaker__State.HALF_OPEN
+            assert _.allow() is False                                               # ... the others keep failing fast
+            _.record_failure()                                                      # probe failed: open again
+            assert _.state   == Enum__Circuit_Breaker__State.OPEN
+            assert _.times_opened == 2
+
+            _.opened_at -= 31
+            assert _.allow() is True
+            _.record_success()                                                      # probe worked: closed, with a clean window
+            assert _.state   == Enum__Circuit_Breaker__State.CLOSED
+            assert _.stats() == dict(state='closed', failure_rate=0.0, calls=1, times_opened=2, rejected=2)
+
+    def test__disabled(self):
+        with Http__Circuit__Breaker(failure_rate=0, min_calls=1) as _:
+            _.record_failure()
+            assert _.allow() is True
@@ -0,0 +1,41 @@
+import pytest
+import requests
+from unittest                                                                       import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                              import Temp_Env_Vars
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                        import ENV_VAR__CIRCUIT_BREAKER__FAILURE_RATE, ENV_VAR__CIRCUIT_BREAKER__OPEN_SECONDS
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker                import Http__Circuit__Open__Error
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breakers               import Http__Circuit__Breakers, circuit_breakers
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool                   import Http__Session__Pool
+
+
+class test_Http__Circuit__Breakers(TestCase):
+
+    def test_setup(self):
+        with Temp_Env_Vars(env_vars={ENV_VAR__CIRCUIT_BREAKER__FAILURE_RATE: '0.8', ENV_VAR__CIRCUIT_BREAKER__OPEN_SECONDS: '5'}):
+            with Http__Circuit__Breakers().setup() as _:
+                assert _.failure_rate == 0.8
+                assert _.breaker('https://html.example.com').open_seconds == 5
+        assert type(circuit_breakers) is Http__Circuit__Breakers
+
+    def test_breaker(self):
+        with Http__Circuit__Breakers() as _:
+            breaker = _.breaker('https://html.example.com')
+            assert _.breaker('https://html.example.com') is breaker                # one breaker per backend
+            breaker.state = breaker.state.OPEN
+            assert _.stats()['https://html.example.com']['state'] == 'open'
+            _.reset()
+            assert _.stats()['https://html.example.com']['state'] == 'closed'
+
+    def test__session_pool__fails_fast(self):                                       # after enough failures the pool stops calling an unreachable backend
+        host = 'http://127.0.0.1:1'                                                 # (its own breaker: other tests use localhost:1)
+        with Http__Session__Pool(max_retries=0) as pool:
+            for i in range(5):
+                with pytest.raises(requests.exceptions.ConnectionError):
+                    pool.post(f'{host}/not-listening', json={}, timeout=1)
+            with pytest.raises(Http__Circuit__Open__Error):
+                pool.post(f'{host}/not-listening', json={}, timeout=1)
+            assert isinstance(Http__Circuit__Open__Error(), requests.RequestException)     # so the clients handle it like any other request error
+            assert pool.host_requests[host]                  == 5                   # the rejected call never reached the backend
+            assert circuit_breakers.stats()[host]['state']   == 'open'
+            pool.close()
+        circuit_breakers.breaker(host).reset()
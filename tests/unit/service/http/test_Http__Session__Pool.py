@@ -0,0 +1,95 @@
+import pytest
+import requests
+from unittest                                                               import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                      import Temp_Env_Vars
+from osbot_utils.type_safe.Type_Safe                                        import Type_Safe
+from osbot_utils.utils.Objects                                              import base_classes
+from requests.adapters                                                      import HTTPAdapter
+from mgraph_ai_service_mitmproxy.service.consts.consts__http                import ENV_VAR__HTTP_POOL__POOL_MAXSIZE, ENV_VAR__HTTP_POOL__MAX_RETRIES, ENV_VAR__HTTP_POOL__BACKOFF_FACTOR
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool           import Http__Session__Pool, http_session_pool, http_session_pool__paid
+from tests.unit.Mitmproxy_Service__Fast_API__Test_Objs                      import get__html_service__fast_api_server
+
+
+class test_Http__Session__Pool(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with get__html_service__fast_api_server() as _:
+            cls.fast_api_server = _.fast_api_server
+            cls.server_url      = str(_.server_url)
+        cls.fast_api_server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.fast_api_server.stop()
+
+    def test__init__(self):
+        with Http__Session__Pool() as _:
+            assert type(_)          is Http__Session__Pool
+            assert base_classes(_)  == [Type_Safe, object]
+            assert _.pool_maxsize   == 20
+            assert _.max_retries    == 2
+            assert _.sessions       == {}
+            assert _.stats()        == dict(pool_connections = 10  , pool_maxsize     = 20   , max_retries    = 2 ,
+                                            backoff_factor   = 0.2 , retry_on_status  = True , sessions_created = 0 ,
+                                            requests_total   = 0   , errors_total     = 0    , hosts            = {})
+        assert type(http_session_pool)             is Http__Session__Pool
+        assert http_session_pool      .retry_on_status is True
+        assert http_session_pool__paid.retry_on_status is False
+
+    def test_setup(self):
+        env_vars = { ENV_VAR__HTTP_POOL__POOL_MAXSIZE   : '50' ,
+                     ENV_VAR__HTTP_POOL__MAX_RETRIES    : '0'  ,
+                     ENV_VAR__HTTP_POOL__BACKOFF_FACTOR : '1.5'}
+        with Temp_Env_Vars(env_vars=env_vars):
+            with Http__Session__Pool().setup() as _:
+                assert _.pool_maxsize   == 50
+                assert _.max_retries    == 0
+                assert _.backoff_factor == 1.5
+
+    def test_session(self):
+        with Http__Session__Pool() as _:
+            session_1 = _.session('https://html.dev.mgraph.ai/html/to/dict/hashes')
+            session_2 = _.session('https://html.dev.mgraph.ai/hashes/to/html'     )
+            session_3 = _.session('https://cache.dev.mgraph.ai/info/health'       )
+            assert session_1            is session_2                                # one session per host
+            assert session_1            is not session_3
+            assert _.sessions_created   == 2
+            assert list(_.sessions)     == ['https://html.dev.mgraph.ai', 'https://cache.dev.mgraph.ai']
+
+            adapter = session_1.get_adapter('https://html.dev.mgraph.ai/')
+            assert type(adapter)                        is HTTPAdapter
+            assert adapter._pool_maxsize                == 20
+            assert adapter.max_retries.connect          == 2
+            assert adapter.max_retries.read             == 0
+            assert 'POST' not in adapter.max_retries.allowed_methods                 # no status retries for (non-idempotent) POSTs
+            _.close()
+            assert _.sessions == {}
+
+    def test_retry_policy__no_retry_on_status(self):                                # paid backends: connect errors are retried, 5xx responses never are
+        with Http__Session__Pool(retry_on_status=False) as _:
+            retry = _.retry_policy()
+            assert retry.connect          == 2
+            assert retry.status           == 0
+            assert retry.status_forcelist == set()
+
+    def test_get__reuses_connections(self):
+        with Http__Session__Pool() as _:
+            for i in range(3):
+                response = _.get(f'{self.server_url}/info/health', timeout=5)
+                assert response.status_code == 200
+            stats = _.stats()
+            assert stats['requests_total'] == 3
+            assert stats['hosts'][self.server_url] == dict(requests           = 3 ,
+                                                           errors             = 0 ,
+                                                           connections_opened = 1 ,  # keep-alive: a single TCP connection
+                                                           connections_reused = 2 )
+            _.close()
+
+    def test_post__errors_are_counted(self):
+        with Http__Session__Pool(max_retries=0) as _:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                _.post('http://localhost:1/not-listening', json={}, timeout=1)
+            assert _.errors_total                          == 1
+            assert _.host_errors['http://localhost:1']     == 1
+            _.close()
@@ -6,6 +6,8 @@ from mgraph_ai_service_mitmproxy.service.proxy.request.Proxy__Request__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Stats__Service            import Proxy__Stats__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Content__Service          import Proxy__Content__Service
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service           import Proxy__Cookie__Service
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__ETag__Service             import Proxy__ETag__Service
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode   import Enum__HTML__Transformation_Mode
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Request_Data      import Schema__Proxy__Request_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications     import Schema__Proxy__Modifications
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Stats             import Schema__Proxy__Stats
@@ -64,6 +66,7 @@ class test_Proxy__Request__Service(TestCase):
             assert type(_.stats_service)   is Proxy__Stats__Service
             assert type(_.content_service) is Proxy__Content__Service
             assert type(_.cookie_service)  is Proxy__Cookie__Service
+            assert type(_.etag_service)    is Proxy__ETag__Service
 
     def test_process_request(self):                                                           # Test basic request processing
         with self.service as _:
@@ -318,4 +321,32 @@ class test_Proxy__Request__Service(TestCase):
             assert type(modifications.headers_to_add)    is Type_Safe__Dict
             assert type(modifications.headers_to_remove) is Type_Safe__List
             assert type(modifications.block_request)     is bool
-            assert modifications.cached_response         == {}                                 # No cached response by default
\ No newline at end of file
+            assert modifications.cached_response         == {}                                 # No cached response by default
+    def test_process_request__not_modified(self):                                              # If-None-Match with the etag of the page's cached transformation: 304, without going upstream
+        etag_service = Proxy__ETag__Service()
+        service      = Proxy__Request__Service(stats_service = self.stats_service,
+                                               etag_service  = etag_service      ).setup()
+        etag         = etag_service.etag('abc123', Enum__HTML__Transformation_Mode.XXX)
+        request_data = Schema__Proxy__Request_Data(method  = 'GET'                                               ,
+                                                   host    = 'example.com'                                       ,
+                                                   path    = '/page'                                             ,
+                                                   headers = {'cookie': 'mitm-mode=xxx', 'If-None-Match': etag}  ,
+                                                   version = 'v1.0.0'                                            )
+        assert service.process_request(request_data).cached_response == {}                      # no etag sent for this page yet
+
+        etag_service.remember('example.com', '/page', Enum__HTML__Transformation_Mode.XXX, etag, fresh_seconds=60)
+        modifications = service.process_request(request_data)
+        assert modifications.cached_response == { 'status_code': 304,
+                                                  'body'       : '' ,
+                                                  'headers'    : { 'etag'                   : etag   ,
+                                                                   'x-mgraph-proxy'         : 'v1.0' ,
+                                                                   'x-proxy-transformation' : 'xxx'  ,
+                                                                   'x-proxy-not-modified'   : 'true' }}
+        assert self.stats_service.get_stats()['not_modified'] == 1
+
+        request_data.headers['cookie'] = 'mitm-mode=hashes'                                     # another mode is another body
+        assert service.process_request(request_data).cached_response == {}
+        request_data.headers['cookie'] = 'mitm-mode=xxx'
+        request_data.method            = 'POST'
+        assert service.process_request(request_data).cached_response == {}
+        assert self.stats_service.get_stats()['not_modified'] == 1
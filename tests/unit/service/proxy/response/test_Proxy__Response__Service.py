@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest                                                                       import TestCase
 from osbot_utils.utils.Misc                                                         import list_set
@@ -13,6 +14,37 @@ from mgraph_ai_service_mitmproxy.service.wcf.Proxy__WCF__Service
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data         import Schema__Proxy__Response_Data
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Response__Processing_Result  import Schema__Response__Processing_Result
 from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Stats                 import Schema__Proxy__Stats
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation__Pipeline  import Enum__HTML__Transformation__Pipeline
+from mgraph_ai_service_mitmproxy.service.html.HTML__Transformation__Service         import HTML__Transformation__Service
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Cache__Service                import Proxy__Cache__Service
+from mgraph_ai_service_mitmproxy.schemas.html.Schema__HTML__Transformation__Result  import Schema__HTML__Transformation__Result
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import HEADER__PROXY__BUDGET_EXCEEDED
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                      import Proxy__Deadline
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__ETag__Service                 import Proxy__ETag__Service
+from mgraph_ai_service_mitmproxy.service.http.Http__Circuit__Breaker                import Http__Circuit__Open__Error
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+
+
+class HTML__Transformation__Service__Slow(HTML__Transformation__Service):           # local pipeline that takes 1s per page
+    def _pipeline_result(self, source_html, mode, deadline=None):
+        time.sleep(1)
+        return super()._pipeline_result(source_html, mode)
+
+
+class HTML__Transformation__Service__Cached(HTML__Transformation__Service):         # reports an enabled cache (etag_headers only needs its content hash and ttl)
+    def cache_enabled(self):
+        return True
+
+    def content_hash(self, source_html):
+        return 'abc123'
+
+    def transformation_ttl_seconds(self, mode):
+        return 60
+
+
+class HTML__Transformation__Service__Failing(HTML__Transformation__Service__Cached):  # every transformation fails (as it does while a backend's circuit breaker is open)
+    def _pipeline_result(self, source_html, mode, deadline=None):
+        raise Http__Circuit__Open__Error('circuit breaker open for semantic-text')
 
 
 class test_Proxy__Response__Service(TestCase):
@@ -65,6 +97,7 @@ class test_Proxy__Response__Service(TestCase):
             assert type(_.stats_service)   is Proxy__Stats__Service
             assert type(_.headers_service) is Proxy__Headers__Service
             assert type(_.cookie_service)  is Proxy__Cookie__Service
+            assert type(_.etag_service)    is Proxy__ETag__Service
 
     def test_generate_request_id(self):                                                       # Test request ID generation
         with self.service as _:
@@ -302,4 +335,117 @@ class test_Proxy__Response__Service(TestCase):
             assert 'x-processed-at' in result.final_headers
             timestamp = result.final_headers['x-processed-at']
             assert 'T' in timestamp                                                            # ISO format
-            assert timestamp.endswith('Z')                                                     # UTC indicator
\ No newline at end of file
+            assert timestamp.endswith('Z')                                                     # UTC indicator
+
+    def test_process_response__budget_exceeded(self):                                         # the original html is served when the transformation doesn't fit in the budget
+        service       = Proxy__Response__Service(stats_service               = self.stats_service                                                        ,
+                                                 debug_service               = self.debug_service                                                        ,
+                                                 html_transformation_service = HTML__Transformation__Service__Slow(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL))
+        source_html   = '<html><body><p>Slow page</p></body></html>'
+        response_data = Schema__Proxy__Response_Data(request   = {'method': 'GET', 'host': 'example.com', 'path': '/slow', 'headers': {'cookie': 'mitm-mode=hashes-random'}},
+                                                     response  = {'status_code': 200, 'content_type': 'text/html', 'body': source_html, 'headers': {'content-type': 'text/html'}},
+                                                     version   = 'v1.0.0',
+                                                     budget_ms = 300     )
+        start_time = time.monotonic()
+        result     = service.process_response(response_data)
+        assert time.monotonic() - start_time                        < 0.8
+        assert result.final_body                                    == source_html
+        assert result.final_headers[HEADER__PROXY__BUDGET_EXCEEDED] == 'transformation'
+        assert self.stats_service.get_stats()['budget_exceeded']    == 1
+
+        response_data.budget_ms = 0                                                             # no budget: waits for the transformation
+        result = service.process_response(response_data)
+        assert result.final_body                                    != source_html
+        assert HEADER__PROXY__BUDGET_EXCEEDED                       not in result.final_headers
+        assert self.stats_service.get_stats()['budget_exceeded']    == 1
+
+    def test_process_response__headers_only(self):                                            # no debug commands or transformations when no cookie can change the body
+        with self.service as _:
+            result = _.process_response(self.test_response_basic)
+            assert result.processing_error                       is None
+            assert result.content_was_modified                   is False
+            assert result.final_headers['content-length']        == '13'
+            assert self.stats_service.get_stats()['headers_only'] == 1
+
+            response_data = Schema__Proxy__Response_Data(request      = {'method': 'GET', 'host': 'example.com', 'path': '/test', 'headers': {'cookie': 'mitm-mode=xxx'}},
+                                                         response     = {'status_code': 200, 'content_type': 'text/html', 'headers': {'content-type': 'text/html', 'content-length': '1234'}},
+                                                         version      = 'v1.0.0',
+                                                         body_omitted = True    )
+            result = _.process_response(response_data)                                          # (this service has no html_transformation_service, so a transformation would fail)
+            assert result.processing_error                       is None
+            assert result.final_body                             == ''
+            assert result.final_headers['content-length']        == '1234'                      # upstream content headers are kept
+            assert result.modifications.modified_body            is None
+            assert self.stats_service.get_stats()['headers_only'] == 2
+
+            result = _.process_response(self.test_response_with_cookies)                        # mitm-show still gets the body
+            assert result.response_overridden                    is True
+            assert self.stats_service.get_stats()['headers_only'] == 2
+
+    def test_etag_headers(self):                                                              # strong etag of (source content hash, mode), remembered for the request phase
+        etag_service  = Proxy__ETag__Service()
+        service       = Proxy__Response__Service(etag_service                = etag_service                                                               ,
+                                                 html_transformation_service = HTML__Transformation__Service__Cached(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL))
+        mode          = Enum__HTML__Transformation_Mode.XXX
+        source_html   = '<html><body><p>Page</p></body></html>'
+        response_data = Schema__Proxy__Response_Data(request  = {'method': 'GET', 'host': 'example.com', 'path': '/page', 'headers': {'cookie': 'mitm-mode=xxx'}},
+                                                     response = {'status_code': 200, 'content_type': 'text/html', 'body': source_html, 'headers': {'content-type': 'text/html', 'cache-control': 'max-age=30'}},
+                                                     version  = 'v1.0.0')
+        result        = Schema__HTML__Transformation__Result(transformed_html='<html><body><p>xxxx</p></body></html>', transformation_mode=mode, success=True)
+
+        assert service.etag_headers(response_data, mode, source_html, result, Proxy__Deadline()) == {'etag': '"abc123-xxx"'}
+        assert etag_service.current_etag('example.com', '/page', mode)                            == '"abc123-xxx"'
+        assert 29 <= etag_service.entries[('example.com/page', 'xxx')][1] - time.monotonic() <= 30  # upstream's max-age (below the transformation's ttl)
+
+        response_data.response['headers']['cache-control'] = 'no-cache'                          # upstream wants to be asked every time: the etag is sent, but never answered with 304 without going upstream
+        assert service.etag_headers(response_data, mode, source_html, result, Proxy__Deadline()) == {'etag': '"abc123-xxx"'}
+        assert etag_service.current_etag('example.com', '/page', mode)                            is None
+        response_data.response['headers']['cache-control'] = 'max-age=30'
+
+        result.success                = False                                                   # the original html was served (passthrough, error or pending)
+        assert service.etag_headers(response_data, mode, source_html, result, Proxy__Deadline()) == {}
+        result.success                = True
+        etag_service.enabled          = False
+        assert service.etag_headers(response_data, mode, source_html, result, Proxy__Deadline()) == {}
+        etag_service.enabled          = True
+
+        service.html_transformation_service = HTML__Transformation__Service(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL)   # no cache: the body isn't guaranteed to be the same next time
+        assert service.etag_headers(response_data, mode, source_html, result, Proxy__Deadline()) == {}
+        assert etag_service.etags_issued == 2
+
+    def test_process_response__etag(self):                                                    # a successful transformation is sent with its etag (and the next request with it gets a 304)
+        etag_service  = Proxy__ETag__Service()
+        service       = Proxy__Response__Service(stats_service               = self.stats_service                                                         ,
+                                                 debug_service               = self.debug_service                                                         ,
+                                                 etag_service                = etag_service                                                               ,
+                                                 html_transformation_service = HTML__Transformation__Service__Cached(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL, cache_service=Proxy__Cache__Service()))   # (default cache config: lookups and stores are no-ops)
+        response_data = Schema__Proxy__Response_Data(request  = {'method': 'GET', 'host': 'example.com', 'path': '/ok', 'headers': {'cookie': 'mitm-mode=hashes-random', 'accept-encoding': 'gzip'}},
+                                                     response = {'status_code': 200, 'content_type': 'text/html', 'body': '<html><body><p>Page</p></body></html>' * 100, 'headers': {'content-type': 'text/html', 'cache-control': 'public, max-age=60'}},
+                                                     version  = 'v1.0.0')
+        result = service.process_response(response_data)
+        assert result.content_was_modified    is True
+        assert result.final_headers['etag']   == '"abc123-hashes-random"'
+        assert etag_service.check_not_modified('example.com', '/ok', Enum__HTML__Transformation_Mode.HASHES_RANDOM, '"abc123-hashes-random"') == '"abc123-hashes-random"'
+
+        body, encoding = service.compress_response(response_data, result)                      # (frame transport) the gzip body is a different representation, with its own etag
+        assert encoding                       == 'gzip'
+        assert result.final_headers['etag']   == '"abc123-hashes-random+gzip"'
+        assert etag_service.check_not_modified('example.com', '/ok', Enum__HTML__Transformation_Mode.HASHES_RANDOM, '"abc123-hashes-random+gzip"') == '"abc123-hashes-random+gzip"'
+
+    def test_process_response__etag__transformation_error(self):                              # error and negative-cache passthroughs carry the original html: no etag, and no 304 later
+        etag_service  = Proxy__ETag__Service()
+        service       = Proxy__Response__Service(stats_service               = self.stats_service                                                          ,
+                                                 debug_service               = self.debug_service                                                          ,
+                                                 etag_service                = etag_service                                                                ,
+                                                 html_transformation_service = HTML__Transformation__Service__Failing(pipeline=Enum__HTML__Transformation__Pipeline.LOCAL, cache_service=Proxy__Cache__Service()))
+        source_html   = '<html><body><p>Page</p></body></html>'
+        response_data = Schema__Proxy__Response_Data(request  = {'method': 'GET', 'host': 'example.com', 'path': '/broken', 'headers': {'cookie': 'mitm-mode=hashes-random'}},
+                                                     response = {'status_code': 200, 'content_type': 'text/html', 'body': source_html, 'headers': {'content-type': 'text/html'}},
+                                                     version  = 'v1.0.0')
+        for _ in range(2):                                                                      # 1st: error result (breaker open), 2nd: negative cache passthrough
+            result = service.process_response(response_data)
+            assert result.final_body          == source_html
+            assert 'etag'                     not in result.final_headers
+            assert etag_service.check_not_modified('example.com', '/broken', Enum__HTML__Transformation_Mode.HASHES_RANDOM, '"abc123-hashes-random"') is None
+        assert service.html_transformation_service.negative_cache.short_circuits == 1
+        assert etag_service.etags_issued                                        == 0
@@ -475,6 +475,7 @@ class test_Proxy__Response__Service__using_html_service(TestCase):
             result = _.process_response(response_data)
 
             assert result.content_was_modified is True
+            _.html_transformation_service.original_html_uploads.wait(timeout=10)       # the original html is uploaded in the background
 
             # Verify original HTML can be retrieved from cache
             target_url = 'https://example.com/provenance-test'
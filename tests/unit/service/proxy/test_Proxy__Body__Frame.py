@@ -0,0 +1,65 @@
+from unittest                                                                        import TestCase
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from osbot_utils.utils.Objects                                                       import base_classes
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Modifications          import Schema__Proxy__Modifications
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Response_Data          import Schema__Proxy__Response_Data
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Body__Frame                    import Proxy__Body__Frame
+
+
+class test_Proxy__Body__Frame(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.body_frame = Proxy__Body__Frame()
+
+    def test__init__(self):
+        with Proxy__Body__Frame() as _:
+            assert type(_)         is Proxy__Body__Frame
+            assert base_classes(_) == [Type_Safe, object]
+
+    def test_encode__decode(self):
+        metadata = {'response': {'status_code': 200}}
+        body     = '<html><body>"quotes", \\backslashes\\ and ünicode</body></html>'.encode('utf-8')
+        frame    = self.body_frame.encode(metadata, body)
+
+        assert frame[:4]                   == len(b'{"response": {"status_code": 200}}').to_bytes(4, 'big')
+        assert frame.endswith(body)                                                 # body is appended as is (no escaping)
+        assert self.body_frame.decode(frame) == (metadata, body)
+        assert self.body_frame.decode(self.body_frame.encode({}, b'')) == ({}, b'')
+
+    def test_decode__invalid_frames(self):
+        with self.assertRaises(ValueError):
+            self.body_frame.decode(b'ab')
+        with self.assertRaises(ValueError):
+            self.body_frame.decode((1000).to_bytes(4, 'big') + b'{}')
+
+    def test_decode__response_data(self):
+        metadata      = {'request' : {'url': 'https://example.com/'}                                    ,
+                         'response': {'status_code': 200, 'headers': {'content-type': 'text/html'}}     ,
+                         'version' : 'v0.3.0'                                                           }
+        frame         = self.body_frame.encode(metadata, 'café <b>bold</b>'.encode('utf-8') + b'\xff')
+        response_data = self.body_frame.decode__response_data(frame)
+
+        assert type(response_data)                     is Schema__Proxy__Response_Data
+        assert response_data.request ['url'         ] == 'https://example.com/'
+        assert response_data.response['body'        ] == 'café <b>bold</b>'             # invalid utf-8 dropped (same as the json transport)
+        assert response_data.response['body_size'   ] == 16
+        assert response_data.response['status_code' ] == 200
+
+    def test_encode__modifications(self):
+        modifications = Schema__Proxy__Modifications(modified_body='<p>new "body"</p>', headers_to_add={'x-a': 'b'})
+        metadata, body = self.body_frame.decode(self.body_frame.encode__modifications(modifications))
+
+        assert body                       == b'<p>new "body"</p>'
+        assert 'modified_body'            not in metadata
+        assert metadata['headers_to_add'] == {'x-a': 'b'}
+
+        metadata, body = self.body_frame.decode(self.body_frame.encode__modifications(Schema__Proxy__Modifications()))
+        assert body == b''
+
+    def test_encode__modifications__encoded_body(self):                                 # a compressed body replaces modified_body's utf-8 bytes
+        modifications  = Schema__Proxy__Modifications(modified_body='<p>new body</p>')
+        metadata, body = self.body_frame.decode(self.body_frame.encode__modifications(modifications, b'\x1f\x8b...', 'gzip'))
+        assert body                               == b'\x1f\x8b...'
+        assert metadata['modified_body_encoding'] == 'gzip'
+        assert 'modified_body'                    not in metadata
@@ -3,6 +3,8 @@ from osbot_utils.testing.__
 from osbot_utils.utils.Objects                                                      import base_classes
 from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service               import Proxy__Cookie__Service
 from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Command_Type              import Enum__WCF__Command_Type
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Cookie__Context       import Schema__Proxy__Cookie__Context
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
 
 
 class test_Proxy__Cookie__Service(TestCase):
@@ -41,7 +43,34 @@ class test_Proxy__Cookie__Service(TestCase):
                                  COOKIE_DEBUG   = 'mitm-debug'        ,
                                  COOKIE_RATING  = 'mitm-rating'       ,
                                  COOKIE_MODEL   = 'mitm-model'        ,
-                                 COOKIE_CACHE   = 'mitm-cache'        )
+                                 COOKIE_CACHE   = 'mitm-cache'        ,
+                                 COOKIE_MODE    = 'mitm-mode'         ,
+                                 BODY_COOKIES   = ('mitm-show', 'mitm-inject', 'mitm-replace', 'mitm-debug', 'mitm-mode'),
+                                 BODY_OFF_VALUES= ('', 'off', 'false', '0', 'no'))
+
+    def test_context_modifies_body(self):                                                     # only these cookies can change the response body
+        def modifies_body(cookie_header):
+            return self.cookie_service.context_modifies_body(self.cookie_service.cookie_context({'cookie': cookie_header}))
+
+        assert modifies_body(''                                  ) is False
+        assert modifies_body('session=abc; mitm-cache=true'      ) is False
+        assert modifies_body('mitm-rating=0.5; mitm-model=gpt'   ) is False
+        assert modifies_body('mitm-mode=off; mitm-debug=false'   ) is False
+        assert modifies_body('mitm-show=off'                     ) is False       # same off values as the interceptor (which doesn't send the body for these)
+        assert modifies_body('mitm-show=OFF; mitm-inject=no'     ) is False
+        assert modifies_body('mitm-replace=0; mitm-debug=false'  ) is False
+        assert modifies_body('mitm-mode=xxx'                     ) is True
+        assert modifies_body('mitm-debug=true'                   ) is True
+        assert modifies_body('mitm-show=url-to-html'             ) is True
+        assert modifies_body('mitm-inject=debug-banner'          ) is True
+        assert modifies_body('mitm-replace=old:new'              ) is True
+
+    def test_body_cookie_is_on(self):
+        with self.cookie_service as _:
+            for value in _.BODY_OFF_VALUES + (None, ' Off ', 'FALSE'):
+                assert _.body_cookie_is_on(value) is False
+            for value in ('url-to-html', 'xxx', 'true', '1'):
+                assert _.body_cookie_is_on(value) is True
 
     def test_parse_cookies(self):                                                             # Test basic cookie parsing
         with self.cookie_service as _:
@@ -482,3 +511,35 @@ class test_Proxy__Cookie__Service(TestCase):
             assert len(proxy) == 7                                                             # Only proxy cookies
             assert 'session' not in proxy
             assert 'user' not in proxy
+
+    def test_cookie_context(self):                                                             # Test single-pass parsed context
+        context = self.cookie_service.cookie_context(self.test_headers_full)
+        assert type(context)            is Schema__Proxy__Cookie__Context
+        assert context.show_command     == 'url-to-html-xxx'
+        assert context.inject_command   == 'debug-panel'
+        assert context.replace_command  == 'Hello:Hi'
+        assert context.rating           == 0.5
+        assert context.model_override   == 'gpt-4'
+        assert context.debug_enabled    is True
+        assert context.cache_enabled    is True
+        assert context.is_wcf_command   is True
+        assert context.mitm_mode        == Enum__HTML__Transformation_Mode.OFF
+        assert len(context.proxy_cookies) == 7
+
+        assert self.cookie_service.cookie_context(self.test_headers_empty).cookies == {}
+        assert self.cookie_service.cookie_context({'cookie': 'mitm-mode=xxx'}).mitm_mode == Enum__HTML__Transformation_Mode.XXX
+
+    def test_cookie_context__per_call(self):                                                   # Each call builds its own context (nothing is kept, or shared, across requests)
+        context_1 = self.cookie_service  .cookie_context({'cookie': 'mitm-show=url-to-html; a=1'})
+        context_2 = Proxy__Cookie__Service().cookie_context({'Cookie': 'mitm-show=url-to-html; a=1'})
+        assert context_1       is not context_2
+        assert context_1.json() == context_2.json()
+        assert hasattr(Proxy__Cookie__Service, 'cookie_context_for_header') is False
+
+    def test_split_cookie_header(self):                                                        # Test fast path and json/quote aware path
+        split = self.cookie_service.split_cookie_header
+        assert split('a=1; b=2,c=3;;  ')                      == ['a=1', 'b=2', 'c=3']
+        assert split('a={"x":1;"y":2}; b=2')                  == ['a={"x":1;"y":2}', 'b=2']
+        assert split(r'a="one; two", b=\;c')                 == ['a="one; two"', r'b=\;c']
+        assert split('a=}{; b=2')                             == ['a=}{; b=2']                    # unbalanced braces keep the rest as one token
+        assert split('')                                      == []
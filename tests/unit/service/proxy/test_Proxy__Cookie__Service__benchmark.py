@@ -0,0 +1,53 @@
+import time
+from unittest                                                                        import TestCase
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Cookie__Service                import Proxy__Cookie__Service
+
+BENCHMARK__COOKIE_HEADER__SIZE = 4 * 1024                                            # typical worst case for real sites (analytics + session cookies)
+BENCHMARK__ITERATIONS          = 50
+
+
+def cookie_header__4kb(with_json=False):                                             # mitm-* cookies mixed with lots of tracking cookies
+    cookies = ['mitm-mode=xxx', 'mitm-show=url-to-html', 'mitm-debug=true']
+    index   = 0
+    while len('; '.join(cookies)) < BENCHMARK__COOKIE_HEADER__SIZE:
+        value = f'{{"id":{index},"tags":["a","b"],"note":"x;y"}}' if with_json and index % 5 == 0 else f'GA1.2.{index}.1700000000'
+        cookies.append(f'_tracking_{index}={value}')
+        index += 1
+    return '; '.join(cookies)[:BENCHMARK__COOKIE_HEADER__SIZE]
+
+
+class test_Proxy__Cookie__Service__benchmark(TestCase):                               # Micro-benchmark: 4KB Cookie headers
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cookie_service = Proxy__Cookie__Service()
+
+    def duration_ms(self, target, *args):                                            # average ms per call
+        start = time.perf_counter()
+        for _ in range(BENCHMARK__ITERATIONS):
+            target(*args)
+        return (time.perf_counter() - start) * 1000 / BENCHMARK__ITERATIONS
+
+    def test_split_cookie_header__4kb(self):
+        for with_json in (False, True):
+            cookie_header = cookie_header__4kb(with_json=with_json)
+            assert len(cookie_header) == BENCHMARK__COOKIE_HEADER__SIZE
+            duration_ms   = self.duration_ms(self.cookie_service.split_cookie_header, cookie_header)
+            print(f"split_cookie_header  (4KB, json={with_json!s:5}): {duration_ms:.3f} ms")
+            assert duration_ms < 5                                                   # tokenizer alone should be well under a millisecond
+
+    def test_cookie_context__4kb(self):                                              # one parse per request vs the context helpers its steps call
+        cookie_header = cookie_header__4kb(with_json=True)
+        headers       = {'cookie': cookie_header}
+        context       = self.cookie_service.cookie_context(headers)
+        parse_ms      = self.duration_ms(self.cookie_service.cookie_context, headers)
+        helpers_ms    = self.duration_ms(self.helpers, context)
+
+        print(f"cookie_context (4KB): parse {parse_ms:.3f} ms | all helpers {helpers_ms:.4f} ms")
+        assert context.mitm_mode.value == 'xxx'
+        assert helpers_ms              <  parse_ms                                   # all the per-request consumers together cost less than one parse
+
+    def helpers(self, context):                                                      # the calls made for one proxied page (on its already parsed context)
+        self.cookie_service.context_debug_params  (context)
+        self.cookie_service.context_cookie_summary(context)
+        self.cookie_service.context_modifies_body (context)
@@ -0,0 +1,64 @@
+import time
+import pytest
+from unittest                                                                       import TestCase
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import HEADER__PROXY__BUDGET_EXCEEDED
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Deadline                      import Proxy__Deadline, Proxy__Deadline__Exceeded
+
+
+class test_Proxy__Deadline(TestCase):
+
+    def test__init__(self):
+        with Proxy__Deadline() as _:
+            assert _.budget_ms           == 0
+            assert _.started_at          >  0
+            assert _.steps_skipped       == []
+            assert _.is_bounded()        is False
+            assert _.remaining_seconds() is None
+            assert _.allows('any-step', 1_000_000) is True                          # no budget: nothing is skipped
+            assert _.exceeded()          is False
+            assert _.to_headers()        == {}
+
+    def test_remaining_ms(self):
+        with Proxy__Deadline(budget_ms=1000) as _:
+            assert _.is_bounded()                is True
+            assert 900 < _.remaining_ms()        <= 1000
+            assert 0.9 < _.remaining_seconds()   <= 1.0
+            _.started_at -= 2                                                       # two seconds ago
+            assert _.elapsed_ms()                >= 2000
+            assert _.remaining_ms()              == 0
+            assert _.remaining_seconds()         == 0
+
+    def test_allows(self):
+        with Proxy__Deadline(budget_ms=1000) as _:
+            assert _.allows('store_original_html', 100 ) is True
+            assert _.allows('transformation'     , 5000) is False                   # not enough budget left
+            assert _.steps_skipped == ['transformation']
+            _.skip('transformation')                                                # recorded once
+            _.skip('store_original_html')
+            assert _.steps_skipped == ['transformation', 'store_original_html']
+            assert _.exceeded()    is True
+            assert _.to_headers()  == {HEADER__PROXY__BUDGET_EXCEEDED: 'transformation,store_original_html'}
+
+    def test_started_at(self):
+        started_at = time.monotonic() - 1
+        assert Proxy__Deadline(budget_ms=500, started_at=started_at).allows('transformation') is False
+
+    def test_timeout_seconds(self):
+        assert Proxy__Deadline().timeout_seconds(30)                     == 30.0    # no budget: the client's own timeout
+        with Proxy__Deadline(budget_ms=1000) as _:
+            assert 0.9 < _.timeout_seconds(30 ) <= 1.0                              # capped by the budget left
+            assert       _.timeout_seconds(0.5) == 0.5
+
+    def test_check(self):
+        with Proxy__Deadline(budget_ms=1000) as _:
+            _.check('html_to_hashes')                                               # budget left: nothing raised
+            assert _.steps_skipped == []
+            _.started_at -= 2
+            with pytest.raises(Proxy__Deadline__Exceeded, match='semantic_text'):
+                _.check('semantic_text')
+            assert _.steps_skipped == ['semantic_text']
+        with Proxy__Deadline(budget_ms=1000) as _:                                  # the caller already gave up (so later steps are not started)
+            _.skip('transformation')
+            with pytest.raises(Proxy__Deadline__Exceeded):
+                _.check('hashes_to_html')
+            assert _.steps_skipped == ['transformation']
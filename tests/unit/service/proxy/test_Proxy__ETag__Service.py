@@ -0,0 +1,96 @@
+import time
+from unittest                                                                       import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                              import Temp_Env_Vars
+from mgraph_ai_service_mitmproxy.schemas.html.Enum__HTML__Transformation_Mode       import Enum__HTML__Transformation_Mode
+from mgraph_ai_service_mitmproxy.service.consts.consts__proxy                       import ENV_VAR__PROXY__CONDITIONAL_REQUESTS, DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__ETag__Service                 import Proxy__ETag__Service
+
+
+class test_Proxy__ETag__Service(TestCase):
+
+    def setUp(self):
+        self.etag_service = Proxy__ETag__Service()
+        self.mode         = Enum__HTML__Transformation_Mode.XXX
+        self.etag         = self.etag_service.etag('abc123', self.mode)
+
+    def test__init__(self):
+        with Proxy__ETag__Service() as _:
+            assert _.enabled         is True
+            assert _.max_age_seconds == DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS
+            assert _.entries         == {}
+            assert _.stats()         == dict(enabled=True, pages=0, etags_issued=0, not_modified=0)
+
+    def test_setup(self):
+        with Temp_Env_Vars(env_vars={ENV_VAR__PROXY__CONDITIONAL_REQUESTS: 'false'}):
+            assert Proxy__ETag__Service().setup().enabled is False
+        assert Proxy__ETag__Service().setup().enabled is True
+
+    def test_etag(self):
+        assert self.etag                                                                    == '"abc123-xxx"'
+        assert self.etag_service.etag('abc123', Enum__HTML__Transformation_Mode.HASHES)     == '"abc123-hashes"'   # one etag per (content, mode)
+
+    def test_encoded_etag__decoded_etag(self):
+        with self.etag_service as _:
+            assert _.encoded_etag(self.etag, 'gzip')         == '"abc123-xxx+gzip"'
+            assert _.decoded_etag('"abc123-xxx+gzip"')       == self.etag
+            assert _.decoded_etag(self.etag)                 == self.etag
+
+    def test_upstream_fresh_seconds(self):
+        with self.etag_service as _:
+            assert _.upstream_fresh_seconds({})                                                         == 0     # no freshness: always ask upstream
+            assert _.upstream_fresh_seconds({'Cache-Control': 'public, max-age=60'})                    == 60
+            assert _.upstream_fresh_seconds({'cache-control': 'max-age=60, s-maxage=120', 'age': '20'}) == 100   # s-maxage wins (shared cache), minus Age
+            assert _.upstream_fresh_seconds({'cache-control': 'max-age=60', 'age': '90'})               == 0
+            assert _.upstream_fresh_seconds({'cache-control': 'no-cache, max-age=60'})                  == 0
+            assert _.upstream_fresh_seconds({'cache-control': 'private, max-age=60'})                   == 0
+            assert _.upstream_fresh_seconds({'expires': 'Thu, 01 Jan 2026 00:10:00 GMT', 'date': 'Thu, 01 Jan 2026 00:00:00 GMT'}) == 600
+            assert _.upstream_fresh_seconds({'expires': '0'})                                           == 0     # invalid: already expired
+
+    def test_if_none_match_etags(self):
+        with self.etag_service as _:
+            assert _.if_none_match_etags('"a"'                ) == ['"a"']
+            assert _.if_none_match_etags('"a", W/"b" , "c"'   ) == ['"a"', '"b"', '"c"']    # weak comparison
+            assert _.if_none_match_etags(''                   ) == []
+            assert _.if_none_match_etags('*'                  ) == ['*']
+
+    def test_remember__current_etag(self):
+        with self.etag_service as _:
+            assert _.current_etag('example.com', '/page', self.mode) is None
+            _.remember('example.com', '/page', self.mode, self.etag)                        # upstream gave no freshness: always ask it
+            assert _.current_etag('example.com', '/page', self.mode)                              is None
+            _.remember('example.com', '/page', self.mode, self.etag, fresh_seconds=60)
+            assert _.current_etag('example.com', '/page', self.mode)                              == self.etag
+            assert _.current_etag('example.com', '/page', Enum__HTML__Transformation_Mode.HASHES) is None
+            assert _.current_etag('example.com', '/other', self.mode)                             is None
+            assert _.etags_issued == 2
+
+    def test_remember__expires(self):
+        with self.etag_service as _:
+            _.remember('example.com', '/page', self.mode, self.etag, fresh_seconds=1000)    # capped by max_age_seconds
+            assert _.entries[('example.com/page', 'xxx')][1] - time.monotonic() <= DEFAULT__PROXY__ETAG__MAX_AGE_SECONDS
+            assert _.current_etag('example.com', '/page', self.mode) == self.etag
+            _.entries[('example.com/page', 'xxx')] = (self.etag, time.monotonic() - 1)
+            assert _.current_etag('example.com', '/page', self.mode) is None
+            assert _.entries                                          == {}
+
+    def test_remember__max_entries(self):
+        with Proxy__ETag__Service(max_entries=2) as _:
+            for path in ('/a', '/b', '/c'):
+                _.remember('example.com', path, self.mode, self.etag, fresh_seconds=60)
+            assert list(_.entries) == [('example.com/b', 'xxx'), ('example.com/c', 'xxx')]
+
+    def test_check_not_modified(self):
+        with self.etag_service as _:
+            assert _.check_not_modified('example.com', '/page', self.mode, self.etag) is None   # nothing sent yet
+            _.remember('example.com', '/page', self.mode, self.etag, fresh_seconds=60)
+            assert _.check_not_modified('example.com', '/page', self.mode, self.etag             ) == self.etag
+            assert _.check_not_modified('example.com', '/page', self.mode, f'"x", W/{self.etag}' ) == self.etag
+            assert _.check_not_modified('example.com', '/page', self.mode, '"other-xxx"'         ) is None     # the page changed since the client got it
+            assert _.check_not_modified('example.com', '/page', self.mode, ''                    ) is None
+            assert _.check_not_modified('example.com', '/page', Enum__HTML__Transformation_Mode.OFF, self.etag) is None
+            assert _.check_not_modified('example.com', '/page', self.mode, '"abc123-xxx+br"'     ) == '"abc123-xxx+br"'   # the client's (encoded) etag is echoed
+            assert _.check_not_modified('example.com', '/page', self.mode, '*'                   ) == self.etag
+            assert _.not_modified == 4
+
+            _.enabled = False
+            assert _.check_not_modified('example.com', '/page', self.mode, self.etag) is None
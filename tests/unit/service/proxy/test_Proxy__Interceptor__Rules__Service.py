@@ -0,0 +1,48 @@
+from unittest                                                                        import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                               import Temp_Env_Vars
+from osbot_utils.type_safe.Type_Safe                                                 import Type_Safe
+from osbot_utils.utils.Objects                                                       import base_classes
+from mgraph_ai_service_mitmproxy.schemas.proxy.Schema__Proxy__Interceptor__Rules     import Schema__Proxy__Interceptor__Rules
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Interceptor__Rules__Service    import Proxy__Interceptor__Rules__Service
+
+
+class test_Proxy__Interceptor__Rules__Service(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rules_service = Proxy__Interceptor__Rules__Service()
+
+    def test__init__(self):
+        with Proxy__Interceptor__Rules__Service() as _:
+            assert type(_)         is Proxy__Interceptor__Rules__Service
+            assert base_classes(_) == [Type_Safe, object]
+
+    def test_get_rules(self):
+        with self.rules_service.get_rules() as _:
+            assert type(_)                    is Schema__Proxy__Interceptor__Rules
+            assert _.bypass_enabled           is True
+            assert _.refresh_seconds          == 60
+            assert _.cookie_prefixes          == ['mitm-'       ]
+            assert _.cookie_names             == ['cache_test'  ]
+            assert _.admin_path_prefixes      == ['/mitm-proxy' ]
+            assert _.blocked_path_markers     == ['/blocked'    ]
+            assert _.sensitive_header_markers == ['Secret', 'Private', 'Token']
+            assert _.headers_only_enabled     is True
+            assert _.body_cookie_names        == ['mitm-show', 'mitm-inject', 'mitm-replace', 'mitm-debug', 'mitm-mode']
+            assert _.body_cookie_off_values   == ['', 'off', 'false', '0', 'no']
+            assert len(_.rules_hash)          == 10
+            assert _.rules_hash               == self.rules_service.get_rules().rules_hash  # stable while the rules don't change
+
+    def test_get_rules__bypass_disabled(self):
+        rules_hash = self.rules_service.get_rules().rules_hash
+        with Temp_Env_Vars(env_vars={'PROXY__INTERCEPTOR_BYPASS': 'false'}):
+            rules = self.rules_service.get_rules()
+            assert rules.bypass_enabled is False
+            assert rules.rules_hash     != rules_hash
+
+    def test_get_rules__headers_only_disabled(self):
+        rules_hash = self.rules_service.get_rules().rules_hash
+        with Temp_Env_Vars(env_vars={'PROXY__INTERCEPTOR_HEADERS_ONLY': 'false'}):
+            rules = self.rules_service.get_rules()
+            assert rules.headers_only_enabled is False
+            assert rules.rules_hash           != rules_hash
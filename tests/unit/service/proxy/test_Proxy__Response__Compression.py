@@ -0,0 +1,70 @@
+import gzip
+from unittest                                                                       import TestCase
+from osbot_utils.testing.Temp_Env_Vars                                              import Temp_Env_Vars
+from mgraph_ai_service_mitmproxy.service.cache.Proxy__Precompressed__Cache          import Proxy__Precompressed__Cache
+from mgraph_ai_service_mitmproxy.service.proxy.Proxy__Response__Compression         import Proxy__Response__Compression, brotli
+
+HTML__LARGE = "<html><body>" + "".join(f"<p>Paragraph {i} with some repeated text</p>" for i in range(100)) + "</body></html>"
+
+
+class test_Proxy__Response__Compression(TestCase):
+
+    def setUp(self):
+        self.compression = Proxy__Response__Compression()
+
+    def test__init__(self):
+        with self.compression as _:
+            assert _.enabled  is True
+            assert _.min_size == 1024
+            assert _.stats()  == dict(enabled=True, encodings=_.supported_encodings(), compressed=0, precompressed=0,
+                                      bytes_in=0, bytes_out=0, compress_time_ms=0.0)
+            assert _.supported_encodings() == (['gzip'] if brotli is None else ['br', 'gzip'])
+
+    def test_setup(self):
+        with Temp_Env_Vars(env_vars={'PROXY__RESPONSE_COMPRESSION': 'false'}):
+            assert Proxy__Response__Compression().setup().enabled is False
+        assert Proxy__Response__Compression().setup().enabled is True
+
+    def test_accepted_encodings(self):
+        with self.compression as _:
+            assert _.accepted_encodings('gzip, deflate, br'   ) == _.supported_encodings()
+            assert _.accepted_encodings('deflate;q=1, gzip;q=0.5') == ['gzip']
+            assert _.accepted_encodings('gzip;q=0'            ) == []
+            assert _.accepted_encodings('identity'            ) == []
+            assert _.accepted_encodings(''                    ) == []
+            assert _.accepted_encodings('*'                   ) == _.supported_encodings()
+            assert _.accepted_encodings('*;q=0, gzip'         ) == ['gzip']
+            assert _.accepted_encodings('GZIP ; q=0.8'        ) == ['gzip']
+
+    def test_compress(self):
+        with self.compression as _:
+            body, encoding = _.compress(HTML__LARGE, 'gzip')
+            assert encoding                      == 'gzip'
+            assert gzip.decompress(body).decode() == HTML__LARGE
+            assert len(body)                     <  len(HTML__LARGE) / 5
+            assert _.compressed                  == 1
+            assert _.bytes_in                    == len(HTML__LARGE)
+            assert _.bytes_out                   == len(body)
+
+            assert _.compress('<p>small</p>', 'gzip') == (None, None)              # below min_size
+            assert _.compress(HTML__LARGE   , ''    ) == (None, None)              # client doesn't accept any encoding
+            assert _.compress(None          , 'gzip') == (None, None)
+            _.enabled = False
+            assert _.compress(HTML__LARGE   , 'gzip') == (None, None)
+            assert _.compressed                       == 1
+
+    def test_compress__precompressed(self):                                         # a variant in the cache is sent as is (no cpu spent)
+        precompressed = Proxy__Precompressed__Cache()
+        with self.compression as _:
+            body_1, _encoding = _.compress(HTML__LARGE, 'gzip', precompressed)       # compressed, and remembered
+            body_2, encoding  = _.compress(HTML__LARGE, 'gzip', precompressed)
+            assert body_2           is body_1
+            assert encoding         == 'gzip'
+            assert _.compressed     == 1
+            assert _.precompressed  == 1
+            assert precompressed.stats() == dict(entries=1, bytes=len(body_1), hits=1, misses=1)
+
+        stored_gzip = gzip.compress(HTML__LARGE.encode(), compresslevel=1)           # e.g. the gzip bytes the cache service returned
+        precompressed.put(precompressed.body_key(HTML__LARGE.encode()), 'gzip', stored_gzip)
+        body, encoding = Proxy__Response__Compression().compress(HTML__LARGE, 'br, gzip', precompressed)
+        assert (body, encoding) == (stored_gzip, 'gzip')                             # preferred over compressing (even as br)
@@ -0,0 +1,59 @@
+import time
+import threading
+from unittest                                                                           import TestCase
+from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Content_Type                  import Enum__WCF__Content_Type
+from mgraph_ai_service_mitmproxy.schemas.wcf.Schema__WCF__Response                      import Schema__WCF__Response
+from mgraph_ai_service_mitmproxy.service.wcf.Proxy__WCF__Service                        import Proxy__WCF__Service
+
+
+class test_Proxy__WCF__Service__single_flight(TestCase):
+
+    def setUp(self):
+        self.service  = Proxy__WCF__Service().setup()
+        self.requests = []
+        self.service.cache_service.cache_config.enabled = False                         # every call would otherwise reach the WCF service
+        self.service.make_request = self.make_request                                   # no network calls in these tests
+
+    def make_request(self, wcf_request):
+        self.requests.append(wcf_request)
+        time.sleep(0.1)                                                                 # keep the WCF call in flight while the other requests arrive
+        return Schema__WCF__Response(status_code  = 200                             ,
+                                     content_type = Enum__WCF__Content_Type.text_html,
+                                     body         = f'<html>{wcf_request.target_url}</html>',
+                                     success      = True                            )
+
+    def process_concurrently(self, show_value, target_url, callers):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.service.process_show_command(show_value, target_url)))
+                   for _ in range(callers)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        return results
+
+    def test_process_show_command__concurrent_callers_share_one_wcf_call(self):
+        results = self.process_concurrently('url-to-html', 'https://example.com/popular', callers=4)
+        assert len(self.requests)                      == 1
+        assert len(results)                            == 4
+        assert len({id(result) for result in results}) == 1
+        assert results[0].body                         == '<html>https://example.com/popular</html>'
+        assert self.service.single_flight.stats()      == dict(leaders=1, followers=3, in_flight=0)
+
+    def test_process_show_command__different_commands_are_not_coalesced(self):
+        self.service.process_show_command('url-to-html'      , 'https://example.com/a')
+        self.service.process_show_command('url-to-html-xxx'  , 'https://example.com/a')
+        self.service.process_show_command('url-to-html'      , 'https://example.com/b')
+        assert len(self.requests)                      == 3
+        assert self.service.process_show_command('response-data', 'https://example.com/a') is None     # not a WCF command (never enters the single flight)
+        assert self.service.single_flight.leaders      == 3
+
+    def test_process_show_command__failures_back_off(self):                         # a failing url is not sent to the WCF again until its backoff expires
+        self.service.make_request = lambda wcf_request: self.requests.append(wcf_request) or Schema__WCF__Response(status_code=504, success=False, error_message='timeout')
+        assert self.service.process_show_command('url-to-html', 'https://example.com/broken').status_code == 504
+        assert self.service.process_show_command('url-to-html', 'https://example.com/broken') is None
+        assert len(self.requests)                      == 1
+        assert self.service.negative_cache.stats()     == dict(failing_keys=1, failures=1, short_circuits=1)
+
+        self.service.negative_cache.entry(('https://example.com/broken', 'url-to-html')).retry_at = 0
+        self.service.make_request = self.make_request
+        assert self.service.process_show_command('url-to-html', 'https://example.com/broken').success is True
+        assert self.service.negative_cache.stats()['failing_keys'] == 0             # a success clears the backoff
@@ -0,0 +1,54 @@
+import threading
+from http.server                                                            import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest                                                               import TestCase
+from mgraph_ai_service_mitmproxy.schemas.proxy.Enum__WCF__Command_Type      import Enum__WCF__Command_Type
+from mgraph_ai_service_mitmproxy.service.http.Http__Session__Pool           import http_session_pool__paid
+from mgraph_ai_service_mitmproxy.service.wcf.WCF__Request__Handler          import WCF__Request__Handler
+
+
+class WCF__Unavailable__Handler(BaseHTTPRequestHandler):                    # WCF stand-in that always answers 503 (and counts the calls it was charged for)
+    requests_received = 0
+
+    def do_GET(self):
+        WCF__Unavailable__Handler.requests_received += 1
+        body = b'Service Unavailable'
+        self.send_response(503)
+        self.send_header('content-type'  , 'text/plain'  )
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class test_WCF__Request__Handler(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server     = ThreadingHTTPServer(('127.0.0.1', 0), WCF__Unavailable__Handler)
+        cls.server_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.thread     = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        WCF__Unavailable__Handler.requests_received = 0
+
+    def test_make_request__503__requested_once(self):                       # each WCF call is a paid LLM call, so a 5xx is returned, never replayed
+        with WCF__Request__Handler(wcf_base_url=self.server_url) as _:
+            wcf_request = _.create_request(Enum__WCF__Command_Type.url_to_html_xxx, 'https://example.com')
+            response    = _.make_request(wcf_request)
+            assert response.status_code                         == 503
+            assert response.success                             is False
+            assert response.body                                == 'Service Unavailable'
+            assert WCF__Unavailable__Handler.requests_received  == 1
+
+    def test_make_request__uses_paid_pool(self):
+        adapter = http_session_pool__paid.session(self.server_url).get_adapter(self.server_url)
+        assert adapter.max_retries.status           == 0
+        assert adapter.max_retries.status_forcelist == set()